@@ -0,0 +1,232 @@
+/**
+ * Distribution des trames reçues du RFXtrx aux clients connectés
+ *
+ * Le lecteur série publie chaque trame une seule fois; chaque client a sa
+ * propre file bornée. Quand un client ne lit plus assez vite (tampon de la
+ * socket plein), ses trames s'accumulent dans sa file et les plus anciennes
+ * sont écartées: la publication ne bloque jamais le lecteur série.
+ *
+ * Chaque trame reçoit un numéro de séquence croissant et les plus récentes
+ * sont conservées: un client qui se reconnecte reprend après la dernière
+ * séquence reçue (since), sans trou tant qu'elle est encore conservée.
+ * L'époque change à chaque démarrage de l'add-on (séquences remises à zéro).
+ */
+
+const DEFAULT_QUEUE_SIZE = 256;
+const DEFAULT_HISTORY_SIZE = 1024;
+
+class FrameClient {
+    constructor(id, res, queueSize, remote) {
+        this.id = id;
+        this.res = res;
+        this.queueSize = queueSize;
+        this.remote = remote;
+        this.connectedAt = Date.now();
+        // File circulaire: pas de décalage du tableau à chaque trame
+        this.queue = new Array(queueSize);
+        this.head = 0;
+        this.length = 0;
+        this.blocked = false;
+        this.lastSeq = 0;
+        this.delivered = 0;
+        this.dropped = 0;
+        this.maxLag = 0;
+        this.onDrain = () => {
+            this.blocked = false;
+            this.flush();
+        };
+        res.on('drain', this.onDrain);
+    }
+
+    // Trames en attente d'écriture
+    get lag() {
+        return this.length;
+    }
+
+    push(entry) {
+        if (this.length === this.queueSize) {
+            // File pleine: écarter la plus ancienne
+            this.head = (this.head + 1) % this.queueSize;
+            this.length -= 1;
+            this.dropped += 1;
+        }
+        this.queue[(this.head + this.length) % this.queueSize] = entry;
+        this.length += 1;
+        if (this.length > this.maxLag) {
+            this.maxLag = this.length;
+        }
+        this.flush();
+    }
+
+    flush() {
+        while (this.length > 0 && !this.blocked) {
+            const entry = this.queue[this.head];
+            this.queue[this.head] = undefined;
+            this.head = (this.head + 1) % this.queueSize;
+            this.length -= 1;
+            this.write(entry);
+        }
+    }
+
+    write(entry) {
+        this.delivered += 1;
+        this.lastSeq = entry.seq;
+        // false: tampon de la socket plein, attendre 'drain'
+        if (!this.res.write(entry.line)) {
+            this.blocked = true;
+        }
+    }
+
+    // Trames conservées manquées pendant la déconnexion, avant le flux en direct
+    replay(entries) {
+        for (const entry of entries) {
+            this.write(entry);
+        }
+    }
+
+    // Maintient la connexion active quand le RFXtrx est silencieux
+    heartbeat() {
+        if (this.length === 0 && !this.blocked && !this.res.write('\n')) {
+            this.blocked = true;
+        }
+    }
+
+    close() {
+        this.res.removeListener('drain', this.onDrain);
+        this.queue = new Array(this.queueSize);
+        this.length = 0;
+    }
+
+    stats() {
+        return {
+            id: this.id,
+            remote: this.remote,
+            connected_at: new Date(this.connectedAt).toISOString(),
+            last_seq: this.lastSeq,
+            delivered: this.delivered,
+            dropped: this.dropped,
+            lag: this.lag,
+            max_lag: this.maxLag,
+            queue_size: this.queueSize
+        };
+    }
+}
+
+class FrameHub {
+    constructor(queueSize = DEFAULT_QUEUE_SIZE, historySize = DEFAULT_HISTORY_SIZE) {
+        this.queueSize = queueSize;
+        this.historySize = historySize;
+        this.clients = new Map();
+        this.nextId = 1;
+        this.received = 0;
+        this.epoch = Date.now().toString(36);
+        this.seq = 0;
+        // Historique circulaire des trames récentes: {seq, t, line}
+        this.history = new Array(historySize);
+        this.historyLength = 0;
+    }
+
+    // Plus ancienne séquence conservée (seq + 1 si l'historique est vide)
+    get firstSeq() {
+        return this.seq - this.historyLength + 1;
+    }
+
+    // Publie une trame brute (octets, longueur comprise) à tous les clients
+    publish(data) {
+        this.received += 1;
+        this.seq += 1;
+        const t = Date.now();
+        // Sérialisée une seule fois pour l'historique et tous les clients
+        const entry = {
+            seq: this.seq,
+            t,
+            line: JSON.stringify({
+                seq: this.seq,
+                t,
+                hex: Buffer.from(data).toString('hex')
+            }) + '\n'
+        };
+        this.history[this.seq % this.historySize] = entry;
+        if (this.historyLength < this.historySize) {
+            this.historyLength += 1;
+        }
+        for (const client of this.clients.values()) {
+            client.push(entry);
+        }
+    }
+
+    // Trames conservées de séquence > since, ou reçues depuis minTime (ms)
+    retained(since, minTime) {
+        const entries = [];
+        for (let seq = Math.max(since + 1, this.firstSeq); seq <= this.seq; seq += 1) {
+            const entry = this.history[seq % this.historySize];
+            if (entry.t >= minTime) {
+                entries.push(entry);
+            }
+        }
+        return entries;
+    }
+
+    /**
+     * Ajoute un client de flux; retiré à la fermeture de sa connexion.
+     *
+     * options.since: dernière séquence reçue par le client (reprise), valable
+     * pour options.epoch; une autre époque reprend au début de l'historique.
+     * options.maxAge: sans since, rejoue les trames des maxAge dernières secondes.
+     */
+    subscribe(res, options = {}) {
+        const size = options.queueSize > 0 ? options.queueSize : this.queueSize;
+        const client = new FrameClient(this.nextId, res, size, options.remote);
+        this.nextId += 1;
+
+        let since = this.seq;
+        let minTime = 0;
+        if (Number.isInteger(options.since) && options.since >= 0) {
+            since = options.epoch === this.epoch ? Math.min(options.since, this.seq) : 0;
+        } else if (options.maxAge > 0) {
+            since = 0;
+            minTime = Date.now() - options.maxAge * 1000;
+        }
+        // Trames perdues: plus anciennes que l'historique conservé
+        const missed = minTime === 0 ? Math.max(0, this.firstSeq - 1 - since) : 0;
+        res.write(JSON.stringify({
+            type: 'hello',
+            epoch: this.epoch,
+            seq: this.seq,
+            first: this.firstSeq,
+            missed
+        }) + '\n');
+        client.replay(this.retained(since, minTime));
+        client.lastSeq = this.seq;
+
+        this.clients.set(client.id, client);
+        res.on('close', () => this.unsubscribe(client.id));
+        return client;
+    }
+
+    heartbeat() {
+        for (const client of this.clients.values()) {
+            client.heartbeat();
+        }
+    }
+
+    unsubscribe(id) {
+        const client = this.clients.get(id);
+        if (client) {
+            client.close();
+            this.clients.delete(id);
+        }
+    }
+
+    stats() {
+        return {
+            received: this.received,
+            epoch: this.epoch,
+            seq: this.seq,
+            first_seq: this.firstSeq,
+            clients: Array.from(this.clients.values(), (client) => client.stats())
+        };
+    }
+}
+
+module.exports = { FrameHub, FrameClient, DEFAULT_QUEUE_SIZE, DEFAULT_HISTORY_SIZE };
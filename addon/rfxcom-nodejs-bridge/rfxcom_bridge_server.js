@@ -7,6 +7,7 @@
 const http = require('http');
 const url = require('url');
 const rfxcom = require('rfxcom');
+const { FrameHub } = require('./frame_hub');
 
 // Configuration depuis les options de l'add-on
 const PORT = process.env.API_PORT || 8888;
@@ -17,6 +18,13 @@ let rfxtrx = null;
 let handlers = {};
 let isInitialized = false;
 
+// Trames reçues: lues une fois, conservées, distribuées à chaque client de /api/frames
+const FRAME_QUEUE_SIZE = parseInt(process.env.FRAME_QUEUE_SIZE, 10) || 256;
+const FRAME_HISTORY_SIZE = parseInt(process.env.FRAME_HISTORY_SIZE, 10) || 1024;
+const FRAME_HEARTBEAT_MS = 30000;
+const frameHub = new FrameHub(FRAME_QUEUE_SIZE, FRAME_HISTORY_SIZE);
+setInterval(() => frameHub.heartbeat(), FRAME_HEARTBEAT_MS).unref();
+
 // Initialiser la connexion RFXCOM avec un port spécifique
 function initializeRFXCOM(serialPort) {
     // Si déjà initialisé avec le même port, ne rien faire
@@ -42,6 +50,8 @@ function initializeRFXCOM(serialPort) {
             rfxtrx = new rfxcom.RfxCom(currentSerialPort, {
                 debug: false
             });
+            // Un seul abonnement par connexion série, quel que soit le nombre de clients
+            rfxtrx.on('receive', (data) => frameHub.publish(data));
 
             rfxtrx.initialise((error) => {
                 if (error) {
@@ -168,6 +178,52 @@ async function sendCommand(protocol, deviceId, houseCode, unitCode, command, ser
     });
 }
 
+// Répéter une commande à cadence fixe (rafale d'appairage)
+// Échéances calculées sur l'horloge monotone depuis le début de la rafale:
+// la durée d'un envoi ne décale pas les suivants, les créneaux manqués sont sautés.
+async function sendBurst(protocol, deviceId, houseCode, unitCode, command, rate, duration, serialPort) {
+    const periodNs = BigInt(Math.round(1e9 / rate));
+    const slots = BigInt(Math.max(1, Math.round(duration * rate)));
+    const start = process.hrtime.bigint();
+    let slot = 0n;
+    let sent = 0;
+    let failed = 0;
+    let skipped = 0;
+
+    while (slot < slots) {
+        const delayNs = start + slot * periodNs - process.hrtime.bigint();
+        if (delayNs > 0n) {
+            await new Promise((resolve) => setTimeout(resolve, Number(delayNs / 1000000n)));
+        }
+        try {
+            await sendCommand(protocol, deviceId, houseCode, unitCode, command, serialPort);
+            sent += 1;
+        } catch (error) {
+            failed += 1;
+        }
+        slot += 1n;
+        const lateNs = process.hrtime.bigint() - (start + slot * periodNs);
+        if (lateNs > periodNs) {
+            let missed = lateNs / periodNs;
+            if (missed > slots - slot) {
+                missed = slots - slot;
+            }
+            skipped += Number(missed);
+            slot += missed;
+        }
+    }
+
+    const elapsed = Number(process.hrtime.bigint() - start) / 1e9;
+    return {
+        status: 'success',
+        sent,
+        failed,
+        skipped,
+        duration: Math.round(elapsed * 1000) / 1000,
+        achieved_rate: Math.round((sent / Math.max(elapsed, duration)) * 100) / 100
+    };
+}
+
 // Gérer les requêtes HTTP
 const server = http.createServer(async (req, res) => {
     // CORS headers
@@ -190,11 +246,56 @@ const server = http.createServer(async (req, res) => {
         res.end(JSON.stringify({
             status: 'ok',
             initialized: isInitialized,
-            port: currentSerialPort
+            port: currentSerialPort,
+            frames_received: frameHub.received,
+            frame_clients: frameHub.clients.size
         }));
         return;
     }
 
+    // Flux des trames reçues (une ligne JSON par trame)
+    if (path === '/api/frames' && req.method === 'GET') {
+        if (!isInitialized) {
+            try {
+                await initializeRFXCOM(parsedUrl.query.port);
+            } catch (error) {
+                res.writeHead(503, { 'Content-Type': 'application/json' });
+                res.end(JSON.stringify({
+                    status: 'error',
+                    error: error.message
+                }));
+                return;
+            }
+        }
+        res.writeHead(200, {
+            'Content-Type': 'application/x-ndjson',
+            'Cache-Control': 'no-cache'
+        });
+        const since = parsedUrl.query.since !== undefined ? Number(parsedUrl.query.since) : undefined;
+        const client = frameHub.subscribe(res, {
+            queueSize: parseInt(parsedUrl.query.queue, 10),
+            remote: req.socket.remoteAddress,
+            since,
+            epoch: parsedUrl.query.epoch,
+            maxAge: Number(parsedUrl.query.max_age) || 0
+        });
+        console.log(
+            `📥 Client de flux #${client.id} connecté (${client.remote}, file ${client.queueSize}` +
+            (since !== undefined ? `, reprise après ${since})` : ')')
+        );
+        res.on('close', () => {
+            console.log(`📤 Client de flux #${client.id} déconnecté: ${client.delivered} trame(s), ${client.dropped} perdue(s)`);
+        });
+        return;
+    }
+
+    // Compteurs des clients de flux
+    if (path === '/api/frames/clients' && req.method === 'GET') {
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify(frameHub.stats()));
+        return;
+    }
+
     // API endpoint
     if (path === '/api/command' && req.method === 'POST') {
         let body = '';
@@ -240,6 +341,54 @@ const server = http.createServer(async (req, res) => {
         return;
     }
 
+    // Rafale à cadence fixe
+    if (path === '/api/burst' && req.method === 'POST') {
+        let body = '';
+
+        req.on('data', (chunk) => {
+            body += chunk.toString();
+        });
+
+        req.on('end', async () => {
+            try {
+                const data = JSON.parse(body);
+                const { protocol, device_id, house_code, unit_code, command, rate, duration, port } = data;
+
+                if (!protocol || !command || !(rate > 0) || !(duration > 0)) {
+                    res.writeHead(400, { 'Content-Type': 'application/json' });
+                    res.end(JSON.stringify({
+                        status: 'error',
+                        error: 'Paramètres manquants: protocol, command, rate et duration sont requis'
+                    }));
+                    return;
+                }
+
+                const result = await sendBurst(
+                    protocol,
+                    device_id,
+                    house_code,
+                    unit_code,
+                    command,
+                    rate,
+                    duration,
+                    port
+                );
+                console.log(`📡 Rafale ${protocol}: ${result.sent} trame(s), ${result.achieved_rate}/s (visé ${rate}/s)`);
+
+                res.writeHead(200, { 'Content-Type': 'application/json' });
+                res.end(JSON.stringify(result));
+            } catch (error) {
+                console.error('❌ Erreur lors de la rafale:', error);
+                res.writeHead(500, { 'Content-Type': 'application/json' });
+                res.end(JSON.stringify({
+                    status: 'error',
+                    error: error.message
+                }));
+            }
+        });
+        return;
+    }
+
     // 404
     res.writeHead(404, { 'Content-Type': 'application/json' });
     res.end(JSON.stringify({
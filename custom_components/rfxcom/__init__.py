@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
 
@@ -15,14 +15,10 @@ from .const import (
     DOMAIN,
     CONF_DEBUG,
     DEFAULT_DEBUG,
-    CONF_PROTOCOL,
-    CONF_DEVICE_ID,
-    CONF_HOUSE_CODE,
-    CONF_UNIT_CODE,
 )
 from .coordinator import RFXCOMCoordinator
-from .log_handler import setup_log_handler
-from .services import async_setup_services, async_unload_services
+from .device_identity import async_clear_device_identities, async_find_device_identity
+from .log_handler import set_capture_level, setup_log_handler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +31,9 @@ PLATFORMS: list[Platform] = [Platform.SWITCH, Platform.SENSOR, Platform.COVER]
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Configure l'intégration RFXCOM au niveau du composant."""
     _LOGGER.debug("Configuration de l'intégration RFXCOM au niveau du composant")
+    # Import différé: les schémas voluptuous des services ne sont chargés qu'ici
+    from .services import async_setup_services
+
     await async_setup_services(hass)
     _LOGGER.debug("Services RFXCOM configurés")
     return True
@@ -77,25 +76,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     debug_enabled = entry.options.get(CONF_DEBUG, DEFAULT_DEBUG)
     _update_log_level(debug_enabled)
 
+    setup_start = time.monotonic()
     coordinator = RFXCOMCoordinator(hass, entry)
-
-    try:
-        _LOGGER.debug("Initialisation du coordinateur...")
-        await coordinator.async_setup()
-        _LOGGER.debug("Coordinateur initialisé avec succès")
-    except Exception as err:
-        _LOGGER.error(
-            "Erreur lors de l'initialisation de RFXCOM: %s (type: %s)",
-            err,
-            type(err).__name__,
-            exc_info=True
-        )
-        raise ConfigEntryNotReady from err
+    coordinator.record_timing("coordinator", setup_start)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     _LOGGER.debug("Coordinateur enregistré dans hass.data")
 
+    # Le transport (santé de l'add-on, /api/init ou socket TCP) se connecte en
+    # arrière-plan: le hub et les plateformes sont créés depuis la configuration
+    # stockée pendant ce temps, et les commandes attendent que le transport soit prêt.
+    _LOGGER.debug("Connexion du coordinateur en arrière-plan...")
+    coordinator.async_start()
+
+    phase_start = time.monotonic()
     # Créer le device hub principal dans le device registry
     device_registry = dr.async_get(hass)
     # Ne pas spécifier de manufacturer pour éviter le 404 sur brands.home-assistant.io
@@ -124,9 +119,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.warning("⚠️ Impossible de définir l'icône du device: %s", e)
         _LOGGER.info("💡 Pour définir l'icône manuellement, allez dans Paramètres > Appareils > RFXCOM > Icône et sélectionnez 'mdi:radio'")
     _LOGGER.debug("Device hub RFXCOM créé dans le device registry")
+    coordinator.record_timing("hub_device", phase_start)
 
     _LOGGER.debug("Configuration des plateformes: %s", PLATFORMS)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    phase_start = time.monotonic()
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        await coordinator.async_shutdown()
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        raise
+    coordinator.record_timing("platforms", phase_start)
     
     # Écouter les mises à jour du device registry pour synchroniser avec les options
     # Utiliser async_track_device_registry_updated_event pour écouter les changements
@@ -163,32 +166,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not device_identifier:
             return
         
-        # Trouver l'appareil correspondant dans les options
-        devices = list(entry.options.get("devices", []))
-        device_idx = None
-        
-        for idx, dev_config in enumerate(devices):
-            protocol = dev_config.get(CONF_PROTOCOL, "")
-            device_id_config = dev_config.get(CONF_DEVICE_ID)
-            house_code = dev_config.get(CONF_HOUSE_CODE)
-            unit_code = dev_config.get(CONF_UNIT_CODE)
-            
-            # Construire le device_identifier comme dans switch.py
-            if device_id_config:
-                expected_identifier = f"{protocol}_{device_id_config}_{idx}"
-            elif house_code and unit_code:
-                expected_identifier = f"{protocol}_{house_code}_{unit_code}_{idx}"
-            else:
-                name_slug = dev_config.get("name", "unknown").lower().replace(" ", "_")
-                expected_identifier = f"{protocol}_{name_slug}_{idx}"
-            
-            if expected_identifier == device_identifier:
-                device_idx = idx
-                break
-        
-        if device_idx is None:
+        # Trouver l'appareil correspondant dans les options (index des identités en cache)
+        identity = async_find_device_identity(hass, entry, device_identifier)
+        if identity is None:
             return
-        
+        devices = list(entry.options.get("devices", []))
+        device_idx = identity.index
+
         # Mettre à jour le nom dans les options si le nom a changé
         if device.name and device.name != devices[device_idx].get("name"):
             devices[device_idx]["name"] = device.name
@@ -206,7 +190,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     
-    _LOGGER.info("Intégration RFXCOM configurée avec succès")
+    coordinator.record_timing("total", setup_start)
+    _LOGGER.info(
+        "Intégration RFXCOM configurée avec succès (transport %s) - durées: %s",
+        "prêt" if coordinator.transport_ready else "en cours de connexion",
+        coordinator.setup_timings,
+    )
 
     return True
 
@@ -222,11 +211,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("Arrêt du coordinateur...")
         await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_clear_device_identities(hass, entry)
         _LOGGER.debug("Coordinateur retiré de hass.data")
 
         # Décharger les services si c'est la dernière entrée
         if not hass.data[DOMAIN]:
             _LOGGER.debug("Dernière entrée, déchargement des services")
+            from .services import async_unload_services
+
             await async_unload_services(hass)
         else:
             _LOGGER.debug("Autres entrées présentes, services conservés")
@@ -250,6 +242,8 @@ def _update_log_level(debug_enabled: bool) -> None:
         logger = logging.getLogger(logger_name)
         logger.setLevel(level)
         _LOGGER.debug("Niveau de log mis à jour pour %s: %s", logger_name, level)
+    # Sans debug, le tampon de logs ne capture plus rien sous INFO
+    set_capture_level(level)
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import serial.tools.list_ports
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -60,22 +59,34 @@ from .const import (
     CONF_HOUSE_CODE,
     CONF_DEVICE_ID,
     CONF_AUTO_REGISTRY,
+    CONF_IO_THREAD,
     CONF_ENABLED_PROTOCOLS,
     CONF_DEBUG,
     PROTOCOL_AUTO,
     DEFAULT_AUTO_REGISTRY,
+    DEFAULT_IO_THREAD,
     DEFAULT_DEBUG,
     PAIRING_TIMEOUT,
     CMD_ON,
+    PAIRING_BURST_DURATION,
+    PAIRING_BURST_RATE,
 )
+from .device_identity import device_identifier as device_identifier_for
+from .port_inventory import PortSnapshot, async_get_port_inventory, scan_serial_ports
 
 _LOGGER = logging.getLogger(__name__)
 
 # STEP_CONNECTION_TYPE_SCHEMA supprimé - plus de choix de type de connexion, USB par défaut
 
-def _get_available_ports() -> tuple[list[str], str | None]:
+def _get_available_ports(
+    snapshot: PortSnapshot | None = None,
+) -> tuple[list[str], str | None]:
     """Retourne la liste des ports série disponibles et le port RFXCOM détecté.
     
+    Args:
+        snapshot: Instantané de l'inventaire des ports. Si absent, les ports
+            sont énumérés de façon synchrone (à éviter dans la boucle d'événements).
+
     Returns:
         Tuple (liste des ports, port RFXCOM par défaut ou None)
     """
@@ -85,33 +96,33 @@ def _get_available_ports() -> tuple[list[str], str | None]:
     rfxcom_keywords = ["rfxcom", "rfxtrx", "rfx", "433mhz"]
 
     try:
-        available_ports = serial.tools.list_ports.comports()
-        for port in available_ports:
-            port_str = port.device
-            description_lower = (port.description or "").lower()
-            manufacturer_lower = (port.manufacturer or "").lower()
+        available_ports = snapshot if snapshot is not None else scan_serial_ports()
+        available_devices = {device for device, _, _ in available_ports}
+        for port_str, description, manufacturer in available_ports:
+            description_lower = (description or "").lower()
+            manufacturer_lower = (manufacturer or "").lower()
 
             # Filtrer les ports qui ne sont probablement pas des ports série RFXCOM
             if any(keyword in description_lower for keyword in excluded_keywords):
-                _LOGGER.debug("Port exclu (non RFXCOM): %s (%s)", port_str, port.description)
+                _LOGGER.debug("Port exclu (non RFXCOM): %s (%s)", port_str, description)
                 continue
 
             # Filtrer les ports cu.* sur macOS (utiliser tty.*)
             if port_str.startswith("/dev/cu.") and not port_str.startswith("/dev/cu.usbserial"):
                 # Sur macOS, préférer tty.* mais garder cu.usbserial
                 tty_equivalent = port_str.replace("/dev/cu.", "/dev/tty.")
-                if tty_equivalent not in [p.device for p in available_ports]:
+                if tty_equivalent not in available_devices:
                     continue
 
             ports.append(port_str)
-            _LOGGER.debug("Port série détecté: %s (%s)", port_str, port.description or "Sans description")
+            _LOGGER.debug("Port série détecté: %s (%s)", port_str, description or "Sans description")
             
             # Détecter si c'est un port RFXCOM (priorité)
             if rfxcom_port is None:
                 if any(keyword in description_lower for keyword in rfxcom_keywords) or \
                    any(keyword in manufacturer_lower for keyword in rfxcom_keywords):
                     rfxcom_port = port_str
-                    _LOGGER.info("✅ Port RFXCOM détecté automatiquement: %s (%s)", port_str, port.description or port.manufacturer or "Sans description")
+                    _LOGGER.info("✅ Port RFXCOM détecté automatiquement: %s (%s)", port_str, description or manufacturer or "Sans description")
     except Exception as err:
         _LOGGER.warning("Erreur lors de la détection des ports série: %s", err)
 
@@ -150,27 +161,30 @@ def _get_available_ports() -> tuple[list[str], str | None]:
     return ports, rfxcom_port
 
 
-def _build_usb_schema() -> vol.Schema:
-    """Construit le schéma USB avec les ports disponibles."""
-    available_ports, rfxcom_port = _get_available_ports()
+def _build_usb_schema(snapshot: PortSnapshot | None = None) -> vol.Schema:
+    """Construit le schéma USB avec les ports disponibles.
+
+    Le schéma est construit à partir d'un instantané unique de l'inventaire,
+    sans nouvelle énumération par port.
+    """
+    if snapshot is None:
+        snapshot = scan_serial_ports()
+    available_ports, rfxcom_port = _get_available_ports(snapshot)
+    descriptions = {device: description for device, description, _ in snapshot}
 
     # Créer les options pour le sélecteur avec descriptions
     port_options = {}
     for port in available_ports:
-        try:
-            # Essayer d'obtenir plus d'infos sur le port
-            port_info = next((p for p in serial.tools.list_ports.comports() if p.device == port), None)
-            if port_info:
-                # Marquer le port RFXCOM détecté
-                if port == rfxcom_port:
-                    label = f"{port} - {port_info.description} (RFXCOM détecté)" if port_info.description else f"{port} (RFXCOM détecté)"
-                else:
-                    label = f"{port} - {port_info.description}" if port_info.description else port
+        description = descriptions.get(port)
+        if port in descriptions:
+            # Marquer le port RFXCOM détecté
+            if port == rfxcom_port:
+                label = f"{port} - {description} (RFXCOM détecté)" if description else f"{port} (RFXCOM détecté)"
             else:
-                label = f"{port} (RFXCOM détecté)" if port == rfxcom_port else port
-            port_options[port] = label
-        except Exception:
-            port_options[port] = f"{port} (RFXCOM détecté)" if port == rfxcom_port else port
+                label = f"{port} - {description}" if description else port
+        else:
+            label = f"{port} (RFXCOM détecté)" if port == rfxcom_port else port
+        port_options[port] = label
 
     # Ajouter l'option de saisie manuelle
     port_options["manual"] = "✏️ Saisie manuelle..."
@@ -200,6 +214,7 @@ def _build_network_schema() -> vol.Schema:
                 vol.Coerce(int), vol.Range(min=1, max=65535)
             ),
             vol.Optional(CONF_AUTO_REGISTRY, default=DEFAULT_AUTO_REGISTRY): bool,
+            vol.Optional(CONF_IO_THREAD, default=DEFAULT_IO_THREAD): bool,
             vol.Required(CONF_ENABLED_PROTOCOLS, default=[]): vol.All(
                 cv.multi_select({p: p for p in PROTOCOLS_SWITCH + [PROTOCOL_TEMP_HUM]})
             ),
@@ -276,7 +291,7 @@ class RFXCOMConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Configuration USB."""
         if user_input is None:
-            schema = await self.hass.async_add_executor_job(_build_usb_schema)
+            schema = await self._async_build_usb_schema()
             return self.async_show_form(
                 step_id="usb", data_schema=schema
             )
@@ -303,11 +318,16 @@ class RFXCOMConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 title=f"RFXCOM USB ({port})", data=data, options=options
             )
 
-        schema = await self.hass.async_add_executor_job(_build_usb_schema)
+        schema = await self._async_build_usb_schema()
         return self.async_show_form(
             step_id="usb", data_schema=schema, errors=errors
         )
 
+    async def _async_build_usb_schema(self) -> vol.Schema:
+        """Construit le schéma USB depuis l'inventaire des ports mis en cache."""
+        snapshot = await async_get_port_inventory(self.hass).async_get_ports()
+        return _build_usb_schema(snapshot)
+
     async def async_step_usb_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -406,7 +426,15 @@ class RFXCOMConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
     """Gère le flux d'options pour RFXCOM."""
-    
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialise le flux et l'état de la page de logs affichée."""
+        super().__init__(*args, **kwargs)
+        # Curseur de la page de logs: None pour les logs les plus récents
+        self._log_before: int | None = None
+        self._log_level = "DEBUG"
+        self._log_page: dict[str, Any] = {}
+
     def __getattr__(self, name: str):
         """Intercepte les appels dynamiques à async_step_edit_device_* et async_step_delete_device_*."""
         if name.startswith("async_step_edit_device_"):
@@ -533,60 +561,91 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_view_logs(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Affiche les logs RFXCOM."""
-        from .log_handler import get_logs, clear_logs
-        
+        """Affiche les logs RFXCOM, une page à la fois."""
+        from .log_handler import LOG_PAGE_SIZE, clear_logs, get_log_page
+
+        before = self._log_before
+        level_name = self._log_level
+
         if user_input is None:
-            # Récupérer les logs
-            logs = get_logs(limit=500)
-            
-            # Formater les logs pour l'affichage
+            page = get_log_page(
+                before=before,
+                limit=LOG_PAGE_SIZE,
+                level=logging.getLevelName(level_name),
+            )
+            self._log_page = page
+            logs = page["entries"]
             if logs:
-                logs_text = "\n".join([
+                logs_text = "\n".join(
                     f"[{log['timestamp']}] [{log['level']}] {log['message']}"
                     for log in logs
-                ])
+                )
+                if page["has_more"]:
+                    logs_text = "... (logs plus anciens: page précédente) ...\n\n" + logs_text
             else:
                 logs_text = "Aucun log disponible."
-            
-            # Limiter la taille pour l'affichage (Home Assistant a des limites)
-            # Afficher les 200 derniers logs maximum
-            if logs and len(logs) > 200:
-                logs_display = logs[-200:]
-                logs_text = f"... ({len(logs) - 200} logs plus anciens) ...\n\n" + "\n".join([
-                    f"[{log['timestamp']}] [{log['level']}] {log['message']}"
-                    for log in logs_display
-                ])
-            elif logs:
-                logs_text = "\n".join([
-                    f"[{log['timestamp']}] [{log['level']}] {log['message']}"
-                    for log in logs
-                ])
-            
-            # Créer un schéma avec les actions
+
+            actions = {
+                "back": "← Retour",
+                "clear": "🗑️ Effacer les logs",
+                "refresh": "🔄 Rafraîchir",
+            }
+            if page["has_more"]:
+                actions["older"] = "⏪ Logs plus anciens"
+            if before is not None:
+                actions["newer"] = "⏩ Logs plus récents"
+
+            # Créer un schéma avec les actions et le niveau minimal affiché
             schema = vol.Schema({
-                vol.Required("action", default="back"): vol.In({
-                    "back": "← Retour",
-                    "clear": "🗑️ Effacer les logs",
-                    "refresh": "🔄 Rafraîchir",
+                vol.Required("action", default="back"): vol.In(actions),
+                vol.Required("level", default=level_name): vol.In({
+                    "DEBUG": "Debug",
+                    "INFO": "Info",
+                    "WARNING": "Avertissement",
+                    "ERROR": "Erreur",
                 }),
             })
-            
+
             return self.async_show_form(
                 step_id="view_logs",
                 data_schema=schema,
                 description_placeholders={
-                    "logs": logs_text[:50000] if logs_text else "Aucun log disponible.",  # Limite de 50KB
+                    "logs": logs_text,
                     "logs_count": str(len(logs)),
                 },
             )
-        
+
         # Gérer les actions
         action = user_input.get("action")
+        page = self._log_page
+        if user_input.get("level", level_name) != level_name:
+            # Un changement de niveau repart des logs les plus récents
+            self._log_level = user_input["level"]
+            self._log_before = None
+            if action != "back":
+                return await self.async_step_view_logs()
+
         if action == "clear":
             clear_logs()
+            self._log_before = None
             return await self.async_step_view_logs()
         elif action == "refresh":
+            self._log_before = None
+            return await self.async_step_view_logs()
+        elif action == "older" and page.get("first") is not None:
+            self._log_before = page["first"]
+            return await self.async_step_view_logs()
+        elif action == "newer":
+            # Page suivante: les LOG_PAGE_SIZE logs après la page affichée
+            self._log_before = None
+            if page.get("last") is not None:
+                newer = get_log_page(
+                    since=page["last"],
+                    limit=LOG_PAGE_SIZE,
+                    level=logging.getLevelName(level_name),
+                )
+                if newer["has_more"]:
+                    self._log_before = newer["last"] + 1
             return await self.async_step_view_logs()
         elif action == "back" or not action:
             return await self.async_step_init()
@@ -950,11 +1009,6 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
         name = self._pairing_data["name"]
         
         if user_input is None:
-            # Activer temporairement l'auto-registry pour écouter
-            coordinator: RFXCOMCoordinator = self.hass.data[RFXCOM_DOMAIN][self.config_entry.entry_id]
-            original_auto_registry = coordinator.auto_registry
-            coordinator.auto_registry = True  # Activer pour écouter
-            
             schema = vol.Schema({
                 vol.Required("ready_to_listen", default=False): bool,
             })
@@ -990,33 +1044,22 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
         
         # Écouter les paquets AC pendant 30 secondes
         coordinator: RFXCOMCoordinator = self.hass.data[RFXCOM_DOMAIN][self.config_entry.entry_id]
-        original_auto_registry = coordinator.auto_registry
-        coordinator.auto_registry = True  # Activer pour écouter
         
-        _LOGGER.info("🔍 Écoute des paquets AC pendant 30 secondes...")
+        _LOGGER.info("🔍 Écoute des paquets AC pendant %s secondes...", PAIRING_TIMEOUT)
         _LOGGER.info("💡 Envoyez une commande ON ou OFF depuis votre télécommande ou appuyez sur le bouton de la prise")
         
+        # Attente événementielle: résolue dès qu'une trame AC est décodée
         detected_device = None
-        start_time = asyncio.get_event_loop().time()
-        listen_timeout = 30.0  # 30 secondes
-        
-        while (asyncio.get_event_loop().time() - start_time) < listen_timeout:
-            await asyncio.sleep(0.5)  # Vérifier toutes les 0.5 secondes
-            
-            # Vérifier si un paquet AC a été reçu
-            for unique_id, device_info in coordinator._discovered_devices.items():
-                if device_info.get(CONF_PROTOCOL) == PROTOCOL_AC:
-                    detected_device = device_info
-                    _LOGGER.info("✅ Appareil AC détecté : device_id=%s, unit_code=%s", 
-                                device_info.get(CONF_DEVICE_ID), 
-                                device_info.get(CONF_UNIT_CODE))
-                    break
-            
-            if detected_device:
-                break
-        
-        # Restaurer l'auto-registry
-        coordinator.auto_registry = original_auto_registry
+        try:
+            detected_device = await asyncio.wait_for(
+                coordinator.async_wait_for_device(protocol=PROTOCOL_AC),
+                timeout=PAIRING_TIMEOUT,
+            )
+            _LOGGER.info("✅ Appareil AC détecté : device_id=%s, unit_code=%s", 
+                        detected_device.get(CONF_DEVICE_ID), 
+                        detected_device.get(CONF_UNIT_CODE))
+        except asyncio.TimeoutError:
+            pass
         
         if not detected_device:
             schema = vol.Schema({
@@ -1108,22 +1151,23 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
         # Envoyer des commandes d'appairage (ON répétées) pendant 4 secondes
         _LOGGER.info("📤 Envoi des commandes d'appairage pour device_id=%s, unit_code=%s...", device_id, unit_code)
         
-        pair_start_time = asyncio.get_event_loop().time()
-        pair_duration = 4.0  # 4 secondes
-        send_count = 0
-        
-        while (asyncio.get_event_loop().time() - pair_start_time) < pair_duration:
-            success = await coordinator.send_command(
-                protocol=PROTOCOL_AC,
-                device_id=device_id,
-                command=CMD_ON,
-                unit_code=unit_code,
-            )
-            if success:
-                send_count += 1
-            await asyncio.sleep(0.05)  # ~20 envois par seconde
+        # Rafale cadencée par le coordinateur (horloge monotone, trame précompilée)
+        burst = await coordinator.async_send_burst(
+            protocol=PROTOCOL_AC,
+            device_id=device_id,
+            command=CMD_ON,
+            unit_code=unit_code,
+            rate=PAIRING_BURST_RATE,
+            duration=PAIRING_BURST_DURATION,
+        )
+        send_count = burst["sent"]
         
-        _LOGGER.info("✅ %d commandes d'appairage envoyées", send_count)
+        _LOGGER.info(
+            "✅ %d commandes d'appairage envoyées (%.1f/s pour %.0f/s visés)",
+            send_count,
+            burst["achieved_rate"],
+            PAIRING_BURST_RATE,
+        )
         
         # Attendre un peu pour que l'appairage se stabilise
         await asyncio.sleep(1)
@@ -1363,11 +1407,21 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
         # Récupérer le coordinateur
         coordinator: RFXCOMCoordinator = self.hass.data[RFXCOM_DOMAIN][self.config_entry.entry_id]
         
-        # Activer temporairement l'auto-registry si ce n'est pas déjà fait
-        original_auto_registry = coordinator.auto_registry
-        if not original_auto_registry:
-            coordinator.auto_registry = True
-            _LOGGER.info("Auto-registry activé temporairement pour l'appairage")
+        # Prédicat identifiant l'appareil en cours d'appairage
+        if protocol in lighting1_protocols:
+            def _is_paired_device(device_info: dict[str, Any]) -> bool:
+                return (
+                    device_info.get(CONF_HOUSE_CODE) == self._pairing_data["house_code"]
+                    and device_info.get(CONF_UNIT_CODE) == self._pairing_data["unit_code"]
+                )
+        else:
+            def _is_paired_device(device_info: dict[str, Any]) -> bool:
+                return device_info.get(CONF_DEVICE_ID) == self._pairing_data["device_id"]
+        
+        # Enregistrer l'attente avant l'envoi pour ne pas manquer une réponse immédiate
+        waiter = coordinator.async_wait_for_device(
+            protocol=protocol, predicate=_is_paired_device
+        )
         
         try:
             # Envoyer la commande ON
@@ -1387,8 +1441,7 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
                 )
             
             if not success:
-                # Restaurer l'auto-registry
-                coordinator.auto_registry = original_auto_registry
+                waiter.cancel()
                 return self.async_show_form(
                     step_id="pair_device_ready",
                     data_schema=vol.Schema({
@@ -1409,34 +1462,13 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
             _LOGGER.info("⏳ Attente d'une éventuelle réponse de l'appareil (max 5 secondes)...")
             
             # Attendre qu'un nouvel appareil soit détecté (optionnel)
-            start_time = asyncio.get_event_loop().time()
             detected_device = None
             wait_timeout = min(5, PAIRING_TIMEOUT)  # Attendre max 5 secondes pour une réponse
-            
-            while (asyncio.get_event_loop().time() - start_time) < wait_timeout:
-                await asyncio.sleep(0.5)  # Vérifier toutes les 0.5 secondes
-                
-                # Vérifier si un nouvel appareil a été détecté
-                for unique_id, device_info in coordinator._discovered_devices.items():
-                    if device_info.get(CONF_PROTOCOL) == protocol:
-                        # Vérifier si c'est le bon appareil selon le protocole
-                        if protocol in lighting1_protocols:
-                            if (device_info.get(CONF_HOUSE_CODE) == self._pairing_data["house_code"] and
-                                device_info.get(CONF_UNIT_CODE) == self._pairing_data["unit_code"]):
-                                detected_device = device_info
-                                _LOGGER.info("✅ Réponse de l'appareil détectée : %s", detected_device)
-                                break
-                        else:
-                            if device_info.get(CONF_DEVICE_ID) == self._pairing_data["device_id"]:
-                                detected_device = device_info
-                                _LOGGER.info("✅ Réponse de l'appareil détectée : %s", detected_device)
-                                break
-                
-                if detected_device:
-                    break
-            
-            # Restaurer l'auto-registry
-            coordinator.auto_registry = original_auto_registry
+            try:
+                detected_device = await asyncio.wait_for(waiter, timeout=wait_timeout)
+                _LOGGER.info("✅ Réponse de l'appareil détectée : %s", detected_device)
+            except asyncio.TimeoutError:
+                pass
             
             # Si pas de réponse, ce n'est pas grave : l'appairage RFXCOM fonctionne ainsi
             # L'appareil s'appaire quand on envoie la commande, même sans réponse
@@ -1494,8 +1526,7 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
             
         except Exception as err:
             _LOGGER.error("Erreur lors de l'appairage : %s", err)
-            # Restaurer l'auto-registry
-            coordinator.auto_registry = original_auto_registry
+            waiter.cancel()
             return self.async_show_form(
                 step_id="pair_device_ready",
                 data_schema=vol.Schema({
@@ -1622,19 +1653,7 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
         from homeassistant.helpers import device_registry as dr
         device_registry = dr.async_get(self.hass)
         
-        # Construire le device_identifier comme dans switch.py
-        protocol = device.get(CONF_PROTOCOL, "")
-        device_id = device.get(CONF_DEVICE_ID)
-        house_code = device.get(CONF_HOUSE_CODE)
-        unit_code = device.get(CONF_UNIT_CODE)
-        
-        if device_id:
-            device_identifier = f"{protocol}_{device_id}_{device_idx}"
-        elif house_code and unit_code:
-            device_identifier = f"{protocol}_{house_code}_{unit_code}_{device_idx}"
-        else:
-            name_slug = device.get("name", "unknown").lower().replace(" ", "_")
-            device_identifier = f"{protocol}_{name_slug}_{device_idx}"
+        device_identifier = device_identifier_for(device, device_idx)
         
         # Mettre à jour le device dans le device registry
         device_entry = device_registry.async_get_device(
@@ -1695,19 +1714,7 @@ class RFXCOMOptionsFlowHandler(config_entries.OptionsFlow):
             from homeassistant.helpers import device_registry as dr
             device_registry = dr.async_get(self.hass)
             
-            # Construire le device_identifier comme dans switch.py
-            protocol = device_to_delete.get(CONF_PROTOCOL, "")
-            device_id = device_to_delete.get(CONF_DEVICE_ID)
-            house_code = device_to_delete.get(CONF_HOUSE_CODE)
-            unit_code = device_to_delete.get(CONF_UNIT_CODE)
-            
-            if device_id:
-                device_identifier = f"{protocol}_{device_id}_{device_idx}"
-            elif house_code and unit_code:
-                device_identifier = f"{protocol}_{house_code}_{unit_code}_{device_idx}"
-            else:
-                name_slug = device_to_delete.get("name", "unknown").lower().replace(" ", "_")
-                device_identifier = f"{protocol}_{name_slug}_{device_idx}"
+            device_identifier = device_identifier_for(device_to_delete, device_idx)
             
             # Supprimer le device du device registry (cela supprimera aussi les entités associées)
             device_entry = device_registry.async_get_device(
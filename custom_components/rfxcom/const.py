@@ -96,6 +96,9 @@ DEVICE_TYPE_SENSOR = "sensor"
 # Commandes
 CMD_ON = "ON"
 CMD_OFF = "OFF"
+# Commandes de groupe RF (Lighting1: toute la house code, Lighting2: toutes les unités d'un ID)
+CMD_GROUP_ON = "GROUP_ON"
+CMD_GROUP_OFF = "GROUP_OFF"
 
 # Configuration
 CONF_PORT = "port"
@@ -109,6 +112,7 @@ CONF_HOUSE_CODE = "house_code"
 CONF_DEVICE_ID = "device_id"
 CONF_PAIRING_MODE = "pairing_mode"
 CONF_ENABLED_PROTOCOLS = "enabled_protocols"
+CONF_TRANSCEIVERS = "transceivers"  # RFXtrx supplémentaires (voir pool.py)
 PROTOCOL_AUTO = "auto"
 
 # RFXCOM Packet Types
@@ -119,6 +123,7 @@ PACKET_TYPE_LIGHTING4 = 0x13
 PACKET_TYPE_LIGHTING5 = 0x14
 PACKET_TYPE_LIGHTING6 = 0x15
 PACKET_TYPE_TEMP_HUM = 0x52
+PACKET_TYPE_TRANSMITTER = 0x02  # réponse du transmetteur (ACK/NAK)
 
 # Lighting1 Subtypes (0x10)
 SUBTYPE_X10 = 0x00
@@ -192,10 +197,113 @@ PROTOCOL_TO_PACKET = {
 CONF_AUTO_REGISTRY = "auto_registry"
 DEFAULT_AUTO_REGISTRY = False
 
+# Lecture réseau sur un thread dédié (voir transport.IOThreadReader)
+CONF_IO_THREAD = "io_thread"
+DEFAULT_IO_THREAD = False
+
 # Debug
 CONF_DEBUG = "debug"
 DEFAULT_DEBUG = False
 
 # Timeouts
 PAIRING_TIMEOUT = 30  # secondes
+TRANSPORT_READY_TIMEOUT = 15  # secondes d'attente max d'une commande avant connexion
+TRANSPORT_RETRY_DELAYS = (5, 10, 30, 60)  # secondes entre les tentatives de connexion
+
+# Rafale d'appairage (trame ON répétée)
+PAIRING_BURST_RATE = 20.0  # trames par seconde
+PAIRING_BURST_DURATION = 4.0  # secondes
+
+# Inventaire des ports série (flux de configuration)
+DATA_PORT_INVENTORY = f"{DOMAIN}_port_inventory"
+PORT_INVENTORY_TTL = 30  # secondes
+
+# Cache des identités d'appareils (plateformes)
+DATA_DEVICE_IDENTITIES = f"{DOMAIN}_device_identities"
+
+# Ordonnancement RF: temps d'émission estimé par trame (ms), répétitions du
+# transceiver incluses (estimations à partir du codage de chaque protocole)
+AIRTIME_DEFAULT_MS = 150
+AIRTIME_BY_PACKET_TYPE = {
+    PACKET_TYPE_LIGHTING1: 170,  # ARC & co: 12 bits trinaires, ~28 ms x 6 répétitions
+    PACKET_TYPE_LIGHTING2: 220,  # AC/HomeEasy: 32 bits + unité, ~55 ms x 4 répétitions
+    PACKET_TYPE_LIGHTING3: 120,  # Ikea Koppla: ~40 ms x 3 répétitions
+    PACKET_TYPE_LIGHTING4: 200,  # PT2262: 24 bits, ~50 ms x 4 répétitions
+    PACKET_TYPE_LIGHTING5: 300,  # LightwaveRF & co: trame longue, ~50 ms x 6 répétitions
+    PACKET_TYPE_LIGHTING6: 180,  # Blyss: ~60 ms x 3 répétitions
+}
+AIRTIME_BY_PROTOCOL = {
+    PROTOCOL_X10: 170,  # 32 bits, ~85 ms x 2 répétitions
+    PROTOCOL_LIVOLO: 120,  # trame courte
+}
+AIRTIME_BUCKET_MS = 400  # temps d'antenne pouvant être émis d'un bloc
+AIRTIME_DUTY_CYCLE = 1.0  # part du canal utilisable (1.0 = émission continue)
+AIRTIME_STATS_WINDOW = 100  # émissions prises en compte pour les statistiques
+
+# Classes de priorité des émissions (valeur basse = servie en premier)
+PRIORITY_INTERACTIVE = 0  # action d'un utilisateur (interface, flux de configuration)
+PRIORITY_AUTOMATION = 1  # automatisations et scripts
+PRIORITY_BULK = 2  # rafales d'appairage, commandes de groupe
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_AUTOMATION: "automation",
+    PRIORITY_BULK: "bulk",
+}
+PRIORITY_AGING = 2.0  # secondes d'attente pour gagner une classe (anti-famine)
+
+# Histogrammes de latence des commandes (buckets logarithmiques, type HDR)
+LATENCY_MIN_MS = 0.1  # résolution
+LATENCY_MAX_MS = 60000.0  # au-delà, les valeurs sont comptées dans le dernier bucket
+LATENCY_SUB_BUCKETS = 32  # puissance de 2; 16 buckets par octave: erreur relative < 1/16
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# Statistiques de transport (diagnostics)
+DEVICE_STATS_MAX = 256  # appareils suivis pour le classement des plus bavards
+DIAGNOSTICS_TOP_DEVICES = 10
+# Longueur minimale d'une trame reçue par type de paquet
+PACKET_MIN_LENGTH = {
+    PACKET_TYPE_LIGHTING1: 8,
+    PACKET_TYPE_LIGHTING2: 11,
+    PACKET_TYPE_LIGHTING3: 8,
+    PACKET_TYPE_LIGHTING4: 7,
+    PACKET_TYPE_LIGHTING5: 10,
+    PACKET_TYPE_LIGHTING6: 8,
+    PACKET_TYPE_TEMP_HUM: 11,
+}
+PACKET_TYPE_NAMES = {
+    PACKET_TYPE_LIGHTING1: "lighting1",
+    PACKET_TYPE_LIGHTING2: "lighting2",
+    PACKET_TYPE_LIGHTING3: "lighting3",
+    PACKET_TYPE_LIGHTING4: "lighting4",
+    PACKET_TYPE_LIGHTING5: "lighting5",
+    PACKET_TYPE_LIGHTING6: "lighting6",
+    PACKET_TYPE_TEMP_HUM: "temp_hum",
+}
+
+
+# Trace binaire des trames reçues/émises (toujours active)
+TRACE_CAPACITY = 4096  # trames conservées
+TRACE_SLOT_SIZE = 64  # octets par trame (une trame RFXtrx en fait au plus 51)
+TRACE_DIRECTION_RX = 0
+TRACE_DIRECTION_TX = 1
+TRACE_DUMP_SECONDS = 300  # fenêtre par défaut du service dump_packet_trace
+
+# Pool de transceivers (plusieurs RFXtrx pour une même entrée)
+TRANSCEIVER_PRIMARY = "primary"  # nom du transceiver configuré par l'entrée
+SUBTYPE_TRANSMITTER_RESPONSE = 0x01
+TRANSMITTER_ACK_CODES = (0x00, 0x01)  # 0x00 ACK, 0x01 ACK différé; 0x02/0x03 NAK
+TRANSCEIVER_ACK_TIMEOUT = 1.0  # secondes d'attente de la réponse du transmetteur
+TRANSCEIVER_RETRY_DELAY = 30  # secondes avant de réessayer un transceiver en échec
+TRANSCEIVER_RSSI_MAX_AGE = 3600  # secondes de validité d'un niveau de signal
+TRANSCEIVER_DEDUPE_WINDOW = 0.5  # secondes: même trame reçue par plusieurs unités
+TRANSCEIVER_DEDUPE_MAX = 256  # trames récentes mémorisées pour la déduplication
+
+# Transports partagés entre entrées visant le même RFXtrx (voir transport.py)
+DATA_TRANSPORTS = f"{DOMAIN}_transports"  # clé hass.data du registre
+TRANSPORT_SUBSCRIBER_QUEUE = 256  # trames en attente par entrée abonnée
+IO_THREAD_NAME = "rfxcom_io"
+IO_THREAD_RECV_SIZE = 1024  # octets lus par appel (plusieurs trames par lot)
 
+# Flux des trames reçues par l'add-on (GET /api/frames)
+FRAME_STREAM_IDLE_TIMEOUT = 90  # secondes sans donnée (battement toutes les 30 s)
+FRAME_REPLAY_MAX_AGE = 120  # secondes de trames rejouées à la première connexion
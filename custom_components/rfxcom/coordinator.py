@@ -4,10 +4,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import socket
+import time
 from pathlib import Path
-from typing import Any
-
-import serial
+from typing import TYPE_CHECKING, Any, Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -50,6 +49,8 @@ from .const import (
     PROTOCOL_TO_PACKET,
     CMD_ON,
     CMD_OFF,
+    CMD_GROUP_ON,
+    CMD_GROUP_OFF,
     PACKET_TYPE_LIGHTING1,
     PACKET_TYPE_LIGHTING2,
     PACKET_TYPE_LIGHTING3,
@@ -59,18 +60,81 @@ from .const import (
     PACKET_TYPE_TEMP_HUM,
     SUBTYPE_TH13,
     CONF_AUTO_REGISTRY,
+    CONF_IO_THREAD,
     DEFAULT_AUTO_REGISTRY,
+    DEFAULT_IO_THREAD,
     CONF_PROTOCOL,
     CONF_HOUSE_CODE,
     CONF_UNIT_CODE,
     CONF_DEVICE_ID,
     DEVICE_TYPE_SENSOR,
+    TRANSPORT_READY_TIMEOUT,
+    TRANSPORT_RETRY_DELAYS,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BULK,
+    PAIRING_BURST_RATE,
+    PAIRING_BURST_DURATION,
+    PACKET_MIN_LENGTH,
+    CONF_TRANSCEIVERS,
+    TRANSCEIVER_PRIMARY,
+)
+from .frames import (
+    FrameTemplate,
+    compile_frame_template,
+    hex_to_bytes,
+    lighting1_template,
+    lighting2_template,
+    lighting3_template,
+    lighting4_template,
+    lighting5_template,
+    lighting6_template,
+)
+from .metrics import (
+    DECODE_INCOMPLETE,
+    DECODE_INVALID_LENGTH,
+    DECODE_REJECTED,
+    DECODE_TOO_SHORT,
+    DECODE_TRUNCATED,
+    DECODE_UNKNOWN_TYPE,
+    DECODE_UNSUPPORTED_SUBTYPE,
+    CommandMetrics,
+    TransportStats,
+)
+from .scheduler import (
+    AirtimeScheduler,
+    PriorityLock,
+    async_run_burst,
+    empty_burst_result,
+    estimate_airtime,
 )
-from .node_bridge_http import NodeBridgeHTTP
+from .pool import Transceiver, TransceiverPool, frame_rssi, transmit_key
+from .trace import PacketTrace
+from .transport import SharedTransport, get_registry, transport_key
+
+if TYPE_CHECKING:
+    # Transports chargés uniquement selon le type de connexion (voir async_setup)
+    import serial
+
+    from .node_bridge_http import FrameCursor, NodeBridgeHTTP
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _PendingCommand:
+    """Commande en attente d'émission, partagée par les appels fusionnés."""
+
+    __slots__ = ("command", "future", "superseded", "task", "enqueued_at", "priority")
+
+    def __init__(self, command: str, future: asyncio.Future, priority: int) -> None:
+        """Initialise la commande en attente."""
+        self.command = command
+        self.future = future
+        self.priority = priority
+        self.superseded = 0
+        self.task: asyncio.Task | None = None
+        self.enqueued_at = time.monotonic()
+
+
 class RFXCOMCoordinator(DataUpdateCoordinator):
     """Coordinateur pour gérer la communication RFXCOM."""
 
@@ -93,13 +157,154 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
         self.network_port = entry.data.get("network_port", DEFAULT_NETWORK_PORT)
         # auto_registry peut être dans data (configuration initiale) ou options (modification)
         self.auto_registry = entry.data.get(CONF_AUTO_REGISTRY) or entry.options.get(CONF_AUTO_REGISTRY, DEFAULT_AUTO_REGISTRY)
+        # Lecture réseau sur un thread dédié, indépendante de la charge de la boucle HA
+        self.io_thread = entry.data.get(CONF_IO_THREAD) or entry.options.get(CONF_IO_THREAD, DEFAULT_IO_THREAD)
         self._sequence_number = 0
-        self._lock = asyncio.Lock()
+        # Trames précompilées par (protocole, id, commande, house code, unit code)
+        self._frame_templates: dict[
+            tuple[str, str | None, str, str | None, str | None], FrameTemplate
+        ] = {}
+        # Verrou d'émission: les actions utilisateur passent avant automatisations et rafales
+        self._lock = PriorityLock()
         self._receive_task: asyncio.Task | None = None
+        # Boucle démarrée pour une attente de découverte (sans auto-registry)
+        self._receive_on_demand = False
         self._discovered_devices: dict[str, dict[str, Any]] = {}
+        # Attentes de découverte (appairage): (protocole, packet_type, new_only, prédicat, future)
+        self._discovery_waiters: list[
+            tuple[str | None, int | None, bool, Callable[[dict[str, Any]], bool] | None, asyncio.Future]
+        ] = []
         # Bridge Node.js pour les commandes via l'add-on HTTP uniquement
         self._node_bridge: NodeBridgeHTTP | None = None
         self._use_node_bridge = True  # Utiliser Node.js pour AC par défaut
+        # Position de l'entrée dans le flux des trames de l'add-on (bridge partagé)
+        self._frame_cursor: FrameCursor | None = None
+        # Connexion du transport en arrière-plan (voir async_start)
+        self._connect_task: asyncio.Task | None = None
+        self._transport_ready = asyncio.Event()
+        self.transport_error: str | None = None
+        # Durées des phases de configuration, en millisecondes
+        self.setup_timings: dict[str, float] = {}
+        # Fusion des commandes par appareil: (protocole, device_id, house_code, unit_code)
+        self._pending_commands: dict[tuple[str, str, str | None, str | None], _PendingCommand] = {}
+        # Entités prévenues des commandes de groupe émises pour leur appareil, même clé
+        self._command_listeners: dict[
+            tuple[str, str, str | None, str | None], list[Callable[[str], None]]
+        ] = {}
+        self.coalesced_commands = 0
+        # Espacement des émissions selon le temps d'antenne estimé de chaque trame
+        self.scheduler = AirtimeScheduler()
+        # Latences par étape (enqueue -> dequeue -> write -> ack) et commandes en vol
+        self.metrics = CommandMetrics()
+        # Entités prévenues des variations de la file d'émission et des commandes en vol
+        self._queue_listeners: list[Callable[[], None]] = []
+        self._remove_lock_listener = self._lock.add_listener(self._notify_queue_changed)
+        self.metrics.add_listener(self._notify_queue_changed)
+        # Compteurs de trames reçues/émises, échecs de décodage, reconnexions
+        self.stats = TransportStats()
+        # Trace binaire des trames reçues/émises (toujours active)
+        self.trace = PacketTrace()
+        # Transceiver de l'entrée: réponses du transmetteur aux trames émises en réseau
+        self._primary = Transceiver(
+            TRANSCEIVER_PRIMARY, self.connection_type, scheduler=self.scheduler
+        )
+        # RFXtrx supplémentaires: le transceiver de l'entrée devient le principal du pool
+        transceivers = entry.data.get(CONF_TRANSCEIVERS) or []
+        self.pool: TransceiverPool | None = None
+        if transceivers:
+            self.pool = TransceiverPool.from_config(self._primary, transceivers)
+        # Connexion partagée avec les autres entrées du même point d'accès (voir async_setup)
+        self._transport: SharedTransport | None = None
+
+    def record_timing(self, phase: str, start: float) -> None:
+        """Enregistre la durée d'une phase de configuration (start = time.monotonic())."""
+        self.setup_timings[phase] = round((time.monotonic() - start) * 1000, 1)
+
+    @property
+    def transport_ready(self) -> bool:
+        """Indique si le transport est connecté et prêt à émettre."""
+        return self._transport_ready.is_set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de commandes en attente du canal d'émission."""
+        return self._lock.queue_depth
+
+    def async_add_queue_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Abonne une entité aux variations de queue_depth et des commandes en vol.
+
+        Retourne la fonction de désabonnement (pour async_on_remove).
+        """
+        self._queue_listeners.append(listener)
+
+        def _remove_listener() -> None:
+            if listener in self._queue_listeners:
+                self._queue_listeners.remove(listener)
+
+        return _remove_listener
+
+    def _notify_queue_changed(self) -> None:
+        """Prévient les entités que la file d'émission a changé."""
+        for listener in list(self._queue_listeners):
+            listener()
+
+    def async_start(self) -> None:
+        """Démarre la connexion du transport en arrière-plan.
+
+        Les entités peuvent être créées immédiatement depuis la configuration
+        stockée; les commandes émises avant la fin de la connexion attendent
+        que le transport soit prêt (voir send_command).
+        """
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = asyncio.create_task(self._async_connect())
+
+    async def _async_connect(self) -> None:
+        """Connecte le transport, avec nouvelles tentatives en cas d'échec."""
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                await self.async_setup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.transport_error = str(err)
+                delay = TRANSPORT_RETRY_DELAYS[min(attempt, len(TRANSPORT_RETRY_DELAYS) - 1)]
+                attempt += 1
+                _LOGGER.warning(
+                    "⚠️ Connexion RFXCOM impossible (tentative %s), nouvel essai dans %ss: %s",
+                    attempt,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.record_timing("transport", start)
+            self.transport_error = None
+            self._transport_ready.set()
+            _LOGGER.info(
+                "✅ Transport RFXCOM prêt en %.1f ms", self.setup_timings["transport"]
+            )
+            return
+
+    async def _async_wait_transport_ready(self) -> bool:
+        """Attend la fin de la connexion en arrière-plan si elle est en cours."""
+        if self._connect_task is None or self._transport_ready.is_set():
+            return True
+        _LOGGER.debug("Transport en cours de connexion, commande mise en attente")
+        try:
+            await asyncio.wait_for(
+                self._transport_ready.wait(), timeout=TRANSPORT_READY_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.error(
+                "❌ Transport RFXCOM non prêt après %ss, commande abandonnée (%s)",
+                TRANSPORT_READY_TIMEOUT,
+                self.transport_error or "connexion en cours",
+            )
+            return False
+        return True
 
     async def async_setup(self) -> None:
         """Configure la connexion USB ou réseau."""
@@ -110,26 +315,12 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
                 _LOGGER.info("Connexion USB configurée - Le port série sera géré par l'add-on RFXCOM Node.js Bridge")
             elif self.connection_type == CONNECTION_TYPE_NETWORK:
                 _LOGGER.debug("Configuration connexion réseau: host=%s, port=%s", self.host, self.network_port)
-                # Fermer l'ancien socket s'il existe
-                if self.socket is not None:
-                    try:
-                        self.socket.close()
-                    except Exception:
-                        pass
-                self.socket = await self.hass.async_add_executor_job(
-                    socket.socket,
-                    socket.AF_INET,
-                    socket.SOCK_STREAM,
-                )
-                # Configurer le socket pour qu'il ne reste pas bloqué
-                self.socket.settimeout(5.0)
-                # Désactiver l'algorithme de Nagle pour envoyer immédiatement (TCP_NODELAY)
-                # Cela garantit que les petits paquets sont envoyés sans délai
-                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                await self.hass.async_add_executor_job(
-                    self.socket.connect,
-                    (self.host, self.network_port),
-                )
+                self._acquire_transport()
+                connect_start = time.monotonic()
+                # Réutilise la socket d'une autre entrée du même host:port si elle est ouverte
+                if await self._transport.async_connect(self.hass):
+                    self.record_timing("socket_connect", connect_start)
+                self.socket = self._transport.socket
                 _LOGGER.info(
                     "✅ Connexion RFXCOM réseau établie sur %s:%s",
                     self.host,
@@ -144,9 +335,17 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
                 try:
                     _LOGGER.info("🔍 Vérification de la communication avec l'add-on RFXCOM Node.js Bridge...")
                     
-                    # Utiliser uniquement l'add-on HTTP avec le port série configuré
-                    self._node_bridge = NodeBridgeHTTP(serial_port=self.port)
-                    await self._node_bridge.initialize()
+                    # Utiliser uniquement l'add-on HTTP avec le port série configuré,
+                    # un seul client par port série pour toutes les entrées
+                    self._acquire_transport()
+                    addon_start = time.monotonic()
+                    if await self._transport.async_connect(self.hass):
+                        self.record_timing("addon_init", addon_start)
+                    self._node_bridge = self._transport.node_bridge
+                    if self._frame_cursor is None:
+                        from .node_bridge_http import FrameCursor
+
+                        self._frame_cursor = FrameCursor()
                     _LOGGER.info("✅ Add-on RFXCOM Node.js Bridge connecté et opérationnel")
                 except Exception as e:
                     from homeassistant.exceptions import ConfigEntryNotReady
@@ -190,10 +389,18 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
                     "💡 Pour utiliser Node.js (recommandé), configurez une connexion USB"
                 )
 
+            if self.pool is not None:
+                await self.pool.async_connect(self.hass)
+
             # Démarrer la réception de messages si auto-registry est activé
             if self.auto_registry:
                 _LOGGER.debug("Auto-registry activé, démarrage de la boucle de réception")
-                self._receive_task = asyncio.create_task(self._async_receive_loop())
+                # Une seule boucle par entrée: deux boucles videraient la même file
+                if self._receive_task is None or self._receive_task.done():
+                    self._receive_task = asyncio.create_task(self._async_receive_loop())
+                self._receive_on_demand = False
+                if self.pool is not None:
+                    self.pool.async_start_receiving(self.hass, self._async_handle_packet)
                 _LOGGER.info("Mode auto-registry activé - Détection automatique des appareils")
             else:
                 _LOGGER.debug("Auto-registry désactivé, pas de réception de messages")
@@ -206,8 +413,43 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
             )
             raise
 
+    def _acquire_transport(self) -> None:
+        """Rejoint le transport partagé du point d'accès de l'entrée.
+
+        Le verrou d'émission et le budget de temps d'antenne sont ceux du
+        transport: les émissions de toutes les entrées sont sérialisées.
+        """
+        if self._transport is not None:
+            return
+        self._transport = get_registry(self.hass).acquire(
+            transport_key(self.connection_type, self.port, self.host, self.network_port),
+            io_thread=self.io_thread,
+        )
+        self.scheduler = self._transport.scheduler
+        self._remove_lock_listener()
+        self._lock = self._transport.lock
+        self._remove_lock_listener = self._lock.add_listener(self._notify_queue_changed)
+        self._primary.scheduler = self.scheduler
+
     async def async_shutdown(self) -> None:
         """Ferme la connexion."""
+        # Annuler les attentes de découverte en cours
+        for waiter in list(self._discovery_waiters):
+            waiter[4].cancel()
+
+        # Abandonner les commandes qui n'ont pas encore atteint l'émetteur
+        for pending in list(self._pending_commands.values()):
+            if pending.task:
+                pending.task.cancel()
+
+        # Arrêter la connexion en arrière-plan si elle est toujours en cours
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
+            try:
+                await self._connect_task
+            except asyncio.CancelledError:
+                pass
+
         # Arrêter la tâche de réception
         if self._receive_task:
             self._receive_task.cancel()
@@ -216,6 +458,17 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
             except asyncio.CancelledError:
                 pass
 
+        if self.pool is not None:
+            await self.pool.async_close(self.hass)
+
+        # Le transport partagé n'est fermé qu'au départ de sa dernière entrée
+        if self._transport is not None:
+            transport, self._transport = self._transport, None
+            self._remove_lock_listener()
+            self._node_bridge = None
+            self.socket = None
+            await get_registry(self.hass).async_release(self.hass, transport)
+
         # Fermer le bridge Node.js
         if self._node_bridge:
             try:
@@ -241,8 +494,16 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
         command: str,
         house_code: str | None = None,
         unit_code: str | None = None,
+        priority: int = PRIORITY_INTERACTIVE,
     ) -> bool:
-        """Envoie une commande RFXCOM."""
+        """Envoie une commande RFXCOM.
+
+        Les commandes successives pour un même appareil sont fusionnées tant que
+        la première n'a pas atteint l'émetteur: seule la dernière est émise et
+        tous les appelants reçoivent son résultat. La classe de priorité
+        (PRIORITY_*) décide de l'ordre d'accès au canal RF; une commande fusionnée
+        prend la plus haute classe de ses appelants.
+        """
         _LOGGER.debug(
             "Envoi commande: protocole=%s, device_id=%s, command=%s, house_code=%s, unit_code=%s",
             protocol,
@@ -251,221 +512,734 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
             house_code,
             unit_code,
         )
-        async with self._lock:
-            # Vérifier la connexion
-            if self.connection_type == CONNECTION_TYPE_USB:
-                # Pour USB, on utilise uniquement l'add-on HTTP - pas de vérification de port série nécessaire
-                if not self._node_bridge:
-                    _LOGGER.error("L'add-on Node.js Bridge n'est pas initialisé")
-                    return False
-                _LOGGER.debug("Add-on Node.js Bridge vérifié: disponible")
-            elif self.connection_type == CONNECTION_TYPE_NETWORK:
-                if not self.socket:
-                    _LOGGER.error("La socket réseau n'est pas ouverte")
-                    return False
-                _LOGGER.debug("Socket réseau vérifiée: présente=%s", self.socket is not None)
+        key = (protocol, device_id, house_code, unit_code)
+        pending = self._pending_commands.get(key)
+        if pending is not None:
+            _LOGGER.debug(
+                "🔁 Commande %s remplacée par %s pour %s (pas encore émise)",
+                pending.command,
+                command,
+                device_id or f"{house_code}/{unit_code}",
+            )
+            pending.command = command
+            pending.superseded += 1
+            self.coalesced_commands += 1
+            if priority < pending.priority:
+                # Une action utilisateur n'attend pas derrière la classe de l'appel remplacé
+                pending.priority = priority
+                self._lock.raise_priority(pending, priority)
+        else:
+            pending = _PendingCommand(
+                command, asyncio.get_running_loop().create_future(), priority
+            )
+            self._pending_commands[key] = pending
+            # L'émission ne dépend pas de l'appelant: l'annulation d'une attente
+            # n'interrompt pas la commande partagée avec les autres appelants
+            pending.task = asyncio.create_task(self._async_dispatch_command(key, pending))
+        return await asyncio.shield(pending.future)
+
+    def async_add_command_listener(
+        self,
+        protocol: str,
+        device_id: str | None,
+        house_code: str | None,
+        unit_code: str | None,
+        listener: Callable[[str], None],
+    ) -> Callable[[], None]:
+        """Abonne une entité aux commandes de groupe émises pour son appareil.
+
+        listener reçoit la commande émise (CMD_ON/CMD_OFF). Retourne la
+        fonction de désabonnement (pour async_on_remove).
+        """
+        key = (protocol, device_id or "", house_code, unit_code)
+        listeners = self._command_listeners.setdefault(key, [])
+        listeners.append(listener)
+
+        def _remove_listener() -> None:
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners and self._command_listeners.get(key) is listeners:
+                del self._command_listeners[key]
+
+        return _remove_listener
+
+    def _notify_command_sent(
+        self,
+        protocol: str,
+        device_id: str | None,
+        house_code: str | None,
+        unit_code: str | None,
+        command: str,
+    ) -> None:
+        """Prévient les entités de l'appareil qu'une commande a été émise."""
+        for listener in list(
+            self._command_listeners.get((protocol, device_id or "", house_code, unit_code), ())
+        ):
+            listener(command)
 
+    async def async_send_burst(
+        self,
+        protocol: str,
+        device_id: str | None,
+        command: str,
+        house_code: str | None = None,
+        unit_code: str | None = None,
+        rate: float = PAIRING_BURST_RATE,
+        duration: float = PAIRING_BURST_DURATION,
+        priority: int = PRIORITY_BULK,
+    ) -> dict[str, Any]:
+        """Répète une même trame à cadence fixe (rafale d'appairage).
+
+        En réseau, la trame est précompilée une fois et seule la séquence change;
+        le verrou d'émission est pris trame par trame pour laisser passer les
+        commandes plus prioritaires. La rafale occupe volontairement le canal et
+        ne passe pas par le seau de temps d'antenne. En USB, la rafale est
+        cadencée par l'add-on lorsqu'il le supporte. Retourne la cadence obtenue.
+        """
+        if not await self._async_wait_transport_ready():
+            return empty_burst_result(rate)
+
+        if self.connection_type == CONNECTION_TYPE_USB:
+            if not self._node_bridge:
+                _LOGGER.error("L'add-on Node.js Bridge n'est pas initialisé")
+                return empty_burst_result(rate)
             try:
-                # Construction de la commande selon le protocole
-                if protocol not in PROTOCOL_TO_PACKET:
-                    _LOGGER.error("Protocole non supporté: %s", protocol)
-                    return False
+                unit_code_int = int(unit_code) if unit_code else 1
+            except (ValueError, TypeError):
+                unit_code_int = 1
+            cmd_str = "on" if command == CMD_ON else "off"
+            result = await self._node_bridge.send_burst(
+                protocol=protocol,
+                device_id=device_id,
+                house_code=house_code,
+                unit_code=unit_code_int,
+                command=cmd_str,
+                rate=rate,
+                duration=duration,
+            )
+            if result is not None:
+                if protocol in PROTOCOL_TO_PACKET:
+                    self.stats.frame_sent(PROTOCOL_TO_PACKET[protocol][0], result["sent"])
+                self._log_burst(protocol, result)
+                return result
+
+            # Rafale non déléguée (add-on antérieur ou erreur): cadencement côté intégration
+            async def _send_once() -> bool:
+                return await self._node_bridge.send_command(
+                    protocol=protocol,
+                    device_id=device_id,
+                    house_code=house_code,
+                    unit_code=unit_code_int,
+                    command=cmd_str,
+                )
+        else:
+            template = self._get_frame_template(
+                protocol, device_id, command, house_code, unit_code
+            )
+            if template is None or not self.socket:
+                _LOGGER.error("Rafale impossible pour %s: trame ou socket indisponible", protocol)
+                return empty_burst_result(rate)
+
+            async def _send_once() -> bool:
+                frame = template.render(self._next_sequence_number())
+                await self.hass.async_add_executor_job(self.socket.sendall, frame)
+                self.trace.sent(frame)
+                return True
 
-                packet_type, subtype = PROTOCOL_TO_PACKET[protocol]
-                _LOGGER.debug(
-                    "Construction commande %s: packet_type=0x%02X, subtype=%s",
+        async def _send_locked() -> bool:
+            async with self._lock.hold(priority):
+                return await _send_once()
+
+        result = await async_run_burst(_send_locked, rate, duration)
+        if protocol in PROTOCOL_TO_PACKET:
+            self.stats.frame_sent(PROTOCOL_TO_PACKET[protocol][0], result["sent"])
+        self._log_burst(protocol, result)
+        return result
+
+    @staticmethod
+    def _log_burst(protocol: str, result: dict[str, Any]) -> None:
+        """Journalise le bilan d'une rafale."""
+        _LOGGER.info(
+            "📡 Rafale %s: %s trame(s) en %.2f s, %.1f/s (visé %.1f/s), %s échec(s), %s créneau(x) sauté(s)",
+            protocol,
+            result["sent"],
+            result["duration"],
+            result["achieved_rate"],
+            result["target_rate"],
+            result["failed"],
+            result["skipped"],
+        )
+
+    async def async_send_group_command(
+        self,
+        devices: list[dict[str, Any]],
+        command: str,
+        priority: int = PRIORITY_BULK,
+    ) -> bool:
+        """Envoie une commande ON/OFF à plusieurs appareils en une seule opération.
+
+        En réseau, les appareils Lighting1 d'une même house code et Lighting2 d'un
+        même ID sont adressés par une trame de groupe native lorsque la sélection
+        couvre toutes leurs unités configurées; chaque trame passe par le pool et
+        attend la réponse du transmetteur comme une commande isolée. En USB,
+        les commandes sont envoyées à la suite. Le verrou est repris pour chaque
+        trame: une action utilisateur n'attend jamais la fin d'une scène.
+        """
+        operations = self._plan_group_command(devices, command)
+        _LOGGER.info(
+            "📦 Commande de groupe %s: %s appareil(s) -> %s trame(s)",
+            command,
+            len(devices),
+            len(operations),
+        )
+        if not operations:
+            return True
+        if not await self._async_wait_transport_ready():
+            return False
+
+        # Chaque trame suit le chemin d'une commande: choix de l'unité du pool,
+        # bascule et réponse du transmetteur (un NAK fait échouer l'opération).
+        # Verrou pris trame par trame, temps d'antenne réservé sous le verrou:
+        # une action utilisateur passe entre deux trames de la scène
+        results = []
+        for operation in operations:
+            protocol, device_id, house_code, unit_code, op_command = operation
+            async with self._lock.hold(priority):
+                success = await self._async_send_command_locked(
+                    protocol, device_id, op_command, house_code, unit_code
+                )
+            if success:
+                self._notify_group_operation(devices, operation, command)
+            results.append(success)
+        _LOGGER.info(
+            "✅ Commande de groupe envoyée: %s/%s trame(s) confirmée(s)", sum(results), len(results)
+        )
+        return all(results)
+
+    def _notify_group_operation(
+        self,
+        devices: list[dict[str, Any]],
+        operation: tuple[str, str, str | None, str | None, str],
+        command: str,
+    ) -> None:
+        """Met à jour les appareils couverts par une opération de groupe émise."""
+        protocol, device_id, house_code, unit_code, op_command = operation
+        if op_command not in (CMD_GROUP_ON, CMD_GROUP_OFF):
+            self._notify_command_sent(protocol, device_id, house_code, unit_code, op_command)
+            return
+        # Les trames de groupe ne nomment pas les appareils: état mis à jour par appareil ciblé
+        group_key = (protocol, house_code or device_id)
+        for device in devices:
+            if self._group_key(device) == group_key:
+                self._notify_command_sent(
                     protocol,
-                    packet_type,
-                    subtype,
+                    device.get(CONF_DEVICE_ID),
+                    device.get(CONF_HOUSE_CODE),
+                    device.get(CONF_UNIT_CODE),
+                    command,
                 )
 
-                # Pour USB, utiliser uniquement l'add-on HTTP
-                if self.connection_type == CONNECTION_TYPE_USB:
-                    if not self._node_bridge:
-                        _LOGGER.error("L'add-on Node.js Bridge n'est pas disponible pour USB")
-                        return False
-                    
-                    try:
-                        # Convertir unit_code en int si nécessaire
-                        unit_code_int = 1
-                        if unit_code:
-                            try:
-                                unit_code_int = int(unit_code)
-                            except (ValueError, TypeError):
-                                unit_code_int = 1
-                        
-                        # Convertir command en format Node.js
-                        cmd_str = "on" if command == CMD_ON else "off"
-                        
-                        _LOGGER.info(
-                            "🔵 Envoi via add-on HTTP: protocole=%s, device_id=%s, house_code=%s, unit_code=%s, command=%s",
-                            protocol,
-                            device_id,
-                            house_code,
-                            unit_code_int,
-                            cmd_str,
-                        )
-                        
-                        success = await self._node_bridge.send_command(
-                            protocol=protocol,
-                            device_id=device_id,
-                            house_code=house_code,
-                            unit_code=unit_code_int,
-                            command=cmd_str,
-                        )
-                        
-                        if success:
-                            _LOGGER.info(
-                                "✅ Commande envoyée avec succès via add-on HTTP: protocole=%s, device=%s/%s, commande=%s",
-                                protocol,
-                                device_id or house_code,
-                                unit_code_int,
-                                command,
-                            )
-                            return True
-                        else:
-                            _LOGGER.error("❌ Échec de l'envoi via add-on HTTP")
-                            return False
-                    except Exception as e:
-                        _LOGGER.error("❌ Erreur lors de l'envoi via add-on HTTP: %s", e, exc_info=True)
-                        return False
-                
-                # Pour réseau, utiliser Python
-                elif self.connection_type == CONNECTION_TYPE_NETWORK:
-                    _LOGGER.info(
-                        "ℹ️ Connexion réseau détectée, utilisation de Python pour protocole=%s",
+    def _plan_group_command(
+        self, devices: list[dict[str, Any]], command: str
+    ) -> list[tuple[str, str, str | None, str | None, str]]:
+        """Regroupe les appareils en opérations (protocole, device_id, house_code, unit_code, commande)."""
+        group_command = CMD_GROUP_ON if command == CMD_ON else CMD_GROUP_OFF
+        groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        operations: list[tuple[str, str, str | None, str | None, str]] = []
+        seen: set[tuple] = set()
+
+        for device in devices:
+            protocol = device.get(CONF_PROTOCOL, "")
+            device_id = device.get(CONF_DEVICE_ID) or ""
+            house_code = device.get(CONF_HOUSE_CODE)
+            unit_code = device.get(CONF_UNIT_CODE)
+            key = (protocol, device_id, house_code, unit_code)
+            if key in seen:
+                continue
+            seen.add(key)
+            group_key = self._group_key(device)
+            if group_key is not None:
+                groups.setdefault(group_key, []).append(device)
+            else:
+                operations.append((protocol, device_id, house_code, unit_code, command))
+
+        # Unités configurées par groupe: une trame de groupe ne doit pas toucher
+        # d'appareil configuré hors de la sélection
+        configured_units: dict[tuple[str, str], set[str]] = {}
+        for device in self.entry.options.get("devices", []):
+            group_key = self._group_key(device)
+            if group_key is not None:
+                configured_units.setdefault(group_key, set()).add(str(device.get(CONF_UNIT_CODE)))
+
+        native = self.connection_type == CONNECTION_TYPE_NETWORK
+        for (protocol, address), members in groups.items():
+            selected_units = {str(member.get(CONF_UNIT_CODE)) for member in members}
+            if (
+                native
+                and len(members) > 1
+                and configured_units.get((protocol, address), set()) <= selected_units
+            ):
+                packet_type = PROTOCOL_TO_PACKET[protocol][0]
+                if packet_type == PACKET_TYPE_LIGHTING1:
+                    operations.append((protocol, "", address, None, group_command))
+                else:
+                    operations.append((protocol, address, None, None, group_command))
+                continue
+            for member in members:
+                operations.append((
+                    protocol,
+                    member.get(CONF_DEVICE_ID) or "",
+                    member.get(CONF_HOUSE_CODE),
+                    member.get(CONF_UNIT_CODE),
+                    command,
+                ))
+        return operations
+
+    @staticmethod
+    def _group_key(device: dict[str, Any]) -> tuple[str, str] | None:
+        """Adresse de groupe RF d'un appareil (house code Lighting1, ID Lighting2)."""
+        protocol = device.get(CONF_PROTOCOL, "")
+        packet_type = PROTOCOL_TO_PACKET.get(protocol, (None, None))[0]
+        if packet_type == PACKET_TYPE_LIGHTING1 and device.get(CONF_HOUSE_CODE):
+            return (protocol, str(device[CONF_HOUSE_CODE]).upper())
+        if packet_type == PACKET_TYPE_LIGHTING2 and device.get(CONF_DEVICE_ID):
+            return (protocol, str(device[CONF_DEVICE_ID]).upper())
+        return None
+
+    async def _async_dispatch_command(
+        self, key: tuple[str, str, str | None, str | None], pending: _PendingCommand
+    ) -> None:
+        """Émet la dernière commande en attente pour un appareil."""
+        protocol, device_id, house_code, unit_code = key
+        result = False
+        try:
+            # Les commandes émises pendant la connexion initiale sont mises en attente
+            if await self._async_wait_transport_ready():
+                async with self._lock.hold(pending.priority, owner=pending):
+                    # La commande part vers l'émetteur: les suivantes ne la remplacent plus
+                    if self._pending_commands.get(key) is pending:
+                        del self._pending_commands[key]
+                    result = await self._async_send_command_locked(
                         protocol,
+                        device_id,
+                        pending.command,
+                        house_code,
+                        unit_code,
+                        enqueued_at=pending.enqueued_at,
                     )
-                else:
-                    # Ne devrait jamais arriver ici
-                    _LOGGER.error("Type de connexion inconnu: %s", self.connection_type)
-                    return False
-                
-                # Méthode Python (pour réseau uniquement - USB utilise l'add-on)
-                if self.connection_type != CONNECTION_TYPE_NETWORK:
-                    _LOGGER.error("❌ Tentative d'utiliser Python pour USB - l'add-on devrait être utilisé")
+        finally:
+            if self._pending_commands.get(key) is pending:
+                del self._pending_commands[key]
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def _async_send_command_locked(
+        self,
+        protocol: str,
+        device_id: str,
+        command: str,
+        house_code: str | None = None,
+        unit_code: str | None = None,
+        enqueued_at: float | None = None,
+    ) -> bool:
+        """Construit et émet une commande (appelé avec le verrou d'émission).
+
+        L'émission attend que l'ordonnanceur de temps d'antenne libère le canal;
+        enqueued_at sert à mesurer l'attente en file. Les horodatages de chaque
+        étape alimentent self.metrics.
+        """
+        dequeued_at = time.monotonic()
+        if enqueued_at is None:
+            enqueued_at = dequeued_at
+        if self.pool is not None:
+            return await self._async_send_via_pool(
+                protocol, device_id, command, house_code, unit_code, enqueued_at, dequeued_at
+            )
+        return await self._async_send_primary_locked(
+            protocol, device_id, command, house_code, unit_code, enqueued_at, dequeued_at
+        )
+
+    async def _async_send_via_pool(
+        self,
+        protocol: str,
+        device_id: str,
+        command: str,
+        house_code: str | None,
+        unit_code: str | None,
+        enqueued_at: float,
+        dequeued_at: float,
+    ) -> bool:
+        """Émet une commande par le meilleur transceiver du pool, avec bascule."""
+        airtime_ms = estimate_airtime(protocol)
+        key = transmit_key(protocol, device_id, house_code, unit_code)
+        for attempt, transceiver in enumerate(self.pool.candidates(key, airtime_ms)):
+            if attempt:
+                self.pool.failovers += 1
+            if transceiver.primary:
+                success = await self._async_send_primary_locked(
+                    protocol, device_id, command, house_code, unit_code, enqueued_at, dequeued_at
+                )
+            else:
+                success = await self._async_send_extra(
+                    transceiver, protocol, device_id, command, house_code, unit_code,
+                    enqueued_at, dequeued_at,
+                )
+            if success:
+                transceiver.available = True
+                transceiver.frames_sent += 1
+                return True
+            transceiver.mark_failed("échec de l'émission")
+        return False
+
+    async def _async_send_extra(
+        self,
+        transceiver: Transceiver,
+        protocol: str,
+        device_id: str,
+        command: str,
+        house_code: str | None,
+        unit_code: str | None,
+        enqueued_at: float,
+        dequeued_at: float,
+    ) -> bool:
+        """Émet une commande par un transceiver supplémentaire du pool."""
+        frame = None
+        if transceiver.connection_type == CONNECTION_TYPE_NETWORK:
+            frame = self._build_command_frame(protocol, device_id, command, house_code, unit_code)
+            if frame is None:
+                _LOGGER.error("Échec de la construction de la commande pour %s", protocol)
+                return False
+        # La réponse du transmetteur n'est attendue que si la socket de l'unité est lue
+        receiving = transceiver.receiving
+        await transceiver.scheduler.async_acquire(
+            estimate_airtime(protocol), enqueued_at=enqueued_at
+        )
+        write_at = time.monotonic()
+        self.metrics.in_flight += 1
+        try:
+            success = await transceiver.async_send(
+                self.hass, protocol, device_id, command, house_code, unit_code, frame,
+                wait_ack=receiving,
+            )
+        except Exception as err:
+            _LOGGER.error("❌ Erreur d'émission via %s: %s", transceiver.name, err)
+            success = False
+        finally:
+            self.metrics.in_flight -= 1
+        if not success:
+            self.metrics.failed += 1
+            return False
+        self.metrics.record(enqueued_at, dequeued_at, write_at, time.monotonic(), acked=receiving)
+        self.stats.frame_sent(PROTOCOL_TO_PACKET[protocol][0])
+        if frame is not None:
+            self.trace.sent(frame)
+        _LOGGER.info(
+            "✅ Commande envoyée via %s: protocole=%s, device=%s, commande=%s",
+            transceiver.name,
+            protocol,
+            device_id or f"{house_code}/{unit_code}",
+            command,
+        )
+        return True
+
+    async def _async_send_primary_locked(
+        self,
+        protocol: str,
+        device_id: str,
+        command: str,
+        house_code: str | None,
+        unit_code: str | None,
+        enqueued_at: float,
+        dequeued_at: float,
+    ) -> bool:
+        """Émet une commande par le transport de l'entrée (add-on USB ou socket)."""
+        # Vérifier la connexion
+        if self.connection_type == CONNECTION_TYPE_USB:
+            # Pour USB, on utilise uniquement l'add-on HTTP - pas de vérification de port série nécessaire
+            if not self._node_bridge:
+                _LOGGER.error("L'add-on Node.js Bridge n'est pas initialisé")
+                return False
+            _LOGGER.debug("Add-on Node.js Bridge vérifié: disponible")
+        elif self.connection_type == CONNECTION_TYPE_NETWORK:
+            if not self.socket:
+                _LOGGER.error("La socket réseau n'est pas ouverte")
+                return False
+            _LOGGER.debug("Socket réseau vérifiée: présente=%s", self.socket is not None)
+
+        try:
+            # Construction de la commande selon le protocole
+            if protocol not in PROTOCOL_TO_PACKET:
+                _LOGGER.error("Protocole non supporté: %s", protocol)
+                return False
+
+            packet_type, subtype = PROTOCOL_TO_PACKET[protocol]
+            _LOGGER.debug(
+                "Construction commande %s: packet_type=0x%02X, subtype=%s",
+                protocol,
+                packet_type,
+                subtype,
+            )
+
+            # Pour USB, utiliser uniquement l'add-on HTTP
+            if self.connection_type == CONNECTION_TYPE_USB:
+                if not self._node_bridge:
+                    _LOGGER.error("L'add-on Node.js Bridge n'est pas disponible pour USB")
                     return False
                 
-                if packet_type == PACKET_TYPE_LIGHTING1:
-                    cmd_bytes = self._build_lighting1_command(
-                        protocol, subtype, house_code, unit_code, command
-                    )
-                elif packet_type == PACKET_TYPE_LIGHTING2:
-                    unit_code_int = 1  # Par défaut 1 pour AC
+                try:
+                    # Convertir unit_code en int si nécessaire
+                    unit_code_int = 1
                     if unit_code:
                         try:
                             unit_code_int = int(unit_code)
                         except (ValueError, TypeError):
                             unit_code_int = 1
-                    _LOGGER.debug(
-                        "Lighting2 command (Python): device_id=%s, unit_code=%s (int=%s), command=%s",
+                    
+                    # Convertir command en format Node.js
+                    cmd_str = "on" if command == CMD_ON else "off"
+                    
+                    _LOGGER.info(
+                        "🔵 Envoi via add-on HTTP: protocole=%s, device_id=%s, house_code=%s, unit_code=%s, command=%s",
+                        protocol,
                         device_id,
-                        unit_code,
+                        house_code,
                         unit_code_int,
-                        command,
-                    )
-                    cmd_bytes = self._build_lighting2_command(
-                        protocol, subtype, device_id, command, unit_code_int
-                    )
-                elif packet_type == PACKET_TYPE_LIGHTING3:
-                    cmd_bytes = self._build_lighting3_command(
-                        protocol, device_id, unit_code, command
-                    )
-                elif packet_type == PACKET_TYPE_LIGHTING4:
-                    cmd_bytes = self._build_lighting4_command(
-                        protocol, device_id, command
+                        cmd_str,
                     )
-                elif packet_type == PACKET_TYPE_LIGHTING5:
-                    cmd_bytes = self._build_lighting5_command(
-                        protocol, subtype, device_id, unit_code, command
-                    )
-                elif packet_type == PACKET_TYPE_LIGHTING6:
-                    cmd_bytes = self._build_lighting6_command(
-                        protocol, device_id, command
+                    
+                    await self.scheduler.async_acquire(
+                        estimate_airtime(protocol), enqueued_at=enqueued_at
                     )
-                else:
-                    _LOGGER.error("Type de paquet non supporté: 0x%02X", packet_type)
+                    write_at = time.monotonic()
+                    self.metrics.in_flight += 1
+                    try:
+                        success = await self._node_bridge.send_command(
+                            protocol=protocol,
+                            device_id=device_id,
+                            house_code=house_code,
+                            unit_code=unit_code_int,
+                            command=cmd_str,
+                        )
+                    finally:
+                        self.metrics.in_flight -= 1
+                    
+                    if success:
+                        self.metrics.record(enqueued_at, dequeued_at, write_at, time.monotonic())
+                        self.stats.frame_sent(packet_type)
+                        _LOGGER.info(
+                            "✅ Commande envoyée avec succès via add-on HTTP: protocole=%s, device=%s/%s, commande=%s",
+                            protocol,
+                            device_id or house_code,
+                            unit_code_int,
+                            command,
+                        )
+                        return True
+                    else:
+                        self.metrics.failed += 1
+                        _LOGGER.error("❌ Échec de l'envoi via add-on HTTP")
+                        return False
+                except Exception as e:
+                    self.metrics.failed += 1
+                    _LOGGER.error("❌ Erreur lors de l'envoi via add-on HTTP: %s", e, exc_info=True)
                     return False
+            
+            # Pour réseau, utiliser Python
+            elif self.connection_type == CONNECTION_TYPE_NETWORK:
+                _LOGGER.info(
+                    "ℹ️ Connexion réseau détectée, utilisation de Python pour protocole=%s",
+                    protocol,
+                )
+            else:
+                # Ne devrait jamais arriver ici
+                _LOGGER.error("Type de connexion inconnu: %s", self.connection_type)
+                return False
+            
+            # Méthode Python (pour réseau uniquement - USB utilise l'add-on)
+            if self.connection_type != CONNECTION_TYPE_NETWORK:
+                _LOGGER.error("❌ Tentative d'utiliser Python pour USB - l'add-on devrait être utilisé")
+                return False
+            
+            cmd_bytes = self._build_command_frame(
+                protocol, device_id, command, house_code, unit_code
+            )
 
-                if not cmd_bytes:
-                    _LOGGER.error("Échec de la construction de la commande pour %s", protocol)
-                    return False
+            if not cmd_bytes:
+                _LOGGER.error("Échec de la construction de la commande pour %s", protocol)
+                return False
 
-                _LOGGER.info("📤 Commande construite: %s bytes, hex=%s", len(cmd_bytes), cmd_bytes.hex())
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("📤 Commande construite: %s bytes, hex=%s", len(cmd_bytes), cmd_bytes.hex())
 
-                # Envoi de la commande (uniquement pour réseau - USB utilise l'add-on)
-                if self.connection_type == CONNECTION_TYPE_USB:
-                    # Ne devrait jamais arriver ici car USB utilise l'add-on
-                    _LOGGER.error("❌ Tentative d'envoi via port série Python pour USB - l'add-on devrait être utilisé")
-                    return False
-                elif self.connection_type == CONNECTION_TYPE_NETWORK:
+            # Envoi de la commande (uniquement pour réseau - USB utilise l'add-on)
+            if self.connection_type == CONNECTION_TYPE_USB:
+                # Ne devrait jamais arriver ici car USB utilise l'add-on
+                _LOGGER.error("❌ Tentative d'envoi via port série Python pour USB - l'add-on devrait être utilisé")
+                return False
+            elif self.connection_type == CONNECTION_TYPE_NETWORK:
+                ack: asyncio.Future | None = None
+                write_at: float | None = None
+                try:
+                    # Vérifier que le socket est toujours connecté
+                    if self.socket is None:
+                        _LOGGER.warning("⚠️ Socket non initialisé, reconnexion...")
+                        await self._async_reconnect_transport()
+                    
+                    # Vérifier la connexion avant d'envoyer
+                    try:
+                        # Test de connexion (peek)
+                        self.socket.getpeername()
+                    except (OSError, AttributeError) as conn_err:
+                        _LOGGER.warning("⚠️ Socket déconnecté (%s), reconnexion...", conn_err)
+                        self.stats.reconnects += 1
+                        await self._async_reconnect_transport()
+                    
+                    # Réponse du transmetteur (ACK/NAK) lue par la boucle de réception:
+                    # elle date l'acquittement et, avec un pool, décide de la bascule
+                    if self._receive_task is not None:
+                        ack = self._primary.expect_ack(cmd_bytes[3])
+
+                    # Attendre que le canal RF soit libre (remplace le délai fixe de 100 ms)
+                    await self.scheduler.async_acquire(
+                        estimate_airtime(protocol), enqueued_at=enqueued_at
+                    )
+                    write_at = time.monotonic()
+                    self.metrics.in_flight += 1
                     try:
-                        # Vérifier que le socket est toujours connecté
-                        if self.socket is None:
-                            _LOGGER.warning("⚠️ Socket non initialisé, reconnexion...")
-                            await self.async_setup()
-                        
-                        # Vérifier la connexion avant d'envoyer
-                        try:
-                            # Test de connexion (peek)
-                            self.socket.getpeername()
-                        except (OSError, AttributeError) as conn_err:
-                            _LOGGER.warning("⚠️ Socket déconnecté (%s), reconnexion...", conn_err)
-                            # Fermer l'ancien socket
-                            try:
-                                self.socket.close()
-                            except Exception:
-                                pass
-                            self.socket = None
-                            await self.async_setup()
-                        
                         # Envoyer la commande
                         # Utiliser sendall() pour envoyer tous les bytes
                         await self.hass.async_add_executor_job(
                             self.socket.sendall, cmd_bytes
                         )
-                        # Petit délai pour s'assurer que les données sont transmises via le tunnel
-                        await asyncio.sleep(0.1)  # 100ms de délai pour la transmission
-                        
-                        _LOGGER.info(
-                            "📤 Commande envoyée via réseau: protocole=%s, device=%s, commande=%s, bytes=%s",
-                            protocol,
-                            device_id or f"{house_code}/{unit_code}",
-                            command,
-                            cmd_bytes.hex(),
+                    finally:
+                        self.metrics.in_flight -= 1
+                    self.trace.sent(cmd_bytes)
+                    
+                    _LOGGER.info(
+                        "📤 Commande envoyée via réseau: protocole=%s, device=%s, commande=%s",
+                        protocol,
+                        device_id or f"{house_code}/{unit_code}",
+                        command,
+                    )
+                except Exception as send_err:
+                    _LOGGER.error("❌ Erreur lors de l'envoi réseau: %s", send_err)
+                    # Tentative de reconnexion
+                    self.stats.reconnects += 1
+                    try:
+                        _LOGGER.info("🔄 Tentative de reconnexion...")
+                        await self._async_reconnect_transport()
+                        # Réessayer l'envoi après reconnexion
+                        await self.hass.async_add_executor_job(
+                            self.socket.sendall, cmd_bytes
                         )
-                    except Exception as send_err:
-                        _LOGGER.error("❌ Erreur lors de l'envoi réseau: %s", send_err)
-                        # Tentative de reconnexion
-                        try:
-                            _LOGGER.info("🔄 Tentative de reconnexion...")
-                            if self.socket:
-                                try:
-                                    self.socket.close()
-                                except Exception:
-                                    pass
-                            self.socket = None
-                            await self.async_setup()
-                            # Réessayer l'envoi après reconnexion
-                            await self.hass.async_add_executor_job(
-                                self.socket.sendall, cmd_bytes
-                            )
-                            _LOGGER.info("✅ Commande envoyée après reconnexion")
-                        except Exception as reconnect_err:
-                            _LOGGER.error("❌ Échec de la reconnexion: %s", reconnect_err)
-                            return False
+                        self.trace.sent(cmd_bytes)
+                        _LOGGER.info("✅ Commande envoyée après reconnexion")
+                    except Exception as reconnect_err:
+                        self.metrics.failed += 1
+                        _LOGGER.error("❌ Échec de la reconnexion: %s", reconnect_err)
+                        self._primary.discard_ack(cmd_bytes[3])
+                        return False
 
-                _LOGGER.info(
-                    "✅ Commande envoyée avec succès: protocole=%s, device=%s, commande=%s",
-                    protocol,
-                    device_id or f"{house_code}/{unit_code}",
-                    command,
-                )
-                return True
+                if ack is not None:
+                    self.metrics.in_flight += 1
+                    try:
+                        acked = await self._primary.async_wait_ack(cmd_bytes[3], ack)
+                    finally:
+                        self.metrics.in_flight -= 1
+                    if not acked:
+                        self.metrics.failed += 1
+                        _LOGGER.warning(
+                            "⚠️ Émission refusée ou non confirmée par le RFXtrx (séquence %s)",
+                            cmd_bytes[3],
+                        )
+                        return False
+                if write_at is not None:
+                    # Sans boucle de réception, l'étape transport s'arrête à l'écriture
+                    self.metrics.record(
+                        enqueued_at, dequeued_at, write_at, time.monotonic(), acked=ack is not None
+                    )
 
-            except Exception as err:
-                _LOGGER.error("Erreur lors de l'envoi de la commande: %s", err)
-                return False
+            self.stats.frame_sent(packet_type)
+            _LOGGER.info(
+                "✅ Commande envoyée avec succès: protocole=%s, device=%s, commande=%s",
+                protocol,
+                device_id or f"{house_code}/{unit_code}",
+                command,
+            )
+            return True
+
+        except Exception as err:
+            _LOGGER.error("Erreur lors de l'envoi de la commande: %s", err)
+            return False
+
+    async def _async_reconnect_transport(self) -> None:
+        """Rouvre la connexion réseau par le transport partagé.
+
+        Le transport remplace la socket sous son verrou de connexion: les autres
+        entrées et la lecture en cours ne perdent pas une socket encore valide,
+        et la boucle de réception de l'entrée n'est pas relancée.
+        """
+        self._acquire_transport()
+        await self._transport.async_reconnect(self.hass, self.socket)
+        self.socket = self._transport.socket
+
+    def _next_sequence_number(self) -> int:
+        """Incrémente et retourne le numéro de séquence des trames émises."""
+        self._sequence_number = (self._sequence_number + 1) % 256
+        return self._sequence_number
+
+    def prepare_command_frames(
+        self,
+        protocol: str,
+        device_id: str | None,
+        house_code: str | None = None,
+        unit_code: str | None = None,
+        commands: tuple[str, ...] = (CMD_ON, CMD_OFF),
+    ) -> None:
+        """Précompile les trames d'un appareil (appelé à la création de l'entité)."""
+        if self.connection_type != CONNECTION_TYPE_NETWORK:
+            # En USB, l'add-on construit les trames
+            return
+        for command in commands:
+            self._get_frame_template(protocol, device_id, command, house_code, unit_code)
+
+    def _get_frame_template(
+        self,
+        protocol: str,
+        device_id: str | None,
+        command: str,
+        house_code: str | None = None,
+        unit_code: str | None = None,
+    ) -> FrameTemplate | None:
+        """Retourne le template de trame d'une commande, compilé au premier usage."""
+        key = (protocol, device_id, command, house_code, unit_code)
+        template = self._frame_templates.get(key)
+        if template is None:
+            template = compile_frame_template(
+                protocol, device_id, command, house_code, unit_code
+            )
+            if template is not None:
+                self._frame_templates[key] = template
+        return template
+
+    def _build_command_frame(
+        self,
+        protocol: str,
+        device_id: str | None,
+        command: str,
+        house_code: str | None = None,
+        unit_code: str | None = None,
+    ) -> bytes | None:
+        """Construit la trame RFXtrx d'une commande à partir de son template.
+
+        Seul l'octet de séquence est écrit à l'émission: le coût ne dépend plus
+        du protocole ni du format de l'identifiant.
+        """
+        template = self._get_frame_template(
+            protocol, device_id, command, house_code, unit_code
+        )
+        if template is None:
+            return None
+        return template.render(self._next_sequence_number())
 
     def _build_lighting1_command(
         self,
@@ -479,40 +1253,8 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
 
         Format: [length] 0x10 [subtype] [seq] [house] [unit] [cmd] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir house code (A=0x41, B=0x42, etc. ou hex)
-        hc = 0x41  # Default to A
-        if house_code:
-            if len(house_code) == 1 and house_code.isalpha():
-                hc = ord(house_code.upper())
-            else:
-                try:
-                    hc = int(house_code, 16) if house_code.startswith("0x") else int(house_code)
-                except ValueError:
-                    pass
-
-        # Convertir unit code
-        try:
-            uc = int(unit_code) if unit_code else 1
-        except (ValueError, TypeError):
-            uc = 1
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Construire le paquet: 07 10 [subtype] [seq] [house] [unit] [cmd] 00
-        return bytes([
-            0x07,  # Longueur
-            PACKET_TYPE_LIGHTING1,  # 0x10
-            subtype,
-            self._sequence_number,
-            hc,
-            uc,
-            cmd_byte,
-            0x00,  # Signal level
-        ])
+        template = lighting1_template(subtype, house_code, unit_code, command)
+        return template.render(self._next_sequence_number())
 
     def _build_lighting2_command(
         self,
@@ -524,36 +1266,10 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
     ) -> bytes:
         """Construit une commande Lighting2 (AC, HomeEasy EU, etc.).
 
-        Format: [length] 0x11 [subtype] [id(4)] [unit] [cmd] [level] [signal]
+        Format: [length] 0x11 [subtype] [seq] [id(4)] [unit] [cmd] [level] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir device_id en 4 bytes
-        device_bytes = self._hex_string_to_bytes(device_id or "00000000", 4)
-
-        # Unit code (généralement 0 ou 1 pour AC, par défaut 1)
-        if unit_code is None:
-            unit_code = 1  # Par défaut 1 pour AC (comme dans la trame de l'utilisateur)
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Level (0x0F = 100% pour ON, 0x00 pour OFF)
-        level = 0x0F if command == CMD_ON else 0x00
-
-        # Construire le paquet: 0B 11 [subtype] [id(4)] [unit] [cmd] [level] [signal]
-        return bytes([
-            0x0B,  # Longueur
-            PACKET_TYPE_LIGHTING2,  # 0x11
-            subtype,
-            self._sequence_number,
-        ]) + device_bytes + bytes([
-            unit_code,
-            cmd_byte,
-            level,
-            0x80,  # Signal level (0x80 = -56dBm standard)
-        ])
+        template = lighting2_template(subtype, device_id, command, unit_code)
+        return template.render(self._next_sequence_number())
 
     def _build_lighting3_command(
         self,
@@ -564,37 +1280,10 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
     ) -> bytes:
         """Construit une commande Lighting3 (Ikea Koppla).
 
-        Format: [length] 0x12 [id(2)] [group] [unit] [cmd] [signal]
+        Format: [length] 0x12 [seq] [id(2)] [group] [unit] [cmd] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir device_id en 2 bytes
-        device_bytes = self._hex_string_to_bytes(device_id or "0000", 2)
-
-        # Group (généralement 0)
-        group = 0
-
-        # Unit code
-        try:
-            uc = int(unit_code) if unit_code else 1
-        except (ValueError, TypeError):
-            uc = 1
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Construire le paquet: 08 12 [id(2)] [group] [unit] [cmd] 00
-        return bytes([
-            0x08,  # Longueur
-            PACKET_TYPE_LIGHTING3,  # 0x12
-            self._sequence_number,
-        ]) + device_bytes + bytes([
-            group,
-            uc,
-            cmd_byte,
-            0x00,  # Signal level
-        ])
+        template = lighting3_template(device_id, unit_code, command)
+        return template.render(self._next_sequence_number())
 
     def _build_lighting4_command(
         self,
@@ -604,26 +1293,10 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
     ) -> bytes:
         """Construit une commande Lighting4 (PT2262).
 
-        Format: [length] 0x13 [id(3)] [cmd] [signal]
+        Format: [length] 0x13 [seq] [id(3)] [cmd] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir device_id en 3 bytes
-        device_bytes = self._hex_string_to_bytes(device_id or "000000", 3)
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Construire le paquet: 07 13 [id(3)] [cmd] 00
-        return bytes([
-            0x07,  # Longueur
-            PACKET_TYPE_LIGHTING4,  # 0x13
-            self._sequence_number,
-        ]) + device_bytes + bytes([
-            cmd_byte,
-            0x00,  # Signal level
-        ])
+        template = lighting4_template(device_id, command)
+        return template.render(self._next_sequence_number())
 
     def _build_lighting5_command(
         self,
@@ -635,38 +1308,10 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
     ) -> bytes:
         """Construit une commande Lighting5 (LightwaveRF, etc.).
 
-        Format: [length] 0x14 [subtype] [id(3)] [unit] [cmd] [level] [signal]
+        Format: [length] 0x14 [subtype] [seq] [id(3)] [unit] [cmd] [level] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir device_id en 3 bytes
-        device_bytes = self._hex_string_to_bytes(device_id or "000000", 3)
-
-        # Unit code
-        try:
-            uc = int(unit_code) if unit_code else 0
-        except (ValueError, TypeError):
-            uc = 0
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Level (0x0F = 100% pour ON, 0x00 pour OFF)
-        level = 0x0F if command == CMD_ON else 0x00
-
-        # Construire le paquet: 0A 14 [subtype] [id(3)] [unit] [cmd] [level] 00
-        return bytes([
-            0x0A,  # Longueur
-            PACKET_TYPE_LIGHTING5,  # 0x14
-            subtype,
-            self._sequence_number,
-        ]) + device_bytes + bytes([
-            uc,
-            cmd_byte,
-            level,
-            0x00,  # Signal level
-        ])
+        template = lighting5_template(subtype, device_id, unit_code, command)
+        return template.render(self._next_sequence_number())
 
     def _build_lighting6_command(
         self,
@@ -676,77 +1321,45 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
     ) -> bytes:
         """Construit une commande Lighting6 (BLYSS).
 
-        Format: [length] 0x15 [id(2)] [group] [unit] [cmd] [signal]
+        Format: [length] 0x15 [seq] [id(2)] [group] [unit] [cmd] [signal]
         """
-        # Incrémenter le numéro de séquence
-        self._sequence_number = (self._sequence_number + 1) % 256
-
-        # Convertir device_id en 2 bytes
-        device_bytes = self._hex_string_to_bytes(device_id or "0000", 2)
-
-        # Group (généralement 0)
-        group = 0
-
-        # Unit code (généralement 0)
-        unit_code = 0
-
-        # Commande
-        cmd_byte = 0x01 if command == CMD_ON else 0x00
-
-        # Construire le paquet: 08 15 [id(2)] [group] [unit] [cmd] 00
-        return bytes([
-            0x08,  # Longueur
-            PACKET_TYPE_LIGHTING6,  # 0x15
-            self._sequence_number,
-        ]) + device_bytes + bytes([
-            group,
-            unit_code,
-            cmd_byte,
-            0x00,  # Signal level
-        ])
+        template = lighting6_template(device_id, command)
+        return template.render(self._next_sequence_number())
 
     def _hex_string_to_bytes(self, hex_str: str, length: int) -> bytes:
         """Convertit une chaîne hexadécimale en bytes."""
-        try:
-            # Supprimer les espaces et les séparateurs
-            hex_str = hex_str.replace(" ", "").replace(":", "").replace("-", "")
-
-            # Si le nombre de caractères est impair, ajouter un 0 devant
-            if len(hex_str) % 2 == 1:
-                hex_str = "0" + hex_str
-                _LOGGER.debug("ID hex impair, ajout d'un 0 devant: %s", hex_str)
-
-            # Convertir en bytes
-            device_bytes = bytes.fromhex(hex_str)
-
-            # Compléter ou tronquer à la longueur souhaitée
-            if len(device_bytes) < length:
-                # Compléter avec des zéros au début (padding left)
-                device_bytes = bytes(length - len(device_bytes)) + device_bytes
-            elif len(device_bytes) > length:
-                # Tronquer en gardant les bytes de droite (LSB)
-                device_bytes = device_bytes[-length:]
-
-            return device_bytes
-        except ValueError as err:
-            _LOGGER.error("Erreur lors de la conversion hex: %s (%s)", hex_str, err)
-            return bytes(length)
+        return hex_to_bytes(hex_str, length)
 
     async def _async_receive_loop(self) -> None:
         """Boucle de réception des messages RFXCOM."""
         _LOGGER.info("Démarrage de la réception des messages RFXCOM")
         _LOGGER.debug("Type de connexion: %s", self.connection_type)
+        # Trames du transport partagé (lues une seule fois pour toutes les entrées)
+        frames: asyncio.Queue | None = None
 
         while True:
             try:
                 # Lire les données
                 if self.connection_type == CONNECTION_TYPE_USB:
-                    # Pour USB, la réception est gérée par l'add-on
-                    # Pour l'instant, on attend - la réception sera implémentée plus tard via l'add-on
-                    _LOGGER.debug("Réception USB - l'add-on gère la réception des messages")
+                    # Pour USB, la réception est gérée par l'add-on (flux /api/frames)
+                    if self._node_bridge is None or not self._node_bridge.frame_stream_available:
+                        await asyncio.sleep(1)
+                        continue
+                    # Après une coupure, le flux reprend après la dernière trame reçue
+                    async for packet in self._node_bridge.async_iter_frames(self._frame_cursor):
+                        await self._async_handle_packet(packet)
+                    # Flux fermé par l'add-on: les trames reçues entre-temps seront rejouées
                     await asyncio.sleep(1)
                     continue
 
+                elif self.connection_type == CONNECTION_TYPE_NETWORK and self._transport is not None:
+                    if frames is None:
+                        frames = self._transport.subscribe(self, self.hass)
+                    packet, reason = await frames.get()
+                    if packet is None:
+                        self.stats.decode_failed(reason)
+                        continue
+
                 elif self.connection_type == CONNECTION_TYPE_NETWORK:
                     if not self.socket:
                         _LOGGER.debug("Socket fermée, attente...")
@@ -765,30 +1378,24 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
                     _LOGGER.debug("Paquet réseau reçu: longueur=%s", packet_length)
                     if packet_length < 1 or packet_length > 50:
                         _LOGGER.debug("Longueur invalide, ignoré: %s", packet_length)
+                        self.stats.decode_failed(DECODE_INVALID_LENGTH)
                         continue
 
-                    # Lire le reste
+                    # Lire le reste (l'octet de longueur ne se compte pas)
                     remaining = await self.hass.async_add_executor_job(
-                        self.socket.recv, packet_length - 1
+                        self.socket.recv, packet_length
                     )
-                    if len(remaining) < packet_length - 1:
-                        _LOGGER.debug("Paquet incomplet: reçu %s/%s bytes", len(remaining), packet_length - 1)
+                    if len(remaining) < packet_length:
+                        _LOGGER.debug("Paquet incomplet: reçu %s/%s bytes", len(remaining), packet_length)
+                        self.stats.decode_failed(DECODE_INCOMPLETE)
                         continue
 
                     packet = data + remaining
-                    _LOGGER.debug("Paquet réseau complet: %s bytes, hex=%s", len(packet), packet.hex())
                 else:
                     await asyncio.sleep(1)
                     continue
 
-                # Parser le paquet
-                _LOGGER.info("📥 Paquet reçu: %s bytes, hex=%s", len(packet), packet.hex().upper())
-                device_info = self._parse_packet(packet)
-                if device_info:
-                    _LOGGER.info("✅ Appareil parsé: %s", device_info)
-                    await self._handle_discovered_device(device_info)
-                else:
-                    _LOGGER.debug("⚠️ Paquet non reconnu ou ignoré")
+                await self._async_handle_packet(packet)
 
             except asyncio.CancelledError:
                 _LOGGER.info("Réception des messages RFXCOM arrêtée")
@@ -797,6 +1404,56 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
                 _LOGGER.error("Erreur lors de la réception: %s", err)
                 await asyncio.sleep(1)
 
+        if frames is not None and self._transport is not None:
+            self._transport.unsubscribe(self)
+
+    async def _async_handle_packet(self, packet: bytes, source: str | None = None) -> None:
+        """Décode une trame reçue et traite l'appareil correspondant.
+
+        source est le nom du transceiver du pool qui a reçu la trame (None pour
+        le transceiver de l'entrée).
+        """
+        # La trace garde tout ce que chaque unité a reçu, doublons entre unités compris
+        self.trace.received(packet)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("📥 Paquet reçu: %s bytes, hex=%s", len(packet), packet.hex().upper())
+        transceiver = self.pool.get(source) if self.pool is not None else self._primary
+        if transceiver.resolve_ack(packet):
+            # Réponse du transmetteur: acquittement d'une trame émise, pas un appareil
+            self.stats.frame_received(packet[1])
+            return
+        device_info = self._parse_packet(packet)
+        if device_info and self.pool is not None:
+            self.pool.note_reception(
+                self._device_unique_id(device_info), source, frame_rssi(packet)
+            )
+            if self.pool.is_duplicate(packet, source):
+                _LOGGER.debug("Trame déjà reçue par un autre transceiver, ignorée")
+                return
+        # Compteurs par type: une trame reçue par plusieurs unités n'est comptée qu'une fois
+        if len(packet) > 1:
+            self.stats.frame_received(packet[1])
+        if device_info:
+            _LOGGER.info("✅ Appareil parsé: %s", device_info)
+            await self._handle_discovered_device(device_info)
+        else:
+            self.stats.decode_failed(self._decode_failure_reason(packet))
+            _LOGGER.debug("⚠️ Paquet non reconnu ou ignoré")
+
+    @staticmethod
+    def _decode_failure_reason(packet: bytes) -> str:
+        """Classe une trame que _parse_packet n'a pas pu décoder."""
+        if len(packet) < 4:
+            return DECODE_TOO_SHORT
+        packet_type = packet[1]
+        if packet_type not in PACKET_MIN_LENGTH:
+            return DECODE_UNKNOWN_TYPE
+        if len(packet) < PACKET_MIN_LENGTH[packet_type]:
+            return DECODE_TRUNCATED
+        if packet_type == PACKET_TYPE_TEMP_HUM and packet[2] != SUBTYPE_TH13:
+            return DECODE_UNSUPPORTED_SUBTYPE
+        return DECODE_REJECTED
+
     def _parse_packet(self, packet: bytes) -> dict[str, Any] | None:
         """Parse un paquet RFXCOM et extrait les informations de l'appareil."""
         if len(packet) < 4:
@@ -1059,9 +1716,94 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("BLYSS appareil détecté: %s", device_info)
         return device_info
 
-    async def _handle_discovered_device(self, device_info: dict[str, Any]) -> None:
-        """Gère un appareil découvert."""
-        # Créer un identifiant unique selon le protocole
+    def async_wait_for_device(
+        self,
+        protocol: str | None = None,
+        packet_type: int | None = None,
+        new_only: bool = False,
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> asyncio.Future:
+        """Retourne un awaitable résolu dès qu'une trame correspondante est décodée.
+
+        Les critères sont cumulatifs: protocole, type de paquet (0x10, 0x11, ...),
+        appareil jamais vu auparavant (new_only) et prédicat libre sur device_info.
+        La future est résolue avec le device_info décodé. L'annuler (par exemple
+        via asyncio.wait_for) retire l'attente.
+        """
+        future = asyncio.get_running_loop().create_future()
+        waiter = (protocol, packet_type, new_only, predicate, future)
+        self._discovery_waiters.append(waiter)
+
+        def _remove_waiter(_: asyncio.Future) -> None:
+            if waiter in self._discovery_waiters:
+                self._discovery_waiters.remove(waiter)
+            if not self._discovery_waiters:
+                self._stop_on_demand_receive_loop()
+
+        future.add_done_callback(_remove_waiter)
+        # La réception doit tourner pendant l'attente, même sans auto-registry
+        self._ensure_receive_loop()
+        _LOGGER.debug(
+            "Attente de découverte enregistrée: protocole=%s, packet_type=%s, new_only=%s",
+            protocol,
+            packet_type,
+            new_only,
+        )
+        return future
+
+    def _ensure_receive_loop(self) -> None:
+        """Démarre la boucle de réception si elle ne tourne pas déjà."""
+        if self._receive_task is None or self._receive_task.done():
+            _LOGGER.debug("Démarrage de la boucle de réception à la demande")
+            self._receive_task = asyncio.create_task(self._async_receive_loop())
+            self._receive_on_demand = True
+
+    def _stop_on_demand_receive_loop(self) -> None:
+        """Arrête la boucle démarrée à la demande, après la dernière attente de découverte.
+
+        Sans auto-registry, la réception ne reste pas active: les émissions
+        n'attendent plus de réponse du transmetteur que personne ne lirait.
+        """
+        if not self._receive_on_demand:
+            return
+        self._receive_on_demand = False
+        if self._receive_task is not None:
+            _LOGGER.debug("Arrêt de la boucle de réception démarrée à la demande")
+            self._receive_task.cancel()
+            self._receive_task = None
+
+    def _notify_discovery_waiters(self, device_info: dict[str, Any], is_new: bool) -> None:
+        """Résout les attentes de découverte correspondant à device_info."""
+        if not self._discovery_waiters:
+            return
+
+        protocol = device_info.get(CONF_PROTOCOL)
+        if protocol == PROTOCOL_TEMP_HUM:
+            packet_type = PACKET_TYPE_TEMP_HUM
+        else:
+            packet_type = PROTOCOL_TO_PACKET.get(protocol, (None, None))[0]
+
+        # Copier la liste: la résolution retire les attentes via le done callback
+        for waiter_protocol, waiter_packet_type, new_only, predicate, future in list(self._discovery_waiters):
+            if future.done():
+                continue
+            if waiter_protocol is not None and waiter_protocol != protocol:
+                continue
+            if waiter_packet_type is not None and waiter_packet_type != packet_type:
+                continue
+            if new_only and not is_new:
+                continue
+            try:
+                if predicate is not None and not predicate(device_info):
+                    continue
+            except Exception as err:
+                _LOGGER.debug("Erreur dans le prédicat de découverte: %s", err)
+                continue
+            future.set_result(device_info)
+
+    @staticmethod
+    def _device_unique_id(device_info: dict[str, Any]) -> str:
+        """Identifiant unique d'un appareil reçu, selon le protocole."""
         protocol = device_info[CONF_PROTOCOL]
         if protocol in [PROTOCOL_ARC, PROTOCOL_X10, PROTOCOL_ABICOD, PROTOCOL_WAVEMAN,
                         PROTOCOL_EMW100, PROTOCOL_IMPULS, PROTOCOL_RISINGSUN,
@@ -1074,12 +1816,24 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
         else:
             # Protocoles avec device_id
             device_id = device_info.get(CONF_DEVICE_ID, "")
+        return f"{protocol}_{device_id}"
 
-        unique_id = f"{device_info[CONF_PROTOCOL]}_{device_id}"
+    async def _handle_discovered_device(self, device_info: dict[str, Any]) -> None:
+        """Gère un appareil découvert."""
+        # Créer un identifiant unique selon le protocole
+        unique_id = self._device_unique_id(device_info)
         _LOGGER.debug("Identifiant unique généré: %s", unique_id)
 
+        # Réveiller les attentes de découverte (appairage) avant toute autre action
+        self._notify_discovery_waiters(
+            device_info, unique_id not in self._discovered_devices
+        )
+
+        self.stats.device_seen(unique_id)
+
         # Mettre à jour les données si l'appareil est déjà connu (pour les capteurs)
         if unique_id in self._discovered_devices:
+            self.stats.dedupe_hits += 1
             _LOGGER.debug("Appareil déjà connu, mise à jour des données: %s", unique_id)
             # Mettre à jour les données (important pour les capteurs qui envoient régulièrement)
             old_data = self._discovered_devices[unique_id]
@@ -1092,11 +1846,7 @@ class RFXCOMCoordinator(DataUpdateCoordinator):
         self._discovered_devices[unique_id] = device_info
         _LOGGER.debug("Appareil ajouté au cache: %s", unique_id)
 
-        _LOGGER.info(
-            "Nouvel appareil détecté: %s - %s",
-            device_info[CONF_PROTOCOL],
-            device_id,
-        )
+        _LOGGER.info("Nouvel appareil détecté: %s", unique_id)
 
         # Si auto-registry est activé, ajouter automatiquement
         if self.auto_registry:
@@ -6,8 +6,7 @@ from typing import Any
 
 from homeassistant.components.cover import CoverEntity, CoverEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -16,13 +15,15 @@ from .const import (
     DOMAIN,
     CMD_ON,
     CMD_OFF,
-    CONF_PROTOCOL,
-    CONF_DEVICE_ID,
-    CONF_HOUSE_CODE,
-    CONF_UNIT_CODE,
     DEVICE_TYPE_COVER,
 )
 from .coordinator import RFXCOMCoordinator
+from .device_identity import (
+    async_get_device_identities,
+    async_sync_device_registry,
+    build_device_info,
+)
+from .scheduler import entity_command_priority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,66 +40,41 @@ async def async_setup_entry(
     devices = entry.options.get("devices", [])
     _LOGGER.debug("Configuration de %s volets RFXCOM", len(devices))
 
-    entities = []
-    for idx, device_config in enumerate(devices):
+    # Identités calculées une fois par révision des options, registry synchronisé en une passe
+    identities = [
+        identity
+        for identity in async_get_device_identities(hass, entry)
         # Ne créer une entité cover que si le type est "cover"
-        if device_config.get("device_type") != DEVICE_TYPE_COVER:
-            continue
-            
+        if identity.device_type == DEVICE_TYPE_COVER
+    ]
+    async_sync_device_registry(
+        hass,
+        entry,
+        ((identity.identifier, identity.name, identity.protocol) for identity in identities),
+    )
+
+    entities = []
+    for identity in identities:
         _LOGGER.debug(
             "Création entité cover %s: %s (protocol=%s)",
-            idx + 1,
-            device_config.get("name", "Sans nom"),
-            device_config.get(CONF_PROTOCOL),
-        )
-        
-        # Générer un unique_id unique en incluant l'index et le protocole
-        protocol = device_config.get(CONF_PROTOCOL, "")
-        device_id = device_config.get(CONF_DEVICE_ID)
-        house_code = device_config.get(CONF_HOUSE_CODE)
-        unit_code = device_config.get(CONF_UNIT_CODE)
-        
-        # Construire l'identifiant unique avec l'index pour garantir l'unicité
-        # Inclure l'index dans device_identifier pour éviter les collisions
-        if device_id:
-            unique_id = f"{entry.entry_id}_cover_{protocol}_{device_id}_{idx}"
-            device_identifier = f"{protocol}_{device_id}_{idx}"  # Inclure idx pour garantir l'unicité
-        elif house_code and unit_code:
-            unique_id = f"{entry.entry_id}_cover_{protocol}_{house_code}_{unit_code}_{idx}"
-            device_identifier = f"{protocol}_{house_code}_{unit_code}_{idx}"  # Inclure idx pour garantir l'unicité
-        else:
-            # Fallback: utiliser le nom et l'index
-            name_slug = device_config.get("name", "unknown").lower().replace(" ", "_")
-            unique_id = f"{entry.entry_id}_cover_{protocol}_{name_slug}_{idx}"
-            device_identifier = f"{protocol}_{name_slug}_{idx}"  # Inclure idx pour garantir l'unicité
-        
-        # Créer ou récupérer le device dans le device registry
-        device_registry = dr.async_get(hass)
-        device_entry = device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, device_identifier)},
-            name=device_config.get("name", "Sans nom"),
-            manufacturer="RFXCOM",
-            model=protocol,
+            identity.index + 1,
+            identity.name,
+            identity.protocol,
         )
-        
-        entity = RFXCOMCover(
-            coordinator=coordinator,
-            name=device_config["name"],
-            protocol=protocol,
-            device_id=device_id,
-            house_code=house_code,
-            unit_code=unit_code,
-            unique_id=unique_id,
-            device_info=DeviceInfo(
-                identifiers={(DOMAIN, device_identifier)},
-                name=device_config.get("name", "Sans nom"),
-                manufacturer="RFXCOM",
-                model=protocol,
-                via_device=(DOMAIN, entry.entry_id),
-            ),
+        entities.append(
+            RFXCOMCover(
+                coordinator=coordinator,
+                name=identity.config["name"],
+                protocol=identity.protocol,
+                device_id=identity.device_id,
+                house_code=identity.house_code,
+                unit_code=identity.unit_code,
+                unique_id=f"{entry.entry_id}_cover_{identity.identifier}",
+                device_info=build_device_info(
+                    entry, identity.identifier, identity.name, identity.protocol
+                ),
+            )
         )
-        entities.append(entity)
 
     _LOGGER.info("Création de %s entités cover RFXCOM", len(entities))
     async_add_entities(entities)
@@ -134,8 +110,34 @@ class RFXCOMCover(CoordinatorEntity[RFXCOMCoordinator], CoverEntity):
         self._device_id = device_id
         self._house_code = house_code
         self._unit_code = unit_code
+        # Trames ON/OFF précompilées: l'émission ne fait que poser la séquence
+        coordinator.prepare_command_frames(protocol, device_id or "", house_code, unit_code)
+        if unit_code == "1":
+            # STOP = ON sur l'unité 3 (voir async_stop_cover)
+            coordinator.prepare_command_frames(
+                protocol, device_id or "", house_code, "3", commands=(CMD_ON,)
+            )
         self._is_closed = None  # État inconnu par défaut
 
+    async def async_added_to_hass(self) -> None:
+        """Appelé lorsque l'entité est ajoutée à Home Assistant."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_command_listener(
+                self._protocol,
+                self._device_id,
+                self._house_code,
+                self._unit_code,
+                self._async_handle_group_command,
+            )
+        )
+
+    @callback
+    def _async_handle_group_command(self, command: str) -> None:
+        """Met à jour l'état après une commande de groupe visant le volet (ON = ouvrir)."""
+        self._is_closed = command == CMD_OFF
+        self.async_write_ha_state()
+
     @property
     def is_closed(self) -> bool | None:
         """Retourne l'état du volet (None = état inconnu)."""
@@ -157,6 +159,7 @@ class RFXCOMCover(CoordinatorEntity[RFXCOMCoordinator], CoverEntity):
             command=CMD_ON,
             house_code=self._house_code,
             unit_code=self._unit_code,
+            priority=entity_command_priority(self),
         )
 
         if success:
@@ -182,6 +185,7 @@ class RFXCOMCover(CoordinatorEntity[RFXCOMCoordinator], CoverEntity):
             command=CMD_OFF,
             house_code=self._house_code,
             unit_code=self._unit_code,
+            priority=entity_command_priority(self),
         )
 
         if success:
@@ -213,6 +217,7 @@ class RFXCOMCover(CoordinatorEntity[RFXCOMCoordinator], CoverEntity):
             command=CMD_ON,
             house_code=self._house_code,
             unit_code=stop_unit_code,
+            priority=entity_command_priority(self),
         )
 
         if success:
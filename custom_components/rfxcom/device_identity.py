@@ -0,0 +1,199 @@
+"""Identités des appareils RFXCOM et synchronisation groupée du device registry."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import (
+    DOMAIN,
+    CONF_PROTOCOL,
+    CONF_DEVICE_ID,
+    CONF_HOUSE_CODE,
+    CONF_UNIT_CODE,
+    DATA_DEVICE_IDENTITIES,
+    PROTOCOL_TEMP_HUM,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MANUFACTURER = "RFXCOM"
+
+
+def device_identifier(device_config: dict[str, Any], idx: int) -> str:
+    """Construit l'identifiant device registry d'un appareil configuré.
+
+    L'index est inclus pour garantir l'unicité entre appareils de même code.
+    """
+    protocol = device_config.get(CONF_PROTOCOL, "")
+    device_id = device_config.get(CONF_DEVICE_ID)
+    house_code = device_config.get(CONF_HOUSE_CODE)
+    unit_code = device_config.get(CONF_UNIT_CODE)
+
+    if device_id:
+        return f"{protocol}_{device_id}_{idx}"
+    if house_code and unit_code:
+        return f"{protocol}_{house_code}_{unit_code}_{idx}"
+    # Fallback: utiliser le nom et l'index
+    name_slug = device_config.get("name", "unknown").lower().replace(" ", "_")
+    return f"{protocol}_{name_slug}_{idx}"
+
+
+def temp_hum_identifier(device_id: str | None) -> str:
+    """Construit l'identifiant device registry d'un capteur température/humidité."""
+    return f"{PROTOCOL_TEMP_HUM}_{device_id}"
+
+
+@dataclass(frozen=True)
+class DeviceIdentity:
+    """Identité calculée d'un appareil configuré dans les options."""
+
+    index: int
+    name: str
+    protocol: str
+    device_id: str | None
+    house_code: str | None
+    unit_code: str | None
+    device_type: str | None
+    identifier: str
+    config: dict[str, Any] = field(compare=False, repr=False)
+
+
+def build_device_info(
+    entry: ConfigEntry, identifier: str, name: str, model: str
+) -> DeviceInfo:
+    """Construit le DeviceInfo d'un appareil rattaché au hub RFXCOM."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, identifier)},
+        name=name,
+        manufacturer=MANUFACTURER,
+        model=model,
+        via_device=(DOMAIN, entry.entry_id),
+    )
+
+
+def build_hub_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """DeviceInfo du hub RFXCOM (entités de diagnostic de l'intégration)."""
+    return DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+
+class _EntryIdentities:
+    """Cache des identités d'une entrée pour une révision des options."""
+
+    def __init__(self, devices: list[dict[str, Any]]) -> None:
+        """Calcule les identités de la liste d'appareils."""
+        # Conserver la référence: une nouvelle révision des options crée une nouvelle liste
+        self.devices = devices
+        self.identities = tuple(
+            DeviceIdentity(
+                index=idx,
+                name=device_config.get("name", "Sans nom"),
+                protocol=device_config.get(CONF_PROTOCOL, ""),
+                device_id=device_config.get(CONF_DEVICE_ID),
+                house_code=device_config.get(CONF_HOUSE_CODE),
+                unit_code=device_config.get(CONF_UNIT_CODE),
+                device_type=device_config.get("device_type"),
+                identifier=device_identifier(device_config, idx),
+                config=device_config,
+            )
+            for idx, device_config in enumerate(devices)
+        )
+        self.by_identifier = {
+            identity.identifier: identity for identity in self.identities
+        }
+        # identifiant -> (nom, modèle) déjà synchronisés dans le device registry
+        self.synced: dict[str, tuple[str, str]] = {}
+
+
+@callback
+def _async_get_entry_cache(hass: HomeAssistant, entry: ConfigEntry) -> _EntryIdentities:
+    """Retourne le cache de l'entrée, recalculé si les options ont changé."""
+    caches: dict[str, _EntryIdentities] = hass.data.setdefault(DATA_DEVICE_IDENTITIES, {})
+    devices = entry.options.get("devices", [])
+    cache = caches.get(entry.entry_id)
+    if cache is None or cache.devices is not devices:
+        cache = _EntryIdentities(devices)
+        caches[entry.entry_id] = cache
+        _LOGGER.debug(
+            "Identités calculées pour %s appareil(s) de l'entrée %s",
+            len(cache.identities),
+            entry.entry_id,
+        )
+    return cache
+
+
+@callback
+def async_get_device_identities(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> tuple[DeviceIdentity, ...]:
+    """Retourne les identités des appareils configurés (une fois par révision des options)."""
+    return _async_get_entry_cache(hass, entry).identities
+
+
+@callback
+def async_find_device_identity(
+    hass: HomeAssistant, entry: ConfigEntry, identifier: str
+) -> DeviceIdentity | None:
+    """Retrouve l'appareil configuré correspondant à un identifiant du device registry."""
+    return _async_get_entry_cache(hass, entry).by_identifier.get(identifier)
+
+
+@callback
+def async_sync_device_registry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    devices: Iterable[tuple[str, str, str]],
+) -> int:
+    """Crée ou met à jour en une passe les appareils (identifiant, nom, modèle).
+
+    Les appareils déjà à jour dans le registry, ou déjà synchronisés pour la
+    révision courante des options, sont ignorés. Retourne le nombre d'appareils
+    créés ou mis à jour.
+    """
+    cache = _async_get_entry_cache(hass, entry)
+    device_registry = dr.async_get(hass)
+    updated = 0
+    skipped = 0
+
+    for identifier, name, model in devices:
+        if cache.synced.get(identifier) == (name, model):
+            skipped += 1
+            continue
+
+        existing = device_registry.async_get_device(identifiers={(DOMAIN, identifier)})
+        if (
+            existing is None
+            or entry.entry_id not in existing.config_entries
+            or existing.name != name
+            or existing.model != model
+            or existing.manufacturer != MANUFACTURER
+        ):
+            device_registry.async_get_or_create(
+                config_entry_id=entry.entry_id,
+                identifiers={(DOMAIN, identifier)},
+                name=name,
+                manufacturer=MANUFACTURER,
+                model=model,
+            )
+            updated += 1
+        else:
+            skipped += 1
+        cache.synced[identifier] = (name, model)
+
+    _LOGGER.debug(
+        "Device registry synchronisé: %s créé(s)/mis à jour, %s inchangé(s)",
+        updated,
+        skipped,
+    )
+    return updated
+
+
+@callback
+def async_clear_device_identities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Supprime le cache des identités d'une entrée déchargée."""
+    hass.data.get(DATA_DEVICE_IDENTITIES, {}).pop(entry.entry_id, None)
@@ -0,0 +1,72 @@
+"""Diagnostics de l'intégration RFXCOM (statistiques de transport et du parseur)."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DIAGNOSTICS_TOP_DEVICES, DOMAIN, PACKET_TYPE_NAMES
+from .coordinator import RFXCOMCoordinator
+
+TO_REDACT = {"host"}
+
+
+def _frames_by_type(counter: dict[int, int]) -> dict[str, int]:
+    """Compteurs de trames indexés par nom de type de paquet."""
+    return {
+        PACKET_TYPE_NAMES.get(packet_type, f"0x{packet_type:02X}"): count
+        for packet_type, count in sorted(counter.items())
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Retourne les diagnostics d'une entrée de configuration."""
+    coordinator: RFXCOMCoordinator = hass.data[DOMAIN][entry.entry_id]
+    stats = coordinator.stats
+    node_bridge = coordinator._node_bridge
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "transport": {
+            "connection_type": coordinator.connection_type,
+            "ready": coordinator.transport_ready,
+            "error": coordinator.transport_error,
+            "reconnects": stats.reconnects,
+            "setup_timings_ms": dict(coordinator.setup_timings),
+            "shared": (
+                coordinator._transport.stats() if coordinator._transport is not None else None
+            ),
+        },
+        "frames": {
+            "received": _frames_by_type(stats.frames_received),
+            "sent": _frames_by_type(stats.frames_sent),
+            "decode_failures": dict(stats.decode_failures),
+            "dedupe_hits": stats.dedupe_hits,
+            "discovered_cache_size": len(coordinator.get_discovered_devices()),
+        },
+        "commands": {
+            "latency": coordinator.metrics.summary(),
+            "coalesced": coordinator.coalesced_commands,
+            "queue_depth": coordinator.queue_depth,
+            "lock": coordinator._lock.stats(),
+            "airtime": coordinator.scheduler.stats(),
+        },
+        "addon": node_bridge.stats(coordinator._frame_cursor) if node_bridge is not None else None,
+        "transceivers": (
+            {
+                "units": coordinator.pool.stats(),
+                "failovers": coordinator.pool.failovers,
+                "cross_unit_duplicates": coordinator.pool.duplicates,
+            }
+            if coordinator.pool is not None
+            else None
+        ),
+        "top_devices": [
+            {"unique_id": unique_id, "frames": count}
+            for unique_id, count in stats.top_devices(DIAGNOSTICS_TOP_DEVICES)
+        ],
+    }
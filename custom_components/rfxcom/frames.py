@@ -0,0 +1,239 @@
+"""Trames RFXtrx précompilées (templates) pour les commandes Lighting1-6."""
+from __future__ import annotations
+
+import logging
+
+from .const import (
+    CMD_GROUP_OFF,
+    CMD_GROUP_ON,
+    CMD_ON,
+    PACKET_TYPE_LIGHTING1,
+    PACKET_TYPE_LIGHTING2,
+    PACKET_TYPE_LIGHTING3,
+    PACKET_TYPE_LIGHTING4,
+    PACKET_TYPE_LIGHTING5,
+    PACKET_TYPE_LIGHTING6,
+    PROTOCOL_TO_PACKET,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FrameTemplate:
+    """Trame figée d'une commande: seul l'octet de séquence change à l'émission."""
+
+    __slots__ = ("_buffer", "_seq_offset")
+
+    def __init__(self, frame: bytes, seq_offset: int) -> None:
+        """Initialise le template à partir d'une trame de séquence 0."""
+        self._buffer = bytearray(frame)
+        self._seq_offset = seq_offset
+
+    def __len__(self) -> int:
+        """Longueur de la trame en octets."""
+        return len(self._buffer)
+
+    def render(self, sequence: int) -> bytes:
+        """Retourne la trame avec le numéro de séquence donné."""
+        self._buffer[self._seq_offset] = sequence
+        return bytes(self._buffer)
+
+
+def hex_to_bytes(hex_str: str, length: int) -> bytes:
+    """Convertit une chaîne hexadécimale en bytes de longueur fixe."""
+    try:
+        # Supprimer les espaces et les séparateurs
+        hex_str = hex_str.replace(" ", "").replace(":", "").replace("-", "")
+
+        # Si le nombre de caractères est impair, ajouter un 0 devant
+        if len(hex_str) % 2 == 1:
+            hex_str = "0" + hex_str
+            _LOGGER.debug("ID hex impair, ajout d'un 0 devant: %s", hex_str)
+
+        # Convertir en bytes
+        device_bytes = bytes.fromhex(hex_str)
+
+        # Compléter ou tronquer à la longueur souhaitée
+        if len(device_bytes) < length:
+            # Compléter avec des zéros au début (padding left)
+            device_bytes = bytes(length - len(device_bytes)) + device_bytes
+        elif len(device_bytes) > length:
+            # Tronquer en gardant les bytes de droite (LSB)
+            device_bytes = device_bytes[-length:]
+
+        return device_bytes
+    except ValueError as err:
+        _LOGGER.error("Erreur lors de la conversion hex: %s (%s)", hex_str, err)
+        return bytes(length)
+
+
+def _unit_code_int(unit_code: str | int | None, default: int) -> int:
+    """Convertit un unit code, avec valeur par défaut si absent ou invalide."""
+    if not unit_code:
+        return default
+    try:
+        return int(unit_code)
+    except (ValueError, TypeError):
+        return default
+
+
+def lighting1_template(
+    subtype: int, house_code: str | None, unit_code: str | None, command: str
+) -> FrameTemplate:
+    """Template Lighting1 (X10, ARC, ABICOD, etc.).
+
+    Format: [length] 0x10 [subtype] [seq] [house] [unit] [cmd] [signal]
+    """
+    # Convertir house code (A=0x41, B=0x42, etc. ou hex)
+    hc = 0x41  # Default to A
+    if house_code:
+        if len(house_code) == 1 and house_code.isalpha():
+            hc = ord(house_code.upper())
+        else:
+            try:
+                hc = int(house_code, 16) if house_code.startswith("0x") else int(house_code)
+            except ValueError:
+                pass
+
+    uc = _unit_code_int(unit_code, 1)
+
+    # Commande (0x05/0x06 = all off/all on pour la house code, unité ignorée)
+    cmd_byte = {CMD_ON: 0x01, CMD_GROUP_OFF: 0x05, CMD_GROUP_ON: 0x06}.get(command, 0x00)
+    if command in (CMD_GROUP_ON, CMD_GROUP_OFF):
+        uc = 0x00
+
+    # 07 10 [subtype] [seq] [house] [unit] [cmd] 00
+    return FrameTemplate(
+        bytes([0x07, PACKET_TYPE_LIGHTING1, subtype, 0x00, hc, uc, cmd_byte, 0x00]), 3
+    )
+
+
+def lighting2_template(
+    subtype: int, device_id: str | None, command: str, unit_code: int | None = None
+) -> FrameTemplate:
+    """Template Lighting2 (AC, HomeEasy EU, etc.).
+
+    Format: [length] 0x11 [subtype] [seq] [id(4)] [unit] [cmd] [level] [signal]
+    """
+    device_bytes = hex_to_bytes(device_id or "00000000", 4)
+
+    # Unit code (généralement 0 ou 1 pour AC, par défaut 1)
+    if unit_code is None:
+        unit_code = 1
+
+    # Commande (0x03/0x04 = group off/group on pour toutes les unités de l'ID)
+    cmd_byte = {CMD_ON: 0x01, CMD_GROUP_OFF: 0x03, CMD_GROUP_ON: 0x04}.get(command, 0x00)
+
+    # Level (0x0F = 100% pour ON, 0x00 pour OFF)
+    level = 0x0F if command in (CMD_ON, CMD_GROUP_ON) else 0x00
+
+    # 0B 11 [subtype] [seq] [id(4)] [unit] [cmd] [level] 80 (-56 dBm)
+    return FrameTemplate(
+        bytes([0x0B, PACKET_TYPE_LIGHTING2, subtype, 0x00])
+        + device_bytes
+        + bytes([unit_code, cmd_byte, level, 0x80]),
+        3,
+    )
+
+
+def lighting3_template(
+    device_id: str | None, unit_code: str | None, command: str
+) -> FrameTemplate:
+    """Template Lighting3 (Ikea Koppla).
+
+    Format: [length] 0x12 [seq] [id(2)] [group] [unit] [cmd] [signal]
+    """
+    device_bytes = hex_to_bytes(device_id or "0000", 2)
+    uc = _unit_code_int(unit_code, 1)
+    cmd_byte = 0x01 if command == CMD_ON else 0x00
+
+    # 08 12 [seq] [id(2)] [group=0] [unit] [cmd] 00
+    return FrameTemplate(
+        bytes([0x08, PACKET_TYPE_LIGHTING3, 0x00])
+        + device_bytes
+        + bytes([0x00, uc, cmd_byte, 0x00]),
+        2,
+    )
+
+
+def lighting4_template(device_id: str | None, command: str) -> FrameTemplate:
+    """Template Lighting4 (PT2262).
+
+    Format: [length] 0x13 [seq] [id(3)] [cmd] [signal]
+    """
+    device_bytes = hex_to_bytes(device_id or "000000", 3)
+    cmd_byte = 0x01 if command == CMD_ON else 0x00
+
+    # 07 13 [seq] [id(3)] [cmd] 00
+    return FrameTemplate(
+        bytes([0x07, PACKET_TYPE_LIGHTING4, 0x00]) + device_bytes + bytes([cmd_byte, 0x00]),
+        2,
+    )
+
+
+def lighting5_template(
+    subtype: int, device_id: str | None, unit_code: str | None, command: str
+) -> FrameTemplate:
+    """Template Lighting5 (LightwaveRF, etc.).
+
+    Format: [length] 0x14 [subtype] [seq] [id(3)] [unit] [cmd] [level] [signal]
+    """
+    device_bytes = hex_to_bytes(device_id or "000000", 3)
+    uc = _unit_code_int(unit_code, 0)
+    cmd_byte = 0x01 if command == CMD_ON else 0x00
+    level = 0x0F if command == CMD_ON else 0x00
+
+    # 0A 14 [subtype] [seq] [id(3)] [unit] [cmd] [level] 00
+    return FrameTemplate(
+        bytes([0x0A, PACKET_TYPE_LIGHTING5, subtype, 0x00])
+        + device_bytes
+        + bytes([uc, cmd_byte, level, 0x00]),
+        3,
+    )
+
+
+def lighting6_template(device_id: str | None, command: str) -> FrameTemplate:
+    """Template Lighting6 (BLYSS).
+
+    Format: [length] 0x15 [seq] [id(2)] [group] [unit] [cmd] [signal]
+    """
+    device_bytes = hex_to_bytes(device_id or "0000", 2)
+    cmd_byte = 0x01 if command == CMD_ON else 0x00
+
+    # 08 15 [seq] [id(2)] [group=0] [unit=0] [cmd] 00
+    return FrameTemplate(
+        bytes([0x08, PACKET_TYPE_LIGHTING6, 0x00])
+        + device_bytes
+        + bytes([0x00, 0x00, cmd_byte, 0x00]),
+        2,
+    )
+
+
+def compile_frame_template(
+    protocol: str,
+    device_id: str | None,
+    command: str,
+    house_code: str | None = None,
+    unit_code: str | None = None,
+) -> FrameTemplate | None:
+    """Compile la trame d'une commande selon le type de paquet du protocole."""
+    if protocol not in PROTOCOL_TO_PACKET:
+        _LOGGER.error("Protocole non supporté: %s", protocol)
+        return None
+    packet_type, subtype = PROTOCOL_TO_PACKET[protocol]
+
+    if packet_type == PACKET_TYPE_LIGHTING1:
+        return lighting1_template(subtype, house_code, unit_code, command)
+    if packet_type == PACKET_TYPE_LIGHTING2:
+        # Par défaut 1 pour AC
+        return lighting2_template(subtype, device_id, command, _unit_code_int(unit_code, 1))
+    if packet_type == PACKET_TYPE_LIGHTING3:
+        return lighting3_template(device_id, unit_code, command)
+    if packet_type == PACKET_TYPE_LIGHTING4:
+        return lighting4_template(device_id, command)
+    if packet_type == PACKET_TYPE_LIGHTING5:
+        return lighting5_template(subtype, device_id, unit_code, command)
+    if packet_type == PACKET_TYPE_LIGHTING6:
+        return lighting6_template(device_id, command)
+    _LOGGER.error("Type de paquet non supporté: 0x%02X", packet_type)
+    return None
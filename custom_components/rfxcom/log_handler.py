@@ -1,38 +1,184 @@
 """Gestionnaire de logs pour RFXCOM."""
 from __future__ import annotations
 
+import itertools
 import logging
+import weakref
 from collections import deque
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
 _LOGGER = logging.getLogger(__name__)
 
-# Stockage des logs en mémoire (limité à 1000 entrées)
-_log_buffer: deque[dict[str, Any]] = deque(maxlen=1000)
+LOG_BUFFER_SIZE = 1000
+LOG_PAGE_SIZE = 50
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _LogEntry(NamedTuple):
+    """Éléments bruts d'un LogRecord, formatés seulement à la lecture."""
+
+    seq: int
+    created: float
+    levelno: int
+    name: str
+    msg: Any
+    args: Any
+    exc_text: str | None
+
+
+# Tampon circulaire en mémoire: deque.append est atomique, sans verrou
+_log_buffer: deque[_LogEntry] = deque(maxlen=LOG_BUFFER_SIZE)
+# Numéros de séquence monotones (curseurs de pagination), jamais réutilisés
+_sequence = itertools.count(1)
+
+# Seuils de capture: par défaut, puis par logger
+_capture_level = logging.DEBUG
+_capture_levels: dict[str, int] = {}
+_handlers: weakref.WeakSet[RFXCOMLogHandler] = weakref.WeakSet()
+
+_formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
 
 class RFXCOMLogHandler(logging.Handler):
-    """Handler personnalisé pour capturer les logs RFXCOM."""
+    """Handler personnalisé pour capturer les logs RFXCOM.
+
+    La capture ne conserve que les éléments bruts de l'enregistrement (horodatage,
+    niveau, logger, message et arguments): le formatage n'a lieu qu'à la lecture.
+    Les arguments sont conservés par référence et reflètent leur état à la lecture.
+    """
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Capture un log sans prendre le verrou du handler."""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
 
     def emit(self, record: logging.LogRecord) -> None:
         """Capture un log."""
+        if record.levelno < _capture_levels.get(record.name, _capture_level):
+            return
         try:
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "level": record.levelname,
-                "logger": record.name,
-                "message": self.format(record),
-            }
-            _log_buffer.append(log_entry)
+            exc_text = None
+            if record.exc_info:
+                # Rare: la trace est formatée tant que l'exception existe
+                exc_text = record.exc_text or _formatter.formatException(record.exc_info)
+            _log_buffer.append(
+                _LogEntry(
+                    next(_sequence),
+                    record.created,
+                    record.levelno,
+                    record.name,
+                    record.msg,
+                    record.args,
+                    exc_text,
+                )
+            )
         except Exception:
             # Ignorer les erreurs dans le handler pour éviter les boucles
             pass
 
 
+def _format_entry(entry: _LogEntry) -> dict[str, Any]:
+    """Formate une entrée du tampon."""
+    record = logging.makeLogRecord(
+        {
+            "created": entry.created,
+            "msecs": (entry.created - int(entry.created)) * 1000,
+            "levelno": entry.levelno,
+            "levelname": logging.getLevelName(entry.levelno),
+            "name": entry.name,
+            "msg": entry.msg,
+            "args": entry.args,
+            "exc_text": entry.exc_text,
+        }
+    )
+    try:
+        message = _formatter.format(record)
+    except Exception:
+        # Arguments incompatibles avec le message: afficher le message brut
+        message = f"{record.levelname} {entry.name}: {entry.msg!r} {entry.args!r}"
+    return {
+        "seq": entry.seq,
+        "timestamp": datetime.fromtimestamp(entry.created).isoformat(),
+        "level": record.levelname,
+        "logger": entry.name,
+        "message": message,
+    }
+
+
 def get_logs(limit: int = 500) -> list[dict[str, Any]]:
     """Retourne les logs récents."""
-    return list(_log_buffer)[-limit:]
+    return [_format_entry(entry) for entry in list(_log_buffer)[-limit:]]
+
+
+def _matches(entry: _LogEntry, level: int, logger_name: str | None) -> bool:
+    """Indique si une entrée passe les filtres de niveau et de logger."""
+    if entry.levelno < level:
+        return False
+    return logger_name is None or entry.name == logger_name or entry.name.startswith(f"{logger_name}.")
+
+
+def _select_page(
+    buffer: deque[_LogEntry],
+    since: int | None,
+    before: int | None,
+    limit: int,
+    level: int,
+    logger_name: str | None,
+) -> tuple[list[_LogEntry], bool]:
+    """Sélectionne les entrées d'une page sans parcourir le reste du tampon."""
+    selected: list[_LogEntry] = []
+    if since is not None:
+        # Vers les plus récents: les séquences sont contiguës dans le tampon,
+        # la première entrée après le curseur est donc à une position connue.
+        start = max(0, since + 1 - buffer[0].seq) if buffer else 0
+        for entry in itertools.islice(buffer, start, None):
+            if entry.seq <= since or not _matches(entry, level, logger_name):
+                continue
+            if len(selected) == limit:
+                return selected, True
+            selected.append(entry)
+        return selected, False
+
+    # Page la plus récente, ou plus ancienne que le curseur before
+    for entry in reversed(buffer):
+        if (before is not None and entry.seq >= before) or not _matches(entry, level, logger_name):
+            continue
+        if len(selected) == limit:
+            selected.reverse()
+            return selected, True
+        selected.append(entry)
+    selected.reverse()
+    return selected, False
+
+
+def get_log_page(
+    since: int | None = None,
+    before: int | None = None,
+    limit: int = LOG_PAGE_SIZE,
+    level: int = logging.NOTSET,
+    logger_name: str | None = None,
+) -> dict[str, Any]:
+    """Retourne une page de logs, de la plus ancienne à la plus récente.
+
+    Sans curseur, la page contient les logs les plus récents. since retourne
+    les logs suivant une séquence, before ceux qui la précèdent. Seules les
+    entrées de la page sont formatées.
+    """
+    try:
+        entries, has_more = _select_page(_log_buffer, since, before, limit, level, logger_name)
+    except (RuntimeError, IndexError):
+        # Tampon modifié pendant le parcours par un autre thread: parcourir une copie
+        entries, has_more = _select_page(_log_buffer.copy(), since, before, limit, level, logger_name)
+    return {
+        "entries": [_format_entry(entry) for entry in entries],
+        "first": entries[0].seq if entries else None,
+        "last": entries[-1].seq if entries else since,
+        "has_more": has_more,
+    }
 
 
 def clear_logs() -> None:
@@ -40,15 +186,39 @@ def clear_logs() -> None:
     _log_buffer.clear()
 
 
+def set_capture_level(level: int, logger_name: str | None = None) -> None:
+    """Définit le seuil de capture, pour un logger ou par défaut."""
+    global _capture_level
+    if logger_name is None:
+        _capture_level = level
+    else:
+        _capture_levels[logger_name] = level
+    for handler in _handlers:
+        _apply_handler_level(handler)
+
+
+def reset_capture_levels() -> None:
+    """Revient à la capture de tous les niveaux."""
+    global _capture_level
+    _capture_level = logging.DEBUG
+    _capture_levels.clear()
+    for handler in _handlers:
+        _apply_handler_level(handler)
+
+
+def _apply_handler_level(handler: RFXCOMLogHandler) -> None:
+    """Aligne le niveau du handler sur le plus bas seuil de capture.
+
+    logging compare ce niveau avant d'appeler le handler: les logs sous tous
+    les seuils sont écartés sans appel de méthode.
+    """
+    handler.setLevel(min([_capture_level, *_capture_levels.values()]))
+
+
 def setup_log_handler() -> RFXCOMLogHandler:
     """Configure et retourne le handler de logs."""
     handler = RFXCOMLogHandler()
-    handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(_formatter)
+    _apply_handler_level(handler)
+    _handlers.add(handler)
     return handler
-
-
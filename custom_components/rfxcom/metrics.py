@@ -0,0 +1,223 @@
+"""Mesures RFXCOM: latences des commandes (histogrammes de taille fixe) et compteurs."""
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any, Callable
+
+from .const import (
+    DEVICE_STATS_MAX,
+    LATENCY_MAX_MS,
+    LATENCY_MIN_MS,
+    LATENCY_PERCENTILES,
+    LATENCY_SUB_BUCKETS,
+)
+
+# Étapes d'une commande, entre les horodatages enqueue -> dequeue -> write -> ack
+STAGE_LOCK_WAIT = "lock_wait"  # attente du verrou d'émission
+STAGE_AIRTIME_WAIT = "airtime_wait"  # attente du canal RF (seau de temps d'antenne)
+# Écriture jusqu'à la réponse du transmetteur: réponse HTTP de l'add-on (USB), ACK
+# 0x02 au numéro de séquence (réseau); fin d'écriture si aucune réponse n'est lue
+STAGE_TRANSPORT = "transport"
+STAGE_TOTAL = "total"
+STAGES = (STAGE_LOCK_WAIT, STAGE_AIRTIME_WAIT, STAGE_TRANSPORT, STAGE_TOTAL)
+
+
+class LatencyHistogram:
+    """Histogramme de latences à buckets logarithmiques (type HDR).
+
+    Les valeurs sont exprimées en unités de min_ms. Sous sub_buckets unités, les
+    buckets sont linéaires; au-delà, chaque octave est découpée en sub_buckets/2
+    buckets. La mémoire est fixe et l'erreur relative d'un percentile bornée,
+    quel que soit le nombre de commandes.
+    """
+
+    def __init__(
+        self,
+        min_ms: float = LATENCY_MIN_MS,
+        max_ms: float = LATENCY_MAX_MS,
+        sub_buckets: int = LATENCY_SUB_BUCKETS,
+    ) -> None:
+        """Initialise un histogramme vide."""
+        if sub_buckets < 2 or sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets doit être une puissance de 2")
+        self.min_ms = min_ms
+        self._sub_buckets = sub_buckets
+        self._half = sub_buckets // 2
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self._max_units = max(sub_buckets, int(max_ms / min_ms))
+        self._counts = [0] * (self._index(self._max_units) + 1)
+        self.count = 0
+        self.max_ms = 0.0
+
+    def _index(self, units: int) -> int:
+        """Index du bucket d'une valeur (en unités)."""
+        if units < self._sub_buckets:
+            return units
+        exponent = units.bit_length() - 1
+        shift = exponent - self._sub_bits + 1
+        return self._sub_buckets + (exponent - self._sub_bits) * self._half + (units >> shift) - self._half
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        """Bornes [basse, haute[ d'un bucket (en unités)."""
+        if index < self._sub_buckets:
+            return index, index + 1
+        octave, offset = divmod(index - self._sub_buckets, self._half)
+        shift = octave + 1
+        sub = self._half + offset
+        return sub << shift, (sub + 1) << shift
+
+    def __len__(self) -> int:
+        """Nombre de buckets (fixe)."""
+        return len(self._counts)
+
+    def record(self, value_ms: float) -> None:
+        """Enregistre une latence."""
+        value_ms = max(0.0, value_ms)
+        units = min(int(value_ms / self.min_ms), self._max_units)
+        self._counts[self._index(units)] += 1
+        self.count += 1
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Retourne le percentile demandé (ms), None sans mesure."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= target:
+                low, high = self._bounds(index)
+                # Milieu du bucket, sans dépasser la valeur maximale observée
+                return round(min((low + high) / 2 * self.min_ms, self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def reset(self) -> None:
+        """Remet l'histogramme à zéro."""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.max_ms = 0.0
+
+
+class CommandMetrics:
+    """Latences par étape des commandes émises et commandes en vol."""
+
+    def __init__(self) -> None:
+        """Initialise un histogramme par étape."""
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self._in_flight = 0
+        self.failed = 0
+        # Commandes dont l'étape transport s'arrête à l'écriture (réponse non lue)
+        self.unacked = 0
+        # Prévenus à chaque variation du nombre de commandes en vol
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre de commandes en cours d'émission."""
+        return self._in_flight
+
+    @in_flight.setter
+    def in_flight(self, value: int) -> None:
+        if value == self._in_flight:
+            return
+        self._in_flight = value
+        for listener in list(self._listeners):
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Abonne listener aux variations des commandes en vol.
+
+        Retourne la fonction de désabonnement.
+        """
+        self._listeners.append(listener)
+
+        def _remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove_listener
+
+    def record(
+        self,
+        enqueued_at: float,
+        dequeued_at: float,
+        write_at: float,
+        ack_at: float,
+        acked: bool = True,
+    ) -> None:
+        """Enregistre les horodatages (time.monotonic) d'une commande émise.
+
+        ack_at est l'instant de la réponse du transmetteur; sans réponse lue
+        (acked=False, réseau sans boucle de réception), celui de la fin d'écriture.
+        """
+        if not acked:
+            self.unacked += 1
+        self.histograms[STAGE_LOCK_WAIT].record((dequeued_at - enqueued_at) * 1000)
+        self.histograms[STAGE_AIRTIME_WAIT].record((write_at - dequeued_at) * 1000)
+        self.histograms[STAGE_TRANSPORT].record((ack_at - write_at) * 1000)
+        self.histograms[STAGE_TOTAL].record((ack_at - enqueued_at) * 1000)
+
+    def percentile(self, percentile: float, stage: str = STAGE_TOTAL) -> float | None:
+        """Percentile (ms) d'une étape, None sans mesure."""
+        return self.histograms[stage].percentile(percentile)
+
+    def summary(self) -> dict[str, Any]:
+        """Retourne nombre, percentiles et maximum de chaque étape."""
+        summary: dict[str, Any] = {
+            "in_flight": self.in_flight,
+            "failed": self.failed,
+            "unacked": self.unacked,
+        }
+        for stage, histogram in self.histograms.items():
+            stage_summary: dict[str, Any] = {"count": histogram.count}
+            for percentile in LATENCY_PERCENTILES:
+                stage_summary[f"p{percentile}_ms"] = histogram.percentile(percentile)
+            stage_summary["max_ms"] = round(histogram.max_ms, 1)
+            summary[stage] = stage_summary
+        return summary
+
+
+# Raisons d'échec de décodage des trames reçues
+DECODE_INVALID_LENGTH = "invalid_length"  # octet de longueur hors limites
+DECODE_INCOMPLETE = "incomplete"  # trame tronquée par le transport
+DECODE_TOO_SHORT = "too_short"  # moins de 4 octets
+DECODE_TRUNCATED = "truncated"  # type connu, longueur insuffisante
+DECODE_UNKNOWN_TYPE = "unknown_type"
+DECODE_UNSUPPORTED_SUBTYPE = "unsupported_subtype"
+DECODE_REJECTED = "rejected"  # refusée par le parseur du type de paquet
+
+
+class TransportStats:
+    """Compteurs entiers des trames reçues/émises, tenus sur les chemins critiques."""
+
+    def __init__(self) -> None:
+        """Initialise des compteurs à zéro."""
+        self.frames_received: Counter[int] = Counter()
+        self.frames_sent: Counter[int] = Counter()
+        self.decode_failures: Counter[str] = Counter()
+        self.device_frames: Counter[str] = Counter()
+        self.dedupe_hits = 0
+        self.reconnects = 0
+
+    def frame_received(self, packet_type: int) -> None:
+        """Compte une trame reçue."""
+        self.frames_received[packet_type] += 1
+
+    def frame_sent(self, packet_type: int, count: int = 1) -> None:
+        """Compte des trames émises."""
+        self.frames_sent[packet_type] += count
+
+    def decode_failed(self, reason: str) -> None:
+        """Compte un échec de décodage."""
+        self.decode_failures[reason] += 1
+
+    def device_seen(self, unique_id: str) -> None:
+        """Compte une trame décodée pour un appareil (nombre d'appareils borné)."""
+        if unique_id in self.device_frames or len(self.device_frames) < DEVICE_STATS_MAX:
+            self.device_frames[unique_id] += 1
+
+    def top_devices(self, count: int) -> list[tuple[str, int]]:
+        """Appareils les plus bavards (identifiant, trames)."""
+        return self.device_frames.most_common(count)
@@ -4,19 +4,65 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 try:
     import aiohttp
 except ImportError:
     aiohttp = None
 
+from .const import FRAME_REPLAY_MAX_AGE, FRAME_STREAM_IDLE_TIMEOUT, LATENCY_PERCENTILES
+from .metrics import LatencyHistogram
+
 _LOGGER = logging.getLogger(__name__)
 
 # URL par défaut de l'add-on (accessible via Supervisor API)
 DEFAULT_ADDON_URL = "http://localhost:8888"
 
 
+class FrameCursor:
+    """Position d'un consommateur dans le flux des trames reçues par l'add-on.
+
+    Chaque entrée qui suit le flux a son propre curseur: plusieurs entrées
+    partagent le même NodeBridgeHTTP (même port série) sans se voler les trames.
+    """
+
+    def __init__(self) -> None:
+        """Curseur vide: la première connexion rejoue les trames récentes."""
+        # Époque de l'add-on (change à chaque redémarrage) et dernière séquence reçue
+        self.epoch: str | None = None
+        self.seq = 0
+        self.frames = 0
+        self.gaps = 0
+        self.connects = 0
+
+    def resume(self, hello: dict[str, Any]) -> None:
+        """Traite l'en-tête du flux: époque de l'add-on et trames perdues."""
+        epoch = hello.get("epoch")
+        if self.epoch is not None and epoch != self.epoch:
+            # Add-on redémarré: ses séquences repartent de zéro
+            _LOGGER.info("🔄 Add-on redémarré, reprise du flux au début de son historique")
+            self.seq = 0
+        missed = int(hello.get("missed", 0))
+        if missed:
+            self.gaps += missed
+            _LOGGER.warning("⚠️ %s trame(s) perdue(s) pendant la coupure du flux", missed)
+        elif self.epoch is not None:
+            _LOGGER.debug("Flux repris après la séquence %s", self.seq)
+        self.epoch = epoch
+
+    def as_dict(self) -> dict[str, Any]:
+        """Statistiques du curseur (diagnostics)."""
+        return {
+            "epoch": self.epoch,
+            "last_seq": self.seq,
+            "frames": self.frames,
+            "gaps": self.gaps,
+            "connects": self.connects,
+        }
+
+
 class NodeBridgeHTTP:
     """Wrapper pour communiquer avec le bridge Node.js RFXCOM via HTTP."""
 
@@ -27,6 +73,14 @@ class NodeBridgeHTTP:
         self._session: aiohttp.ClientSession | None = None
         self._initialized = False
         self._lock = asyncio.Lock()
+        # Aller-retours HTTP des commandes (diagnostics)
+        self._round_trip = LatencyHistogram()
+        self._requests = 0
+        self._errors = 0
+        # Curseur du flux des trames reçues quand l'appelant n'a pas le sien
+        self._frame_cursor = FrameCursor()
+        # Add-on antérieur sans /api/frames: pas de réception
+        self.frame_stream_available = True
 
     async def _ensure_session(self) -> None:
         """S'assure qu'une session HTTP est créée."""
@@ -185,6 +239,16 @@ class NodeBridgeHTTP:
         if self.serial_port:
             payload["port"] = self.serial_port
 
+        started_at = time.monotonic()
+        success = await self._post_command(payload, command)
+        self._round_trip.record((time.monotonic() - started_at) * 1000)
+        self._requests += 1
+        if not success:
+            self._errors += 1
+        return success
+
+    async def _post_command(self, payload: dict[str, Any], command: str) -> bool:
+        """Poste une commande à l'add-on et retourne son acquittement."""
         try:
             async with self._session.post(
                 f"{self.addon_url}/api/command",
@@ -238,6 +302,131 @@ class NodeBridgeHTTP:
             )
             return False
 
+    async def send_burst(
+        self,
+        protocol: str,
+        device_id: str | None = None,
+        house_code: str | None = None,
+        unit_code: int | None = None,
+        command: str = "on",
+        rate: float = 20.0,
+        duration: float = 4.0,
+    ) -> dict[str, Any] | None:
+        """Demande à l'add-on de répéter une commande à cadence fixe.
+
+        L'add-on cadence les trames au plus près du port série. Retourne son
+        bilan (sent, failed, skipped, duration, target_rate, achieved_rate), ou
+        None si la rafale n'a pas pu être déléguée (add-on antérieur sans
+        /api/burst, ou erreur).
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        await self._ensure_session()
+
+        payload: dict[str, Any] = {
+            "protocol": protocol,
+            "command": command,
+            "rate": rate,
+            "duration": duration,
+        }
+        if device_id:
+            payload["device_id"] = device_id
+        if house_code:
+            payload["house_code"] = house_code
+        if unit_code is not None:
+            payload["unit_code"] = unit_code
+        if self.serial_port:
+            payload["port"] = self.serial_port
+
+        try:
+            async with self._session.post(
+                f"{self.addon_url}/api/burst",
+                json=payload,
+            ) as response:
+                if response.status == 404:
+                    _LOGGER.debug("Add-on sans /api/burst, rafale cadencée par l'intégration")
+                    return None
+                data = await response.json()
+                if response.status != 200 or data.get("status") != "success":
+                    _LOGGER.error(
+                        "❌ Erreur add-on lors de la rafale %s: %s",
+                        command,
+                        data.get("error", f"HTTP {response.status}"),
+                    )
+                    return None
+                return {
+                    "sent": int(data.get("sent", 0)),
+                    "failed": int(data.get("failed", 0)),
+                    "skipped": int(data.get("skipped", 0)),
+                    "duration": float(data.get("duration", 0.0)),
+                    "target_rate": rate,
+                    "achieved_rate": float(data.get("achieved_rate", 0.0)),
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            _LOGGER.error("❌ Erreur lors de la rafale %s via add-on: %s", command, e)
+            return None
+
+    async def async_iter_frames(self, cursor: FrameCursor | None = None) -> AsyncIterator[bytes]:
+        """Suit le flux des trames reçues par l'add-on (GET /api/frames).
+
+        cursor mémorise la position du consommateur (celui du bridge par
+        défaut). Après une coupure, le flux reprend après la dernière séquence
+        reçue par ce curseur:
+        l'add-on rejoue les trames manquées qu'il conserve encore. À la première
+        connexion, les trames des FRAME_REPLAY_MAX_AGE dernières secondes sont
+        rejouées pour rafraîchir les capteurs. L'itération se termine quand
+        l'add-on ferme le flux; les erreurs de connexion sont propagées.
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        await self._ensure_session()
+
+        if cursor is None:
+            cursor = self._frame_cursor
+        params: dict[str, str] = {}
+        if self.serial_port:
+            params["port"] = self.serial_port
+        if cursor.epoch is None:
+            params["max_age"] = str(FRAME_REPLAY_MAX_AGE)
+        else:
+            params["epoch"] = cursor.epoch
+            params["since"] = str(cursor.seq)
+
+        async with self._session.get(
+            f"{self.addon_url}/api/frames",
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=FRAME_STREAM_IDLE_TIMEOUT),
+        ) as response:
+            if response.status == 404:
+                _LOGGER.info("ℹ️ Add-on sans /api/frames: réception USB indisponible, mettez l'add-on à jour")
+                self.frame_stream_available = False
+                return
+            if response.status != 200:
+                raise ConnectionError(f"Flux des trames indisponible (HTTP {response.status})")
+            cursor.connects += 1
+            expected: int | None = None
+            async for line in response.content:
+                if not line.strip():
+                    # Battement de l'add-on
+                    continue
+                message = json.loads(line)
+                if message.get("type") == "hello":
+                    cursor.resume(message)
+                    expected = None
+                    continue
+                seq = message["seq"]
+                if seq <= cursor.seq:
+                    continue
+                if expected is not None and seq > expected:
+                    # Trames écartées par l'add-on (file du client pleine)
+                    cursor.gaps += seq - expected
+                expected = seq + 1
+                cursor.seq = seq
+                cursor.frames += 1
+                yield bytes.fromhex(message["hex"])
+
     async def pair_device(
         self,
         protocol: str,
@@ -257,6 +446,19 @@ class NodeBridgeHTTP:
         )
         return {"status": "success" if success else "error"}
 
+    def stats(self, cursor: FrameCursor | None = None) -> dict[str, Any]:
+        """Statistiques des aller-retours HTTP et du flux suivi par cursor."""
+        stats: dict[str, Any] = {
+            "addon_url": self.addon_url,
+            "requests": self._requests,
+            "errors": self._errors,
+        }
+        for percentile in LATENCY_PERCENTILES:
+            stats[f"round_trip_p{percentile}_ms"] = self._round_trip.percentile(percentile)
+        stats["round_trip_max_ms"] = round(self._round_trip.max_ms, 1)
+        stats["frame_stream"] = (cursor or self._frame_cursor).as_dict()
+        return stats
+
     async def close(self) -> None:
         """Ferme la connexion."""
         if self._session:
@@ -0,0 +1,389 @@
+"""Pool de transceivers RFXtrx: choix de l'émetteur, bascule et fusion des réceptions."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import time
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_CONNECTION_TYPE,
+    CONF_HOST,
+    CONF_NETWORK_PORT,
+    CONF_PORT,
+    CONNECTION_TYPE_NETWORK,
+    CONNECTION_TYPE_USB,
+    DEFAULT_HOST,
+    DEFAULT_NETWORK_PORT,
+    DEFAULT_PORT,
+    PACKET_TYPE_LIGHTING1,
+    PACKET_TYPE_TRANSMITTER,
+    PROTOCOL_TO_PACKET,
+    SUBTYPE_TRANSMITTER_RESPONSE,
+    TRANSCEIVER_ACK_TIMEOUT,
+    TRANSCEIVER_DEDUPE_MAX,
+    TRANSCEIVER_DEDUPE_WINDOW,
+    TRANSCEIVER_PRIMARY,
+    TRANSCEIVER_RETRY_DELAY,
+    TRANSCEIVER_RSSI_MAX_AGE,
+    TRANSMITTER_ACK_CODES,
+)
+from .scheduler import AirtimeScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def transmit_key(
+    protocol: str, device_id: str | None, house_code: str | None, unit_code: str | None
+) -> str:
+    """Clé d'un appareil commandé, identique à l'identifiant des trames reçues."""
+    if PROTOCOL_TO_PACKET.get(protocol, (None, None))[0] == PACKET_TYPE_LIGHTING1:
+        return f"{protocol}_{house_code}_{unit_code}".lower()
+    return f"{protocol}_{device_id or ''}".lower()
+
+
+def frame_rssi(packet: bytes) -> int:
+    """Niveau de signal d'une trame reçue (quartet haut du dernier octet, 0-15)."""
+    return packet[-1] >> 4
+
+
+class Transceiver:
+    """Un RFXtrx du pool.
+
+    Le transceiver principal est celui de l'entrée (USB via l'add-on ou réseau):
+    sa connexion et ses envois restent gérés par le coordinateur. Les
+    transceivers supplémentaires sont des RFXtrx réseau (socket TCP).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connection_type: str,
+        port: str = DEFAULT_PORT,
+        host: str = DEFAULT_HOST,
+        network_port: int = DEFAULT_NETWORK_PORT,
+        scheduler: AirtimeScheduler | None = None,
+    ) -> None:
+        """Initialise un transceiver non connecté."""
+        self.name = name
+        self.connection_type = connection_type
+        self.port = port
+        self.host = host
+        self.network_port = network_port
+        self.primary = name == TRANSCEIVER_PRIMARY
+        # Chaque unité a son propre canal: son propre budget de temps d'antenne
+        self.scheduler = scheduler or AirtimeScheduler()
+        self.socket: socket.socket | None = None
+        self.available = self.primary
+        self.retry_at = 0.0
+        self.failures = 0
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.receive_task: asyncio.Task | None = None
+        self._acks: dict[int, asyncio.Future] = {}
+
+    @classmethod
+    def from_config(cls, index: int, config: dict[str, Any]) -> Transceiver:
+        """Crée un transceiver depuis sa configuration (entry.data[CONF_TRANSCEIVERS])."""
+        return cls(
+            config.get("name") or f"rfxtrx_{index + 2}",
+            config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_NETWORK),
+            port=config.get(CONF_PORT, DEFAULT_PORT),
+            host=config.get(CONF_HOST, DEFAULT_HOST),
+            network_port=config.get(CONF_NETWORK_PORT, DEFAULT_NETWORK_PORT),
+        )
+
+    @property
+    def usable(self) -> bool:
+        """Indique si le transceiver peut recevoir une commande maintenant."""
+        return self.available or time.monotonic() >= self.retry_at
+
+    @property
+    def receiving(self) -> bool:
+        """Indique si la boucle de réception lit l'unité (et donc ses réponses ACK/NAK)."""
+        return self.receive_task is not None and not self.receive_task.done()
+
+    def mark_failed(self, reason: Any) -> None:
+        """Écarte le transceiver du choix de l'émetteur jusqu'à la prochaine tentative.
+
+        La connexion n'est pas touchée: un NAK signifie seulement que l'émetteur
+        n'a pas émis. Seule la boucle de réception ferme et rouvre la socket.
+        """
+        self.failures += 1
+        self.available = False
+        self.retry_at = time.monotonic() + TRANSCEIVER_RETRY_DELAY
+        _LOGGER.warning("⚠️ Transceiver %s en échec, bascule: %s", self.name, reason)
+
+    async def async_connect(self, hass: HomeAssistant) -> None:
+        """Ouvre la socket du transceiver."""
+        await self._async_close_socket(hass)
+        sock = await hass.async_add_executor_job(
+            socket.socket, socket.AF_INET, socket.SOCK_STREAM
+        )
+        sock.settimeout(5.0)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        await hass.async_add_executor_job(sock.connect, (self.host, self.network_port))
+        self.socket = sock
+        self.available = True
+        _LOGGER.info("✅ Transceiver %s connecté (%s)", self.name, self.connection_type)
+
+    async def _async_close_socket(self, hass: HomeAssistant) -> None:
+        """Ferme la socket si elle est ouverte."""
+        if self.socket is not None:
+            sock, self.socket = self.socket, None
+            try:
+                await hass.async_add_executor_job(sock.close)
+            except Exception:
+                pass
+
+    async def async_close(self, hass: HomeAssistant) -> None:
+        """Arrête la réception et ferme le transport."""
+        if self.receive_task:
+            self.receive_task.cancel()
+            try:
+                await self.receive_task
+            except asyncio.CancelledError:
+                pass
+            self.receive_task = None
+        await self._async_close_socket(hass)
+        self.available = False
+
+    async def async_send(
+        self,
+        hass: HomeAssistant,
+        protocol: str,
+        device_id: str | None,
+        command: str,
+        house_code: str | None,
+        unit_code: str | None,
+        frame: bytes | None,
+        wait_ack: bool,
+    ) -> bool:
+        """Émet une commande; False sur NAK, absence de réponse ou déconnexion."""
+        if frame is None or self.socket is None:
+            # Socket fermée: la boucle de réception se charge de la reconnexion
+            return False
+        ack = self.expect_ack(frame[3]) if wait_ack else None
+        try:
+            await hass.async_add_executor_job(self.socket.sendall, frame)
+        except BaseException:
+            self.discard_ack(frame[3])
+            raise
+        if ack is None:
+            return True
+        return await self.async_wait_ack(frame[3], ack)
+
+    def expect_ack(self, seq: int) -> asyncio.Future:
+        """Attend la réponse du transmetteur à la trame de séquence seq (avant l'envoi)."""
+        ack = asyncio.get_running_loop().create_future()
+        self._acks[seq] = ack
+        return ack
+
+    def discard_ack(self, seq: int) -> None:
+        """Abandonne l'attente de la réponse à la séquence seq."""
+        self._acks.pop(seq, None)
+
+    async def async_wait_ack(self, seq: int, ack: asyncio.Future) -> bool:
+        """True sur ACK; False sur NAK ou sans réponse dans TRANSCEIVER_ACK_TIMEOUT."""
+        try:
+            return await asyncio.wait_for(ack, TRANSCEIVER_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("⚠️ Pas de réponse du transceiver %s (séquence %s)", self.name, seq)
+            return False
+        finally:
+            self.discard_ack(seq)
+
+    def resolve_ack(self, packet: bytes) -> bool:
+        """Traite une réponse du transmetteur; True si la trame est consommée."""
+        if len(packet) < 5 or packet[1] != PACKET_TYPE_TRANSMITTER or packet[2] != SUBTYPE_TRANSMITTER_RESPONSE:
+            return False
+        ack = self._acks.get(packet[3])
+        if ack is not None and not ack.done():
+            ack.set_result(packet[4] in TRANSMITTER_ACK_CODES)
+        return True
+
+    async def async_read_frame(self, hass: HomeAssistant) -> bytes | None:
+        """Lit une trame préfixée par sa longueur (réseau uniquement)."""
+        data = await hass.async_add_executor_job(self.socket.recv, 1)
+        if not data:
+            raise ConnectionError("connexion fermée par le RFXtrx")
+        length = data[0]
+        if length < 1 or length > 50:
+            return None
+        remaining = await hass.async_add_executor_job(self.socket.recv, length)
+        if len(remaining) < length:
+            return None
+        return data + remaining
+
+
+class TransceiverPool:
+    """Ensemble des RFXtrx d'une entrée.
+
+    L'émetteur d'un appareil est choisi selon le dernier niveau de signal reçu
+    de cet appareil par chaque unité, puis selon l'attente de temps d'antenne:
+    sans mesure, les commandes se répartissent entre les unités. Une unité qui
+    répond NAK ou se déconnecte est écartée et la commande part par la suivante.
+    Les trames reçues par plusieurs unités ne sont traitées qu'une fois.
+    """
+
+    def __init__(self, transceivers: list[Transceiver]) -> None:
+        """Initialise le pool (le premier transceiver est le principal)."""
+        self.transceivers = transceivers
+        self._by_name = {transceiver.name: transceiver for transceiver in transceivers}
+        # Niveau de signal par appareil puis par transceiver: (rssi, instant)
+        self._rssi: dict[str, dict[str, tuple[int, float]]] = {}
+        # Trames récentes (sans séquence ni RSSI): (instant, transceiver)
+        self._recent: dict[bytes, tuple[float, str]] = {}
+        self.duplicates = 0
+        self.failovers = 0
+
+    @classmethod
+    def from_config(
+        cls, primary: Transceiver, configs: list[dict[str, Any]]
+    ) -> TransceiverPool:
+        """Crée le pool: transceiver principal puis transceivers supplémentaires.
+
+        Les unités USB supplémentaires sont ignorées: l'add-on ne pilote qu'un
+        port série, et alterner entre deux ports couperait celui de l'entrée.
+        """
+        transceivers = [primary]
+        for index, config in enumerate(configs):
+            if config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_NETWORK) == CONNECTION_TYPE_USB:
+                _LOGGER.error(
+                    "❌ Transceiver supplémentaire %s ignoré: seuls les RFXtrx réseau sont pris en charge "
+                    "(l'add-on ne gère qu'un port série, celui de l'entrée)",
+                    config.get("name") or config.get(CONF_PORT, DEFAULT_PORT),
+                )
+                continue
+            transceivers.append(Transceiver.from_config(index, config))
+        return cls(transceivers)
+
+    @property
+    def extras(self) -> list[Transceiver]:
+        """Transceivers supplémentaires (hors principal)."""
+        return [transceiver for transceiver in self.transceivers if not transceiver.primary]
+
+    def get(self, name: str | None) -> Transceiver | None:
+        """Transceiver par nom."""
+        return self._by_name.get(name or TRANSCEIVER_PRIMARY)
+
+    def note_reception(self, key: str, source: str | None, rssi: int) -> None:
+        """Mémorise le niveau de signal d'un appareil reçu par une unité."""
+        name = source or TRANSCEIVER_PRIMARY
+        self._rssi.setdefault(key.lower(), {})[name] = (rssi, time.monotonic())
+        transceiver = self._by_name.get(name)
+        if transceiver is not None:
+            transceiver.frames_received += 1
+
+    def is_duplicate(self, packet: bytes, source: str | None) -> bool:
+        """Indique si la trame vient d'être reçue par une autre unité."""
+        name = source or TRANSCEIVER_PRIMARY
+        now = time.monotonic()
+        # Séquence (octet 3) et RSSI (dernier octet) diffèrent d'une unité à l'autre
+        key = bytes(packet[1:3]) + bytes(packet[4:-1])
+        previous = self._recent.get(key)
+        if previous is not None and previous[1] != name and now - previous[0] < TRANSCEIVER_DEDUPE_WINDOW:
+            self.duplicates += 1
+            return True
+        if len(self._recent) >= TRANSCEIVER_DEDUPE_MAX:
+            self._recent = {
+                recent_key: recent
+                for recent_key, recent in self._recent.items()
+                if now - recent[0] < TRANSCEIVER_DEDUPE_WINDOW
+            }
+        self._recent[key] = (now, name)
+        return False
+
+    def candidates(self, key: str, airtime_ms: float) -> list[Transceiver]:
+        """Transceivers à essayer pour un appareil, du meilleur au moins bon."""
+        now = time.monotonic()
+        levels = {
+            name: rssi
+            for name, (rssi, seen_at) in self._rssi.get(key.lower(), {}).items()
+            if now - seen_at < TRANSCEIVER_RSSI_MAX_AGE
+        }
+
+        def _rank(transceiver: Transceiver) -> tuple[bool, int, float, int]:
+            return (
+                not transceiver.usable,
+                -levels.get(transceiver.name, -1),
+                transceiver.scheduler.delay_for(airtime_ms),
+                transceiver.failures,
+            )
+
+        return sorted(self.transceivers, key=_rank)
+
+    async def async_connect(self, hass: HomeAssistant) -> None:
+        """Connecte les transceivers supplémentaires (un échec n'est pas bloquant)."""
+        for transceiver in self.extras:
+            try:
+                await transceiver.async_connect(hass)
+            except Exception as err:
+                transceiver.mark_failed(err)
+
+    def async_start_receiving(
+        self,
+        hass: HomeAssistant,
+        handler: Callable[[bytes, str], Awaitable[None]],
+    ) -> None:
+        """Démarre la réception des transceivers supplémentaires."""
+        for transceiver in self.extras:
+            if transceiver.receive_task is None:
+                transceiver.receive_task = asyncio.create_task(
+                    self._async_receive_loop(hass, transceiver, handler)
+                )
+
+    async def _async_receive_loop(
+        self,
+        hass: HomeAssistant,
+        transceiver: Transceiver,
+        handler: Callable[[bytes, str], Awaitable[None]],
+    ) -> None:
+        """Boucle de réception d'un transceiver supplémentaire.
+
+        Seule propriétaire des reconnexions: la socket n'est fermée et rouverte
+        qu'ici, jamais pendant une lecture ou une émission en cours.
+        """
+        while True:
+            try:
+                if transceiver.socket is None:
+                    await asyncio.sleep(max(1.0, transceiver.retry_at - time.monotonic()))
+                    await transceiver.async_connect(hass)
+                    continue
+                packet = await transceiver.async_read_frame(hass)
+                if packet is None:
+                    continue
+                if transceiver.resolve_ack(packet):
+                    continue
+                await handler(packet, transceiver.name)
+            except asyncio.CancelledError:
+                raise
+            except socket.timeout:
+                continue
+            except Exception as err:
+                # Connexion perdue ou reconnexion impossible: nouvel essai après le délai
+                transceiver.mark_failed(err)
+                await transceiver._async_close_socket(hass)
+
+    async def async_close(self, hass: HomeAssistant) -> None:
+        """Ferme les transceivers supplémentaires."""
+        for transceiver in self.extras:
+            await transceiver.async_close(hass)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """État et compteurs de chaque transceiver."""
+        return [
+            {
+                "name": transceiver.name,
+                "connection_type": transceiver.connection_type,
+                "available": transceiver.available,
+                "failures": transceiver.failures,
+                "frames_sent": transceiver.frames_sent,
+                "frames_received": transceiver.frames_received,
+                "airtime": transceiver.scheduler.stats(),
+            }
+            for transceiver in self.transceivers
+        ]
@@ -0,0 +1,111 @@
+"""Inventaire des ports série pour RFXCOM, mis en cache hors de la boucle d'événements."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_PORT_INVENTORY, PORT_INVENTORY_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Instantané immuable: ((device, description, manufacturer), ...)
+PortSnapshot = tuple[tuple[str, Optional[str], Optional[str]], ...]
+
+
+def scan_serial_ports() -> PortSnapshot:
+    """Énumère les ports série (bloquant, à exécuter dans l'executor)."""
+    import serial.tools.list_ports
+
+    return tuple(
+        (port.device, port.description, port.manufacturer)
+        for port in serial.tools.list_ports.comports()
+    )
+
+
+class PortInventory:
+    """Cache des ports série avec TTL court et invalidation sur événement USB."""
+
+    def __init__(self, hass: HomeAssistant, ttl: float = PORT_INVENTORY_TTL) -> None:
+        """Initialise l'inventaire."""
+        self.hass = hass
+        self.ttl = ttl
+        self._snapshot: PortSnapshot | None = None
+        self._timestamp = 0.0
+        self._lock = asyncio.Lock()
+        self._unsub_usb: Callable[[], None] | None = None
+        self._usb_listening = False
+
+    def _is_fresh(self) -> bool:
+        """Indique si l'instantané courant est encore valide."""
+        return (
+            self._snapshot is not None
+            and (time.monotonic() - self._timestamp) < self.ttl
+        )
+
+    async def async_get_ports(self) -> PortSnapshot:
+        """Retourne l'instantané des ports, rafraîchi dans l'executor si expiré."""
+        if self._is_fresh():
+            return self._snapshot
+
+        async with self._lock:
+            # Un autre appel a pu rafraîchir le cache pendant l'attente du verrou
+            if self._is_fresh():
+                return self._snapshot
+
+            self._async_listen_usb_events()
+            try:
+                snapshot = await self.hass.async_add_executor_job(scan_serial_ports)
+            except Exception as err:
+                _LOGGER.warning("Erreur lors de la détection des ports série: %s", err)
+                snapshot = self._snapshot or ()
+            self._snapshot = snapshot
+            self._timestamp = time.monotonic()
+            _LOGGER.debug("Inventaire des ports série rafraîchi: %s port(s)", len(snapshot))
+            return snapshot
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Invalide le cache (le prochain accès relancera l'énumération)."""
+        self._snapshot = None
+        self._timestamp = 0.0
+
+    @callback
+    def _async_listen_usb_events(self) -> None:
+        """S'abonne aux événements de branchement USB si le composant usb est disponible."""
+        if self._usb_listening:
+            return
+        self._usb_listening = True
+        try:
+            from homeassistant.components import usb
+
+            self._unsub_usb = usb.async_register_port_event_callback(
+                self.hass, self._async_usb_port_event
+            )
+            _LOGGER.debug("Inventaire des ports abonné aux événements USB")
+        except Exception as err:
+            # Composant usb absent ou version de Home Assistant trop ancienne: TTL seul
+            _LOGGER.debug("Événements USB indisponibles, rafraîchissement par TTL uniquement: %s", err)
+
+    @callback
+    def _async_usb_port_event(self, added: set, removed: set) -> None:
+        """Invalide le cache lors d'un branchement ou débranchement USB."""
+        _LOGGER.debug(
+            "Événement USB: %s ajouté(s), %s retiré(s) - invalidation de l'inventaire",
+            len(added),
+            len(removed),
+        )
+        self.async_invalidate()
+
+
+@callback
+def async_get_port_inventory(hass: HomeAssistant) -> PortInventory:
+    """Retourne l'inventaire partagé des ports série."""
+    inventory = hass.data.get(DATA_PORT_INVENTORY)
+    if inventory is None:
+        inventory = PortInventory(hass)
+        hass.data[DATA_PORT_INVENTORY] = inventory
+    return inventory
@@ -0,0 +1,370 @@
+"""Ordonnancement des émissions RF: temps d'antenne (token bucket) et priorités."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from .const import (
+    AIRTIME_BUCKET_MS,
+    AIRTIME_BY_PACKET_TYPE,
+    AIRTIME_BY_PROTOCOL,
+    AIRTIME_DEFAULT_MS,
+    AIRTIME_DUTY_CYCLE,
+    AIRTIME_STATS_WINDOW,
+    PRIORITY_AGING,
+    PRIORITY_AUTOMATION,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NAMES,
+    PROTOCOL_TO_PACKET,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def estimate_airtime(protocol: str) -> float:
+    """Retourne le temps d'antenne estimé (ms) d'une trame pour un protocole."""
+    if protocol in AIRTIME_BY_PROTOCOL:
+        return AIRTIME_BY_PROTOCOL[protocol]
+    packet_type = PROTOCOL_TO_PACKET.get(protocol, (None, None))[0]
+    return AIRTIME_BY_PACKET_TYPE.get(packet_type, AIRTIME_DEFAULT_MS)
+
+
+class AirtimeScheduler:
+    """Token bucket sur le temps d'antenne du canal 433 MHz (half-duplex).
+
+    Le seau se remplit à raison de duty_cycle ms de temps d'antenne par ms
+    écoulée, jusqu'à capacity_ms. Chaque émission consomme le temps d'antenne
+    estimé de ses trames: une émission isolée part immédiatement, une rafale
+    est espacée au rythme où le canal se libère.
+    """
+
+    def __init__(
+        self,
+        capacity_ms: float = AIRTIME_BUCKET_MS,
+        duty_cycle: float = AIRTIME_DUTY_CYCLE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise l'ordonnanceur avec un seau plein."""
+        self.capacity_ms = capacity_ms
+        self.duty_cycle = duty_cycle
+        self._clock = clock
+        self._tokens = capacity_ms
+        self._updated = clock()
+        # Fenêtre glissante: (instant d'émission, temps d'antenne ms, attente totale ms)
+        self._history: deque[tuple[float, float, float]] = deque(maxlen=AIRTIME_STATS_WINDOW)
+        self.frames_sent = 0
+        self.airtime_total_ms = 0.0
+        self.max_queue_delay_ms = 0.0
+
+    def _refill(self) -> None:
+        """Ajoute le temps d'antenne libéré depuis la dernière mise à jour."""
+        now = self._clock()
+        elapsed_ms = (now - self._updated) * 1000
+        self._updated = now
+        self._tokens = min(self.capacity_ms, self._tokens + elapsed_ms * self.duty_cycle)
+
+    def delay_for(self, airtime_ms: float) -> float:
+        """Retourne l'attente (ms) nécessaire avant d'émettre airtime_ms."""
+        self._refill()
+        # Une trame plus longue que le seau part dès qu'il est plein
+        needed = min(airtime_ms, self.capacity_ms)
+        if self._tokens >= needed:
+            return 0.0
+        return (needed - self._tokens) / self.duty_cycle
+
+    async def async_acquire(
+        self, airtime_ms: float, frames: int = 1, enqueued_at: float | None = None
+    ) -> float:
+        """Attend que le canal soit libre puis réserve le temps d'antenne.
+
+        enqueued_at (time.monotonic) permet de mesurer l'attente depuis la
+        demande initiale, verrou d'émission compris. Retourne l'attente (ms)
+        imposée par le seau.
+
+        Le temps d'antenne est réservé avant l'attente: deux appels concurrents
+        ne peuvent pas compter sur le même solde, le second attend la fin du
+        premier.
+        """
+        delay_ms = self.delay_for(airtime_ms)
+        # Le solde peut devenir négatif: la trame suivante attendra la fin de celle-ci
+        self._tokens -= airtime_ms
+        if delay_ms > 0:
+            _LOGGER.debug(
+                "⏳ Canal RF occupé: émission de %.0f ms retardée de %.0f ms",
+                airtime_ms,
+                delay_ms,
+            )
+            try:
+                await asyncio.sleep(delay_ms / 1000)
+            except asyncio.CancelledError:
+                # Émission abandonnée: le temps d'antenne réservé est rendu
+                self._tokens += airtime_ms
+                raise
+
+        now = self._clock()
+        queue_delay_ms = (now - enqueued_at) * 1000 if enqueued_at is not None else delay_ms
+        self._history.append((now, airtime_ms, queue_delay_ms))
+        self.frames_sent += frames
+        self.airtime_total_ms += airtime_ms
+        self.max_queue_delay_ms = max(self.max_queue_delay_ms, queue_delay_ms)
+        return delay_ms
+
+    def stats(self) -> dict[str, Any]:
+        """Retourne débit mesuré, occupation du canal et attente en file."""
+        history = list(self._history)
+        stats: dict[str, Any] = {
+            "frames_sent": self.frames_sent,
+            "airtime_total_ms": round(self.airtime_total_ms, 1),
+            "bucket_ms": round(self._tokens, 1),
+            "throughput_per_s": 0.0,
+            "channel_utilization": 0.0,
+            "queue_delay_avg_ms": 0.0,
+            "queue_delay_max_ms": round(self.max_queue_delay_ms, 1),
+        }
+        if not history:
+            return stats
+        stats["queue_delay_avg_ms"] = round(
+            sum(delay for _, _, delay in history) / len(history), 1
+        )
+        span = history[-1][0] - history[0][0]
+        if len(history) > 1 and span > 0:
+            stats["throughput_per_s"] = round((len(history) - 1) / span, 2)
+            # Temps d'antenne des émissions postérieures à la première de la fenêtre
+            airtime_s = sum(airtime for _, airtime, _ in history[1:]) / 1000
+            stats["channel_utilization"] = round(min(1.0, airtime_s / span), 3)
+        return stats
+
+
+def priority_for_context(context: Any) -> int:
+    """Classe de priorité d'une commande selon son contexte Home Assistant.
+
+    Une action déclenchée par un utilisateur porte un user_id; les
+    automatisations et scripts n'en ont pas.
+    """
+    if context is None or getattr(context, "user_id", None):
+        return PRIORITY_INTERACTIVE
+    return PRIORITY_AUTOMATION
+
+
+def entity_command_priority(entity: Any) -> int:
+    """Classe de priorité d'une commande émise par une entité.
+
+    Home Assistant pose le contexte de l'appel de service sur l'entité avant
+    d'appeler turn_on/turn_off.
+    """
+    return priority_for_context(getattr(entity, "_context", None))
+
+
+class _Waiter:
+    """Demande d'accès au canal en attente."""
+
+    __slots__ = ("priority", "seq", "enqueued_at", "future", "owner")
+
+    def __init__(
+        self, priority: int, seq: int, enqueued_at: float, future: asyncio.Future, owner: Any = None
+    ) -> None:
+        """Initialise la demande."""
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = enqueued_at
+        self.future = future
+        self.owner = owner
+
+
+class PriorityLock:
+    """Verrou d'émission à priorité stricte avec vieillissement anti-famine.
+
+    À chaque libération, la demande de plus haute priorité est servie (FIFO à
+    priorité égale). Une demande gagne une classe par tranche de aging_s
+    secondes d'attente: une rafale de basse priorité finit toujours par passer.
+    """
+
+    def __init__(
+        self,
+        aging_s: float = PRIORITY_AGING,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise le verrou libre."""
+        self.aging_s = aging_s
+        self._clock = clock
+        self._locked = False
+        self._waiters: list[_Waiter] = []
+        self._seq = 0
+        self.promoted = 0
+        self.max_wait_ms: dict[int, float] = {}
+        # Prévenus à chaque variation de la file d'attente
+        self._listeners: list[Callable[[], None]] = []
+
+    def locked(self) -> bool:
+        """Indique si le canal est réservé."""
+        return self._locked
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de demandes en attente."""
+        return len(self._waiters)
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Abonne listener aux variations de la file d'attente.
+
+        Retourne la fonction de désabonnement.
+        """
+        self._listeners.append(listener)
+
+        def _remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove_listener
+
+    def _notify(self) -> None:
+        """Prévient les abonnés que la file d'attente a changé."""
+        for listener in list(self._listeners):
+            listener()
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> int:
+        """Priorité après vieillissement."""
+        if self.aging_s <= 0:
+            return waiter.priority
+        return max(0, waiter.priority - int((now - waiter.enqueued_at) / self.aging_s))
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, owner: Any = None) -> None:
+        """Attend l'accès au canal pour une classe de priorité.
+
+        owner identifie la demande pour raise_priority.
+        """
+        now = self._clock()
+        if not self._locked and not self._waiters:
+            self._locked = True
+            self._record_wait(priority, 0.0)
+            return
+
+        self._seq += 1
+        waiter = _Waiter(priority, self._seq, now, asyncio.get_running_loop().create_future(), owner)
+        self._waiters.append(waiter)
+        self._notify()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._notify()
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # Le verrou venait d'être transmis: le rendre au suivant
+                self.release()
+            raise
+        self._record_wait(waiter.priority, (self._clock() - waiter.enqueued_at) * 1000)
+
+    def raise_priority(self, owner: Any, priority: int) -> bool:
+        """Relève la classe d'une demande en attente (sans perdre son ancienneté).
+
+        Retourne True si une demande de owner attendait le canal.
+        """
+        for waiter in self._waiters:
+            if waiter.owner is owner:
+                waiter.priority = min(waiter.priority, priority)
+                return True
+        return False
+
+    def release(self) -> None:
+        """Libère le canal et le transmet à la demande la plus prioritaire."""
+        if not self._waiters:
+            self._locked = False
+            return
+        now = self._clock()
+        waiter = min(
+            self._waiters, key=lambda w: (self._effective_priority(w, now), w.seq)
+        )
+        self._waiters.remove(waiter)
+        if self._effective_priority(waiter, now) < waiter.priority:
+            self.promoted += 1
+        self._notify()
+        # Le verrou reste pris: il passe directement à la demande servie
+        waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def hold(self, priority: int = PRIORITY_INTERACTIVE, owner: Any = None) -> AsyncIterator[None]:
+        """Réserve le canal le temps d'un bloc `async with`."""
+        await self.acquire(priority, owner)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record_wait(self, priority: int, wait_ms: float) -> None:
+        """Mémorise l'attente maximale observée par classe."""
+        self.max_wait_ms[priority] = max(self.max_wait_ms.get(priority, 0.0), wait_ms)
+
+    def stats(self) -> dict[str, Any]:
+        """Retourne file d'attente par classe, promotions et attentes maximales."""
+        waiting = {name: 0 for name in PRIORITY_NAMES.values()}
+        for waiter in self._waiters:
+            waiting[PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))] += 1
+        return {
+            "waiting": waiting,
+            "promoted": self.promoted,
+            "max_wait_ms": {
+                PRIORITY_NAMES.get(priority, str(priority)): round(wait, 1)
+                for priority, wait in sorted(self.max_wait_ms.items())
+            },
+        }
+
+
+def empty_burst_result(rate: float) -> dict[str, Any]:
+    """Bilan d'une rafale sans aucune émission."""
+    return {
+        "sent": 0,
+        "failed": 0,
+        "skipped": 0,
+        "duration": 0.0,
+        "target_rate": rate,
+        "achieved_rate": 0.0,
+    }
+
+
+async def async_run_burst(
+    send_once: Callable[[], Awaitable[bool]],
+    rate: float,
+    duration: float,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict[str, Any]:
+    """Appelle send_once à cadence fixe pendant duration secondes.
+
+    Les échéances sont calculées depuis le début de la rafale sur l'horloge
+    monotone: la latence d'un envoi ne décale pas les suivants. Un retard de
+    plus d'une période fait sauter les créneaux manqués plutôt que de les
+    rattraper en rafale. Retourne trames émises, échecs, créneaux sautés,
+    durée et cadence obtenue.
+    """
+    result = empty_burst_result(rate)
+    period = 1 / rate
+    slots = max(1, round(duration * rate))
+    start = clock()
+    slot = 0
+    while slot < slots:
+        delay = start + slot * period - clock()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            success = await send_once()
+        except Exception as err:
+            _LOGGER.debug("Échec d'une trame de la rafale: %s", err)
+            success = False
+        result["sent" if success else "failed"] += 1
+
+        slot += 1
+        late = clock() - (start + slot * period)
+        if late > period:
+            missed = min(int(late / period), slots - slot)
+            result["skipped"] += missed
+            slot += missed
+
+    elapsed = clock() - start
+    result["duration"] = round(elapsed, 3)
+    # La dernière trame ouvre son créneau: la rafale couvre au moins duration
+    result["achieved_rate"] = round(result["sent"] / max(elapsed, duration), 2)
+    return result
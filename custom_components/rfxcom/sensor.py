@@ -10,10 +10,9 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, PERCENTAGE
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import UnitOfTemperature, UnitOfTime, PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -22,11 +21,23 @@ from .const import (
     PROTOCOL_TEMP_HUM,
     CONF_PROTOCOL,
     CONF_DEVICE_ID,
+    LATENCY_PERCENTILES,
 )
 from .coordinator import RFXCOMCoordinator
+from .device_identity import (
+    async_get_device_identities,
+    async_sync_device_registry,
+    build_device_info,
+    build_hub_device_info,
+    temp_hum_identifier,
+)
+from .metrics import STAGES
 
 _LOGGER = logging.getLogger(__name__)
 
+QUEUE_DEPTH = "queue_depth"
+IN_FLIGHT = "in_flight"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,53 +47,57 @@ async def async_setup_entry(
     """Configure les capteurs RFXCOM."""
     coordinator: RFXCOMCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    # Entités de diagnostic du hub: latences des commandes et file d'émission
+    hub_device_info = build_hub_device_info(entry)
+    async_add_entities(
+        [
+            RFXCOMCommandLatencySensor(coordinator, entry, percentile, hub_device_info)
+            for percentile in LATENCY_PERCENTILES
+        ]
+        + [
+            RFXCOMQueueSensor(coordinator, entry, key, hub_device_info)
+            for key in (QUEUE_DEPTH, IN_FLIGHT)
+        ]
+    )
+
     # Charger les appareils configurés
     devices = entry.options.get("devices", [])
     _LOGGER.debug("Configuration de %s appareils RFXCOM (sensors)", len(devices))
 
-    entities = []
-    for device_config in devices:
-        if device_config.get(CONF_PROTOCOL) == PROTOCOL_TEMP_HUM:
-            device_id = device_config.get(CONF_DEVICE_ID)
-            sensor_data = device_config.get("sensor_data", {})
-            name = device_config.get("name", f"RFXCOM Temp/Hum {device_id}")
-            unique_id = f"{entry.entry_id}_temp_hum_{device_id}"
-            device_identifier = f"{PROTOCOL_TEMP_HUM}_{device_id}"
-
-            _LOGGER.debug(
-                "Création capteur TEMP_HUM: %s (device_id=%s)",
-                name,
-                device_id,
-            )
+    sensors = []
+    for identity in async_get_device_identities(hass, entry):
+        if identity.protocol != PROTOCOL_TEMP_HUM:
+            continue
+        device_id = identity.device_id
+        name = identity.config.get("name", f"RFXCOM Temp/Hum {device_id}")
+        sensors.append((device_id, name, temp_hum_identifier(device_id)))
 
-            # Créer ou récupérer le device dans le device registry
-            device_registry = dr.async_get(hass)
-            device_entry = device_registry.async_get_or_create(
-                config_entry_id=entry.entry_id,
-                identifiers={(DOMAIN, device_identifier)},
-                name=name,
-                manufacturer="RFXCOM",
-                model=PROTOCOL_TEMP_HUM,
-            )
+    # Registry synchronisé en une passe, appareils inchangés ignorés
+    async_sync_device_registry(
+        hass,
+        entry,
+        ((identifier, name, PROTOCOL_TEMP_HUM) for _, name, identifier in sensors),
+    )
 
-            device_info = DeviceInfo(
-                identifiers={(DOMAIN, device_identifier)},
+    entities = []
+    for device_id, name, device_identifier in sensors:
+        _LOGGER.debug(
+            "Création capteur TEMP_HUM: %s (device_id=%s)",
+            name,
+            device_id,
+        )
+        # Créer une seule entité composite pour température et humidité
+        entities.append(
+            RFXCOMTempHumSensor(
+                coordinator=coordinator,
                 name=name,
-                manufacturer="RFXCOM",
-                model=PROTOCOL_TEMP_HUM,
-                via_device=(DOMAIN, entry.entry_id),
-            )
-
-            # Créer une seule entité composite pour température et humidité
-            entities.append(
-                RFXCOMTempHumSensor(
-                    coordinator=coordinator,
-                    name=name,
-                    device_id=device_id,
-                    unique_id=unique_id,
-                    device_info=device_info,
-                )
+                device_id=device_id,
+                unique_id=f"{entry.entry_id}_temp_hum_{device_id}",
+                device_info=build_device_info(
+                    entry, device_identifier, name, PROTOCOL_TEMP_HUM
+                ),
             )
+        )
 
     _LOGGER.info("Création de %s entités sensor RFXCOM", len(entities))
     async_add_entities(entities)
@@ -169,3 +184,102 @@ class RFXCOMTempHumSensor(
             attrs["status"] = self._status
         return attrs
 
+
+class RFXCOMCommandLatencySensor(SensorEntity):
+    """Percentile de la latence des commandes (enqueue -> ack), en ms.
+
+    Les percentiles de chaque étape (verrou, canal RF, transport) sont exposés
+    en attributs pour localiser l'origine d'une lenteur.
+    """
+
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: RFXCOMCoordinator,
+        entry: ConfigEntry,
+        percentile: int,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialise le capteur de latence."""
+        self.coordinator = coordinator
+        self._percentile = percentile
+        self._attr_name = f"RFXCOM latence commande p{percentile}"
+        self._attr_unique_id = f"{entry.entry_id}_command_latency_p{percentile}"
+        self._attr_device_info = device_info
+
+    @property
+    def native_value(self) -> float | None:
+        """Latence totale au percentile, None tant qu'aucune commande n'est émise."""
+        return self.coordinator.metrics.percentile(self._percentile)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Percentile par étape et nombre de commandes mesurées."""
+        metrics = self.coordinator.metrics
+        attributes: dict[str, Any] = {
+            f"{stage}_ms": metrics.percentile(self._percentile, stage) for stage in STAGES
+        }
+        attributes["count"] = metrics.histograms["total"].count
+        attributes["failed"] = metrics.failed
+        # Réseau sans boucle de réception: transport mesuré jusqu'à la fin d'écriture
+        attributes["unacked"] = metrics.unacked
+        return attributes
+
+
+class RFXCOMQueueSensor(SensorEntity):
+    """Profondeur de la file d'émission ou nombre de commandes en vol.
+
+    L'état est poussé à chaque variation: une file vidée entre deux
+    interrogations resterait invisible.
+    """
+
+    _attr_icon = "mdi:tray-full"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: RFXCOMCoordinator,
+        entry: ConfigEntry,
+        key: str,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialise le capteur (key: QUEUE_DEPTH ou IN_FLIGHT)."""
+        self.coordinator = coordinator
+        self._key = key
+        self._attr_name = (
+            "RFXCOM file d'émission" if key == QUEUE_DEPTH else "RFXCOM commandes en vol"
+        )
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_device_info = device_info
+        self._written_value: int | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Abonne le capteur aux variations de la file d'émission."""
+        await super().async_added_to_hass()
+        # État initial écrit par Home Assistant à l'ajout de l'entité
+        self._written_value = self.native_value
+        self.async_on_remove(
+            self.coordinator.async_add_queue_listener(self._async_handle_queue_change)
+        )
+
+    @callback
+    def _async_handle_queue_change(self) -> None:
+        """Écrit l'état si la valeur suivie a changé."""
+        value = self.native_value
+        if value == self._written_value:
+            return
+        self._written_value = value
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> int:
+        """Valeur courante."""
+        if self._key == QUEUE_DEPTH:
+            return self.coordinator.queue_depth
+        return self.coordinator.metrics.in_flight
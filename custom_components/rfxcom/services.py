@@ -5,12 +5,15 @@ import asyncio
 import logging
 import os
 import subprocess
+from datetime import datetime
 from pathlib import Path
 
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 
 from .const import (
     DOMAIN,
@@ -46,12 +49,18 @@ from .const import (
     CONF_DEVICE_ID,
     CONF_HOUSE_CODE,
     CONF_UNIT_CODE,
+    CMD_ON,
+    CMD_OFF,
+    TRACE_DUMP_SECONDS,
 )
+from .device_identity import DeviceIdentity, async_find_device_identity
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_PAIR_DEVICE = "pair_device"
 SERVICE_SEND_COMMAND = "send_command"
+SERVICE_GROUP_COMMAND = "group_command"
+SERVICE_DUMP_PACKET_TRACE = "dump_packet_trace"
 
 PAIR_DEVICE_SCHEMA = vol.Schema(
     {
@@ -73,6 +82,65 @@ SEND_COMMAND_SCHEMA = vol.Schema(
     }
 )
 
+GROUP_COMMAND_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("entity_id", default=[]): cv.entity_ids,
+            vol.Optional("device_id", default=[]): vol.All(cv.ensure_list, [cv.string]),
+            vol.Required("command"): vol.In(["on", "off"]),
+        }
+    ),
+    cv.has_at_least_one_key("entity_id", "device_id"),
+)
+
+DUMP_PACKET_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("seconds", default=TRACE_DUMP_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+    }
+)
+
+
+def _resolve_group_targets(
+    hass: HomeAssistant, entity_ids: list[str], device_ids: list[str]
+) -> dict[str, list[DeviceIdentity]]:
+    """Résout entités et appareils Home Assistant en appareils RFXCOM, par entrée."""
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    entries = {entry.entry_id: entry for entry in hass.config_entries.async_entries(DOMAIN)}
+
+    registry_device_ids = list(device_ids)
+    for entity_id in entity_ids:
+        entity_entry = entity_registry.async_get(entity_id)
+        if entity_entry is None or entity_entry.device_id is None:
+            _LOGGER.warning("Entité ignorée (inconnue ou sans appareil): %s", entity_id)
+            continue
+        registry_device_ids.append(entity_entry.device_id)
+
+    targets: dict[str, list[DeviceIdentity]] = {}
+    for registry_device_id in dict.fromkeys(registry_device_ids):
+        device = device_registry.async_get(registry_device_id)
+        if device is None:
+            _LOGGER.warning("Appareil ignoré (inconnu): %s", registry_device_id)
+            continue
+        identity = None
+        for entry_id in device.config_entries:
+            entry = entries.get(entry_id)
+            if entry is None:
+                continue
+            for domain, identifier in device.identifiers:
+                if domain == DOMAIN:
+                    identity = async_find_device_identity(hass, entry, identifier)
+                    if identity is not None:
+                        targets.setdefault(entry_id, []).append(identity)
+                        break
+            if identity is not None:
+                break
+        if identity is None:
+            _LOGGER.warning("Appareil ignoré (pas un appareil RFXCOM configuré): %s", registry_device_id)
+    return targets
+
 
 def _get_node_script_path() -> Path:
     """Retourne le chemin du script Node.js."""
@@ -256,16 +324,62 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         else:
             _LOGGER.error("Échec de l'envoi de la commande %s", command)
     
+    async def group_command(call: ServiceCall) -> None:
+        """Envoie une commande ON/OFF à un ensemble d'appareils RFXCOM."""
+        _LOGGER.debug("Service group_command appelé: %s", call.data)
+        command = CMD_ON if call.data["command"] == "on" else CMD_OFF
+        targets = _resolve_group_targets(
+            hass, call.data["entity_id"], call.data["device_id"]
+        )
+        if not targets:
+            _LOGGER.error("Aucun appareil RFXCOM trouvé pour la commande de groupe")
+            return
+
+        for entry_id, identities in targets.items():
+            coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+            if coordinator is None:
+                _LOGGER.error("Intégration RFXCOM non chargée pour l'entrée %s", entry_id)
+                continue
+            success = await coordinator.async_send_group_command(
+                [identity.config for identity in identities], command
+            )
+            if success:
+                _LOGGER.info(
+                    "Commande de groupe %s envoyée à %s appareil(s)", command, len(identities)
+                )
+            else:
+                _LOGGER.error("Échec de la commande de groupe %s", command)
+
+    async def dump_packet_trace(call: ServiceCall) -> None:
+        """Écrit les trames des dernières secondes dans un fichier pcap par entrée."""
+        seconds = call.data["seconds"]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+            capture = coordinator.trace.export_pcap(seconds)
+            path = Path(hass.config.path(f"rfxcom_trace_{entry_id}_{timestamp}.pcap"))
+            await hass.async_add_executor_job(path.write_bytes, capture)
+            _LOGGER.info(
+                "📼 Trace RFXCOM des %s dernières secondes écrite dans %s", seconds, path
+            )
+
     hass.services.async_register(
         DOMAIN, SERVICE_PAIR_DEVICE, pair_device, schema=PAIR_DEVICE_SCHEMA
     )
     hass.services.async_register(
         DOMAIN, SERVICE_SEND_COMMAND, send_command, schema=SEND_COMMAND_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GROUP_COMMAND, group_command, schema=GROUP_COMMAND_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP_PACKET_TRACE, dump_packet_trace, schema=DUMP_PACKET_TRACE_SCHEMA
+    )
 
 
 async def async_unload_services(hass: HomeAssistant) -> None:
     """Décharge les services RFXCOM."""
     hass.services.async_remove(DOMAIN, SERVICE_PAIR_DEVICE)
     hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMAND)
+    hass.services.async_remove(DOMAIN, SERVICE_GROUP_COMMAND)
+    hass.services.async_remove(DOMAIN, SERVICE_DUMP_PACKET_TRACE)
 
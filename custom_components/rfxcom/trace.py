@@ -0,0 +1,111 @@
+"""Trace binaire des trames RFXtrx, indépendante des logs texte."""
+from __future__ import annotations
+
+import struct
+import time
+from array import array
+from typing import Callable
+
+from .const import (
+    TRACE_CAPACITY,
+    TRACE_DIRECTION_RX,
+    TRACE_DIRECTION_TX,
+    TRACE_SLOT_SIZE,
+)
+
+# Format pcap classique (microsecondes). Chaque paquet est précédé d'un octet
+# de direction (0 reçu, 1 émis); le type de lien est réservé à l'utilisateur.
+PCAP_MAGIC = 0xA1B2C3D4
+PCAP_LINKTYPE_USER0 = 147
+_PCAP_HEADER = struct.Struct("<IHHiIII")
+_PCAP_RECORD = struct.Struct("<IIII")
+
+
+class PacketTrace:
+    """Tampon circulaire de trames dans une arène d'octets préallouée.
+
+    Chaque trame occupe un emplacement de taille fixe; horodatage, direction et
+    longueur sont rangés dans des tableaux parallèles. L'enregistrement ne fait
+    que des copies d'octets, sans allocation ni formatage.
+    """
+
+    def __init__(
+        self,
+        capacity: int = TRACE_CAPACITY,
+        slot_size: int = TRACE_SLOT_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Préalloue l'arène et les tableaux de métadonnées."""
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._clock = clock
+        self._arena = bytearray(capacity * slot_size)
+        self._times = array("d", bytes(8 * capacity))
+        self._lengths = array("H", bytes(2 * capacity))
+        self._directions = bytearray(capacity)
+        self.total = 0  # trames enregistrées depuis le démarrage
+
+    def __len__(self) -> int:
+        """Nombre de trames conservées."""
+        return min(self.total, self.capacity)
+
+    def record(self, direction: int, frame: bytes) -> None:
+        """Enregistre une trame (tronquée à la taille d'un emplacement)."""
+        slot = self.total % self.capacity
+        length = len(frame)
+        stored = min(length, self.slot_size)
+        offset = slot * self.slot_size
+        self._arena[offset:offset + stored] = frame if stored == length else memoryview(frame)[:stored]
+        self._times[slot] = self._clock()
+        self._lengths[slot] = length
+        self._directions[slot] = direction
+        self.total += 1
+
+    def received(self, frame: bytes) -> None:
+        """Enregistre une trame reçue."""
+        self.record(TRACE_DIRECTION_RX, frame)
+
+    def sent(self, frame: bytes) -> None:
+        """Enregistre une trame émise."""
+        self.record(TRACE_DIRECTION_TX, frame)
+
+    def entries(self, seconds: float | None = None) -> list[tuple[float, int, bytes, int]]:
+        """Retourne les trames conservées, des plus anciennes aux plus récentes.
+
+        Chaque trame est (temps monotone, direction, octets, longueur d'origine);
+        seconds limite le résultat aux dernières secondes.
+        """
+        since = None if seconds is None else self._clock() - seconds
+        count = len(self)
+        first = self.total - count
+        result = []
+        for position in range(first, self.total):
+            slot = position % self.capacity
+            created = self._times[slot]
+            if since is not None and created < since:
+                continue
+            length = self._lengths[slot]
+            offset = slot * self.slot_size
+            stored = min(length, self.slot_size)
+            result.append(
+                (created, self._directions[slot], bytes(self._arena[offset:offset + stored]), length)
+            )
+        return result
+
+    def export_pcap(self, seconds: float | None = None) -> bytes:
+        """Exporte les trames au format pcap (horodatage converti en temps réel)."""
+        # Décalage entre l'horloge monotone et l'horloge murale au moment de l'export
+        wall_offset = time.time() - self._clock()
+        chunks = [
+            _PCAP_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, self.slot_size + 1, PCAP_LINKTYPE_USER0)
+        ]
+        for created, direction, frame, length in self.entries(seconds):
+            seconds_part, fraction = divmod(created + wall_offset, 1)
+            chunks.append(
+                _PCAP_RECORD.pack(
+                    int(seconds_part), int(fraction * 1_000_000), len(frame) + 1, length + 1
+                )
+            )
+            chunks.append(bytes((direction,)))
+            chunks.append(frame)
+        return b"".join(chunks)
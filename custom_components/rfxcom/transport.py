@@ -0,0 +1,435 @@
+"""Transports RFXtrx partagés entre les entrées qui visent le même point d'accès.
+
+Un RFXtrx réseau n'accepte proprement qu'un client TCP, et l'add-on gère un
+port série par processus: deux entrées configurées sur le même host:port (ou
+le même port série) partagent donc une seule connexion, comptée par référence.
+Les trames reçues sont lues une fois et distribuées à chaque entrée abonnée;
+les émissions passent par un seul verrou et un seul budget de temps d'antenne.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONNECTION_TYPE_USB,
+    DATA_TRANSPORTS,
+    IO_THREAD_NAME,
+    IO_THREAD_RECV_SIZE,
+    TRANSPORT_RETRY_DELAYS,
+    TRANSPORT_SUBSCRIBER_QUEUE,
+)
+from .metrics import DECODE_INCOMPLETE, DECODE_INVALID_LENGTH
+from .scheduler import AirtimeScheduler, PriorityLock
+
+if TYPE_CHECKING:
+    from .node_bridge_http import NodeBridgeHTTP
+
+_LOGGER = logging.getLogger(__name__)
+
+# Trame reçue ou raison d'échec de lecture: (trame, None) ou (None, raison)
+FrameItem = tuple[bytes | None, str | None]
+
+
+def transport_key(
+    connection_type: str, port: str, host: str, network_port: int
+) -> tuple[str, str, int | None]:
+    """Clé du point d'accès: port série en USB, host:port en réseau."""
+    if connection_type == CONNECTION_TYPE_USB:
+        return (connection_type, port, None)
+    return (connection_type, host.lower(), int(network_port))
+
+
+def split_frames(buffer: bytearray) -> list[FrameItem]:
+    """Extrait les trames complètes en tête du tampon de réception.
+
+    Les octets d'une trame incomplète restent dans le tampon jusqu'à la
+    lecture suivante; un octet de longueur invalide est écarté seul.
+    """
+    items: list[FrameItem] = []
+    position = 0
+    size = len(buffer)
+    while position < size:
+        length = buffer[position]
+        if length < 1 or length > 50:
+            items.append((None, DECODE_INVALID_LENGTH))
+            position += 1
+            continue
+        end = position + length + 1
+        if end > size:
+            break
+        items.append((bytes(buffer[position:end]), None))
+        position = end
+    del buffer[:position]
+    return items
+
+
+def _socket_open(sock: socket.socket | None) -> bool:
+    """Indique si la socket existe et n'a pas été fermée."""
+    return sock is not None and sock.fileno() != -1
+
+
+class IOThreadReader:
+    """Lecture d'une socket sur un thread dédié, avec sa propre boucle asyncio.
+
+    La réception et le réassemblage des trames ne dépendent plus des temps de
+    réponse de la boucle de Home Assistant: les trames de chaque lecture y sont
+    remises en un seul lot, dans l'ordre, par call_soon_threadsafe.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        deliver: Callable[[list[FrameItem]], None],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Prépare la lecture de sock; deliver est appelé dans la boucle loop."""
+        self._sock = sock
+        self._deliver = deliver
+        self._hass_loop = loop
+        self._loop = asyncio.new_event_loop()
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=IO_THREAD_NAME, daemon=True)
+        # Résultat: None à l'arrêt, l'exception si la lecture a échoué
+        self.done: asyncio.Future[Exception | None] = loop.create_future()
+
+    def start(self) -> None:
+        """Démarre le thread de lecture."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Demande l'arrêt de la lecture (sans attendre le thread)."""
+        try:
+            self._loop.call_soon_threadsafe(self._cancel)
+        except RuntimeError:
+            # Boucle déjà fermée: la lecture est terminée
+            pass
+
+    def _cancel(self) -> None:
+        """Annule la lecture (thread de lecture)."""
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _run(self) -> None:
+        """Corps du thread: exécute la lecture dans sa propre boucle."""
+        asyncio.set_event_loop(self._loop)
+        error: Exception | None = None
+        try:
+            self._loop.run_until_complete(self._async_read())
+        except asyncio.CancelledError:
+            pass
+        except Exception as err:
+            error = err
+        finally:
+            self._loop.close()
+            try:
+                self._hass_loop.call_soon_threadsafe(self._finish, error)
+            except RuntimeError:
+                # Boucle de Home Assistant arrêtée
+                pass
+
+    def _finish(self, error: Exception | None) -> None:
+        """Signale la fin de la lecture (boucle de Home Assistant)."""
+        if not self.done.done():
+            self.done.set_result(error)
+
+    async def _async_read(self) -> None:
+        """Lit et réassemble les trames jusqu'à l'arrêt ou la fermeture."""
+        if self._stopped:
+            return
+        self._task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        # Copie non bloquante du descripteur: la socket d'origine garde son
+        # délai d'attente pour les émissions faites depuis Home Assistant
+        sock = self._sock.dup()
+        sock.setblocking(False)
+        buffer = bytearray()
+        try:
+            while True:
+                data = await loop.sock_recv(sock, IO_THREAD_RECV_SIZE)
+                if not data:
+                    raise ConnectionError("connexion fermée par le RFXtrx")
+                buffer += data
+                items = split_frames(buffer)
+                if items:
+                    self._hass_loop.call_soon_threadsafe(self._deliver, items)
+        finally:
+            sock.close()
+
+
+class SharedTransport:
+    """Connexion à un RFXtrx, partagée par toutes les entrées de ce point d'accès."""
+
+    def __init__(self, key: tuple[str, str, int | None]) -> None:
+        """Initialise un transport non connecté."""
+        self.key = key
+        self.connection_type = key[0]
+        self.socket: socket.socket | None = None
+        self.node_bridge: NodeBridgeHTTP | None = None
+        # Un seul canal radio: un seul verrou d'émission et un seul budget d'antenne
+        self.scheduler = AirtimeScheduler()
+        self.lock = PriorityLock()
+        self.refs = 0
+        self.connects = 0
+        self.dropped = 0
+        # Lecture sur un thread dédié (si une entrée le demande), lots remis
+        self.io_thread = False
+        self.batches = 0
+        self._subscribers: dict[Any, asyncio.Queue[FrameItem]] = {}
+        self._connect_lock = asyncio.Lock()
+        self._reader: asyncio.Task | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Nombre d'entrées abonnées aux trames reçues."""
+        return len(self._subscribers)
+
+    async def async_connect(self, hass: HomeAssistant) -> bool:
+        """Ouvre la connexion si elle est absente ou fermée.
+
+        Retourne True si une connexion a été ouverte, False si celle d'une
+        autre entrée a été réutilisée.
+        """
+        async with self._connect_lock:
+            if self.connection_type == CONNECTION_TYPE_USB:
+                if self.node_bridge is not None:
+                    return False
+                # Import différé: aiohttp n'est chargé que pour les connexions USB
+                from .node_bridge_http import NodeBridgeHTTP
+
+                node_bridge = NodeBridgeHTTP(serial_port=self.key[1])
+                await node_bridge.initialize()
+                self.node_bridge = node_bridge
+            else:
+                if _socket_open(self.socket):
+                    return False
+                await self._async_close_socket(hass)
+                sock = await hass.async_add_executor_job(
+                    socket.socket, socket.AF_INET, socket.SOCK_STREAM
+                )
+                # Ne pas rester bloqué, et envoyer les petites trames sans délai (Nagle)
+                sock.settimeout(5.0)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                try:
+                    await hass.async_add_executor_job(sock.connect, (self.key[1], self.key[2]))
+                except BaseException:
+                    sock.close()
+                    raise
+                self.socket = sock
+            self.connects += 1
+            return True
+
+    async def async_reconnect(self, hass: HomeAssistant, stale: socket.socket | None) -> None:
+        """Remplace une socket constatée morte par une entrée.
+
+        Sans effet si une autre entrée (ou la lecture) l'a déjà remplacée: la
+        socket n'est fermée que si c'est toujours celle du transport.
+        """
+        async with self._connect_lock:
+            if stale is not None and self.socket is stale:
+                await self._async_close_socket(hass)
+        await self.async_connect(hass)
+
+    async def _async_close_socket(self, hass: HomeAssistant) -> None:
+        """Ferme la socket si elle existe."""
+        if self.socket is not None:
+            sock, self.socket = self.socket, None
+            try:
+                await hass.async_add_executor_job(sock.close)
+            except Exception:
+                pass
+
+    async def async_close(self, hass: HomeAssistant) -> None:
+        """Arrête la lecture et ferme la connexion."""
+        self._subscribers.clear()
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self.node_bridge is not None:
+            node_bridge, self.node_bridge = self.node_bridge, None
+            await node_bridge.close()
+        await self._async_close_socket(hass)
+
+    def subscribe(self, owner: Any, hass: HomeAssistant) -> asyncio.Queue[FrameItem]:
+        """Abonne une entrée aux trames reçues et démarre la lecture si besoin."""
+        queue = self._subscribers.get(owner)
+        if queue is None:
+            queue = self._subscribers[owner] = asyncio.Queue(TRANSPORT_SUBSCRIBER_QUEUE)
+        if self._reader is None or self._reader.done():
+            read_loop = self._async_thread_loop(hass) if self.io_thread else self._async_read_loop(hass)
+            self._reader = asyncio.create_task(read_loop)
+        return queue
+
+    def unsubscribe(self, owner: Any) -> None:
+        """Désabonne une entrée; la lecture s'arrête avec le dernier abonné."""
+        self._subscribers.pop(owner, None)
+        if not self._subscribers and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    def _publish(self, item: FrameItem) -> None:
+        """Distribue une trame à chaque abonné, sans attendre les plus lents."""
+        for queue in self._subscribers.values():
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def _publish_batch(self, items: list[FrameItem]) -> None:
+        """Distribue un lot de trames remis par le thread de lecture."""
+        self.batches += 1
+        for item in items:
+            self._publish(item)
+
+    async def async_read_frame(self, hass: HomeAssistant) -> FrameItem | None:
+        """Lit une trame préfixée par sa longueur; None si rien n'a été reçu."""
+        data = await hass.async_add_executor_job(self.socket.recv, 1)
+        if not data:
+            return None
+        length = data[0]
+        if length < 1 or length > 50:
+            return None, DECODE_INVALID_LENGTH
+        # L'octet de longueur ne se compte pas: length octets suivent
+        remaining = await hass.async_add_executor_job(self.socket.recv, length)
+        if len(remaining) < length:
+            return None, DECODE_INCOMPLETE
+        return data + remaining, None
+
+    async def _async_read_loop(self, hass: HomeAssistant) -> None:
+        """Lit les trames du RFXtrx une seule fois pour toutes les entrées abonnées."""
+        while True:
+            try:
+                if not _socket_open(self.socket):
+                    # Reconnexion à la charge des entrées (chemin d'émission)
+                    await asyncio.sleep(1)
+                    continue
+                item = await self.async_read_frame(hass)
+                if item is None:
+                    await asyncio.sleep(0.1)
+                    continue
+                self._publish(item)
+            except asyncio.CancelledError:
+                raise
+            except socket.timeout:
+                continue
+            except Exception as err:
+                _LOGGER.error("Erreur lors de la réception (transport partagé): %s", err)
+                await asyncio.sleep(1)
+
+    async def _async_thread_loop(self, hass: HomeAssistant) -> None:
+        """Supervise le thread de lecture: relancé sur chaque nouvelle socket.
+
+        Une connexion fermée par le RFXtrx est rouverte ici, sans attendre une
+        émission: les entrées qui ne font que recevoir retrouvent leurs trames.
+        """
+        while True:
+            sock = self.socket
+            if not _socket_open(sock):
+                # Reconnexion à la charge des entrées (chemin d'émission)
+                await asyncio.sleep(1)
+                continue
+            reader = IOThreadReader(sock, self._publish_batch, asyncio.get_running_loop())
+            reader.start()
+            try:
+                # La copie du descripteur garderait ouverte une socket remplacée
+                while not reader.done.done() and self.socket is sock and _socket_open(sock):
+                    await asyncio.wait({reader.done}, timeout=1)
+            finally:
+                reader.stop()
+            error = reader.done.result() if reader.done.done() else None
+            if error is None:
+                continue
+            if isinstance(error, OSError):
+                # Connexion perdue: la socket d'origine garde un descripteur
+                # valide, relancer la lecture dessus échouerait indéfiniment
+                _LOGGER.warning("🔌 Connexion au RFXtrx perdue (%s), reconnexion", error)
+                if self.socket is sock:
+                    await self._async_close_socket(hass)
+                await self._async_reconnect(hass)
+                continue
+            _LOGGER.error("Erreur lors de la réception (thread dédié): %s", error)
+            await asyncio.sleep(1)
+
+    async def _async_reconnect(self, hass: HomeAssistant) -> None:
+        """Rouvre la connexion, en espaçant les tentatives selon TRANSPORT_RETRY_DELAYS."""
+        attempt = 0
+        while not _socket_open(self.socket):
+            try:
+                await self.async_connect(hass)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                delay = TRANSPORT_RETRY_DELAYS[min(attempt, len(TRANSPORT_RETRY_DELAYS) - 1)]
+                attempt += 1
+                _LOGGER.warning(
+                    "⚠️ Reconnexion au RFXtrx impossible (%s), nouvel essai dans %ss", err, delay
+                )
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Entrées, abonnés, connexions ouvertes et trames perdues par des abonnés lents."""
+        return {
+            "connection_type": self.connection_type,
+            "entries": self.refs,
+            "subscribers": self.subscribers,
+            "connects": self.connects,
+            "dropped_frames": self.dropped,
+            "io_thread": self.io_thread,
+            "batches": self.batches,
+        }
+
+
+class TransportRegistry:
+    """Transports ouverts, par point d'accès, comptés par référence."""
+
+    def __init__(self) -> None:
+        """Initialise un registre vide."""
+        self.transports: dict[tuple[str, str, int | None], SharedTransport] = {}
+
+    def acquire(
+        self, key: tuple[str, str, int | None], io_thread: bool = False
+    ) -> SharedTransport:
+        """Retourne le transport du point d'accès (créé au premier appel).
+
+        La lecture sur un thread dédié est activée dès qu'une entrée la demande.
+        """
+        transport = self.transports.get(key)
+        if transport is None:
+            transport = self.transports[key] = SharedTransport(key)
+        elif transport.refs:
+            _LOGGER.info(
+                "🔗 Point d'accès %s déjà utilisé par %s entrée(s), connexion partagée",
+                key[1] if key[2] is None else f"{key[1]}:{key[2]}",
+                transport.refs,
+            )
+        transport.refs += 1
+        transport.io_thread = transport.io_thread or io_thread
+        return transport
+
+    async def async_release(self, hass: HomeAssistant, transport: SharedTransport) -> None:
+        """Libère une référence; le transport est fermé avec la dernière."""
+        transport.refs -= 1
+        if transport.refs > 0:
+            return
+        if self.transports.get(transport.key) is transport:
+            del self.transports[transport.key]
+        await transport.async_close(hass)
+
+
+def get_registry(hass: HomeAssistant) -> TransportRegistry:
+    """Registre des transports de l'instance Home Assistant."""
+    registry = hass.data.get(DATA_TRANSPORTS)
+    if not isinstance(registry, TransportRegistry):
+        registry = hass.data[DATA_TRANSPORTS] = TransportRegistry()
+    return registry
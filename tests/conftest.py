@@ -1,6 +1,6 @@
 """Configuration pytest avec mocks Home Assistant."""
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, MagicMock, patch
 import sys
 import os
 from typing import Any
@@ -24,6 +24,7 @@ sys.modules['homeassistant.helpers.device_registry'] = MagicMock()
 sys.modules['homeassistant.components.switch'] = MagicMock()
 sys.modules['homeassistant.components.sensor'] = MagicMock()
 sys.modules['homeassistant.components.cover'] = MagicMock()
+sys.modules['homeassistant.components.diagnostics'] = MagicMock()
 
 # Créer un mock pour RestoreEntity qui fonctionne comme une classe normale
 class MockRestoreEntity:
@@ -54,7 +55,12 @@ class MockCoordinatorEntity:
         self._attr_name = None
         self._attr_unique_id = None
         self._attr_device_info = None
-    
+        self._on_remove = []
+
+    def async_on_remove(self, func):
+        """Mock de async_on_remove: mémorise le callback de nettoyage."""
+        self._on_remove.append(func)
+
     async def async_added_to_hass(self):
         """Mock de async_added_to_hass."""
         pass
@@ -65,6 +71,21 @@ class MockCoordinatorEntity:
 
 sys.modules['homeassistant.helpers.update_coordinator'].CoordinatorEntity = MockCoordinatorEntity
 
+# Mock DataUpdateCoordinator (classe réelle pour que RFXCOMCoordinator reste instanciable)
+class MockDataUpdateCoordinator:
+    """Mock de DataUpdateCoordinator."""
+    def __init__(self, hass, logger, name=None, update_interval=None):
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+
+    def async_update_listeners(self):
+        """Mock de async_update_listeners."""
+        pass
+
+sys.modules['homeassistant.helpers.update_coordinator'].DataUpdateCoordinator = MockDataUpdateCoordinator
+
 # Mock SwitchEntity
 class MockSwitchEntity:
     """Mock de SwitchEntity."""
@@ -75,7 +96,18 @@ sys.modules['homeassistant.components.switch'].SwitchEntity = MockSwitchEntity
 # Mock SensorEntity
 class MockSensorEntity:
     """Mock de SensorEntity."""
-    pass
+
+    def async_on_remove(self, func):
+        """Mock de async_on_remove: mémorise le callback de nettoyage."""
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    async def async_added_to_hass(self):
+        """Mock de async_added_to_hass."""
+        pass
+
+    def async_write_ha_state(self):
+        """Mock de async_write_ha_state."""
+        pass
 
 sys.modules['homeassistant.components.sensor'].SensorEntity = MockSensorEntity
 
@@ -93,6 +125,14 @@ sys.modules['homeassistant.const'].UnitOfTemperature = MagicMock()
 sys.modules['homeassistant.const'].PERCENTAGE = "%"
 sys.modules['homeassistant.components.cover'].CoverEntityFeature = MagicMock()
 
+# Masquage des diagnostics: remplace les valeurs des clés sensibles
+sys.modules['homeassistant.components.diagnostics'].async_redact_data = lambda data, to_redact: {
+    key: "**REDACTED**" if key in to_redact else value for key, value in data.items()
+}
+
+# Le décorateur callback doit laisser la fonction intacte
+sys.modules['homeassistant.core'].callback = lambda func: func
+
 # Mock des constantes Home Assistant
 from homeassistant.const import Platform
 from homeassistant.data_entry_flow import FlowResultType
@@ -117,3 +157,48 @@ def mock_hass_components():
          patch('homeassistant.components.switch.SwitchEntity'), \
          patch('homeassistant.components.sensor.SensorEntity'):
         yield
+
+
+@pytest.fixture(scope="session")
+def make_coordinator():
+    """Fabrique de coordinateurs RFXCOM sur une entrée et un hass simulés.
+
+    L'entrée a le type de connexion demandé, complété par data et options;
+    le coordinateur est enregistré dans hass.data[DOMAIN] comme à la
+    configuration de l'entrée. Un hass peut être fourni (benchmarks).
+    """
+    from custom_components.rfxcom.const import DOMAIN
+    from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+
+    def _make(
+        connection_type: str = "network",
+        data: dict[str, Any] | None = None,
+        options: dict[str, Any] | None = None,
+        entry_id: str = "test_entry",
+        hass: Any = None,
+    ) -> RFXCOMCoordinator:
+        entry = MagicMock()
+        entry.entry_id = entry_id
+        entry.data = {"connection_type": connection_type, **(data or {})}
+        entry.options = options if options is not None else {}
+        if hass is None:
+            hass = MagicMock()
+            hass.data = {}
+            hass.async_add_executor_job = AsyncMock()
+        coordinator = RFXCOMCoordinator(hass, entry)
+        hass.data.setdefault(DOMAIN, {})[entry_id] = coordinator
+        return coordinator
+
+    return _make
+
+
+def pytest_addoption(parser):
+    """Options des micro-benchmarks (tests/test_benchmarks.py, test_scale.py, test_import_time.py)."""
+    group = parser.getgroup("rfxcom-bench", "micro-benchmarks RFXCOM")
+    group.addoption("--bench", action="store_true", help="exécuter les micro-benchmarks")
+    group.addoption(
+        "--bench-update", action="store_true", help="enregistrer les mesures comme nouvelles références"
+    )
+    group.addoption(
+        "--bench-threshold", type=float, default=1.5, help="régression au-delà de N fois la référence"
+    )
@@ -0,0 +1,122 @@
+"""Tests pour l'add-on simulé et le banc de mesure du client HTTP."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.rfxcom.node_bridge_http import NodeBridgeHTTP
+from tools.addon_stub import AddonStub, Faults
+from tools.bench_addon import async_bench_commands, async_bench_frames
+from tools.rfxtrx_emulator import sensor_frame
+
+
+@pytest.fixture
+async def stub():
+    stub = AddonStub(Faults(seed=1))
+    await stub.start()
+    yield stub
+    await stub.stop()
+
+
+@pytest.mark.asyncio
+async def test_real_client_reuses_one_connection(stub):
+    """Initialisation puis commandes sur une seule connexion keep-alive."""
+    bridge = NodeBridgeHTTP(addon_url=stub.url, serial_port="/dev/ttyACM0")
+    try:
+        for command in ("on", "off", "on"):
+            assert await bridge.send_command("AC", device_id="02382C82", unit_code=1, command=command)
+    finally:
+        await bridge.close()
+
+    assert stub.port == "/dev/ttyACM0" and stub.initialized
+    assert [payload["command"] for payload in stub.commands] == ["on", "off", "on"]
+    assert stub.connections == 1
+    assert stub.stats()["requests"] == {"/health": 1, "/api/init": 1, "/api/command": 3}
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_rejections(stub):
+    """Erreurs HTTP et refus d'émission sont vus comme des échecs par le client."""
+    bridge = NodeBridgeHTTP(addon_url=stub.url)
+    try:
+        await bridge.initialize()
+        stub.faults.error_rate = 1.0
+        assert not await bridge.send_command("AC", device_id="02382C82", unit_code=1)
+        stub.faults.error_rate, stub.faults.reject_rate = 0.0, 1.0
+        assert not await bridge.send_command("AC", device_id="02382C82", unit_code=1)
+        assert bridge.stats()["errors"] == 2 and stub.errors == 1
+
+        stub.unavailable.add("/api/burst")
+        assert await bridge.send_burst("AC", device_id="02382C82", unit_code=1) is None
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_show_in_latency(stub):
+    """Les réponses lentes injectées apparaissent dans le p99 du client."""
+    stub.faults.latency, stub.faults.slow_rate, stub.faults.slow_delay = 0.001, 0.2, 0.05
+    result = await async_bench_commands(stub.url, 30, concurrency=3, stub=stub)
+    assert result["failures"] == 0
+    assert result["p99_ms"] >= 40
+    assert result["connections"] <= 3
+    assert result["requests_per_connection"] >= 10
+
+
+@pytest.mark.asyncio
+async def test_frame_stream_resume_and_restart(stub):
+    """Le flux simulé reprend au curseur du client et signale un redémarrage."""
+    bridge = NodeBridgeHTTP(addon_url=stub.url)
+    received: list[bytes] = []
+
+    async def _consume() -> None:
+        async for packet in bridge.async_iter_frames():
+            received.append(packet)
+
+    try:
+        stub.publish(sensor_frame(0))
+        task = asyncio.create_task(_consume())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if received:
+                break
+        stub.disconnect_streams()
+        await asyncio.wait_for(task, 2)
+        # Trames publiées pendant la coupure: rejouées à la reprise
+        stub.publish(sensor_frame(1))
+        stub.publish(sensor_frame(2))
+        task = asyncio.create_task(_consume())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(received) == 3:
+                break
+        stub.restart()
+        await asyncio.wait_for(task, 2)
+        assert received == [sensor_frame(0), sensor_frame(1), sensor_frame(2)]
+        assert bridge.stats()["frame_stream"]["gaps"] == 0
+
+        stub.publish(sensor_frame(3))
+        task = asyncio.create_task(_consume())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(received) == 4:
+                break
+        assert received[-1] == sensor_frame(3)
+        assert bridge.stats()["frame_stream"]["last_seq"] == 1
+        stub.disconnect_streams()
+        await asyncio.wait_for(task, 2)
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_frame_bench_counts_all_frames():
+    """Le banc du flux reçoit toutes les trames publiées."""
+    stub = AddonStub(history_size=500)
+    await stub.start()
+    try:
+        result = await async_bench_frames(stub, 500)
+    finally:
+        await stub.stop()
+    assert result["frames"] == 500 and result["frames_per_s"] > 0
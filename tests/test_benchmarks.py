@@ -0,0 +1,222 @@
+"""Micro-benchmarks du décodage, des trames de commande et de la découverte.
+
+Exécutés uniquement avec --bench (durée: quelques secondes):
+
+    pytest tests/test_benchmarks.py --bench
+    pytest tests/test_benchmarks.py --bench --bench-update   # nouvelles références
+
+Chaque mesure est comparée à tests/bench_baseline.json; le test échoue si le
+coût relatif dépasse la référence de plus de --bench-threshold (1,5 fois).
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    CONF_DEVICE_ID,
+    CONF_PROTOCOL,
+    PROTOCOL_AC,
+    PROTOCOL_TEMP_HUM,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.sensor import RFXCOMTempHumSensor
+from tools.microbench import Baseline, Measurement, calibrate, measure
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+DEVICE_COUNTS = (10, 100, 1000)
+INNER = 100  # appels par mesure pour les coroutines (une boucle par mesure)
+
+RECEIVED_FRAMES = {
+    "lighting1": "0710010141010100",
+    "lighting2": "0b11000202382c8201010080",
+    "lighting3": "081203000100010100",
+    "lighting4": "0713041234560100",
+    "lighting5": "0a14000512345601010000",
+    "lighting6": "081506123400000100",
+    "temp_hum": "0a520d01680300d4270289",
+}
+
+
+class _Hass:
+    """hass minimal sans MagicMock: le coût mesuré reste celui de l'intégration."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.config_entries = MagicMock()
+        self.config_entries.async_update_entry = lambda entry, options: None
+        self.config_entries.async_reload = _async_noop
+
+
+async def _async_noop(*args: Any) -> None:
+    return None
+
+
+def _coordinator(
+    make_coordinator: Callable[..., RFXCOMCoordinator],
+    auto_registry: bool = False,
+    devices: list[dict[str, Any]] | None = None,
+) -> RFXCOMCoordinator:
+    return make_coordinator(
+        data={"host": "127.0.0.1", "network_port": 10001, "auto_registry": auto_registry},
+        options={"devices": devices or []},
+        entry_id="bench",
+        hass=_Hass(),
+    )
+
+
+def _sensor_info(index: int) -> dict[str, Any]:
+    return {
+        CONF_PROTOCOL: PROTOCOL_TEMP_HUM,
+        CONF_DEVICE_ID: str(26000 + index),
+        "temperature": 21.2,
+        "humidity": 39,
+        "status": "Dry",
+        "signal_level": 8,
+        "battery_ok": True,
+    }
+
+
+def _known_devices(make: Callable[..., RFXCOMCoordinator], count: int) -> RFXCOMCoordinator:
+    coordinator = _coordinator(make)
+    for index in range(count):
+        info = _sensor_info(index)
+        coordinator._discovered_devices[coordinator._device_unique_id(info)] = info
+    return coordinator
+
+
+def _parse_case(make: Callable[..., RFXCOMCoordinator], family: str) -> Callable[[], Any]:
+    coordinator = _coordinator(make)
+    packet = bytes.fromhex(RECEIVED_FRAMES[family])
+    assert coordinator._parse_packet(packet) is not None
+    return lambda: coordinator._parse_packet(packet)
+
+
+def _build_cases(make: Callable[..., RFXCOMCoordinator]) -> dict[str, Callable[[], Any]]:
+    coordinator = _coordinator(make)
+    return {
+        "build_lighting1": lambda: coordinator._build_lighting1_command("ARC", 0x01, "A", "1", CMD_ON),
+        "build_lighting2": lambda: coordinator._build_lighting2_command("AC", 0x00, "02382C82", CMD_ON, 1),
+        "build_lighting3": lambda: coordinator._build_lighting3_command("IKEA_KOPPLA", "0001", "1", CMD_ON),
+        "build_lighting4": lambda: coordinator._build_lighting4_command("PT2262", "123456", CMD_ON),
+        "build_lighting5": lambda: coordinator._build_lighting5_command("LIGHTWAVERF", 0x00, "123456", "1", CMD_ON),
+        "build_lighting6": lambda: coordinator._build_lighting6_command("BLYSS", "1234", CMD_ON),
+        "hex_string_to_bytes": lambda: coordinator._hex_string_to_bytes("2:38:C8-2", 4),
+    }
+
+
+def _handle_known_case(make: Callable[..., RFXCOMCoordinator], count: int, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    """Mise à jour d'un capteur déjà connu parmi count appareils découverts."""
+    coordinator = _known_devices(make, count)
+    info = _sensor_info(count - 1)
+
+    async def _batch() -> None:
+        for _ in range(INNER):
+            await coordinator._handle_discovered_device(dict(info))
+
+    return lambda: loop.run_until_complete(_batch())
+
+
+def _handle_new_case(make: Callable[..., RFXCOMCoordinator], count: int, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    """Auto-enregistrement d'un nouvel appareil face à count appareils enregistrés."""
+    registered = [
+        {"name": f"RFXCOM AC {index:08x}", CONF_PROTOCOL: PROTOCOL_AC, CONF_DEVICE_ID: f"{index:08x}"}
+        for index in range(count)
+    ]
+    coordinator = _coordinator(make, auto_registry=True, devices=registered)
+    info = {CONF_PROTOCOL: PROTOCOL_AC, CONF_DEVICE_ID: "ffffffff", "unit_code": "1", "command": CMD_ON}
+    unique_id = coordinator._device_unique_id(info)
+
+    async def _batch() -> None:
+        for _ in range(INNER):
+            await coordinator._handle_discovered_device(dict(info))
+            # Repartir du même état: appareil inconnu, count enregistrés
+            del coordinator._discovered_devices[unique_id]
+            registered.pop()
+
+    return lambda: loop.run_until_complete(_batch())
+
+
+def _native_value_case(make: Callable[..., RFXCOMCoordinator], count: int) -> Callable[[], Any]:
+    """Lecture de la température du dernier capteur parmi count appareils."""
+    coordinator = _known_devices(make, count)
+    sensor = RFXCOMTempHumSensor(coordinator, "Bench", str(26000 + count - 1), "bench")
+    assert sensor.native_value == 21.2
+    return lambda: sensor.native_value
+
+
+# nom -> (fabrique(boucle, make_coordinator) de l'opération mesurée, opérations par appel)
+CASES: dict[str, tuple[Callable[[asyncio.AbstractEventLoop, Callable[..., RFXCOMCoordinator]], Callable[[], Any]], int]] = {}
+for _family in RECEIVED_FRAMES:
+    CASES[f"parse_{_family}"] = (lambda loop, make, family=_family: _parse_case(make, family), 1)
+for _name in ("build_lighting1", "build_lighting2", "build_lighting3", "build_lighting4",
+              "build_lighting5", "build_lighting6", "hex_string_to_bytes"):
+    CASES[_name] = (lambda loop, make, name=_name: _build_cases(make)[name], 1)
+for _count in DEVICE_COUNTS:
+    CASES[f"handle_known_device_{_count}"] = (
+        lambda loop, make, count=_count: _handle_known_case(make, count, loop), INNER
+    )
+    CASES[f"handle_new_device_{_count}"] = (
+        lambda loop, make, count=_count: _handle_new_case(make, count, loop), INNER
+    )
+    CASES[f"sensor_native_value_{_count}"] = (
+        lambda loop, make, count=_count: _native_value_case(make, count), 1
+    )
+
+
+@pytest.fixture(scope="module")
+def bench(request):
+    """Calibration de la session; enregistre les références avec --bench-update."""
+    config = request.config
+    if not config.getoption("--bench"):
+        pytest.skip("micro-benchmarks désactivés (option --bench)")
+    session = {
+        "baseline": Baseline(BASELINE_PATH),
+        "calibration": calibrate(),
+        "threshold": config.getoption("--bench-threshold"),
+        "update": config.getoption("--bench-update"),
+        "measurements": [],
+        "loop": asyncio.new_event_loop(),
+    }
+    yield session
+    session["loop"].close()
+    if session["update"] and session["measurements"]:
+        session["baseline"].save(session["measurements"], session["calibration"])
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_benchmark(bench, make_coordinator, name):
+    """Coût d'une opération, comparé à sa référence enregistrée."""
+    factory, inner = CASES[name]
+    ns = measure(factory(bench["loop"], make_coordinator), inner=inner)
+    measurement = Measurement(name, ns, ns / bench["calibration"])
+    bench["measurements"].append(measurement)
+    if bench["update"]:
+        return
+    if bench["baseline"].get(name) is None:
+        pytest.skip(f"{name}: pas de référence (--bench-update pour l'enregistrer)")
+    regression = bench["baseline"].check(measurement, bench["threshold"])
+    assert regression is None, regression
+
+
+def test_baseline_flags_regression_only(tmp_path):
+    """La référence signale une régression au-delà du seuil, pas en deçà."""
+    baseline = Baseline(tmp_path / "baseline.json")
+    baseline.save([Measurement("parse", 1000.0, 0.02)], calibration_ns=50000.0)
+    reloaded = Baseline(tmp_path / "baseline.json")
+    assert reloaded.get("parse") == {"ns": 1000.0, "relative": 0.02}
+    assert reloaded.check(Measurement("parse", 1400.0, 0.028), threshold=1.5) is None
+    assert "1.60x" in reloaded.check(Measurement("parse", 1600.0, 0.032), threshold=1.5)
+    assert reloaded.check(Measurement("nouveau", 1.0, 1.0)) is None
+
+
+def test_measure_reports_per_operation_time():
+    """measure() divise par le nombre d'opérations de chaque appel."""
+    single = measure(lambda: sum(range(100)), repeat=2, min_time=0.005)
+    batched = measure(lambda: [sum(range(100)) for _ in range(10)], inner=10, repeat=2, min_time=0.005)
+    assert 0 < single and 0 < batched < single * 5
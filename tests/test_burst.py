@@ -0,0 +1,151 @@
+"""Tests pour la rafale d'appairage cadencée."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.const import CMD_ON, PROTOCOL_AC
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.scheduler import async_run_burst
+
+
+class FakeClock:
+    """Horloge contrôlée; asyncio.sleep l'avance au lieu d'attendre."""
+
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("custom_components.rfxcom.scheduler.asyncio.sleep", new=clock.sleep):
+        yield clock
+
+
+@pytest.mark.asyncio
+async def test_burst_rate_does_not_drift_with_send_latency(clock):
+    """La latence d'envoi (< période) ne réduit pas la cadence obtenue."""
+    sends = []
+
+    async def _send():
+        sends.append(clock.now)
+        clock.now += 0.03  # 30 ms d'aller-retour, période 50 ms
+        return True
+
+    result = await async_run_burst(_send, rate=20, duration=4.0, clock=clock)
+    assert result["sent"] == 80
+    assert result["skipped"] == 0
+    assert result["achieved_rate"] == 20
+    # Les trames partent exactement sur la grille de 50 ms
+    assert sends[1] - sends[0] == pytest.approx(0.05)
+    assert sends[-1] - sends[0] == pytest.approx(79 * 0.05)
+
+
+@pytest.mark.asyncio
+async def test_slow_sends_skip_missed_slots(clock):
+    """Un envoi plus long que la période fait sauter les créneaux au lieu de rattraper."""
+    async def _send():
+        clock.now += 0.12
+        return True
+
+    result = await async_run_burst(_send, rate=20, duration=1.0, clock=clock)
+    assert result["sent"] < 20
+    assert result["skipped"] > 0
+    assert result["achieved_rate"] < 20
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted(clock):
+    """Les échecs (retour False ou exception) sont comptés à part."""
+    outcomes = iter([True, False, RuntimeError("port"), True])
+
+    async def _send():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    result = await async_run_burst(_send, rate=10, duration=0.4, clock=clock)
+    assert (result["sent"], result["failed"]) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_network_burst_streams_prebuilt_frame():
+    """En réseau, la même trame précompilée part avec une séquence incrémentée."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    coordinator = RFXCOMCoordinator(hass, entry)
+    coordinator.socket = MagicMock()
+
+    with patch("custom_components.rfxcom.scheduler.asyncio.sleep", new=AsyncMock()):
+        result = await coordinator.async_send_burst(
+            PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1", rate=20, duration=0.2
+        )
+
+    frames = [call.args[1] for call in hass.async_add_executor_job.await_args_list]
+    assert result["sent"] == len(frames) >= 1
+    assert len(coordinator._frame_templates) == 1
+    assert all(frame[4:] == frames[0][4:] for frame in frames)
+    assert [frame[3] for frame in frames] == list(range(1, len(frames) + 1))
+
+
+@pytest.mark.asyncio
+async def test_usb_burst_is_delegated_to_addon():
+    """En USB, l'add-on cadence la rafale lui-même."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "usb"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    report = {"sent": 80, "failed": 0, "skipped": 0, "duration": 3.96,
+              "target_rate": 20, "achieved_rate": 20.0}
+    coordinator._node_bridge = MagicMock()
+    coordinator._node_bridge.send_burst = AsyncMock(return_value=report)
+    coordinator._node_bridge.send_command = AsyncMock()
+
+    assert await coordinator.async_send_burst(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="2") == report
+    assert coordinator._node_bridge.send_burst.await_args.kwargs["unit_code"] == 2
+    coordinator._node_bridge.send_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_usb_burst_of_unmapped_protocol():
+    """Un protocole accepté par l'add-on mais absent de la table des paquets ne fait pas échouer la rafale."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "usb"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    report = {"sent": 40, "failed": 0, "skipped": 0, "duration": 1.98,
+              "target_rate": 20, "achieved_rate": 20.2}
+    coordinator._node_bridge = MagicMock()
+    coordinator._node_bridge.send_burst = AsyncMock(return_value=report)
+
+    assert await coordinator.async_send_burst("ADDON_ONLY", "123456", CMD_ON) == report
+    assert not coordinator.stats.frames_sent
+
+
+@pytest.mark.asyncio
+async def test_usb_burst_falls_back_without_addon_support():
+    """Add-on sans /api/burst: la rafale est cadencée par l'intégration."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "usb"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator._node_bridge = MagicMock()
+    coordinator._node_bridge.send_burst = AsyncMock(return_value=None)
+    coordinator._node_bridge.send_command = AsyncMock(return_value=True)
+
+    result = await coordinator.async_send_burst(
+        PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1", rate=50, duration=0.1
+    )
+    assert result["sent"] == coordinator._node_bridge.send_command.await_count >= 1
@@ -0,0 +1,96 @@
+"""Tests pour la fusion des commandes par appareil (last-write-wins)."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.const import CMD_OFF, CMD_ON, PROTOCOL_AC, PROTOCOL_ARC
+
+
+@pytest.fixture
+def coordinator():
+    """Coordinateur dont l'émission est simulée et bloquable."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coord = RFXCOMCoordinator(MagicMock(), entry)
+    coord.sent = []
+    coord.release = asyncio.Event()
+
+    async def _send_locked(protocol, device_id, command, house_code=None, unit_code=None, **kwargs):
+        coord.sent.append((protocol, device_id or house_code, command))
+        await coord.release.wait()
+        return True
+
+    coord._async_send_command_locked = _send_locked
+    return coord
+
+
+@pytest.mark.asyncio
+async def test_burst_on_same_device_keeps_last_command(coordinator):
+    """on/off/on en rafale: la commande en vol part, les suivantes sont fusionnées."""
+    first = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON, unit_code="1"))
+    await asyncio.sleep(0)  # La première commande atteint l'émetteur
+
+    second = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_OFF, unit_code="1"))
+    third = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON, unit_code="1"))
+    await asyncio.sleep(0)
+
+    coordinator.release.set()
+    assert await asyncio.gather(first, second, third) == [True, True, True]
+    # Deux émissions au lieu de trois: OFF a été remplacé par le dernier ON
+    assert coordinator.sent == [(PROTOCOL_AC, "0A", CMD_ON), (PROTOCOL_AC, "0A", CMD_ON)]
+    assert coordinator.coalesced_commands == 1
+    assert coordinator._pending_commands == {}
+
+
+@pytest.mark.asyncio
+async def test_different_devices_are_not_coalesced(coordinator):
+    """Les commandes pour des appareils distincts sont toutes émises."""
+    coordinator.release.set()
+    results = await asyncio.gather(
+        coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON, unit_code="1"),
+        coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON, unit_code="2"),
+        coordinator.send_command(PROTOCOL_ARC, "", CMD_OFF, house_code="A", unit_code="1"),
+    )
+    assert results == [True, True, True]
+    assert len(coordinator.sent) == 3
+    assert coordinator.coalesced_commands == 0
+
+
+@pytest.mark.asyncio
+async def test_superseded_waiters_get_final_result(coordinator):
+    """Tous les appelants fusionnés reçoivent le résultat de la commande finale."""
+    blocker = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0B", CMD_ON))
+    await asyncio.sleep(0)
+
+    async def _fail(protocol, device_id, command, house_code=None, unit_code=None, **kwargs):
+        coordinator.sent.append((protocol, device_id, command))
+        return False
+
+    off = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_OFF))
+    on = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON))
+    await asyncio.sleep(0)
+    coordinator._async_send_command_locked = _fail
+    coordinator.release.set()
+
+    assert await blocker is True
+    assert await off is False
+    assert await on is False
+    assert coordinator.sent[-1] == (PROTOCOL_AC, "0A", CMD_ON)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_command(coordinator):
+    """L'annulation d'un appelant n'interrompt pas la commande partagée."""
+    first = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0A", CMD_ON))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    coordinator.release.set()
+    await asyncio.sleep(0.01)
+    assert coordinator.sent == [(PROTOCOL_AC, "0A", CMD_ON)]
+    assert coordinator._pending_commands == {}
@@ -0,0 +1,152 @@
+"""Tests pour les attentes de découverte événementielles du coordinateur."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.const import (
+    CONF_DEVICE_ID,
+    CONF_HOUSE_CODE,
+    CONF_PROTOCOL,
+    CONF_UNIT_CODE,
+    PACKET_TYPE_LIGHTING1,
+    PACKET_TYPE_LIGHTING2,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+)
+
+
+@pytest.fixture
+def coordinator():
+    """Coordinateur réseau sans auto-registry."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coord = RFXCOMCoordinator(MagicMock(), entry)
+    # Ne pas démarrer de vraie boucle de réception pendant les tests
+    coord._ensure_receive_loop = MagicMock()
+    return coord
+
+
+def _ac_info(device_id: str = "02382c82") -> dict:
+    return {CONF_PROTOCOL: PROTOCOL_AC, CONF_DEVICE_ID: device_id, CONF_UNIT_CODE: "1"}
+
+
+def _arc_info(house: str = "A", unit: str = "1") -> dict:
+    return {CONF_PROTOCOL: PROTOCOL_ARC, CONF_HOUSE_CODE: house, CONF_UNIT_CODE: unit}
+
+
+@pytest.mark.asyncio
+async def test_waiter_resolves_on_matching_protocol(coordinator):
+    """La future est résolue dès que la trame correspondante est traitée."""
+    waiter = coordinator.async_wait_for_device(protocol=PROTOCOL_AC)
+    await coordinator._handle_discovered_device(_arc_info())
+    assert not waiter.done()
+
+    await coordinator._handle_discovered_device(_ac_info())
+    assert waiter.done()
+    assert waiter.result()[CONF_DEVICE_ID] == "02382c82"
+    await asyncio.sleep(0)  # Laisser passer le done callback
+    assert coordinator._discovery_waiters == []
+    coordinator._ensure_receive_loop.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_waiter_packet_type_filter(coordinator):
+    """Le filtre par type de paquet s'applique à tous les protocoles d'une famille."""
+    lighting1 = coordinator.async_wait_for_device(packet_type=PACKET_TYPE_LIGHTING1)
+    lighting2 = coordinator.async_wait_for_device(packet_type=PACKET_TYPE_LIGHTING2)
+
+    await coordinator._handle_discovered_device(_arc_info())
+    assert lighting1.done()
+    assert not lighting2.done()
+    lighting2.cancel()
+
+
+@pytest.mark.asyncio
+async def test_waiter_new_only_ignores_known_devices(coordinator):
+    """new_only ignore les appareils déjà présents dans le cache."""
+    await coordinator._handle_discovered_device(_ac_info("00000001"))
+
+    waiter = coordinator.async_wait_for_device(protocol=PROTOCOL_AC, new_only=True)
+    await coordinator._handle_discovered_device(_ac_info("00000001"))
+    assert not waiter.done()
+
+    await coordinator._handle_discovered_device(_ac_info("00000002"))
+    assert waiter.result()[CONF_DEVICE_ID] == "00000002"
+
+
+@pytest.mark.asyncio
+async def test_waiter_predicate(coordinator):
+    """Le prédicat permet de cibler un appareil précis."""
+    waiter = coordinator.async_wait_for_device(
+        protocol=PROTOCOL_ARC,
+        predicate=lambda info: info.get(CONF_HOUSE_CODE) == "B",
+    )
+    await coordinator._handle_discovered_device(_arc_info("A"))
+    assert not waiter.done()
+    await coordinator._handle_discovered_device(_arc_info("B"))
+    assert waiter.result()[CONF_HOUSE_CODE] == "B"
+
+
+@pytest.mark.asyncio
+async def test_waiter_timeout_removes_waiter(coordinator):
+    """Un timeout annule la future et retire l'attente."""
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            coordinator.async_wait_for_device(protocol=PROTOCOL_AC), timeout=0.01
+        )
+    await asyncio.sleep(0)
+    assert coordinator._discovery_waiters == []
+
+
+@pytest.mark.asyncio
+async def test_waiter_does_not_touch_auto_registry(coordinator):
+    """L'attente ne modifie pas auto_registry et n'enregistre pas l'appareil."""
+    waiter = coordinator.async_wait_for_device(protocol=PROTOCOL_AC)
+    with patch.object(coordinator, "_auto_register_device") as auto_register:
+        await coordinator._handle_discovered_device(_ac_info())
+    assert waiter.done()
+    assert not coordinator.auto_registry
+    auto_register.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_on_demand_receive_loop_stops_after_last_waiter():
+    """La boucle démarrée pour l'appairage s'arrête avec la dernière attente."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+
+    first = coordinator.async_wait_for_device(protocol=PROTOCOL_AC)
+    second = coordinator.async_wait_for_device(protocol=PROTOCOL_ARC)
+    task = coordinator._receive_task
+    assert task is not None
+
+    await coordinator._handle_discovered_device(_ac_info())
+    await asyncio.sleep(0)
+    assert first.done() and coordinator._receive_task is task
+
+    second.cancel()
+    await asyncio.wait({task}, timeout=1)
+    assert task.done() and coordinator._receive_task is None
+
+
+@pytest.mark.asyncio
+async def test_auto_registry_loop_outlives_waiters():
+    """Avec auto-registry, la boucle de réception n'est pas arrêtée par les attentes."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator._receive_task = task = asyncio.create_task(asyncio.sleep(10))
+
+    waiter = coordinator.async_wait_for_device(protocol=PROTOCOL_AC)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    assert coordinator._receive_task is task and not task.cancelled()
+    task.cancel()
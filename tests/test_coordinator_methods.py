@@ -33,6 +33,14 @@ sys.modules['custom_components'] = MagicMock()
 sys.modules['custom_components.rfxcom'] = MagicMock()
 sys.modules['custom_components.rfxcom.const'] = const
 
+# Modules internes importés par coordinator
+for _name in ("frames", "metrics", "scheduler", "pool", "trace", "transport"):
+    _path = os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'rfxcom', f'{_name}.py')
+    _spec = importlib.util.spec_from_file_location(f"custom_components.rfxcom.{_name}", _path)
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules[f"custom_components.rfxcom.{_name}"] = _module
+    _spec.loader.exec_module(_module)
+
 # Maintenant charger coordinator
 coordinator_path = os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'rfxcom', 'coordinator.py')
 spec = importlib.util.spec_from_file_location("custom_components.rfxcom.coordinator", coordinator_path)
@@ -49,6 +57,7 @@ RFXCOMCoordinator = coordinator_module.RFXCOMCoordinator
 class MockHass:
     def __init__(self):
         self.async_add_executor_job = AsyncMock()
+        self.data = {}
 
 
 class MockEntry:
@@ -7,6 +7,7 @@ import asyncio
 class MockHass:
     def __init__(self):
         self.async_add_executor_job = AsyncMock()
+        self.data = {}
 
 class MockConfigEntry:
     def __init__(self, data):
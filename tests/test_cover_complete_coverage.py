@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from custom_components.rfxcom.cover import async_setup_entry, RFXCOMCover
 from custom_components.rfxcom.const import (
+    PRIORITY_INTERACTIVE,
     PROTOCOL_ARC,
     CMD_ON,
     CMD_OFF,
@@ -68,7 +69,7 @@ class TestCoverSetup:
         mock_device_entry = Mock()
         mock_dr.async_get_or_create.return_value = mock_device_entry
         
-        with patch('custom_components.rfxcom.cover.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -104,7 +105,7 @@ class TestCoverSetup:
         mock_device_entry = Mock()
         mock_dr.async_get_or_create.return_value = mock_device_entry
         
-        with patch('custom_components.rfxcom.cover.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -158,6 +159,7 @@ class TestRFXCOMCover:
             command=CMD_ON,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -173,6 +175,7 @@ class TestRFXCOMCover:
             command=CMD_OFF,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -189,5 +192,6 @@ class TestRFXCOMCover:
             command=CMD_ON,
             house_code="A",
             unit_code="3",
+            priority=PRIORITY_INTERACTIVE,
         )
 
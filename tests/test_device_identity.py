@@ -0,0 +1,142 @@
+"""Tests pour les identités d'appareils et la synchronisation groupée du device registry."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    DATA_DEVICE_IDENTITIES,
+    DOMAIN,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+)
+from custom_components.rfxcom.device_identity import (
+    MANUFACTURER,
+    async_clear_device_identities,
+    async_find_device_identity,
+    async_get_device_identities,
+    async_sync_device_registry,
+    device_identifier,
+)
+
+DEVICES = [
+    {"name": "Prise AC", "protocol": PROTOCOL_AC, "device_id": "02382C82", "unit_code": "2"},
+    {"name": "Volet ARC", "protocol": PROTOCOL_ARC, "house_code": "A", "unit_code": "1",
+     "device_type": "cover"},
+    {"name": "Sans Code", "protocol": PROTOCOL_AC},
+]
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock de Home Assistant."""
+    hass = MagicMock()
+    hass.data = {}
+    return hass
+
+
+@pytest.fixture
+def mock_entry():
+    """Mock d'une entrée de configuration."""
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    entry.options = {"devices": DEVICES}
+    return entry
+
+
+class _Registry:
+    """Device registry minimal indexé par identifiant."""
+
+    def __init__(self):
+        self.devices = {}
+        self.async_get_or_create = MagicMock(side_effect=self._get_or_create)
+
+    def async_get_device(self, identifiers):
+        ((_, identifier),) = identifiers
+        return self.devices.get(identifier)
+
+    def _get_or_create(self, config_entry_id, identifiers, name, manufacturer, model):
+        ((_, identifier),) = identifiers
+        device = MagicMock(
+            config_entries={config_entry_id}, manufacturer=manufacturer, model=model
+        )
+        device.name = name
+        self.devices[identifier] = device
+        return device
+
+
+def test_device_identifier_variants():
+    """L'identifiant suit les règles historiques (device_id, house/unit, nom)."""
+    assert device_identifier(DEVICES[0], 0) == "AC_02382C82_0"
+    assert device_identifier(DEVICES[1], 1) == "ARC_A_1_1"
+    assert device_identifier(DEVICES[2], 2) == "AC_sans_code_2"
+
+
+def test_identities_cached_per_options_revision(mock_hass, mock_entry):
+    """Les identités ne sont recalculées que si la liste d'appareils change."""
+    first = async_get_device_identities(mock_hass, mock_entry)
+    assert async_get_device_identities(mock_hass, mock_entry) is first
+    assert [identity.identifier for identity in first] == [
+        "AC_02382C82_0", "ARC_A_1_1", "AC_sans_code_2",
+    ]
+
+    mock_entry.options = {"devices": list(DEVICES)}
+    assert async_get_device_identities(mock_hass, mock_entry) is not first
+
+
+def test_find_device_identity(mock_hass, mock_entry):
+    """Recherche d'un appareil par identifiant du registry."""
+    identity = async_find_device_identity(mock_hass, mock_entry, "ARC_A_1_1")
+    assert identity.index == 1
+    assert identity.device_type == "cover"
+    assert async_find_device_identity(mock_hass, mock_entry, "inconnu") is None
+
+
+def test_sync_skips_up_to_date_devices(mock_hass, mock_entry):
+    """Seuls les appareils absents ou modifiés sont écrits dans le registry."""
+    registry = _Registry()
+    batch = [("AC_02382C82_0", "Prise AC", PROTOCOL_AC), ("ARC_A_1_1", "Volet ARC", PROTOCOL_ARC)]
+
+    with patch("custom_components.rfxcom.device_identity.dr.async_get", return_value=registry):
+        assert async_sync_device_registry(mock_hass, mock_entry, batch) == 2
+        # Même révision: aucune écriture
+        assert async_sync_device_registry(mock_hass, mock_entry, batch) == 0
+
+        # Après redémarrage (cache vidé), les appareils inchangés sont ignorés
+        async_clear_device_identities(mock_hass, mock_entry)
+        assert async_sync_device_registry(mock_hass, mock_entry, batch) == 0
+
+        # Un renommage dans les options met l'appareil à jour
+        renamed = [("AC_02382C82_0", "Prise salon", PROTOCOL_AC)]
+        assert async_sync_device_registry(mock_hass, mock_entry, renamed) == 1
+
+    assert registry.async_get_or_create.call_count == 3
+    assert registry.devices["AC_02382C82_0"].name == "Prise salon"
+    assert registry.async_get_or_create.call_args.kwargs["manufacturer"] == MANUFACTURER
+
+
+def test_clear_device_identities(mock_hass, mock_entry):
+    """Le cache de l'entrée est supprimé au déchargement."""
+    async_get_device_identities(mock_hass, mock_entry)
+    assert "entry1" in mock_hass.data[DATA_DEVICE_IDENTITIES]
+    async_clear_device_identities(mock_hass, mock_entry)
+    assert "entry1" not in mock_hass.data[DATA_DEVICE_IDENTITIES]
+
+
+@pytest.mark.asyncio
+async def test_switch_setup_uses_single_registry_pass(mock_hass, mock_entry):
+    """La plateforme switch synchronise le registry en une seule passe."""
+    from custom_components.rfxcom.switch import async_setup_entry
+
+    mock_hass.data[DOMAIN] = {"entry1": MagicMock()}
+    registry = _Registry()
+    add_entities = MagicMock()
+    with patch("custom_components.rfxcom.device_identity.dr.async_get", return_value=registry) as get_registry:
+        await async_setup_entry(mock_hass, mock_entry, add_entities)
+
+    get_registry.assert_called_once()
+    entities = add_entities.call_args[0][0]
+    assert [entity._attr_unique_id for entity in entities] == [
+        "entry1_AC_02382C82_0", "entry1_AC_sans_code_2",
+    ]
@@ -0,0 +1,90 @@
+"""Tests pour les diagnostics et les compteurs de transport."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    PACKET_TYPE_LIGHTING2,
+    PACKET_TYPE_TEMP_HUM,
+    PROTOCOL_AC,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.diagnostics import async_get_config_entry_diagnostics
+from custom_components.rfxcom.metrics import (
+    DECODE_REJECTED,
+    DECODE_TOO_SHORT,
+    DECODE_TRUNCATED,
+    DECODE_UNKNOWN_TYPE,
+    DECODE_UNSUPPORTED_SUBTYPE,
+    TransportStats,
+)
+
+# Trame AC 02382C82 unité 1 ON
+AC_FRAME = bytes.fromhex("0B11000102382C8201010F70")
+
+
+@pytest.mark.parametrize(
+    ("packet", "reason"),
+    [
+        (bytes.fromhex("0311"), DECODE_TOO_SHORT),
+        (bytes.fromhex("0B7F000102382C8201010F70"), DECODE_UNKNOWN_TYPE),
+        (bytes.fromhex("0611000102382C"), DECODE_TRUNCATED),
+        (bytes([0x0A, PACKET_TYPE_TEMP_HUM, 0x01, 0, 0, 0, 0, 0, 0, 0, 0]), DECODE_UNSUPPORTED_SUBTYPE),
+        (bytes.fromhex("0B11070102382C8201010F70"), DECODE_REJECTED),
+    ],
+)
+def test_decode_failure_reason(packet, reason):
+    """Chaque trame non décodée est classée par raison."""
+    assert RFXCOMCoordinator._decode_failure_reason(packet) == reason
+
+
+@pytest.mark.asyncio
+async def test_received_frames_are_counted(make_coordinator):
+    """Trames reçues, échecs de décodage et doublons alimentent les compteurs."""
+    coordinator = make_coordinator("usb", data={"host": "192.168.1.10"})
+    coordinator.async_update_listeners = MagicMock()
+    for _ in range(3):
+        await coordinator._async_handle_packet(AC_FRAME)
+    await coordinator._async_handle_packet(bytes.fromhex("0311"))
+
+    stats = coordinator.stats
+    # La trame trop courte est reçue (type 0x11) même si elle n'est pas décodée
+    assert stats.frames_received[PACKET_TYPE_LIGHTING2] == 4
+    assert stats.decode_failures == {DECODE_TOO_SHORT: 1}
+    assert stats.dedupe_hits == 2
+    assert stats.top_devices(1) == [(f"{PROTOCOL_AC}_02382c82", 3)]
+
+
+def test_device_stats_are_bounded(monkeypatch):
+    """Le nombre d'appareils suivis est borné; les appareils connus restent comptés."""
+    monkeypatch.setattr("custom_components.rfxcom.metrics.DEVICE_STATS_MAX", 2)
+    stats = TransportStats()
+    for unique_id in ("a", "b", "c", "a"):
+        stats.device_seen(unique_id)
+    assert dict(stats.device_frames) == {"a": 2, "b": 1}
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics(make_coordinator):
+    """Les diagnostics exposent les compteurs, sans l'adresse de l'hôte."""
+    coordinator = make_coordinator("usb", data={"host": "192.168.1.10"})
+    coordinator.async_update_listeners = MagicMock()
+    coordinator._node_bridge = MagicMock()
+    coordinator._node_bridge.send_command = AsyncMock(return_value=True)
+    coordinator._node_bridge.stats = MagicMock(return_value={"requests": 1})
+    coordinator.scheduler.async_acquire = AsyncMock(return_value=0)
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    await coordinator._async_handle_packet(AC_FRAME)
+
+    data = await async_get_config_entry_diagnostics(coordinator.hass, coordinator.entry)
+
+    assert data["entry"]["host"] == "**REDACTED**"
+    assert data["frames"]["sent"] == {"lighting2": 1}
+    assert data["frames"]["received"] == {"lighting2": 1}
+    assert data["frames"]["discovered_cache_size"] == 1
+    assert data["commands"]["latency"]["total"]["count"] == 1
+    assert data["addon"] == {"requests": 1}
+    assert data["top_devices"] == [{"unique_id": f"{PROTOCOL_AC}_02382c82", "frames": 1}]
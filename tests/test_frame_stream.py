@@ -0,0 +1,192 @@
+"""Tests pour le flux des trames reçues par l'add-on, avec reprise par curseur."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.rfxcom.const import CONNECTION_TYPE_USB, FRAME_REPLAY_MAX_AGE
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.node_bridge_http import FrameCursor, NodeBridgeHTTP
+
+AC_ON = "0b11000102382c8201010f70"
+AC_OFF = "0b11000202382c8201000f70"
+
+
+class _AddonFrames:
+    """Add-on simulé: historique de trames numérotées, flux NDJSON repris par since."""
+
+    def __init__(self) -> None:
+        self.epoch = "e1"
+        self.history: list[tuple[int, str]] = []
+        self.first = 1
+        self.requests: list[dict[str, str]] = []
+        self.status = 200
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "initialized": True, "port": "/dev/ttyUSB0"})
+
+    async def init(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "success", "port": "/dev/ttyUSB0"})
+
+    async def frames(self, request: web.Request) -> web.StreamResponse:
+        query = dict(request.query)
+        self.requests.append(query)
+        if self.status != 200:
+            return web.json_response({"status": "error"}, status=self.status)
+        since = 0
+        if "since" in query:
+            since = int(query["since"]) if query.get("epoch") == self.epoch else 0
+        last = self.history[-1][0] if self.history else 0
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        hello = {"type": "hello", "epoch": self.epoch, "seq": last, "first": self.first,
+                 "missed": max(0, self.first - 1 - since) if "since" in query else 0}
+        await response.write(json.dumps(hello).encode() + b"\n\n")
+        for seq, frame in self.history:
+            if seq > since:
+                await response.write(json.dumps({"seq": seq, "t": 0, "hex": frame}).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+
+@pytest.fixture
+async def addon():
+    frames = _AddonFrames()
+    app = web.Application()
+    app.router.add_get("/health", frames.health)
+    app.router.add_post("/api/init", frames.init)
+    app.router.add_get("/api/frames", frames.frames)
+    server = TestServer(app)
+    await server.start_server()
+    frames.url = str(server.make_url("")).rstrip("/")
+    yield frames
+    await server.close()
+
+
+async def _collect(bridge: NodeBridgeHTTP) -> list[bytes]:
+    return [packet async for packet in bridge.async_iter_frames()]
+
+
+@pytest.mark.asyncio
+async def test_first_connection_replays_recent_frames(addon):
+    """Sans curseur, l'add-on rejoue les trames récentes; le curseur est mémorisé."""
+    addon.history = [(1, AC_ON), (2, AC_OFF)]
+    bridge = NodeBridgeHTTP(addon_url=addon.url, serial_port="/dev/ttyUSB0")
+    try:
+        assert await _collect(bridge) == [bytes.fromhex(AC_ON), bytes.fromhex(AC_OFF)]
+        assert addon.requests[0]["max_age"] == str(FRAME_REPLAY_MAX_AGE)
+        assert "since" not in addon.requests[0]
+        assert bridge.stats()["frame_stream"] == {
+            "epoch": "e1", "last_seq": 2, "frames": 2, "gaps": 0, "connects": 1,
+        }
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnection_resumes_after_cursor(addon):
+    """Après une coupure, seules les trames suivant le curseur sont reçues."""
+    addon.history = [(1, AC_ON)]
+    bridge = NodeBridgeHTTP(addon_url=addon.url)
+    try:
+        await _collect(bridge)
+        addon.history += [(2, AC_OFF), (3, AC_ON)]
+        assert await _collect(bridge) == [bytes.fromhex(AC_OFF), bytes.fromhex(AC_ON)]
+        assert addon.requests[1]["since"] == "1" and addon.requests[1]["epoch"] == "e1"
+        assert bridge.stats()["frame_stream"]["gaps"] == 0
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_gaps_and_addon_restart(addon):
+    """Trames sorties de l'historique comptées; un redémarrage repart de zéro."""
+    addon.history = [(1, AC_ON)]
+    bridge = NodeBridgeHTTP(addon_url=addon.url)
+    try:
+        await _collect(bridge)
+        # Historique dépassé pendant la coupure: séquences 2 à 4 perdues, 6 écartée
+        addon.first = 5
+        addon.history = [(5, AC_OFF), (7, AC_ON)]
+        assert len(await _collect(bridge)) == 2
+        assert bridge.stats()["frame_stream"]["gaps"] == 4
+
+        addon.epoch, addon.first, addon.history = "e2", 1, [(1, AC_OFF)]
+        assert await _collect(bridge) == [bytes.fromhex(AC_OFF)]
+        assert bridge.stats()["frame_stream"]["last_seq"] == 1
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_addon_without_frame_stream(addon):
+    """Un add-on sans /api/frames désactive la réception sans erreur."""
+    addon.status = 404
+    bridge = NodeBridgeHTTP(addon_url=addon.url)
+    try:
+        assert await _collect(bridge) == []
+        assert not bridge.frame_stream_available
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_cursors_are_independent(addon):
+    """Deux consommateurs du même bridge reçoivent chacun toutes les trames."""
+    addon.history = [(1, AC_ON), (2, AC_OFF)]
+    bridge = NodeBridgeHTTP(addon_url=addon.url)
+    first, second = FrameCursor(), FrameCursor()
+    try:
+        frames = [packet async for packet in bridge.async_iter_frames(first)]
+        assert [packet async for packet in bridge.async_iter_frames(second)] == frames
+        assert len(frames) == 2
+        assert first.seq == second.seq == 2
+        # Le curseur par défaut du bridge n'a pas bougé
+        assert bridge.stats()["frame_stream"]["last_seq"] == 0
+        assert bridge.stats(first)["frame_stream"]["frames"] == 2
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_two_entries_on_one_usb_port(addon):
+    """Deux entrées du même port série partagent le bridge et reçoivent chacune le flux."""
+    hass = MagicMock()
+    hass.data = {}
+    addon.history = [(1, AC_ON), (2, AC_OFF), (3, AC_ON)]
+    coordinators = []
+    received: dict[str, list[bytes]] = {}
+    for entry_id in ("a", "b"):
+        entry = MagicMock()
+        entry.entry_id = entry_id
+        entry.data = {"connection_type": CONNECTION_TYPE_USB, "port": "/dev/ttyUSB0", "auto_registry": True}
+        entry.options = {}
+        coordinator = RFXCOMCoordinator(hass, entry)
+        packets = received[entry_id] = []
+
+        async def _handle(packet: bytes, source: str | None = None, packets=packets) -> None:
+            packets.append(packet)
+
+        coordinator._async_handle_packet = _handle
+        coordinators.append(coordinator)
+
+    with patch("custom_components.rfxcom.node_bridge_http.DEFAULT_ADDON_URL", addon.url):
+        try:
+            for coordinator in coordinators:
+                await coordinator.async_setup()
+            assert coordinators[0]._node_bridge is coordinators[1]._node_bridge
+            for _ in range(200):
+                if all(len(packets) == 3 for packets in received.values()):
+                    break
+                await asyncio.sleep(0.01)
+            assert received["a"] == received["b"] == [
+                bytes.fromhex(AC_ON), bytes.fromhex(AC_OFF), bytes.fromhex(AC_ON)
+            ]
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
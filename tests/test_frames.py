@@ -0,0 +1,81 @@
+"""Tests pour les templates de trames RFXtrx précompilés."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_OFF,
+    CMD_ON,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+    PROTOCOL_BLYSS,
+    PROTOCOL_IKEA_KOPPLA,
+    PROTOCOL_LIGHTWAVERF,
+    PROTOCOL_PT2262,
+)
+from custom_components.rfxcom.frames import FrameTemplate, compile_frame_template
+
+
+@pytest.mark.parametrize(
+    ("protocol", "device_id", "house_code", "unit_code", "build"),
+    [
+        (PROTOCOL_ARC, "", "B", "3",
+         lambda c, cmd: c._build_lighting1_command(PROTOCOL_ARC, 0x01, "B", "3", cmd)),
+        (PROTOCOL_AC, "02382C82", None, "2",
+         lambda c, cmd: c._build_lighting2_command(PROTOCOL_AC, 0x00, "02382C82", cmd, 2)),
+        (PROTOCOL_IKEA_KOPPLA, "0A1B", None, "4",
+         lambda c, cmd: c._build_lighting3_command(PROTOCOL_IKEA_KOPPLA, "0A1B", "4", cmd)),
+        (PROTOCOL_PT2262, "123456", None, None,
+         lambda c, cmd: c._build_lighting4_command(PROTOCOL_PT2262, "123456", cmd)),
+        (PROTOCOL_LIGHTWAVERF, "F00D01", None, "2",
+         lambda c, cmd: c._build_lighting5_command(PROTOCOL_LIGHTWAVERF, 0x00, "F00D01", "2", cmd)),
+        (PROTOCOL_BLYSS, "BEEF", None, None,
+         lambda c, cmd: c._build_lighting6_command(PROTOCOL_BLYSS, "BEEF", cmd)),
+    ],
+)
+def test_template_matches_builder(protocol, device_id, house_code, unit_code, build, make_coordinator):
+    """La trame issue du template est identique à celle des constructeurs historiques."""
+    coordinator = make_coordinator()
+    for command in (CMD_ON, CMD_OFF):
+        coordinator._sequence_number = 41
+        frame = coordinator._build_command_frame(protocol, device_id, command, house_code, unit_code)
+        coordinator._sequence_number = 41
+        assert frame == build(coordinator, command)
+        assert 42 in frame
+
+
+def test_render_patches_only_sequence_byte():
+    """Le rendu ne modifie que l'octet de séquence et retourne des trames distinctes."""
+    template = compile_frame_template(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    first = template.render(1)
+    second = template.render(2)
+    assert first[3] == 1 and second[3] == 2
+    assert first[:3] == second[:3] and first[4:] == second[4:]
+    assert len(template) == 12
+
+
+def test_templates_are_compiled_once(make_coordinator):
+    """Les templates sont mis en cache: le hex n'est converti qu'une fois par commande."""
+    coordinator = make_coordinator()
+    coordinator.prepare_command_frames(PROTOCOL_AC, "02382C82", None, "1")
+    assert len(coordinator._frame_templates) == 2
+    cached = dict(coordinator._frame_templates)
+
+    frames = [coordinator._build_command_frame(PROTOCOL_AC, "02382C82", CMD_ON, None, "1") for _ in range(3)]
+    assert coordinator._frame_templates == cached
+    assert [frame[3] for frame in frames] == [1, 2, 3]
+
+
+def test_prepare_is_noop_over_usb(make_coordinator):
+    """En USB, l'add-on construit les trames: rien n'est précompilé."""
+    coordinator = make_coordinator("usb")
+    coordinator.prepare_command_frames(PROTOCOL_ARC, "", "A", "1")
+    assert coordinator._frame_templates == {}
+
+
+def test_unsupported_protocol_is_not_cached(make_coordinator):
+    """Un protocole inconnu ne produit ni trame ni entrée de cache."""
+    coordinator = make_coordinator()
+    assert coordinator._build_command_frame("INCONNU", "01", CMD_ON) is None
+    assert coordinator._frame_templates == {}
+    assert isinstance(compile_frame_template(PROTOCOL_ARC, "", CMD_ON, "A", "1"), FrameTemplate)
@@ -0,0 +1,299 @@
+"""Tests pour les commandes de groupe (trames de groupe RF et rafale)."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_GROUP_OFF,
+    CMD_GROUP_ON,
+    CMD_OFF,
+    CMD_ON,
+    CONF_TRANSCEIVERS,
+    DOMAIN,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+    PROTOCOL_PT2262,
+)
+
+ARC_A1 = {"name": "A1", "protocol": PROTOCOL_ARC, "house_code": "A", "unit_code": "1"}
+ARC_A2 = {"name": "A2", "protocol": PROTOCOL_ARC, "house_code": "A", "unit_code": "2"}
+ARC_B1 = {"name": "B1", "protocol": PROTOCOL_ARC, "house_code": "B", "unit_code": "1"}
+AC_1 = {"name": "AC1", "protocol": PROTOCOL_AC, "device_id": "02382C82", "unit_code": "1"}
+AC_2 = {"name": "AC2", "protocol": PROTOCOL_AC, "device_id": "02382C82", "unit_code": "2"}
+PT = {"name": "PT", "protocol": PROTOCOL_PT2262, "device_id": "123456"}
+
+
+def test_plan_uses_native_group_frames_on_network(make_coordinator):
+    """Toutes les unités d'une house code / d'un ID: une seule trame de groupe chacun."""
+    coordinator = make_coordinator("network", options={"devices": [ARC_A1, ARC_A2, ARC_B1, AC_1, AC_2, PT]})
+    operations = coordinator._plan_group_command([ARC_A1, ARC_A2, AC_1, AC_2, PT], CMD_ON)
+    assert sorted(operations) == sorted([
+        (PROTOCOL_PT2262, "123456", None, None, CMD_ON),
+        (PROTOCOL_ARC, "", "A", None, CMD_GROUP_ON),
+        (PROTOCOL_AC, "02382C82", None, None, CMD_GROUP_ON),
+    ])
+
+
+def test_plan_falls_back_when_group_would_touch_other_devices(make_coordinator):
+    """Une trame de groupe n'est pas utilisée si elle toucherait un appareil non sélectionné."""
+    coordinator = make_coordinator("network", options={"devices": [ARC_A1, ARC_A2, {**ARC_A2, "unit_code": "3"}]})
+    operations = coordinator._plan_group_command([ARC_A1, ARC_A2], CMD_OFF)
+    assert [op[4] for op in operations] == [CMD_OFF, CMD_OFF]
+
+
+def test_plan_without_native_groups_over_usb(make_coordinator):
+    """En USB (add-on), chaque appareil reçoit sa propre commande."""
+    coordinator = make_coordinator("usb", options={"devices": [ARC_A1, ARC_A2]})
+    operations = coordinator._plan_group_command([ARC_A1, ARC_A2, ARC_A1], CMD_ON)
+    assert len(operations) == 2
+    assert all(op[4] == CMD_ON for op in operations)
+
+
+def test_group_frames_bytes(make_coordinator):
+    """Codes de commande de groupe Lighting1 (0x06/0x05) et Lighting2 (0x04/0x03)."""
+    coordinator = make_coordinator()
+    lighting1 = coordinator._build_command_frame(PROTOCOL_ARC, "", CMD_GROUP_ON, "A", None)
+    assert lighting1[4:7] == bytes([ord("A"), 0x00, 0x06])
+    lighting1_off = coordinator._build_command_frame(PROTOCOL_ARC, "", CMD_GROUP_OFF, "A", None)
+    assert lighting1_off[6] == 0x05
+
+    lighting2 = coordinator._build_command_frame(PROTOCOL_AC, "02382C82", CMD_GROUP_OFF)
+    assert lighting2[9:11] == bytes([0x03, 0x00])
+    lighting2_on = coordinator._build_command_frame(PROTOCOL_AC, "02382C82", CMD_GROUP_ON)
+    assert lighting2_on[9:11] == bytes([0x04, 0x0F])
+
+
+@pytest.mark.asyncio
+async def test_network_group_sends_each_frame(make_coordinator):
+    """En réseau, chaque trame (de groupe ou isolée) est émise par le chemin d'une commande."""
+    coordinator = make_coordinator("network", options={"devices": [ARC_A1, ARC_A2, PT]})
+    coordinator.socket = MagicMock()
+
+    with patch("custom_components.rfxcom.coordinator.asyncio.sleep", new=AsyncMock()):
+        assert await coordinator.async_send_group_command([ARC_A1, ARC_A2, PT], CMD_ON) is True
+
+    calls = coordinator.hass.async_add_executor_job.await_args_list
+    assert [call.args[0] for call in calls] == [coordinator.socket.sendall] * 2
+    frames = {call.args[1][1]: call.args[1] for call in calls}
+    assert frames[0x10][6] == 0x06  # Lighting1 all on
+    assert 0x13 in frames  # Lighting4 (PT2262)
+
+
+@pytest.mark.asyncio
+async def test_network_group_fails_over_through_pool(make_coordinator):
+    """Avec un pool, les trames de groupe suivent le choix de l'unité et la bascule."""
+    coordinator = make_coordinator(
+        data={CONF_TRANSCEIVERS: [{"name": "garage", "connection_type": "network", "host": "10.0.0.2"}]},
+        options={"devices": [ARC_A1, ARC_A2]},
+    )
+    coordinator._async_send_primary_locked = AsyncMock(return_value=False)
+    garage = coordinator.pool.get("garage")
+    garage.available = True
+    garage.socket = MagicMock()
+
+    assert await coordinator.async_send_group_command([ARC_A1, ARC_A2], CMD_OFF) is True
+    coordinator._async_send_primary_locked.assert_awaited_once()
+    frame = coordinator.hass.async_add_executor_job.await_args.args[1]
+    assert frame[1] == 0x10 and frame[6] == 0x05  # Lighting1 all off
+    assert coordinator.pool.failovers == 1
+    assert garage.frames_sent == 1
+
+
+@pytest.mark.asyncio
+async def test_network_group_nak_leaves_device_state(make_coordinator):
+    """Une trame refusée (NAK) fait échouer le groupe et ne change pas l'état de son appareil."""
+    from custom_components.rfxcom.switch import RFXCOMSwitch
+
+    coordinator = make_coordinator("network", options={"devices": [ARC_A1, ARC_A2, PT]})
+    coordinator.socket = MagicMock()
+    coordinator._receive_task = MagicMock()
+
+    async def _executor(func, *args):
+        frame = args[0]
+        # Le RFXtrx refuse la trame Lighting4, accepte la trame de groupe Lighting1
+        response = 0x02 if frame[1] == 0x13 else 0x00
+        asyncio.get_running_loop().call_soon(
+            asyncio.ensure_future,
+            coordinator._async_handle_packet(bytes([0x04, 0x02, 0x01, frame[3], response])),
+        )
+
+    coordinator.hass.async_add_executor_job = _executor
+    switches = [
+        RFXCOMSwitch(coordinator, device["name"], device["protocol"], device.get("device_id"),
+                     device.get("house_code"), device.get("unit_code"))
+        for device in (ARC_A1, ARC_A2, PT)
+    ]
+    for entity in switches:
+        entity.async_write_ha_state = MagicMock()
+        await entity.async_added_to_hass()
+
+    with patch("custom_components.rfxcom.coordinator.asyncio.sleep", new=AsyncMock()):
+        assert await coordinator.async_send_group_command([ARC_A1, ARC_A2, PT], CMD_ON) is False
+    assert [switch.is_on for switch in switches] == [True, True, False]
+    switches[2].async_write_ha_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_usb_group_sends_each_device_in_turn(make_coordinator):
+    """En USB, les commandes sont envoyées à la suite via l'add-on."""
+    coordinator = make_coordinator("usb", options={"devices": [ARC_A1, AC_1]})
+    coordinator._async_send_command_locked = AsyncMock(side_effect=[True, False])
+    assert await coordinator.async_send_group_command([ARC_A1, AC_1], CMD_OFF) is False
+    assert coordinator._async_send_command_locked.await_count == 2
+    assert not coordinator._lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_user_command_interleaves_with_usb_group(make_coordinator):
+    """Un toggle utilisateur passe entre deux commandes d'une scène USB."""
+    coordinator = make_coordinator("usb")
+    sent = []
+    gates = [asyncio.Event() for _ in range(4)]
+
+    async def _send_locked(protocol, device_id, command, house_code=None, unit_code=None, **kwargs):
+        sent.append(unit_code)
+        await gates[len(sent) - 1].wait()
+        return True
+
+    coordinator._async_send_command_locked = _send_locked
+    scene = asyncio.create_task(coordinator.async_send_group_command(
+        [{"protocol": PROTOCOL_AC, "device_id": "0A", "unit_code": str(unit)} for unit in (1, 2, 3)],
+        CMD_ON,
+    ))
+    await asyncio.sleep(0)
+    user = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0B", CMD_ON, unit_code="9"))
+    await asyncio.sleep(0)
+    for gate in gates:
+        gate.set()
+    assert await scene and await user
+    assert sent == ["1", "9", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_network_group_takes_lock_and_airtime_per_frame(make_coordinator):
+    """En réseau, un toggle utilisateur passe entre deux trames; l'antenne est réservée sous le verrou."""
+    coordinator = make_coordinator()
+    coordinator.socket = MagicMock()
+    sent = []
+    acquired_locked = []
+
+    async def _acquire(airtime_ms, frames=1, enqueued_at=None):
+        acquired_locked.append(coordinator._lock.locked())
+        await asyncio.sleep(0)
+        return 0
+
+    async def _executor(func, *args):
+        sent.append(args[0][4:8])
+        # Première trame en cours d'écriture: la commande utilisateur se met en file
+        while len(sent) == 1 and not coordinator.queue_depth:
+            await asyncio.sleep(0)
+
+    coordinator.scheduler.async_acquire = _acquire
+    coordinator.hass.async_add_executor_job = _executor
+    scene = asyncio.create_task(coordinator.async_send_group_command(
+        [{"protocol": PROTOCOL_PT2262, "device_id": f"00000{unit}"} for unit in (1, 2, 3)],
+        CMD_ON,
+    ))
+    await asyncio.sleep(0)
+    user = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0000000B", CMD_ON, unit_code="9"))
+    assert await scene and await user
+    # La commande utilisateur part après la première trame de la scène
+    assert sent[1][:4] == bytes.fromhex("0000000B")
+    assert len(sent) == 4
+    assert acquired_locked == [True] * 4
+
+
+@pytest.mark.asyncio
+async def test_group_command_service_resolves_entities_and_devices():
+    """Le service résout entités et appareils vers les appareils RFXCOM configurés."""
+    from custom_components.rfxcom.services import async_setup_services
+
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    entry.options = {"devices": [ARC_A1, ARC_A2]}
+    coordinator = MagicMock()
+    coordinator.async_send_group_command = AsyncMock(return_value=True)
+
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry1": coordinator}}
+    hass.config_entries.async_entries = MagicMock(return_value=[entry])
+    hass.services.async_register = MagicMock()
+
+    devices = {
+        "dev1": MagicMock(config_entries={"entry1"}, identifiers={(DOMAIN, "ARC_A_1_0")}),
+        "dev2": MagicMock(config_entries={"entry1"}, identifiers={(DOMAIN, "ARC_A_2_1")}),
+    }
+    device_registry = MagicMock()
+    device_registry.async_get = MagicMock(side_effect=devices.get)
+    entity_registry = MagicMock()
+    entity_registry.async_get = MagicMock(return_value=MagicMock(device_id="dev1"))
+
+    await async_setup_services(hass)
+    handler = next(
+        call.args[2]
+        for call in hass.services.async_register.call_args_list
+        if call.args[1] == "group_command"
+    )
+
+    call = MagicMock()
+    call.data = {"entity_id": ["switch.a1"], "device_id": ["dev1", "dev2"], "command": "on"}
+    with patch("custom_components.rfxcom.services.dr.async_get", return_value=device_registry), \
+         patch("custom_components.rfxcom.services.er.async_get", return_value=entity_registry):
+        await handler(call)
+
+    coordinator.async_send_group_command.assert_awaited_once_with([ARC_A1, ARC_A2], CMD_ON)
+
+
+@pytest.mark.asyncio
+async def test_group_command_updates_targeted_entities(make_coordinator):
+    """Après une scène, les entités des appareils commandés reflètent la commande."""
+    from custom_components.rfxcom.cover import RFXCOMCover
+    from custom_components.rfxcom.switch import RFXCOMSwitch
+
+    coordinator = make_coordinator("network", options={"devices": [ARC_A1, ARC_A2, PT]})
+    coordinator.socket = MagicMock()
+    switches = [
+        RFXCOMSwitch(coordinator, device["name"], device["protocol"], device.get("device_id"),
+                     device.get("house_code"), device.get("unit_code"))
+        for device in (ARC_A1, ARC_A2, PT)
+    ]
+    cover = RFXCOMCover(coordinator, "Volet", PROTOCOL_AC, "02382C82", unit_code="1")
+    for entity in (*switches, cover):
+        entity.async_write_ha_state = MagicMock()
+        await entity.async_added_to_hass()
+
+    with patch("custom_components.rfxcom.coordinator.asyncio.sleep", new=AsyncMock()):
+        assert await coordinator.async_send_group_command([ARC_A1, ARC_A2], CMD_ON) is True
+    assert [switch.is_on for switch in switches] == [True, True, False]
+    switches[0].async_write_ha_state.assert_called_once()
+    switches[2].async_write_ha_state.assert_not_called()
+
+    with patch("custom_components.rfxcom.coordinator.asyncio.sleep", new=AsyncMock()):
+        assert await coordinator.async_send_group_command([ARC_A2, AC_1], CMD_OFF) is True
+    assert [switch.is_on for switch in switches] == [True, False, False]
+    assert cover.is_closed is True
+
+    # Entité retirée: plus de mise à jour
+    for remove in switches[0]._on_remove:
+        remove()
+    with patch("custom_components.rfxcom.coordinator.asyncio.sleep", new=AsyncMock()):
+        await coordinator.async_send_group_command([ARC_A1], CMD_OFF)
+    assert switches[0].is_on is True
+
+
+@pytest.mark.asyncio
+async def test_usb_group_updates_only_successful_devices(make_coordinator):
+    """En USB, seuls les appareils dont la commande a abouti changent d'état."""
+    from custom_components.rfxcom.switch import RFXCOMSwitch
+
+    coordinator = make_coordinator("usb", options={"devices": [ARC_A1, AC_1]})
+    coordinator._async_send_command_locked = AsyncMock(side_effect=[True, False])
+    arc = RFXCOMSwitch(coordinator, "A1", PROTOCOL_ARC, house_code="A", unit_code="1")
+    ac = RFXCOMSwitch(coordinator, "AC1", PROTOCOL_AC, device_id="02382C82", unit_code="1")
+    for entity in (arc, ac):
+        await entity.async_added_to_hass()
+    assert await coordinator.async_send_group_command([ARC_A1, AC_1], CMD_ON) is False
+    assert arc.is_on is True and ac.is_on is False
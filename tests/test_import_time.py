@@ -0,0 +1,107 @@
+"""Benchmark du temps d'import de l'intégration (python -X importtime).
+
+Le chargement différé des modules est vérifié à chaque exécution; le budget
+de temps d'import, sensible à la charge de la machine, uniquement avec --bench:
+
+    pytest tests/test_import_time.py --bench -s
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# Budget cumulé pour `import custom_components.rfxcom` (microsecondes)
+IMPORT_TIME_BUDGET_US = 250_000
+
+# Modules qui ne doivent être chargés que si la connexion ou le flux en a besoin
+DEFERRED_MODULES = [
+    "serial",
+    "aiohttp",
+    "voluptuous",
+    "custom_components.rfxcom.services",
+    "custom_components.rfxcom.node_bridge_http",
+    "custom_components.rfxcom.config_flow",
+]
+
+# Même principe que conftest.py: Home Assistant est simulé dans le sous-processus
+BOOTSTRAP = """
+import json
+import sys
+from unittest.mock import MagicMock
+
+for name in (
+    "homeassistant",
+    "homeassistant.config_entries",
+    "homeassistant.core",
+    "homeassistant.const",
+    "homeassistant.exceptions",
+    "homeassistant.helpers",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.update_coordinator",
+):
+    sys.modules[name] = MagicMock()
+
+
+class DataUpdateCoordinator:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+sys.modules["homeassistant.helpers.update_coordinator"].DataUpdateCoordinator = DataUpdateCoordinator
+
+import {module}
+
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _import_with_importtime(module: str) -> tuple[set[str], dict[str, int]]:
+    """Importe un module dans un interpréteur neuf avec -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOTSTRAP.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    # Format: "import time: self [us] | cumulative | imported package"
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumul, name = line.split("|")
+            cumulative[name.strip()] = int(cumul)
+        except ValueError:
+            continue
+    return loaded, cumulative
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["custom_components.rfxcom", "custom_components.rfxcom.coordinator"],
+)
+def test_transport_and_flow_modules_are_deferred(module):
+    """L'import de l'intégration ne charge ni les transports ni le flux de configuration."""
+    loaded, _ = _import_with_importtime(module)
+    unexpected = [name for name in DEFERRED_MODULES if name in loaded]
+    assert unexpected == []
+
+
+def test_integration_import_time_budget(request):
+    """Le temps d'import cumulé de l'intégration reste sous le budget."""
+    if not request.config.getoption("--bench"):
+        pytest.skip("budget de temps d'import désactivé (option --bench)")
+    _, cumulative = _import_with_importtime("custom_components.rfxcom")
+    import_time_us = cumulative["custom_components.rfxcom"]
+    print(f"\nimport custom_components.rfxcom: {import_time_us} us")
+    assert import_time_us < IMPORT_TIME_BUDGET_US
@@ -101,7 +101,7 @@ class TestInit:
         mock_hass.data[DOMAIN] = {mock_entry.entry_id: mock_coord}
         mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
         
-        with patch('custom_components.rfxcom.async_unload_services', new_callable=AsyncMock):
+        with patch('custom_components.rfxcom.services.async_unload_services', new_callable=AsyncMock):
             result = await async_unload_entry(mock_hass, mock_entry)
             assert result is True
             assert mock_coord.async_shutdown.called
@@ -117,7 +117,7 @@ class TestInit:
         }
         mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
         
-        with patch('custom_components.rfxcom.async_unload_services', new_callable=AsyncMock) as mock_unload:
+        with patch('custom_components.rfxcom.services.async_unload_services', new_callable=AsyncMock) as mock_unload:
             result = await async_unload_entry(mock_hass, mock_entry)
             assert result is True
             # Ne doit pas décharger les services si d'autres entrées existent
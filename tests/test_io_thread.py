@@ -0,0 +1,164 @@
+"""Tests pour la lecture réseau sur un thread dédié."""
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import CONNECTION_TYPE_NETWORK, IO_THREAD_NAME
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.metrics import DECODE_INVALID_LENGTH
+from custom_components.rfxcom.transport import (
+    IOThreadReader,
+    SharedTransport,
+    get_registry,
+    split_frames,
+    transport_key,
+)
+
+AC_ON = bytes.fromhex("0B11000102382C8201010F70")
+AC_OFF = bytes.fromhex("0B11000202382C8201000F70")
+
+
+@pytest.fixture
+def pair():
+    ha_side, rfxtrx_side = socket.socketpair()
+    ha_side.settimeout(5.0)
+    yield ha_side, rfxtrx_side
+    ha_side.close()
+    rfxtrx_side.close()
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    """Attend qu'une condition soit vraie, sans bloquer la boucle."""
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition non atteinte")
+
+
+def _io_threads() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name == IO_THREAD_NAME]
+
+
+def test_split_frames_keeps_partial_frame():
+    """Les trames complètes sont extraites; la fin incomplète attend la suite."""
+    buffer = bytearray(AC_ON + b"\x00" + AC_OFF[:5])
+    assert split_frames(buffer) == [(AC_ON, None), (None, DECODE_INVALID_LENGTH)]
+    assert buffer == AC_OFF[:5]
+    buffer += AC_OFF[5:]
+    assert split_frames(buffer) == [(AC_OFF, None)]
+    assert buffer == bytearray()
+
+
+@pytest.mark.asyncio
+async def test_reader_delivers_batches_on_caller_loop(pair):
+    """Les trames d'une lecture arrivent en un lot, dans l'ordre, sur la boucle HA."""
+    ha_side, rfxtrx_side = pair
+    batches = []
+    main_thread = threading.get_ident()
+
+    def deliver(items):
+        assert threading.get_ident() == main_thread
+        batches.append(items)
+
+    reader = IOThreadReader(ha_side, deliver, asyncio.get_running_loop())
+    reader.start()
+    rfxtrx_side.sendall(AC_ON + AC_OFF[:4])
+    await _wait_for(lambda: batches)
+    rfxtrx_side.sendall(AC_OFF[4:])
+    await _wait_for(lambda: len(batches) == 2)
+
+    assert batches == [[(AC_ON, None)], [(AC_OFF, None)]]
+    # La socket d'origine garde son délai d'attente pour les émissions
+    assert ha_side.gettimeout() == 5.0
+
+    reader.stop()
+    assert await asyncio.wait_for(reader.done, 2) is None
+    await _wait_for(lambda: not _io_threads())
+
+
+@pytest.mark.asyncio
+async def test_reader_reports_closed_connection(pair):
+    """La fermeture par le RFXtrx termine la lecture avec une erreur."""
+    ha_side, rfxtrx_side = pair
+    reader = IOThreadReader(ha_side, MagicMock(), asyncio.get_running_loop())
+    reader.start()
+    rfxtrx_side.close()
+    assert isinstance(await asyncio.wait_for(reader.done, 2), ConnectionError)
+
+
+@pytest.mark.asyncio
+async def test_shared_transport_reads_on_thread(pair):
+    """En mode thread dédié, les abonnés reçoivent les trames par lots."""
+    ha_side, rfxtrx_side = pair
+    transport = SharedTransport(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    transport.io_thread = True
+    transport.socket = ha_side
+    frames = transport.subscribe("entry", MagicMock())
+
+    rfxtrx_side.sendall(AC_ON + AC_OFF)
+    assert await asyncio.wait_for(frames.get(), 2) == (AC_ON, None)
+    assert await asyncio.wait_for(frames.get(), 2) == (AC_OFF, None)
+    assert transport.stats()["io_thread"] is True
+    assert 1 <= transport.batches <= 2
+
+    transport.unsubscribe("entry")
+    await _wait_for(lambda: not _io_threads())
+
+
+def test_entry_option_enables_io_thread():
+    """L'option d'une entrée active le thread dédié du transport partagé."""
+    hass = MagicMock()
+    hass.data = {}
+    entry = MagicMock()
+    entry.data = {"connection_type": CONNECTION_TYPE_NETWORK, "host": "rfx.local", "network_port": 10001}
+    entry.options = {"io_thread": True}
+    coordinator = RFXCOMCoordinator(hass, entry)
+    coordinator._acquire_transport()
+
+    assert coordinator._transport.io_thread
+    other = get_registry(hass).acquire(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    assert other is coordinator._transport and other.io_thread
+
+
+@pytest.mark.asyncio
+async def test_closed_connection_is_reopened_by_transport(pair):
+    """Une connexion fermée par le RFXtrx est rouverte sans attendre d'émission."""
+    ha_side, rfxtrx_side = pair
+    new_ha_side, new_rfxtrx_side = socket.socketpair()
+    hass = MagicMock()
+
+    async def async_add_executor_job(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = async_add_executor_job
+    transport = SharedTransport(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    transport.io_thread = True
+    transport.socket = ha_side
+
+    async def async_connect(hass):
+        transport.socket = new_ha_side
+        transport.connects += 1
+        return True
+
+    transport.async_connect = async_connect
+    frames = transport.subscribe("entry", hass)
+    try:
+        rfxtrx_side.close()
+        await _wait_for(lambda: transport.socket is new_ha_side)
+        # L'ancienne socket est fermée: plus de lecture relancée dessus
+        assert ha_side.fileno() == -1
+        assert transport.connects == 1
+
+        new_rfxtrx_side.sendall(AC_ON)
+        assert await asyncio.wait_for(frames.get(), 2) == (AC_ON, None)
+    finally:
+        transport.unsubscribe("entry")
+        await _wait_for(lambda: not _io_threads())
+        new_ha_side.close()
+        new_rfxtrx_side.close()
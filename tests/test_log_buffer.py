@@ -0,0 +1,99 @@
+"""Tests pour le tampon de logs à formatage différé."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from custom_components.rfxcom import log_handler
+from custom_components.rfxcom.log_handler import (
+    clear_logs,
+    get_logs,
+    reset_capture_levels,
+    set_capture_level,
+    setup_log_handler,
+)
+
+
+class _Counting:
+    """Argument qui compte ses conversions en texte."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "valeur"
+
+
+@pytest.fixture
+def logger():
+    clear_logs()
+    reset_capture_levels()
+    handler = setup_log_handler()
+    # Logger hors du registre: le handler de capture de pytest formaterait chaque log
+    logger = logging.Logger("custom_components.rfxcom.test_buffer", logging.DEBUG)
+    logger.addHandler(handler)
+    yield logger
+    logger.removeHandler(handler)
+    reset_capture_levels()
+    clear_logs()
+
+
+def test_formatting_is_deferred_to_read(logger):
+    """Le message n'est formaté qu'à la lecture du tampon."""
+    arg = _Counting()
+    logger.debug("Paquet %s", arg)
+    assert arg.calls == 0
+
+    logs = get_logs()
+    assert arg.calls == 1
+    assert logs[-1]["message"].endswith("custom_components.rfxcom.test_buffer: Paquet valeur")
+    assert logs[-1]["level"] == "DEBUG"
+    assert logs[-1]["logger"] == "custom_components.rfxcom.test_buffer"
+
+
+def test_buffer_is_bounded(logger):
+    """Le tampon circulaire conserve les entrées les plus récentes."""
+    for index in range(log_handler.LOG_BUFFER_SIZE + 5):
+        logger.info("Message %d", index)
+    logs = get_logs(limit=log_handler.LOG_BUFFER_SIZE * 2)
+    assert len(logs) == log_handler.LOG_BUFFER_SIZE
+    assert logs[0]["message"].endswith("Message 5")
+
+
+def test_capture_thresholds(logger):
+    """Seuils de capture par défaut et par logger."""
+    set_capture_level(logging.INFO)
+    logger.debug("ignoré")
+    logger.info("capturé")
+    set_capture_level(logging.DEBUG, logger.name)
+    logger.debug("capturé aussi")
+    other = logging.Logger("custom_components.rfxcom.other_buffer", logging.DEBUG)
+    other.addHandler(logger.handlers[0])
+    other.debug("ignoré")
+
+    messages = [log["message"] for log in get_logs()]
+    assert len(messages) == 2
+    assert all("capturé" in message for message in messages)
+
+
+def test_handler_level_follows_lowest_threshold(logger):
+    """Sous tous les seuils, logging écarte le log avant d'appeler le handler."""
+    handler = logger.handlers[0]
+    set_capture_level(logging.WARNING)
+    assert handler.level == logging.WARNING
+    set_capture_level(logging.INFO, "custom_components.rfxcom.coordinator")
+    assert handler.level == logging.INFO
+
+
+def test_bad_arguments_and_exceptions(logger):
+    """Les erreurs de formatage n'empêchent pas la lecture; les traces sont conservées."""
+    logger.info("Deux %s %s", "arguments")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Échec")
+    logs = get_logs()
+    assert "Deux %s %s" in logs[0]["message"]
+    assert "ValueError: boom" in logs[1]["message"]
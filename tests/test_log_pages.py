@@ -0,0 +1,99 @@
+"""Tests pour la pagination du tampon de logs par curseur."""
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.rfxcom import log_handler
+from custom_components.rfxcom.log_handler import (
+    clear_logs,
+    get_log_page,
+    reset_capture_levels,
+    setup_log_handler,
+)
+
+
+@pytest.fixture
+def logger():
+    clear_logs()
+    reset_capture_levels()
+    handler = setup_log_handler()
+    # Logger hors du registre: le handler de capture de pytest formaterait chaque log
+    logger = logging.Logger("custom_components.rfxcom.coordinator", logging.DEBUG)
+    logger.addHandler(handler)
+    yield logger
+    clear_logs()
+
+
+def _messages(page):
+    return [entry["message"].rsplit(": ", 1)[1] for entry in page["entries"]]
+
+
+def test_latest_page_and_older_pages(logger):
+    """Sans curseur, la page la plus récente; before remonte dans le temps."""
+    for index in range(12):
+        logger.info("m%d", index)
+
+    page = get_log_page(limit=5)
+    assert _messages(page) == ["m7", "m8", "m9", "m10", "m11"]
+    assert page["has_more"]
+
+    older = get_log_page(before=page["first"], limit=5)
+    assert _messages(older) == ["m2", "m3", "m4", "m5", "m6"]
+    oldest = get_log_page(before=older["first"], limit=5)
+    assert _messages(oldest) == ["m0", "m1"]
+    assert not oldest["has_more"]
+
+
+def test_since_cursor_returns_new_entries(logger):
+    """since retourne les logs suivant le curseur, dans l'ordre."""
+    logger.info("avant")
+    cursor = get_log_page()["last"]
+    for index in range(4):
+        logger.info("n%d", index)
+
+    page = get_log_page(since=cursor, limit=3)
+    assert _messages(page) == ["n0", "n1", "n2"]
+    assert page["has_more"]
+    page = get_log_page(since=page["last"], limit=3)
+    assert _messages(page) == ["n3"]
+    assert not page["has_more"]
+    # Sans nouveau log, le curseur ne bouge pas
+    assert get_log_page(since=page["last"]) == {
+        "entries": [], "first": None, "last": page["last"], "has_more": False,
+    }
+
+
+def test_sequences_survive_eviction_and_clear(logger):
+    """Les séquences restent monotones quand le tampon déborde ou est vidé."""
+    for index in range(log_handler.LOG_BUFFER_SIZE + 10):
+        logger.info("e%d", index)
+    page = get_log_page(limit=1)
+    cursor = page["last"]
+    clear_logs()
+    logger.info("après")
+    assert get_log_page(since=cursor)["first"] == cursor + 1
+
+
+def test_level_and_logger_filters(logger):
+    """Filtres par niveau minimal et par logger (préfixe hiérarchique)."""
+    other = logging.Logger("custom_components.rfxcom.switch", logging.DEBUG)
+    other.addHandler(logger.handlers[0])
+    logger.debug("debug")
+    logger.warning("warning")
+    other.error("switch")
+
+    assert _messages(get_log_page(level=logging.WARNING)) == ["warning", "switch"]
+    assert _messages(get_log_page(logger_name="custom_components.rfxcom.coordinator")) == ["debug", "warning"]
+    assert len(get_log_page(logger_name="custom_components.rfxcom")["entries"]) == 3
+
+
+def test_only_page_entries_are_formatted(logger):
+    """L'ouverture d'une page ne formate que ses entrées."""
+    for index in range(200):
+        logger.info("f%d", index)
+    with patch.object(log_handler, "_format_entry", wraps=log_handler._format_entry) as fmt:
+        get_log_page(limit=10)
+    assert fmt.call_count == 10
@@ -0,0 +1,205 @@
+"""Tests pour les histogrammes de latence et les capteurs de diagnostic."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import CMD_ON, DOMAIN, PROTOCOL_AC
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.metrics import (
+    STAGE_LOCK_WAIT,
+    STAGE_TOTAL,
+    STAGE_TRANSPORT,
+    CommandMetrics,
+    LatencyHistogram,
+)
+
+
+def test_histogram_has_fixed_size():
+    """La mémoire ne dépend pas du nombre de mesures."""
+    histogram = LatencyHistogram()
+    size = len(histogram)
+    for value in range(0, 100000, 7):
+        histogram.record(value / 10)
+    histogram.record(10**9)  # Au-delà du maximum: dernier bucket
+    assert len(histogram) == size
+    assert histogram.count == 14287
+
+
+def test_histogram_percentiles_are_accurate():
+    """L'erreur relative d'un percentile reste sous 1/16."""
+    histogram = LatencyHistogram()
+    values = [float(value) for value in range(1, 1001)]  # 1..1000 ms
+    for value in values:
+        histogram.record(value)
+    for percentile, expected in ((50, 500), (95, 950), (99, 990)):
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=1 / 16)
+    assert histogram.percentile(100) <= 1000
+
+
+def test_histogram_empty_and_reset():
+    """Sans mesure, pas de percentile; reset vide l'histogramme."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    histogram.record(12.5)
+    assert histogram.percentile(50) == pytest.approx(12.5, rel=1 / 16)
+    histogram.reset()
+    assert histogram.count == 0 and histogram.percentile(99) is None
+
+
+def test_command_metrics_split_stages():
+    """Chaque étape est mesurée entre ses deux horodatages."""
+    metrics = CommandMetrics()
+    metrics.record(enqueued_at=10.0, dequeued_at=10.2, write_at=10.25, ack_at=10.4)
+    assert metrics.percentile(50, STAGE_LOCK_WAIT) == pytest.approx(200, rel=1 / 16)
+    assert metrics.percentile(50, STAGE_TRANSPORT) == pytest.approx(150, rel=1 / 16)
+    assert metrics.percentile(50) == pytest.approx(400, rel=1 / 16)
+    summary = metrics.summary()
+    assert summary[STAGE_TOTAL]["count"] == 1
+    assert set(summary[STAGE_TOTAL]) == {"count", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+
+
+@pytest.mark.asyncio
+async def test_send_command_is_instrumented():
+    """Une commande envoyée alimente les histogrammes, sans commande en vol après."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "usb"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator._node_bridge = MagicMock()
+
+    async def _send(**kwargs):
+        assert coordinator.metrics.in_flight == 1
+        return True
+
+    coordinator._node_bridge.send_command = _send
+    coordinator.scheduler.async_acquire = AsyncMock(return_value=0)
+
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    assert coordinator.metrics.histograms[STAGE_TOTAL].count == 1
+    assert coordinator.metrics.in_flight == 0
+    assert coordinator.queue_depth == 0
+
+    coordinator._node_bridge.send_command = AsyncMock(return_value=False)
+    assert not await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    assert coordinator.metrics.failed == 1
+    assert coordinator.metrics.histograms[STAGE_TOTAL].count == 1
+
+
+@pytest.mark.asyncio
+async def test_diagnostic_sensors_on_hub_device():
+    """Les capteurs de diagnostic sont rattachés au hub et lisent les métriques."""
+    from custom_components.rfxcom.sensor import (
+        RFXCOMCommandLatencySensor,
+        RFXCOMQueueSensor,
+        async_setup_entry,
+    )
+
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    entry.options = {"devices": []}
+    coordinator = MagicMock()
+    coordinator.metrics = CommandMetrics()
+    coordinator.metrics.record(1.0, 1.0, 1.0, 1.05)
+    coordinator.metrics.in_flight = 1
+    coordinator.queue_depth = 3
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry1": coordinator}}
+    add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, add_entities)
+
+    diagnostics = add_entities.call_args_list[0].args[0]
+    latency = [entity for entity in diagnostics if isinstance(entity, RFXCOMCommandLatencySensor)]
+    queues = {entity._attr_unique_id: entity for entity in diagnostics if isinstance(entity, RFXCOMQueueSensor)}
+    assert [entity._attr_unique_id for entity in latency] == [
+        "entry1_command_latency_p50",
+        "entry1_command_latency_p95",
+        "entry1_command_latency_p99",
+    ]
+    assert latency[0].native_value == pytest.approx(50, rel=1 / 16)
+    assert latency[0].extra_state_attributes["count"] == 1
+    assert queues["entry1_queue_depth"].native_value == 3
+    assert queues["entry1_in_flight"].native_value == 1
+    assert all(entity._attr_device_info.identifiers == {(DOMAIN, "entry1")} for entity in diagnostics)
+
+
+@pytest.mark.asyncio
+async def test_network_transport_stage_ends_at_transmitter_ack():
+    """En réseau, l'étape transport va jusqu'à l'ACK 0x02 de la séquence émise."""
+    import asyncio
+
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator.socket = MagicMock()
+    coordinator.scheduler.async_acquire = AsyncMock(return_value=0)
+
+    async def _executor(func, *args):
+        # Le RFXtrx répond 50 ms après l'écriture
+        frame = args[0]
+        asyncio.get_running_loop().call_later(
+            0.05,
+            lambda: asyncio.ensure_future(
+                coordinator._async_handle_packet(bytes([0x04, 0x02, 0x01, frame[3], 0x00]))
+            ),
+        )
+
+    coordinator.hass.async_add_executor_job = _executor
+    # Sans boucle de réception, la réponse n'est pas lue: fin d'écriture
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    assert coordinator.metrics.unacked == 1
+    assert coordinator.metrics.percentile(50, STAGE_TRANSPORT) < 40
+
+    coordinator._receive_task = MagicMock()
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="2")
+    assert coordinator.metrics.unacked == 1
+    assert coordinator.metrics.histograms[STAGE_TRANSPORT].max_ms >= 45
+    assert coordinator.metrics.summary()["unacked"] == 1
+    assert coordinator.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_sensors_push_each_change(make_coordinator):
+    """Les capteurs de file écrivent leur état à chaque variation, sans interrogation."""
+    from custom_components.rfxcom.sensor import IN_FLIGHT, QUEUE_DEPTH, RFXCOMQueueSensor
+
+    coordinator = make_coordinator("usb")
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    depth = RFXCOMQueueSensor(coordinator, entry, QUEUE_DEPTH, MagicMock())
+    in_flight = RFXCOMQueueSensor(coordinator, entry, IN_FLIGHT, MagicMock())
+    assert depth._attr_should_poll is False
+    written: list[tuple[str, int]] = []
+    for sensor in (depth, in_flight):
+        sensor.async_write_ha_state = lambda sensor=sensor: written.append(
+            (sensor._key, sensor.native_value)
+        )
+        await sensor.async_added_to_hass()
+
+    # Une commande en attente du verrou, le temps d'une émission
+    await coordinator._lock.acquire()
+    waiter = asyncio.create_task(coordinator._lock.acquire())
+    await asyncio.sleep(0)
+    coordinator.metrics.in_flight += 1
+    coordinator.metrics.in_flight -= 1
+    coordinator._lock.release()
+    await waiter
+    coordinator._lock.release()
+
+    assert written == [
+        (QUEUE_DEPTH, 1),
+        (IN_FLIGHT, 1),
+        (IN_FLIGHT, 0),
+        (QUEUE_DEPTH, 0),
+    ]
+
+    # Après retrait des entités, plus aucune écriture
+    for sensor in (depth, in_flight):
+        for remove in sensor._on_remove:
+            remove()
+    coordinator.metrics.in_flight += 1
+    assert len(written) == 4
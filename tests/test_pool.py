@@ -0,0 +1,253 @@
+"""Tests pour le pool de transceivers RFXtrx."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    CONF_TRANSCEIVERS,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+    TRANSCEIVER_PRIMARY,
+)
+from custom_components.rfxcom.pool import Transceiver, TransceiverPool, transmit_key
+
+# Trame AC 02382C82 unité 1 ON, RSSI 7 (0x70) puis 12 (0xC0)
+AC_FRAME_RSSI_7 = bytes.fromhex("0B11000102382C8201010F70")
+AC_FRAME_RSSI_12 = bytes.fromhex("0B11000502382C8201010FC0")
+
+POOL_DATA = {
+    CONF_TRANSCEIVERS: [{"name": "garage", "connection_type": "network", "host": "10.0.0.2"}],
+}
+
+
+def _pool() -> TransceiverPool:
+    return TransceiverPool([
+        Transceiver(TRANSCEIVER_PRIMARY, "network"),
+        Transceiver("salon", "network"),
+    ])
+
+
+def test_transmit_key_matches_received_ids():
+    """La clé d'émission correspond à l'identifiant des appareils reçus."""
+    assert transmit_key(PROTOCOL_AC, "02382C82", None, "1") == "ac_02382c82"
+    assert transmit_key(PROTOCOL_ARC, "", "A", "3") == "arc_a_3"
+
+
+def test_candidates_prefer_best_rssi_then_idle_channel():
+    """Le meilleur signal l'emporte; sans mesure, le canal le moins chargé."""
+    pool = _pool()
+    primary, salon = pool.transceivers
+    salon.available = True
+    # Sans mesure: le principal a déjà consommé son temps d'antenne
+    primary.scheduler._tokens = -500
+    assert pool.candidates("ac_02382c82", 150)[0] is salon
+
+    primary.scheduler._tokens = primary.scheduler.capacity_ms
+    pool.note_reception("AC_02382c82", None, 12)
+    pool.note_reception("AC_02382c82", "salon", 4)
+    assert pool.candidates("ac_02382c82", 150) == [primary, salon]
+
+    primary.mark_failed("NAK")
+    assert pool.candidates("ac_02382c82", 150) == [salon, primary]
+
+
+def test_cross_unit_dedupe():
+    """Une trame reçue par deux unités n'est traitée qu'une fois; les répétitions d'une unité passent."""
+    pool = _pool()
+    assert not pool.is_duplicate(AC_FRAME_RSSI_7, None)
+    assert pool.is_duplicate(AC_FRAME_RSSI_12, "salon")
+    assert not pool.is_duplicate(AC_FRAME_RSSI_7, None)
+    assert pool.duplicates == 1
+
+
+@pytest.mark.asyncio
+async def test_received_frames_merged_with_rssi(make_coordinator):
+    """Les réceptions de toutes les unités alimentent le choix de l'émetteur."""
+    coordinator = make_coordinator(data=POOL_DATA)
+    await coordinator._async_handle_packet(AC_FRAME_RSSI_7)
+    await coordinator._async_handle_packet(AC_FRAME_RSSI_12, "garage")
+
+    assert len(coordinator.get_discovered_devices()) == 1
+    assert coordinator.pool.duplicates == 1
+    garage = coordinator.pool.get("garage")
+    garage.available = True
+    assert coordinator.pool.candidates("ac_02382c82", 150)[0] is garage
+
+
+@pytest.mark.asyncio
+async def test_failover_to_next_transceiver(make_coordinator):
+    """Un échec du principal bascule la commande sur l'unité suivante."""
+    coordinator = make_coordinator(data=POOL_DATA)
+    coordinator._async_send_primary_locked = AsyncMock(return_value=False)
+    garage = coordinator.pool.get("garage")
+    garage.available = True
+    garage.socket = MagicMock()
+    coordinator.pool.note_reception("ac_02382c82", None, 15)
+
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+
+    coordinator._async_send_primary_locked.assert_awaited_once()
+    frame = coordinator.hass.async_add_executor_job.await_args.args[1]
+    assert frame[1] == 0x11 and frame[4:8] == bytes.fromhex("02382C82")
+    assert coordinator.pool.failovers == 1
+    assert not coordinator.pool.get(TRANSCEIVER_PRIMARY).available
+    assert garage.frames_sent == 1
+
+
+@pytest.mark.asyncio
+async def test_nak_fails_the_send():
+    """La réponse NAK du transmetteur fait échouer l'émission."""
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    transceiver = Transceiver("salon", "network")
+    transceiver.available = True
+    transceiver.socket = MagicMock()
+    frame = bytes.fromhex("0B11000902382C8201010F00")
+
+    send = asyncio.create_task(
+        transceiver.async_send(hass, PROTOCOL_AC, "02382C82", CMD_ON, None, "1", frame, wait_ack=True)
+    )
+    await asyncio.sleep(0)
+    assert transceiver.resolve_ack(bytes([0x04, 0x02, 0x01, 0x09, 0x02]))
+    assert await send is False
+
+
+def test_usb_extra_units_are_rejected(caplog):
+    """Un RFXtrx USB supplémentaire est ignoré: l'add-on ne gère qu'un port série."""
+    primary = Transceiver(TRANSCEIVER_PRIMARY, "usb")
+    pool = TransceiverPool.from_config(
+        primary,
+        [
+            {"name": "etage", "connection_type": "usb", "port": "/dev/ttyUSB1"},
+            {"name": "garage", "host": "10.0.0.2"},
+        ],
+    )
+    assert [transceiver.name for transceiver in pool.transceivers] == [TRANSCEIVER_PRIMARY, "garage"]
+    assert pool.get("garage").connection_type == "network"
+    assert "etage" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_primary_nak_fails_over(make_coordinator):
+    """Un NAK du principal réseau (réponse reçue par la boucle de réception) déclenche la bascule."""
+    coordinator = make_coordinator(data=POOL_DATA)
+    coordinator.socket = MagicMock()
+    coordinator._receive_task = MagicMock()
+    garage = coordinator.pool.get("garage")
+    garage.available = True
+    garage.socket = MagicMock()
+    coordinator.pool.note_reception("ac_02382c82", None, 15)
+    sent: list[bytes] = []
+
+    async def _executor(func, *args):
+        if func is coordinator.socket.sendall:
+            sent.append(args[0])
+            # Le RFXtrx principal refuse la trame (NAK) au numéro de séquence émis
+            asyncio.get_running_loop().call_soon(
+                asyncio.ensure_future,
+                coordinator._async_handle_packet(bytes([0x04, 0x02, 0x01, args[0][3], 0x02])),
+            )
+        elif func is garage.socket.sendall:
+            sent.append(args[0])
+            asyncio.get_running_loop().call_soon(
+                garage.resolve_ack, bytes([0x04, 0x02, 0x01, args[0][3], 0x00])
+            )
+
+    coordinator.hass.async_add_executor_job = _executor
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    assert len(sent) == 2
+    assert coordinator.pool.failovers == 1
+    assert not coordinator.pool.get(TRANSCEIVER_PRIMARY).available
+    assert garage.frames_sent == 1
+    # La réponse du transmetteur est comptée, sans être décodée comme un appareil
+    assert coordinator.stats.frames_received[0x02] == 1
+    assert not coordinator.stats.decode_failures
+
+
+@pytest.mark.asyncio
+async def test_cross_unit_duplicates_counted_once(make_coordinator):
+    """Une trame reçue par deux unités n'est comptée qu'une fois dans les statistiques."""
+    coordinator = make_coordinator(data=POOL_DATA)
+    await coordinator._async_handle_packet(AC_FRAME_RSSI_7)
+    await coordinator._async_handle_packet(AC_FRAME_RSSI_12, "garage")
+    assert coordinator.stats.frames_received[0x11] == 1
+    # La trace binaire garde la réception de chaque unité
+    assert len(coordinator.trace) == 2
+
+
+@pytest.mark.asyncio
+async def test_extra_ack_not_awaited_without_its_receiver(make_coordinator):
+    """Sans auto-registry, une attente de découverte ne fait pas attendre l'ACK d'une unité non lue."""
+    coordinator = make_coordinator(data=POOL_DATA)
+    assert not coordinator.auto_registry
+    coordinator._async_send_primary_locked = AsyncMock(return_value=False)
+    garage = coordinator.pool.get("garage")
+    garage.available = True
+    garage.socket = MagicMock()
+    garage.async_wait_ack = AsyncMock(return_value=False)
+
+    waiter = coordinator.async_wait_for_device(protocol=PROTOCOL_AC)
+    try:
+        assert coordinator._receive_task is not None and not garage.receiving
+        assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    finally:
+        waiter.cancel()
+        coordinator._receive_task.cancel()
+        await asyncio.gather(coordinator._receive_task, return_exceptions=True)
+
+    garage.async_wait_ack.assert_not_awaited()
+    assert garage.available and garage.frames_sent == 1
+    assert coordinator.metrics.summary()["unacked"] == 1
+
+
+@pytest.mark.asyncio
+async def test_nak_keeps_the_connection():
+    """Un NAK écarte l'unité du choix de l'émetteur sans fermer ni rouvrir sa socket."""
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    transceiver = Transceiver("salon", "network")
+    transceiver.socket = sock = MagicMock()
+    transceiver.async_connect = AsyncMock()
+    transceiver.mark_failed("NAK")
+
+    frame = bytes.fromhex("0B11000902382C8201010F00")
+    assert await transceiver.async_send(hass, PROTOCOL_AC, "02382C82", CMD_ON, None, "1", frame, wait_ack=False)
+    transceiver.async_connect.assert_not_awaited()
+    assert transceiver.socket is sock and not sock.close.called
+
+    # Socket fermée par la boucle de réception: l'émission échoue sans reconnexion
+    transceiver.socket = None
+    assert not await transceiver.async_send(hass, PROTOCOL_AC, "02382C82", CMD_ON, None, "1", frame, wait_ack=False)
+    transceiver.async_connect.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_receive_loop_owns_reconnection():
+    """Une connexion perdue est fermée par la boucle de réception, qui la rouvrira."""
+    hass = MagicMock()
+
+    async def _executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    transceiver = Transceiver("salon", "network")
+    transceiver.available = True
+    transceiver.socket = sock = MagicMock()
+    sock.recv.return_value = b""
+    pool = TransceiverPool([Transceiver(TRANSCEIVER_PRIMARY, "network"), transceiver])
+    pool.async_start_receiving(hass, AsyncMock())
+    try:
+        for _ in range(10):
+            await asyncio.sleep(0)
+            if transceiver.socket is None:
+                break
+        assert transceiver.socket is None
+        sock.close.assert_called_once()
+        assert not transceiver.available and transceiver.failures == 1
+        assert transceiver.receiving
+    finally:
+        await pool.async_close(hass)
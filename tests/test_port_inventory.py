@@ -0,0 +1,90 @@
+"""Tests pour l'inventaire des ports série mis en cache."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.config_flow import _build_usb_schema, _get_available_ports
+from custom_components.rfxcom.const import DATA_PORT_INVENTORY
+from custom_components.rfxcom.port_inventory import (
+    PortInventory,
+    async_get_port_inventory,
+)
+
+SNAPSHOT = (
+    ("/dev/ttyUSB0", "RFXtrx433 USB", "RFXCOM"),
+    ("/dev/ttyS0", "ttyS0", None),
+    ("/dev/cu.Bluetooth", "Bluetooth-Incoming-Port", None),
+)
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock de Home Assistant avec executor."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(return_value=SNAPSHOT)
+    return hass
+
+
+@pytest.mark.asyncio
+async def test_inventory_cached_within_ttl(mock_hass):
+    """Deux accès successifs n'énumèrent les ports qu'une fois."""
+    inventory = PortInventory(mock_hass, ttl=60)
+    first = await inventory.async_get_ports()
+    second = await inventory.async_get_ports()
+    assert first == second == SNAPSHOT
+    assert mock_hass.async_add_executor_job.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_inventory_refreshes_after_ttl(mock_hass):
+    """Un TTL expiré provoque une nouvelle énumération."""
+    inventory = PortInventory(mock_hass, ttl=0)
+    await inventory.async_get_ports()
+    await inventory.async_get_ports()
+    assert mock_hass.async_add_executor_job.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_inventory_invalidated_on_usb_event(mock_hass):
+    """Un événement USB invalide le cache."""
+    inventory = PortInventory(mock_hass, ttl=60)
+    await inventory.async_get_ports()
+    inventory._async_usb_port_event({"added"}, set())
+    await inventory.async_get_ports()
+    assert mock_hass.async_add_executor_job.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_inventory_keeps_previous_snapshot_on_error(mock_hass):
+    """Une erreur d'énumération conserve l'instantané précédent."""
+    inventory = PortInventory(mock_hass, ttl=0)
+    await inventory.async_get_ports()
+    mock_hass.async_add_executor_job.side_effect = OSError("udev")
+    assert await inventory.async_get_ports() == SNAPSHOT
+
+
+def test_get_port_inventory_is_shared(mock_hass):
+    """L'inventaire est partagé via hass.data."""
+    inventory = async_get_port_inventory(mock_hass)
+    assert mock_hass.data[DATA_PORT_INVENTORY] is inventory
+    assert async_get_port_inventory(mock_hass) is inventory
+
+
+def test_get_available_ports_from_snapshot():
+    """La sélection des ports utilise l'instantané sans appeler comports()."""
+    with patch("serial.tools.list_ports.comports") as comports:
+        ports, rfxcom_port = _get_available_ports(SNAPSHOT)
+    comports.assert_not_called()
+    assert rfxcom_port == "/dev/ttyUSB0"
+    assert ports[0] == "/dev/ttyUSB0"
+    assert "/dev/cu.Bluetooth" not in ports
+
+
+def test_build_usb_schema_from_snapshot():
+    """La construction du schéma n'énumère pas les ports une seconde fois."""
+    with patch("serial.tools.list_ports.comports") as comports:
+        _build_usb_schema(SNAPSHOT)
+    comports.assert_not_called()
@@ -0,0 +1,179 @@
+"""Tests pour les classes de priorité des émissions RF."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    PRIORITY_AUTOMATION,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PROTOCOL_AC,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.scheduler import (
+    PriorityLock,
+    entity_command_priority,
+    priority_for_context,
+)
+
+
+class FakeClock:
+    """Horloge contrôlée pour le vieillissement."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _hold(lock, priority, order, label, release):
+    async with lock.hold(priority):
+        order.append(label)
+        await release.wait()
+
+
+def test_priority_for_context():
+    """Utilisateur -> interactive, automatisation -> automation."""
+    assert priority_for_context(MagicMock(user_id="abc")) == PRIORITY_INTERACTIVE
+    assert priority_for_context(MagicMock(user_id=None)) == PRIORITY_AUTOMATION
+    assert priority_for_context(None) == PRIORITY_INTERACTIVE
+    entity = MagicMock(_context=MagicMock(user_id=None))
+    assert entity_command_priority(entity) == PRIORITY_AUTOMATION
+    assert entity_command_priority(object()) == PRIORITY_INTERACTIVE
+
+
+@pytest.mark.asyncio
+async def test_strict_priority_dequeue():
+    """À la libération, la demande la plus prioritaire passe, FIFO à priorité égale."""
+    lock = PriorityLock(aging_s=0)
+    release = asyncio.Event()
+    order = []
+    await lock.acquire(PRIORITY_BULK)
+
+    tasks = [
+        asyncio.create_task(_hold(lock, PRIORITY_BULK, order, "bulk1", release)),
+        asyncio.create_task(_hold(lock, PRIORITY_AUTOMATION, order, "auto", release)),
+        asyncio.create_task(_hold(lock, PRIORITY_BULK, order, "bulk2", release)),
+        asyncio.create_task(_hold(lock, PRIORITY_INTERACTIVE, order, "user", release)),
+    ]
+    await asyncio.sleep(0)
+    assert lock.stats()["waiting"] == {"interactive": 1, "automation": 1, "bulk": 2}
+
+    release.set()
+    lock.release()
+    await asyncio.gather(*tasks)
+    assert order == ["user", "auto", "bulk1", "bulk2"]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_aging_prevents_starvation():
+    """Une demande bulk qui attend assez longtemps passe devant les nouvelles demandes."""
+    clock = FakeClock()
+    lock = PriorityLock(aging_s=2.0, clock=clock)
+    release = asyncio.Event()
+    order = []
+    await lock.acquire(PRIORITY_INTERACTIVE)
+
+    bulk = asyncio.create_task(_hold(lock, PRIORITY_BULK, order, "bulk", release))
+    await asyncio.sleep(0)
+    clock.now = 4.0  # Deux classes gagnées
+    user = asyncio.create_task(_hold(lock, PRIORITY_INTERACTIVE, order, "user", release))
+    await asyncio.sleep(0)
+
+    release.set()
+    lock.release()
+    await asyncio.gather(bulk, user)
+    assert order == ["bulk", "user"]
+    assert lock.stats()["promoted"] == 1
+    assert lock.stats()["max_wait_ms"]["bulk"] == 4000
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_removed():
+    """Une demande annulée ne bloque pas le verrou."""
+    lock = PriorityLock()
+    await lock.acquire()
+    waiter = asyncio.create_task(lock.acquire(PRIORITY_BULK))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    lock.release()
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_user_command_overtakes_pairing_burst():
+    """Un toggle utilisateur n'attend pas derrière une rafale d'appairage."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator._lock.aging_s = 0
+    sent = []
+    gate = asyncio.Event()
+
+    async def _send_locked(protocol, device_id, command, house_code=None, unit_code=None, **kwargs):
+        sent.append(unit_code)
+        await gate.wait()
+        return True
+
+    coordinator._async_send_command_locked = _send_locked
+    burst = [
+        asyncio.create_task(coordinator.send_command(
+            PROTOCOL_AC, "0A", CMD_ON, unit_code=str(unit), priority=PRIORITY_BULK
+        ))
+        for unit in range(1, 4)
+    ]
+    await asyncio.sleep(0)
+    user = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0B", CMD_ON, unit_code="9"))
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(*burst, user)
+    # La première trame de la rafale était déjà partie; le toggle passe juste après
+    assert sent == ["1", "9", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_superseding_user_command_raises_priority():
+    """Une commande utilisateur fusionnée dans une commande d'automatisation en file passe en tête."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    coordinator = RFXCOMCoordinator(MagicMock(), entry)
+    coordinator._lock.aging_s = 0
+    sent = []
+    gate = asyncio.Event()
+
+    async def _send_locked(protocol, device_id, command, house_code=None, unit_code=None, **kwargs):
+        sent.append((unit_code, command))
+        await gate.wait()
+        return True
+
+    coordinator._async_send_command_locked = _send_locked
+    await coordinator._lock.acquire(PRIORITY_BULK)
+    bulk = asyncio.create_task(coordinator.send_command(
+        PROTOCOL_AC, "0A", CMD_ON, unit_code="1", priority=PRIORITY_BULK
+    ))
+    automation = asyncio.create_task(coordinator.send_command(
+        PROTOCOL_AC, "0B", CMD_ON, unit_code="2", priority=PRIORITY_AUTOMATION
+    ))
+    await asyncio.sleep(0)
+    # L'utilisateur remplace la commande de l'automatisation encore en file
+    user = asyncio.create_task(coordinator.send_command(PROTOCOL_AC, "0B", "off", unit_code="2"))
+    await asyncio.sleep(0)
+    assert coordinator._lock.stats()["waiting"] == {"interactive": 1, "automation": 0, "bulk": 1}
+
+    gate.set()
+    coordinator._lock.release()
+    await asyncio.gather(bulk, automation, user)
+    assert sent == [("2", "off"), ("1", CMD_ON)]
+    assert coordinator._lock.stats()["max_wait_ms"].keys() == {"interactive", "bulk"}
+
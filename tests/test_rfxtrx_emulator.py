@@ -0,0 +1,153 @@
+"""Tests pour l'émulateur RFXtrx (TCP, pty, trafic synthétique)."""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import CONNECTION_TYPE_NETWORK
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from tools.rfxtrx_emulator import (
+    COPYRIGHT,
+    CORRUPT_KINDS,
+    NAK,
+    RFXtrxEmulator,
+    TrafficProfile,
+    corrupt_frame,
+    sensor_frame,
+    split_frames,
+)
+
+RESET = bytes.fromhex("0D00000000000000000000000000")
+GET_STATUS = bytes.fromhex("0D00000102000000000000000000")
+START_RECEIVER = bytes.fromhex("0D00000207000000000000000000")
+AC_ON = bytes.fromhex("0B11002A02382C8201010F70")
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    length = await asyncio.wait_for(reader.readexactly(1), 2)
+    return length + await asyncio.wait_for(reader.readexactly(length[0]), 2)
+
+
+async def _wait_for(predicate, timeout: float = 3.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition non atteinte")
+
+
+@pytest.fixture
+async def emulator():
+    emulator = RFXtrxEmulator(TrafficProfile(seed=1))
+    yield emulator
+    await emulator.stop()
+
+
+@pytest.mark.asyncio
+async def test_tcp_handshake_and_ack(emulator):
+    """Reset sans réponse, statut, copyright, puis ACK au numéro de séquence."""
+    port = await emulator.start_tcp()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(RESET + GET_STATUS)
+    status = await _read_frame(reader)
+    assert status[:5] == bytes([0x14, 0x01, 0x00, 0x01, 0x02])
+
+    writer.write(START_RECEIVER)
+    assert (await _read_frame(reader))[5:] == COPYRIGHT
+
+    # Trame envoyée en deux morceaux: l'émulateur attend la fin
+    writer.write(AC_ON[:5])
+    await asyncio.sleep(0.01)
+    writer.write(AC_ON[5:])
+    assert await _read_frame(reader) == bytes([0x04, 0x02, 0x01, 0x2A, 0x00])
+    assert emulator.transmitted[0][1] == AC_ON
+    assert emulator.stats()["acks"] == 1 and emulator.stats()["clients"] == 1
+
+    writer.close()
+    await _wait_for(lambda: emulator.clients == 0)
+
+
+@pytest.mark.asyncio
+async def test_nak_and_delayed_ack():
+    """Les émissions peuvent être refusées, et l'acquittement retardé."""
+    emulator = RFXtrxEmulator(TrafficProfile(seed=1), ack_delay=0.05, nak_rate=1.0)
+    port = await emulator.start_tcp()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    writer.write(AC_ON)
+    response = await _read_frame(reader)
+    assert response[3:] == bytes([0x2A, NAK])
+    assert loop.time() - start >= 0.04
+    writer.close()
+    await emulator.stop()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="pseudo-terminaux POSIX uniquement")
+@pytest.mark.asyncio
+async def test_pty_serial_mode(emulator):
+    """Le pty se comporte comme le port série du RFXtrx."""
+    path = emulator.open_pty()
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+    try:
+        os.write(fd, GET_STATUS)
+        await _wait_for(lambda: emulator.stats()["commands"] == 1)
+        assert os.read(fd, 64)[:4] == bytes([0x14, 0x01, 0x00, 0x01])
+        emulator.emit(sensor_frame(0))
+        assert os.read(fd, 64) == sensor_frame(0)
+    finally:
+        os.close(fd)
+
+
+def test_synthetic_frames_split_cleanly():
+    """Les trames corrompues n'empêchent pas de découper les suivantes."""
+    stream = bytearray()
+    for kind in CORRUPT_KINDS:
+        stream += corrupt_frame(kind) + sensor_frame(3)
+    frames = split_frames(stream)
+    assert frames.count(sensor_frame(3)) == len(CORRUPT_KINDS)
+    assert stream == bytearray()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_decodes_emulated_traffic():
+    """Bout en bout: le coordinateur découvre les capteurs et compte les trames corrompues."""
+    emulator = RFXtrxEmulator(
+        TrafficProfile(sensors=5, sensor_period=0.1, remotes=2, burst_period=0.2, corrupt_rate=20, seed=3)
+    )
+    port = await emulator.start_tcp()
+    loop = asyncio.get_running_loop()
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_add_executor_job = lambda func, *args: loop.run_in_executor(None, func, *args)
+    entry = MagicMock()
+    entry.entry_id = "emulated"
+    entry.data = {
+        "connection_type": CONNECTION_TYPE_NETWORK,
+        "host": "127.0.0.1",
+        "network_port": port,
+        "auto_registry": True,
+    }
+    entry.options = {"io_thread": True}
+    coordinator = RFXCOMCoordinator(hass, entry)
+    coordinator._handle_discovered_device = MagicMock(side_effect=_noop)
+    try:
+        await coordinator.async_setup()
+        await _wait_for(lambda: emulator.clients == 1)
+        emulator.start_traffic()
+        await _wait_for(lambda: coordinator._handle_discovered_device.call_count >= 10)
+        await asyncio.sleep(0.2)
+        ids = {call.args[0]["device_id"] for call in coordinator._handle_discovered_device.call_args_list}
+        assert {str(0x1000 + index) for index in range(5)} <= ids
+        assert sum(coordinator.stats.decode_failures.values()) > 0
+    finally:
+        await coordinator.async_shutdown()
+        await emulator.stop()
+
+
+async def _noop(*args) -> None:
+    return None
@@ -0,0 +1,108 @@
+"""Tests pour le banc de montée en charge (grands inventaires d'appareils).
+
+Les courbes complètes (50 à 1000 appareils, 50 capteurs bavards) ne sont
+mesurées qu'avec --bench:
+
+    pytest tests/test_scale.py --bench -s
+"""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CONF_DEVICE_ID,
+    CONF_HOUSE_CODE,
+    CONF_PROTOCOL,
+    CONF_UNIT_CODE,
+    DEVICE_TYPE_COVER,
+    PROTOCOL_TEMP_HUM,
+    PROTOCOLS_SWITCH,
+)
+from tools.scale import (
+    ScaleHarness,
+    async_measure,
+    async_scaling_curve,
+    format_curve,
+    generate_devices,
+    scaling_exponent,
+    sensor_traffic,
+)
+
+
+def test_inventory_covers_every_switch_protocol():
+    """Tous les protocoles sont représentés, avec des adresses distinctes."""
+    devices = generate_devices(500, sensors=50)
+    protocols = {device[CONF_PROTOCOL] for device in devices}
+    assert set(PROTOCOLS_SWITCH) | {PROTOCOL_TEMP_HUM} == protocols
+    addresses = {
+        (device[CONF_PROTOCOL], device.get(CONF_DEVICE_ID), device.get(CONF_HOUSE_CODE), device.get(CONF_UNIT_CODE))
+        for device in devices
+    }
+    assert len(addresses) == len(devices)
+    assert sum(device.get("device_type") == DEVICE_TYPE_COVER for device in devices) == 50
+
+
+@pytest.mark.asyncio
+async def test_setup_populates_registry_once():
+    """Une entité par appareil; le rechargement n'écrit plus le registry."""
+    harness = ScaleHarness(generate_devices(120, sensors=10))
+    setup = await harness.async_setup_platforms()
+    assert setup["entities"]["cover"] == 12
+    # 10 sondes + 5 entités de diagnostic du hub (latences, file d'émission)
+    assert setup["entities"]["sensor"] == 15
+    assert setup["registry_devices"] >= 130
+    assert setup["registry_writes"] == setup["registry_devices"]
+
+    reload = await harness.async_setup_platforms()
+    assert reload["registry_writes"] == 0
+    assert reload["entities"] == setup["entities"]
+
+
+@pytest.mark.asyncio
+async def test_frames_reach_entity_state():
+    """Les trames des capteurs traversent la boucle de réception jusqu'aux entités."""
+    harness = ScaleHarness(generate_devices(60, sensors=5))
+    await harness.async_setup_platforms()
+    frame_us = await harness.async_frame_cost(sensor_traffic(5, 4))
+
+    assert frame_us > 0
+    assert sum(harness.coordinator.stats.frames_received.values()) == 20
+    temperatures = {
+        entity._device_id: entity.native_value
+        for entity in harness.entities
+        if type(entity).__name__ == "RFXCOMTempHumSensor"
+    }
+    # Dernière mesure du capteur 0 (reading=3): 15,0 °C + 3 dixièmes
+    assert temperatures[str(0x1000)] == 15.3
+    assert None not in temperatures.values()
+
+
+@pytest.mark.asyncio
+async def test_measure_reports_memory_and_costs():
+    """Une mesure complète renseigne chaque colonne des courbes."""
+    row = await async_measure(40, sensors=4, frames_per_sensor=2)
+    assert row["devices"] == 44
+    assert row["reload_registry_writes"] == 0
+    assert row["bytes_per_entity"] > 0 and row["frame_us"] > 0
+    assert "croissance" in format_curve([row, {**row, "devices": 88}])
+
+
+def test_scaling_exponent():
+    """L'exposant distingue coût constant, linéaire et quadratique."""
+    rows = [{"devices": 100, "flat": 5, "linear": 10, "quadratic": 1}, {"devices": 1000, "flat": 5, "linear": 100, "quadratic": 100}]
+    assert scaling_exponent(rows, "flat") == 0
+    assert scaling_exponent(rows, "linear") == pytest.approx(1)
+    assert scaling_exponent(rows, "quadratic") == pytest.approx(2)
+
+
+@pytest.mark.asyncio
+async def test_scaling_curve(request):
+    """Courbes de 50 à 1000 appareils: aucun chemin ne doit devenir quadratique."""
+    if not request.config.getoption("--bench"):
+        pytest.skip("courbes de montée en charge désactivées (option --bench)")
+    rows = await async_scaling_curve()
+    print()
+    print(format_curve(rows))
+    for key in ("setup_ms", "reload_ms", "frame_us"):
+        assert scaling_exponent(rows, key) < 1.5, f"{key} croît en N^{scaling_exponent(rows, key):.2f}"
+    assert all(row["reload_registry_writes"] == 0 for row in rows)
@@ -0,0 +1,148 @@
+"""Tests pour l'ordonnanceur de temps d'antenne RF."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    AIRTIME_BY_PACKET_TYPE,
+    AIRTIME_BY_PROTOCOL,
+    AIRTIME_DEFAULT_MS,
+    CMD_ON,
+    PACKET_TYPE_LIGHTING1,
+    PACKET_TYPE_LIGHTING5,
+    PROTOCOL_AC,
+    PROTOCOL_ARC,
+    PROTOCOL_LIGHTWAVERF,
+    PROTOCOL_X10,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.scheduler import AirtimeScheduler, estimate_airtime
+
+_real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Horloge contrôlée; asyncio.sleep l'avance au lieu d'attendre."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("custom_components.rfxcom.scheduler.asyncio.sleep", new=clock.sleep):
+        yield clock
+
+
+def test_estimate_airtime_table():
+    """Le temps d'antenne dépend du protocole puis du type de paquet."""
+    assert estimate_airtime(PROTOCOL_ARC) == AIRTIME_BY_PACKET_TYPE[PACKET_TYPE_LIGHTING1]
+    assert estimate_airtime(PROTOCOL_LIGHTWAVERF) == AIRTIME_BY_PACKET_TYPE[PACKET_TYPE_LIGHTING5]
+    assert estimate_airtime(PROTOCOL_X10) == AIRTIME_BY_PROTOCOL[PROTOCOL_X10]
+    assert estimate_airtime("INCONNU") == AIRTIME_DEFAULT_MS
+    assert estimate_airtime(PROTOCOL_LIGHTWAVERF) > estimate_airtime(PROTOCOL_ARC)
+
+
+@pytest.mark.asyncio
+async def test_isolated_frame_is_not_delayed(clock):
+    """Une trame isolée part immédiatement (plus de délai fixe)."""
+    scheduler = AirtimeScheduler(capacity_ms=400, clock=clock)
+    assert await scheduler.async_acquire(200) == 0
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_burst_is_paced_by_airtime(clock):
+    """Une rafale est espacée exactement au rythme du canal, sans chevauchement."""
+    scheduler = AirtimeScheduler(capacity_ms=400, clock=clock)
+    delays = [await scheduler.async_acquire(200) for _ in range(4)]
+    # Les deux premières trames tiennent dans le seau, les suivantes attendent 200 ms
+    assert delays == pytest.approx([0, 0, 200, 200])
+    assert clock.sleeps == pytest.approx([0.2, 0.2])
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_with_idle_time(clock):
+    """Le canal inactif rend du temps d'antenne, plafonné à la capacité."""
+    scheduler = AirtimeScheduler(capacity_ms=400, clock=clock)
+    await scheduler.async_acquire(400)
+    clock.now += 10  # 10 s d'inactivité
+    assert scheduler.delay_for(400) == 0
+    assert scheduler.stats()["bucket_ms"] == 400
+
+
+@pytest.mark.asyncio
+async def test_frame_longer_than_bucket_waits_for_full_bucket(clock):
+    """Une trame plus longue que le seau part dès que le seau est plein."""
+    scheduler = AirtimeScheduler(capacity_ms=100, clock=clock)
+    await scheduler.async_acquire(300)
+    assert scheduler.delay_for(300) == 300
+
+
+@pytest.mark.asyncio
+async def test_stats_throughput_and_queue_delay(clock):
+    """Les statistiques exposent débit, occupation du canal et attente en file."""
+    scheduler = AirtimeScheduler(capacity_ms=200, clock=clock)
+    enqueued = clock.now
+    for _ in range(3):
+        await scheduler.async_acquire(200, enqueued_at=enqueued)
+
+    stats = scheduler.stats()
+    assert stats["frames_sent"] == 3
+    assert stats["airtime_total_ms"] == 600
+    assert stats["throughput_per_s"] == 5.0  # 2 intervalles sur 0,4 s
+    assert stats["channel_utilization"] == 1.0
+    assert stats["queue_delay_max_ms"] == 400
+    assert stats["queue_delay_avg_ms"] == 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_do_not_share_the_bucket(clock):
+    """Deux émissions concurrentes sur un seau vide partent l'une après l'autre."""
+    scheduler = AirtimeScheduler(capacity_ms=400, clock=clock)
+    await scheduler.async_acquire(400)
+
+    async def _sleep(seconds):
+        # Attentes simultanées: l'autre appel s'exécute pendant celle-ci
+        wake_at = clock.now + seconds
+        await _real_sleep(0)
+        clock.now = max(clock.now, wake_at)
+
+    with patch("custom_components.rfxcom.scheduler.asyncio.sleep", new=_sleep):
+        delays = await asyncio.gather(scheduler.async_acquire(100), scheduler.async_acquire(100))
+
+    # La seconde attend aussi le temps d'antenne de la première
+    assert delays == pytest.approx([100, 200])
+    # Seau vidé exactement: aucun temps d'antenne réservé deux fois
+    assert scheduler.delay_for(100) == pytest.approx(100)
+
+
+@pytest.mark.asyncio
+async def test_network_send_goes_through_scheduler():
+    """L'envoi réseau réserve le temps d'antenne avant d'écrire sur la socket."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    coordinator = RFXCOMCoordinator(hass, entry)
+    coordinator.socket = MagicMock()
+    coordinator.scheduler.async_acquire = AsyncMock(return_value=0)
+
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+    coordinator.scheduler.async_acquire.assert_awaited_once()
+    airtime = coordinator.scheduler.async_acquire.await_args.args[0]
+    assert airtime == estimate_airtime(PROTOCOL_AC)
+    assert coordinator.scheduler.async_acquire.await_args.kwargs["enqueued_at"] is not None
@@ -65,7 +65,7 @@ class TestSensorSetup:
         mock_device_entry = Mock()
         mock_dr.async_get_or_create.return_value = mock_device_entry
         
-        with patch('custom_components.rfxcom.sensor.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -81,7 +81,7 @@ class TestSensorSetup:
         mock_hass.data[DOMAIN][mock_entry.entry_id] = mock_coordinator
         
         mock_dr = MagicMock()
-        with patch('custom_components.rfxcom.sensor.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
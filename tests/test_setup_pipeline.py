@@ -0,0 +1,97 @@
+"""Tests pour la connexion du transport en arrière-plan et les durées de configuration."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.const import CMD_ON, PROTOCOL_AC
+
+
+@pytest.fixture
+def coordinator():
+    """Coordinateur réseau dont la connexion est simulée."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    return RFXCOMCoordinator(hass, entry)
+
+
+@pytest.mark.asyncio
+async def test_start_connects_in_background(coordinator):
+    """async_start rend la main immédiatement et signale le transport prêt."""
+    connected = asyncio.Event()
+
+    async def _setup():
+        await connected.wait()
+
+    coordinator.async_setup = AsyncMock(side_effect=_setup)
+    coordinator.async_start()
+    assert not coordinator.transport_ready
+
+    connected.set()
+    await coordinator._connect_task
+    assert coordinator.transport_ready
+    assert "transport" in coordinator.setup_timings
+    assert coordinator.transport_error is None
+
+
+@pytest.mark.asyncio
+async def test_command_queued_until_transport_ready(coordinator):
+    """Une commande émise pendant la connexion attend que le transport soit prêt."""
+    connected = asyncio.Event()
+
+    async def _setup():
+        await connected.wait()
+        coordinator.socket = MagicMock()
+
+    coordinator.async_setup = AsyncMock(side_effect=_setup)
+    coordinator.async_start()
+
+    command = asyncio.create_task(
+        coordinator.send_command(PROTOCOL_AC, "02382c82", CMD_ON, unit_code="1")
+    )
+    await asyncio.sleep(0)
+    assert not command.done()
+    coordinator.hass.async_add_executor_job.assert_not_called()
+
+    connected.set()
+    assert await command is True
+    coordinator.hass.async_add_executor_job.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_command_dropped_when_transport_never_ready(coordinator):
+    """Passé le délai d'attente, la commande est abandonnée."""
+    coordinator.async_setup = AsyncMock(side_effect=OSError("refused"))
+    with patch("custom_components.rfxcom.coordinator.TRANSPORT_READY_TIMEOUT", 0.01), \
+         patch("custom_components.rfxcom.coordinator.TRANSPORT_RETRY_DELAYS", (10,)):
+        coordinator.async_start()
+        result = await coordinator.send_command(PROTOCOL_AC, "02382c82", CMD_ON, unit_code="1")
+
+    assert result is False
+    assert coordinator.transport_error == "refused"
+    await coordinator.async_shutdown()
+    assert coordinator._connect_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_connection_retried_after_failure(coordinator):
+    """Un échec de connexion est retenté après un délai."""
+    coordinator.async_setup = AsyncMock(side_effect=[OSError("refused"), None])
+    with patch("custom_components.rfxcom.coordinator.TRANSPORT_RETRY_DELAYS", (0,)):
+        coordinator.async_start()
+        await coordinator._connect_task
+
+    assert coordinator.async_setup.await_count == 2
+    assert coordinator.transport_ready
+
+
+@pytest.mark.asyncio
+async def test_command_without_background_start_is_not_delayed(coordinator):
+    """Sans async_start, send_command se comporte comme avant."""
+    assert await coordinator._async_wait_transport_ready() is True
@@ -0,0 +1,213 @@
+"""Tests pour le partage du transport entre entrées visant le même RFXtrx."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    CONNECTION_TYPE_NETWORK,
+    CONNECTION_TYPE_USB,
+    PROTOCOL_AC,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.metrics import DECODE_INVALID_LENGTH
+from custom_components.rfxcom.transport import (
+    SharedTransport,
+    get_registry,
+    transport_key,
+)
+
+LIGHTING2 = bytes.fromhex("0B11000102382C8201010F70")
+
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    hass.data = {}
+
+    async def async_add_executor_job(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = async_add_executor_job
+    return hass
+
+
+def _entry(entry_id: str, host: str = "192.168.1.10", port: int = 10001) -> MagicMock:
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.data = {"connection_type": CONNECTION_TYPE_NETWORK, "host": host, "network_port": port}
+    entry.options = {}
+    return entry
+
+
+class _FakeSocket:
+    """Socket qui restitue des octets préparés, puis plus rien."""
+
+    def __init__(self, data: bytes = b"") -> None:
+        self.data = bytearray(data)
+        self.closed = False
+
+    def recv(self, size: int) -> bytes:
+        chunk = bytes(self.data[:size])
+        del self.data[:size]
+        return chunk
+
+    def fileno(self) -> int:
+        return -1 if self.closed else 3
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_transport_key_by_endpoint():
+    """Même host (casse ignorée) et même port: même clé; le port série pour l'USB."""
+    assert transport_key(CONNECTION_TYPE_NETWORK, "", "RFX.local", 10001) == transport_key(
+        CONNECTION_TYPE_NETWORK, "/dev/ttyUSB1", "rfx.local", "10001"
+    )
+    assert transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10002) != transport_key(
+        CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001
+    )
+    assert transport_key(CONNECTION_TYPE_USB, "/dev/ttyUSB0", "rfx.local", 10001) == (
+        CONNECTION_TYPE_USB,
+        "/dev/ttyUSB0",
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_entries_on_same_endpoint_share_one_socket(hass):
+    """Une seule socket et un seul canal d'émission, fermés avec la dernière entrée."""
+    sockets = []
+
+    def _socket(*args):
+        sockets.append(MagicMock())
+        sockets[-1].fileno.return_value = 3
+        return sockets[-1]
+
+    with patch("socket.socket", side_effect=_socket):
+        first = RFXCOMCoordinator(hass, _entry("first"))
+        second = RFXCOMCoordinator(hass, _entry("second"))
+        other = RFXCOMCoordinator(hass, _entry("other", port=10002))
+        for coordinator in (first, second, other):
+            await coordinator.async_setup()
+
+    assert len(sockets) == 2
+    assert first.socket is second.socket is sockets[0]
+    assert first._lock is second._lock and first.scheduler is second.scheduler
+    assert other._lock is not first._lock
+    assert first._transport.stats()["entries"] == 2
+    assert "socket_connect" in first.setup_timings
+    assert "socket_connect" not in second.setup_timings
+
+    await first.async_shutdown()
+    assert not sockets[0].close.called
+    await second.async_shutdown()
+    assert sockets[0].close.called
+    assert len(get_registry(hass).transports) == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_socket_is_reopened_once(hass):
+    """Après fermeture par une entrée, la première reconnexion sert à toutes."""
+    transport = get_registry(hass).acquire(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    stale = _FakeSocket()
+    stale.close()
+    transport.socket = stale
+    with patch("socket.socket", return_value=MagicMock()) as factory:
+        assert await transport.async_connect(hass)
+        assert not await transport.async_connect(hass)
+    assert factory.call_count == 1
+    assert transport.socket is factory.return_value
+
+
+@pytest.mark.asyncio
+async def test_send_error_reconnects_through_transport(hass):
+    """Une socket morte est remplacée par le transport, une fois, sans relancer la réception."""
+    sockets = []
+
+    def _socket(*args):
+        sockets.append(MagicMock())
+        sockets[-1].fileno.return_value = 3
+        sockets[-1].recv.return_value = b""
+        return sockets[-1]
+
+    with patch("socket.socket", side_effect=_socket):
+        first = RFXCOMCoordinator(hass, _entry("first"))
+        second = RFXCOMCoordinator(hass, _entry("second"))
+        for coordinator in (first, second):
+            coordinator.auto_registry = True
+            # Réponse du transmetteur: ACK (la lecture de la socket simulée ne rend rien)
+            coordinator._primary.async_wait_ack = AsyncMock(return_value=True)
+            await coordinator.async_setup()
+        receive_task = first._receive_task
+        # Connexion coupée: la socket partagée n'a plus de pair
+        sockets[0].getpeername.side_effect = OSError("not connected")
+
+        assert await first.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+        assert await second.send_command(PROTOCOL_AC, "02382C83", CMD_ON, unit_code="1")
+
+    assert len(sockets) == 2
+    sockets[0].close.assert_called_once()
+    assert first.socket is second.socket is first._transport.socket is sockets[1]
+    assert first._receive_task is receive_task
+    assert first._transport.subscribers == 2
+    await first.async_shutdown()
+    await second.async_shutdown()
+    assert receive_task.done()
+
+
+@pytest.mark.asyncio
+async def test_received_frames_fan_out_to_subscribers(hass):
+    """Chaque trame est lue une fois et distribuée à chaque abonné."""
+    transport = SharedTransport(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    transport.socket = _FakeSocket(LIGHTING2 + b"\x40")
+    first = transport.subscribe("first", hass)
+    second = transport.subscribe("second", hass)
+
+    for queue in (first, second):
+        assert await asyncio.wait_for(queue.get(), 1) == (LIGHTING2, None)
+        assert await asyncio.wait_for(queue.get(), 1) == (None, DECODE_INVALID_LENGTH)
+
+    transport.unsubscribe("first")
+    assert transport.subscribers == 1 and transport._reader is not None
+    transport.unsubscribe("second")
+    assert transport._reader is None
+
+
+def test_slow_subscriber_drops_frames():
+    """Un abonné qui ne lit plus perd des trames sans bloquer les autres."""
+    transport = SharedTransport(transport_key(CONNECTION_TYPE_NETWORK, "", "rfx.local", 10001))
+    slow: asyncio.Queue = asyncio.Queue(1)
+    fast: asyncio.Queue = asyncio.Queue()
+    transport._subscribers = {"slow": slow, "fast": fast}
+    for _ in range(3):
+        transport._publish((LIGHTING2, None))
+    assert slow.qsize() == 1 and fast.qsize() == 3
+    assert transport.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinators_decode_shared_frames(hass):
+    """Les boucles de réception des entrées consomment le transport partagé."""
+    with patch("socket.socket", return_value=MagicMock()):
+        first = RFXCOMCoordinator(hass, _entry("first"))
+        second = RFXCOMCoordinator(hass, _entry("second"))
+        await first.async_setup()
+        await second.async_setup()
+    first._transport.socket = _FakeSocket(LIGHTING2)
+
+    for coordinator in (first, second):
+        coordinator._ensure_receive_loop()
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+        if first.get_discovered_devices() and second.get_discovered_devices():
+            break
+
+    assert len(first.get_discovered_devices()) == 1
+    assert len(second.get_discovered_devices()) == 1
+    assert first._transport.subscribers == 2
+    await first.async_shutdown()
+    await second.async_shutdown()
@@ -25,7 +25,7 @@ async def mock_async_get_last_state(hass, entity_id):
 sys.modules['homeassistant.helpers.restore_state'].async_get_last_state = mock_async_get_last_state
 
 from custom_components.rfxcom.switch import RFXCOMSwitch
-from custom_components.rfxcom.const import PROTOCOL_ARC, CMD_ON, CMD_OFF
+from custom_components.rfxcom.const import PROTOCOL_ARC, CMD_ON, CMD_OFF, PRIORITY_INTERACTIVE
 from custom_components.rfxcom.coordinator import RFXCOMCoordinator
 
 
@@ -76,6 +76,7 @@ class TestRFXCOMSwitch:
             command=CMD_ON,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -91,6 +92,7 @@ class TestRFXCOMSwitch:
             command=CMD_OFF,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     def test_is_on_property(self, switch):
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from custom_components.rfxcom.switch import async_setup_entry, RFXCOMSwitch
 from custom_components.rfxcom.const import (
+    PRIORITY_INTERACTIVE,
     PROTOCOL_AC,
     PROTOCOL_ARC,
     CMD_ON,
@@ -77,7 +78,7 @@ class TestSwitchSetup:
         mock_device_entry = Mock()
         mock_dr.async_get_or_create.return_value = mock_device_entry
         
-        with patch('custom_components.rfxcom.switch.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -93,7 +94,7 @@ class TestSwitchSetup:
         mock_hass.data[DOMAIN][mock_entry.entry_id] = mock_coordinator
         
         mock_dr = MagicMock()
-        with patch('custom_components.rfxcom.switch.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -129,7 +130,7 @@ class TestSwitchSetup:
         mock_device_entry = Mock()
         mock_dr.async_get_or_create.return_value = mock_device_entry
         
-        with patch('custom_components.rfxcom.switch.dr.async_get', return_value=mock_dr):
+        with patch('custom_components.rfxcom.device_identity.dr.async_get', return_value=mock_dr):
             add_entities = Mock()
             
             await async_setup_entry(mock_hass, mock_entry, add_entities)
@@ -221,6 +222,7 @@ class TestRFXCOMSwitch:
             command=CMD_ON,
             house_code=None,
             unit_code="2",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -238,6 +240,7 @@ class TestRFXCOMSwitch:
             command=CMD_ON,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -256,6 +259,7 @@ class TestRFXCOMSwitch:
             command=CMD_OFF,
             house_code=None,
             unit_code="2",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -274,6 +278,7 @@ class TestRFXCOMSwitch:
             command=CMD_OFF,
             house_code="A",
             unit_code="1",
+            priority=PRIORITY_INTERACTIVE,
         )
 
     @pytest.mark.asyncio
@@ -0,0 +1,124 @@
+"""Tests pour la trace binaire des trames."""
+from __future__ import annotations
+
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.rfxcom.const import (
+    CMD_ON,
+    PROTOCOL_AC,
+    TRACE_DIRECTION_RX,
+    TRACE_DIRECTION_TX,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.trace import PCAP_LINKTYPE_USER0, PCAP_MAGIC, PacketTrace
+
+AC_FRAME = bytes.fromhex("0B11000102382C8201010F70")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ring_keeps_latest_frames_in_fixed_arena():
+    """Au-delà de la capacité, les trames les plus anciennes sont écrasées."""
+    clock = FakeClock()
+    trace = PacketTrace(capacity=4, slot_size=16, clock=clock)
+    arena = trace._arena
+    for index in range(6):
+        clock.now += 1
+        trace.received(bytes([0x03, 0x11, index]))
+    assert len(trace) == 4 and trace.total == 6
+    assert [frame[2] for _, _, frame, _ in trace.entries()] == [2, 3, 4, 5]
+    assert trace._arena is arena and len(arena) == 64
+
+
+def test_long_frames_are_truncated_to_slot():
+    """Une trame plus longue qu'un emplacement est tronquée, sa longueur conservée."""
+    trace = PacketTrace(capacity=2, slot_size=8)
+    trace.sent(bytes(range(12)))
+    trace.received(b"\x01\x02")
+    (_, direction, frame, length), (_, _, short, short_length) = trace.entries()
+    assert direction == TRACE_DIRECTION_TX
+    assert frame == bytes(range(8)) and length == 12
+    assert short == b"\x01\x02" and short_length == 2
+    assert len(trace._arena) == 16
+
+
+def test_entries_window_in_seconds():
+    """seconds ne retient que les trames récentes."""
+    clock = FakeClock()
+    trace = PacketTrace(clock=clock)
+    trace.received(b"\x01")
+    clock.now += 100
+    trace.sent(b"\x02")
+    assert [frame for _, _, frame, _ in trace.entries(seconds=10)] == [b"\x02"]
+
+
+def test_pcap_export():
+    """L'export pcap contient l'en-tête global puis un enregistrement par trame."""
+    trace = PacketTrace()
+    trace.received(AC_FRAME)
+    capture = trace.export_pcap()
+    magic, major, minor, _, _, snaplen, linktype = struct.unpack_from("<IHHiIII", capture)
+    assert (magic, major, minor, linktype) == (PCAP_MAGIC, 2, 4, PCAP_LINKTYPE_USER0)
+    assert snaplen == trace.slot_size + 1
+    _, _, incl_len, orig_len = struct.unpack_from("<IIII", capture, 24)
+    assert incl_len == orig_len == len(AC_FRAME) + 1
+    assert capture[40] == TRACE_DIRECTION_RX
+    assert capture[41:] == AC_FRAME
+
+
+@pytest.mark.asyncio
+async def test_coordinator_traces_both_directions():
+    """Les trames reçues et émises (réseau) sont tracées sans logs de debug."""
+    entry = MagicMock()
+    entry.data = {"connection_type": "network"}
+    entry.options = {}
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    coordinator = RFXCOMCoordinator(hass, entry)
+    coordinator.socket = MagicMock()
+    coordinator.async_update_listeners = MagicMock()
+    coordinator.scheduler.async_acquire = AsyncMock(return_value=0)
+
+    await coordinator._async_handle_packet(AC_FRAME)
+    assert await coordinator.send_command(PROTOCOL_AC, "02382C82", CMD_ON, unit_code="1")
+
+    entries = coordinator.trace.entries()
+    assert [direction for _, direction, _, _ in entries] == [TRACE_DIRECTION_RX, TRACE_DIRECTION_TX]
+    assert entries[0][2] == AC_FRAME
+    assert entries[1][2] == hass.async_add_executor_job.await_args.args[1]
+
+
+@pytest.mark.asyncio
+async def test_dump_packet_trace_service(tmp_path):
+    """Le service écrit un fichier pcap par entrée chargée."""
+    from custom_components.rfxcom.services import SERVICE_DUMP_PACKET_TRACE, async_setup_services
+
+    coordinator = MagicMock()
+    coordinator.trace = PacketTrace()
+    coordinator.trace.received(AC_FRAME)
+    hass = MagicMock()
+    hass.data = {"rfxcom": {"entry1": coordinator}}
+    hass.config.path = lambda name: str(tmp_path / name)
+
+    async def _run(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _run
+    await async_setup_services(hass)
+    handlers = {call.args[1]: call.args[2] for call in hass.services.async_register.call_args_list}
+
+    call = MagicMock()
+    call.data = {"seconds": 60}
+    await handlers[SERVICE_DUMP_PACKET_TRACE](call)
+
+    (capture,) = tmp_path.glob("rfxcom_trace_entry1_*.pcap")
+    assert capture.read_bytes().endswith(AC_FRAME)
@@ -0,0 +1 @@
+"""Outils de développement RFXCOM (émulateur, bancs de test), hors intégration."""
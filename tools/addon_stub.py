@@ -0,0 +1,373 @@
+"""Add-on RFXCOM Node.js Bridge simulé, en process, pour tester le client HTTP.
+
+Le serveur reproduit l'API de l'add-on (/health, /api/init, /api/command,
+/api/burst, /api/frames et /api/frames/clients) sans port série ni Node.js.
+Latence, erreurs HTTP, refus d'émission et réponses lentes s'injectent via
+Faults; les trames du flux sont publiées par publish().
+
+Usage:
+    python -m tools.addon_stub --port 8888 --latency-ms 5 --error-rate 0.01
+
+Nécessite aiohttp (déjà requis par l'intégration).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import json
+import logging
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = "/dev/ttyUSB0"
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_HISTORY_SIZE = 1024
+HEARTBEAT_INTERVAL = 30.0
+
+
+@dataclass
+class Faults:
+    """Défauts injectés dans les réponses (durées en secondes, taux entre 0 et 1)."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0  # HTTP 500
+    reject_rate: float = 0.0  # HTTP 200 avec status=error (émission refusée)
+    slow_rate: float = 0.0
+    slow_delay: float = 0.0
+    seed: int | None = None
+
+
+class _StreamClient:
+    """Client du flux des trames: file bornée, les plus anciennes écartées."""
+
+    def __init__(self, client_id: int, remote: str | None, queue_size: int) -> None:
+        self.id = client_id
+        self.remote = remote
+        self.queue: deque[tuple[int, str] | None] = deque(maxlen=queue_size)
+        self.wakeup = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0
+
+    def push(self, entry: tuple[int, str] | None) -> None:
+        if entry is not None and len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(entry)
+        self.wakeup.set()
+
+
+class AddonStub:
+    """Serveur aiohttp qui se comporte comme l'add-on vu par NodeBridgeHTTP."""
+
+    def __init__(
+        self,
+        faults: Faults | None = None,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+    ) -> None:
+        """Initialise le serveur (aucune écoute avant start())."""
+        self.faults = faults or Faults()
+        self.heartbeat = heartbeat
+        self._rng = random.Random(self.faults.seed)
+        # Routes répondant 404, pour simuler un add-on plus ancien
+        self.unavailable: set[str] = set()
+        self.initialized = False
+        self.port = DEFAULT_PORT
+        self.commands: list[dict[str, Any]] = []
+        self.requests: dict[str, int] = {}
+        self.errors = 0
+        # Connexions TCP distinctes vues par le serveur (réutilisation keep-alive)
+        self._peers: set[Any] = set()
+        self._history: deque[tuple[int, float, str]] = deque(maxlen=history_size)
+        self._clients: dict[int, _StreamClient] = {}
+        self._next_client = 1
+        self.epoch = format(int(time.time() * 1000), "x")
+        self.seq = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_post("/api/init", self._init)
+        app.router.add_post("/api/command", self._command)
+        app.router.add_post("/api/burst", self._burst)
+        app.router.add_get("/api/frames", self._frames)
+        app.router.add_get("/api/frames/clients", self._frame_clients)
+        self.app = app
+
+    @property
+    def connections(self) -> int:
+        """Nombre de connexions TCP ouvertes par les clients depuis le démarrage."""
+        return len(self._peers)
+
+    @property
+    def first_seq(self) -> int:
+        """Plus ancienne séquence conservée (seq + 1 si l'historique est vide)."""
+        return self.seq - len(self._history) + 1
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Démarre l'écoute; retourne l'URL de base (port=0 choisit un port libre)."""
+        self._runner = web.AppRunner(self.app, handle_signals=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Ferme les flux en cours et arrête le serveur."""
+        self.disconnect_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def publish(self, frame: bytes) -> int:
+        """Publie une trame reçue « du RFXtrx » à tous les clients du flux."""
+        self.seq += 1
+        entry = (self.seq, json.dumps({"seq": self.seq, "t": int(time.time() * 1000), "hex": frame.hex()}) + "\n")
+        self._history.append((self.seq, time.time(), entry[1]))
+        for client in self._clients.values():
+            client.push(entry)
+        return self.seq
+
+    def disconnect_streams(self) -> None:
+        """Coupe les flux en cours (les clients reprendront avec leur curseur)."""
+        for client in self._clients.values():
+            client.push(None)
+
+    def restart(self) -> None:
+        """Simule un redémarrage de l'add-on: nouvelle époque, historique vidé."""
+        self.disconnect_streams()
+        self._history.clear()
+        self.seq = 0
+        self.epoch = format(int(time.time() * 1000) + 1, "x")
+        self.initialized = False
+
+    def stats(self) -> dict[str, Any]:
+        """Compteurs du serveur simulé."""
+        return {
+            "requests": dict(self.requests),
+            "connections": self.connections,
+            "errors": self.errors,
+            "commands": len(self.commands),
+            "frames": self.seq,
+            "frame_clients": len(self._clients),
+        }
+
+    def _track(self, request: web.Request) -> str | None:
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        self._peers.add(peer)
+        return peer[0] if peer else None
+
+    async def _delay(self) -> None:
+        faults = self.faults
+        delay = faults.latency
+        if faults.jitter:
+            delay += self._rng.uniform(0, faults.jitter)
+        if faults.slow_rate and self._rng.random() < faults.slow_rate:
+            delay += faults.slow_delay
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _faulty(self, request: web.Request) -> web.Response | None:
+        """Latence et défauts communs; retourne une réponse d'erreur éventuelle."""
+        self._track(request)
+        if request.path in self.unavailable:
+            return web.json_response({"status": "error", "error": "Endpoint non trouvé"}, status=404)
+        await self._delay()
+        if self.faults.error_rate and self._rng.random() < self.faults.error_rate:
+            self.errors += 1
+            return web.json_response({"status": "error", "error": "Erreur simulée"}, status=500)
+        return None
+
+    async def _health(self, request: web.Request) -> web.Response:
+        self._track(request)
+        await self._delay()
+        return web.json_response(
+            {
+                "status": "ok",
+                "initialized": self.initialized,
+                "port": self.port,
+                "frames_received": self.seq,
+                "frame_clients": len(self._clients),
+            }
+        )
+
+    async def _init(self, request: web.Request) -> web.Response:
+        if (response := await self._faulty(request)) is not None:
+            return response
+        data = await request.json()
+        self.port = data.get("port") or self.port
+        self.initialized = True
+        return web.json_response({"status": "success", "port": self.port})
+
+    async def _command(self, request: web.Request) -> web.Response:
+        if (response := await self._faulty(request)) is not None:
+            return response
+        data = await request.json()
+        if not data.get("protocol") or not data.get("command"):
+            return web.json_response(
+                {"status": "error", "error": "Paramètres manquants: protocol et command sont requis"},
+                status=400,
+            )
+        self.commands.append(data)
+        if self.faults.reject_rate and self._rng.random() < self.faults.reject_rate:
+            return web.json_response({"status": "error", "error": "Émission refusée (simulée)"})
+        return web.json_response({"status": "success"})
+
+    async def _burst(self, request: web.Request) -> web.Response:
+        if (response := await self._faulty(request)) is not None:
+            return response
+        data = await request.json()
+        rate, duration = data.get("rate", 0), data.get("duration", 0)
+        if not data.get("protocol") or not data.get("command") or not rate > 0 or not duration > 0:
+            return web.json_response(
+                {
+                    "status": "error",
+                    "error": "Paramètres manquants: protocol, command, rate et duration sont requis",
+                },
+                status=400,
+            )
+        self.commands.append(data)
+        # Bilan immédiat: la rafale n'est pas rejouée en temps réel
+        sent = int(rate * duration)
+        return web.json_response(
+            {
+                "status": "success",
+                "sent": sent,
+                "failed": 0,
+                "skipped": 0,
+                "duration": duration,
+                "achieved_rate": round(sent / duration, 2),
+            }
+        )
+
+    async def _frames(self, request: web.Request) -> web.StreamResponse:
+        remote = self._track(request)
+        if request.path in self.unavailable:
+            return web.json_response({"status": "error", "error": "Endpoint non trouvé"}, status=404)
+        query = request.query
+        client = _StreamClient(self._next_client, remote, int(query.get("queue") or DEFAULT_QUEUE_SIZE))
+        self._next_client += 1
+
+        # Même reprise que frame_hub.js: since valable pour l'époque courante
+        since, min_time = self.seq, 0.0
+        if "since" in query:
+            since = min(int(query["since"]), self.seq) if query.get("epoch") == self.epoch else 0
+        elif float(query.get("max_age") or 0) > 0:
+            since, min_time = 0, time.time() - float(query["max_age"])
+        missed = max(0, self.first_seq - 1 - since) if not min_time else 0
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/x-ndjson", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+        hello = {"type": "hello", "epoch": self.epoch, "seq": self.seq, "first": self.first_seq, "missed": missed}
+        await response.write(json.dumps(hello).encode() + b"\n")
+        for seq, stamp, line in list(self._history):
+            if seq > since and stamp >= min_time:
+                await response.write(line.encode())
+                client.delivered += 1
+
+        self._clients[client.id] = client
+        try:
+            while True:
+                if not client.queue:
+                    client.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(client.wakeup.wait(), self.heartbeat)
+                    except asyncio.TimeoutError:
+                        await response.write(b"\n")
+                        continue
+                entry = client.queue.popleft()
+                if entry is None:
+                    break
+                await response.write(entry[1].encode())
+                client.delivered += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            del self._clients[client.id]
+        return response
+
+    async def _frame_clients(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response(
+            {
+                "received": self.seq,
+                "epoch": self.epoch,
+                "seq": self.seq,
+                "first_seq": self.first_seq,
+                "clients": [
+                    {
+                        "id": client.id,
+                        "remote": client.remote,
+                        "delivered": client.delivered,
+                        "dropped": client.dropped,
+                        "lag": len(client.queue),
+                        "queue_size": client.queue.maxlen,
+                    }
+                    for client in self._clients.values()
+                ],
+            }
+        )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    faults = Faults(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        reject_rate=args.reject_rate,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay_ms / 1000,
+        seed=args.seed,
+    )
+    stub = AddonStub(faults)
+    url = await stub.start(args.host, args.port)
+    print(f"🧪 Add-on simulé sur {url}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(f"📊 {stub.stats()}", flush=True)
+    finally:
+        await stub.stop()
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options de défauts injectés, partagées avec le banc de mesure."""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latence ajoutée à chaque réponse")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="latence aléatoire supplémentaire")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part de réponses HTTP 500 (0-1)")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="part d'émissions refusées (0-1)")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="part de réponses lentes (0-1)")
+    parser.add_argument("--slow-delay-ms", type=float, default=0.0, help="retard des réponses lentes")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Add-on RFXCOM Node.js Bridge simulé")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="affichage des compteurs (s)")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Banc de mesure du client HTTP de l'add-on (NodeBridgeHTTP).
+
+Les commandes passent par le vrai client de l'intégration, vers l'add-on
+simulé en process (tools.addon_stub) ou vers un add-on réel (--url; les
+commandes sont alors réellement émises). Mesure les commandes par seconde,
+les latences p50/p99 vues par le client, la réutilisation des connexions
+keep-alive et le débit du flux des trames reçues.
+
+Usage (environnement de développement Home Assistant):
+    python -m tools.bench_addon --commands 2000 --concurrency 8 --latency-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from .addon_stub import AddonStub, Faults, add_fault_arguments
+from .rfxtrx_emulator import sensor_frame
+
+
+async def async_bench_commands(
+    url: str,
+    commands: int,
+    concurrency: int = 1,
+    serial_port: str | None = None,
+    stub: AddonStub | None = None,
+) -> dict[str, Any]:
+    """Envoie des commandes par le client réel et retourne le bilan.
+
+    Avec stub (démarré pour la mesure), les connexions TCP ouvertes côté
+    serveur mesurent la réutilisation keep-alive de la session du client.
+    """
+    # Import différé: l'intégration n'est chargée que pour mesurer
+    from custom_components.rfxcom.node_bridge_http import NodeBridgeHTTP
+
+    bridge = NodeBridgeHTTP(addon_url=url, serial_port=serial_port)
+    await bridge.initialize()
+    remaining = iter(range(commands))
+    failures = 0
+
+    async def _worker() -> None:
+        nonlocal failures
+        for index in remaining:
+            ok = await bridge.send_command(
+                protocol="AC",
+                device_id=f"{0x02382C00 + index % 16:08x}",
+                unit_code=1,
+                command="on" if index % 2 == 0 else "off",
+            )
+            if not ok:
+                failures += 1
+
+    started_at = time.perf_counter()
+    try:
+        await asyncio.gather(*(_worker() for _ in range(max(concurrency, 1))))
+        elapsed = time.perf_counter() - started_at
+        stats = bridge.stats()
+    finally:
+        await bridge.close()
+
+    result: dict[str, Any] = {
+        "commands": commands,
+        "concurrency": concurrency,
+        "failures": failures,
+        "duration_s": round(elapsed, 3),
+        "commands_per_s": round(commands / elapsed, 1) if elapsed else None,
+        "p50_ms": stats["round_trip_p50_ms"],
+        "p99_ms": stats["round_trip_p99_ms"],
+        "max_ms": stats["round_trip_max_ms"],
+    }
+    if stub is not None:
+        # Requêtes et connexions vues par le serveur depuis son démarrage
+        requests = sum(stub.requests.values())
+        result["connections"] = stub.connections
+        result["requests_per_connection"] = round(requests / stub.connections, 1) if stub.connections else None
+    return result
+
+
+async def async_bench_frames(stub: AddonStub, frames: int) -> dict[str, Any]:
+    """Débit du flux /api/frames jusqu'aux trames décodées par le client réel."""
+    from custom_components.rfxcom.node_bridge_http import NodeBridgeHTTP
+
+    bridge = NodeBridgeHTTP(addon_url=stub.url)
+    received = 0
+    # Trames déjà conservées: rejouées à la connexion, comme après une coupure
+    for index in range(frames):
+        stub.publish(sensor_frame(index % 64, index // 64))
+    stream = bridge.async_iter_frames()
+    started_at = time.perf_counter()
+    try:
+        async for _packet in stream:
+            received += 1
+            if received == frames:
+                break
+        elapsed = time.perf_counter() - started_at
+    finally:
+        await stream.aclose()
+        await bridge.close()
+    return {
+        "frames": received,
+        "duration_s": round(elapsed, 3),
+        "frames_per_s": round(received / elapsed, 1) if elapsed else None,
+    }
+
+
+async def _async_main(args: argparse.Namespace) -> dict[str, Any]:
+    if args.url:
+        return {
+            "commands": await async_bench_commands(args.url, args.commands, args.concurrency, args.serial_port)
+        }
+    faults = Faults(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        reject_rate=args.reject_rate,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay_ms / 1000,
+        seed=args.seed,
+    )
+    stub = AddonStub(faults, history_size=max(args.frames, 1))
+    url = await stub.start()
+    try:
+        results = {
+            "commands": await async_bench_commands(url, args.commands, args.concurrency, args.serial_port, stub)
+        }
+        if args.frames:
+            results["frames"] = await async_bench_frames(stub, args.frames)
+        return results
+    finally:
+        await stub.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Point d'entrée en ligne de commande: affiche le bilan en JSON."""
+    parser = argparse.ArgumentParser(description="Banc de mesure du client HTTP de l'add-on")
+    parser.add_argument("--url", help="add-on réel à mesurer (par défaut: add-on simulé en process)")
+    parser.add_argument("--serial-port", default="/dev/ttyUSB0")
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=10000, help="trames du flux à mesurer (0: aucune)")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(_async_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Micro-benchmarks: mesure, références enregistrées et détection des régressions.
+
+Les durées brutes dépendent de la machine. Chaque mesure est donc aussi
+exprimée relativement à une charge de calibration (pur Python) mesurée dans la
+même session : c'est ce rapport qui est comparé à la référence enregistrée.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import time
+from typing import Any, Callable
+
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.05  # secondes par répétition
+DEFAULT_THRESHOLD = 1.5  # régression au-delà de 1,5 fois la référence
+
+
+@dataclass
+class Measurement:
+    """Durée d'une opération (meilleure répétition) et son coût relatif."""
+
+    name: str
+    ns: float
+    relative: float
+
+    def as_dict(self) -> dict[str, float]:
+        return {"ns": round(self.ns, 1), "relative": round(self.relative, 4)}
+
+
+def measure(func: Callable[[], Any], inner: int = 1, repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME) -> float:
+    """Durée d'une opération en nanosecondes (minimum sur repeat répétitions).
+
+    func exécute inner opérations par appel. Le nombre d'appels par répétition
+    est ajusté pour que chaque répétition dure au moins min_time.
+    """
+    calls = 1
+    while True:
+        started_at = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - started_at
+        if elapsed >= min_time:
+            break
+        calls *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        started_at = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, time.perf_counter() - started_at)
+    return best / (calls * inner) * 1e9
+
+
+def _calibration_workload() -> None:
+    # Mélange représentatif du code mesuré: octets, dictionnaires, chaînes
+    data: dict[str, Any] = {}
+    frame = bytes(range(12))
+    for index in range(50):
+        key = f"ac_{frame[index % 12]:02x}{index}"
+        data[key] = {"id": frame[4:8].hex(), "unit": frame[8]}
+        data.get(key)
+
+
+def calibrate(repeat: int = DEFAULT_REPEAT) -> float:
+    """Durée de la charge de calibration, en nanosecondes."""
+    return measure(_calibration_workload, repeat=repeat)
+
+
+class Baseline:
+    """Références enregistrées dans un fichier JSON versionné."""
+
+    def __init__(self, path: Path) -> None:
+        """Charge les références du fichier (vide s'il n'existe pas)."""
+        self.path = path
+        self.data: dict[str, Any] = {"benchmarks": {}}
+        if path.exists():
+            self.data = json.loads(path.read_text(encoding="utf-8"))
+
+    def get(self, name: str) -> dict[str, float] | None:
+        """Référence d'un benchmark, None s'il n'en a pas encore."""
+        return self.data["benchmarks"].get(name)
+
+    def check(self, measurement: Measurement, threshold: float = DEFAULT_THRESHOLD) -> str | None:
+        """Retourne un message si la mesure dépasse la référence de plus de threshold."""
+        reference = self.get(measurement.name)
+        if reference is None:
+            return None
+        ratio = measurement.relative / reference["relative"]
+        if ratio > threshold:
+            return (
+                f"{measurement.name}: {ratio:.2f}x la référence "
+                f"({measurement.ns:.0f} ns, référence {reference['ns']:.0f} ns, seuil {threshold}x)"
+            )
+        return None
+
+    def save(self, measurements: list[Measurement], calibration_ns: float) -> None:
+        """Enregistre (ou remplace) les références des mesures données."""
+        benchmarks = dict(self.data["benchmarks"])
+        for measurement in measurements:
+            benchmarks[measurement.name] = measurement.as_dict()
+        self.data = {
+            "calibration_ns": round(calibration_ns, 1),
+            "python": platform.python_version(),
+            "benchmarks": dict(sorted(benchmarks.items())),
+        }
+        self.path.write_text(json.dumps(self.data, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,467 @@
+"""Émulateur RFXtrx en Python pur, pour tester sans matériel.
+
+L'émulateur écoute en TCP (comme un RFXtrx réseau) et/ou sur un pseudo-terminal
+(comme un RFXtrx USB, pour l'add-on ou un script série). Il répond aux
+commandes d'interface (reset, statut, démarrage du récepteur), acquitte les
+trames émises avec leur numéro de séquence et génère un trafic radio
+synthétique : capteurs température/humidité périodiques, rafales de
+télécommandes et trames corrompues.
+
+Usage:
+    python -m tools.rfxtrx_emulator --tcp 10001 --sensors 50 --sensor-period 5
+    python -m tools.rfxtrx_emulator --pty --remotes 4 --corrupt-rate 0.5
+
+Aucune dépendance à Home Assistant : les octets du protocole sont décrits ici.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import random
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Types de paquets (SDK RFXtrx)
+PACKET_INTERFACE_CONTROL = 0x00
+PACKET_INTERFACE_MESSAGE = 0x01
+PACKET_TRANSMITTER = 0x02
+PACKET_LIGHTING2 = 0x11
+PACKET_TEMP_HUM = 0x52
+
+# Commandes d'interface (type 0x00)
+CMD_RESET = 0x00
+CMD_STATUS = 0x02
+CMD_SET_MODE = 0x03
+CMD_START_RECEIVER = 0x07
+
+SUBTYPE_TRANSMITTER_RESPONSE = 0x01
+SUBTYPE_AC = 0x00
+SUBTYPE_TH13 = 0x0D
+ACK = 0x00
+NAK = 0x02
+
+# Réponse de statut: 433,92 MHz, firmware Pro XL, protocoles usuels activés
+RECEIVER_TYPE_433 = 0x53
+FIRMWARE_VERSION = 0x19
+FIRMWARE_TYPE_PRO_XL = 0x04
+COPYRIGHT = b"Copyright RFXCOM"
+
+# Longueurs plausibles (l'octet de longueur ne se compte pas)
+MIN_FRAME_LENGTH = 4
+MAX_FRAME_LENGTH = 50
+
+CORRUPT_INVALID_LENGTH = "invalid_length"
+CORRUPT_UNKNOWN_TYPE = "unknown_type"
+CORRUPT_TRUNCATED = "truncated"
+CORRUPT_KINDS = (CORRUPT_INVALID_LENGTH, CORRUPT_UNKNOWN_TYPE, CORRUPT_TRUNCATED)
+
+
+@dataclass
+class TrafficProfile:
+    """Trafic radio synthétique généré par l'émulateur.
+
+    Les périodes sont en secondes; une fréquence à 0 désactive le trafic
+    correspondant.
+    """
+
+    sensors: int = 0
+    sensor_period: float = 30.0
+    remotes: int = 0
+    burst_period: float = 10.0
+    burst_repeats: int = 3
+    corrupt_rate: float = 0.0
+    seed: int | None = None
+
+    @property
+    def sensor_rate(self) -> float:
+        """Trames de capteurs par seconde, tous capteurs confondus."""
+        return self.sensors / self.sensor_period if self.sensors and self.sensor_period > 0 else 0.0
+
+    @property
+    def burst_rate(self) -> float:
+        """Rafales de télécommandes par seconde."""
+        return self.remotes / self.burst_period if self.remotes and self.burst_period > 0 else 0.0
+
+
+def sensor_frame(index: int, reading: int = 0, seq: int = 0) -> bytes:
+    """Trame TEMP_HUM (TH13) du capteur index; reading fait varier la mesure."""
+    device_id = 0x1000 + index
+    temperature = 150 + (index * 7 + reading) % 150  # 15,0 à 29,9 °C, en dixièmes
+    humidity = 30 + (index + reading) % 50
+    return bytes(
+        [
+            0x0A,
+            PACKET_TEMP_HUM,
+            SUBTYPE_TH13,
+            seq,
+            device_id >> 8,
+            device_id & 0xFF,
+            temperature >> 8,
+            temperature & 0xFF,
+            humidity,
+            0x00,  # statut Normal
+            0x89,  # signal 8, batterie 9
+        ]
+    )
+
+
+def remote_frame(index: int, on: bool, seq: int = 0) -> bytes:
+    """Trame Lighting2 AC de la télécommande index (unité 1)."""
+    return bytes(
+        [
+            0x0B,
+            PACKET_LIGHTING2,
+            SUBTYPE_AC,
+            seq,
+            0x02,
+            0x38,
+            (index >> 8) & 0xFF,
+            index & 0xFF,
+            0x01,
+            0x01 if on else 0x00,
+            0x0F,
+            0x70,
+        ]
+    )
+
+
+def corrupt_frame(kind: str) -> bytes:
+    """Trame corrompue du type donné, sans désynchroniser le découpage du flux."""
+    if kind == CORRUPT_INVALID_LENGTH:
+        # Octet de longueur hors limites, seul: le lecteur doit le sauter
+        return bytes([0xFF])
+    if kind == CORRUPT_UNKNOWN_TYPE:
+        return bytes([0x07, 0x7F, 0x00, 0x00, 0x12, 0x34, 0x56, 0x78])
+    if kind == CORRUPT_TRUNCATED:
+        # Lighting2 déclarée sur 5 octets au lieu de 11
+        return bytes([0x05, PACKET_LIGHTING2, SUBTYPE_AC, 0x00, 0x02, 0x38])
+    raise ValueError(f"Type de trame corrompue inconnu: {kind}")
+
+
+def status_response(seq: int, command: int = CMD_STATUS) -> bytes:
+    """Réponse au statut / changement de mode (message d'interface 0x01/0x00)."""
+    return bytes(
+        [
+            0x14,
+            PACKET_INTERFACE_MESSAGE,
+            0x00,
+            seq,
+            command,
+            RECEIVER_TYPE_433,
+            FIRMWARE_VERSION,
+            0x00,  # msg3: protocoles non décodés
+            0x00,  # msg4
+            0x2F,  # msg5: AC, ARC, HomeEasy EU, X10, Oregon...
+            0x8F,  # msg6
+            0x01,  # version matérielle
+            0x01,
+            0x00,  # niveau de bruit
+            FIRMWARE_TYPE_PRO_XL,
+            0x00,
+            0x00,
+            0x00,
+            0x00,
+            0x00,
+            0x00,
+        ]
+    )
+
+
+def start_receiver_response(seq: int) -> bytes:
+    """Réponse au démarrage du récepteur (copyright du firmware)."""
+    return bytes([0x14, PACKET_INTERFACE_MESSAGE, CMD_START_RECEIVER, seq, CMD_START_RECEIVER]) + COPYRIGHT
+
+
+def transmitter_response(seq: int, code: int = ACK) -> bytes:
+    """Acquittement d'une trame émise, avec son numéro de séquence."""
+    return bytes([0x04, PACKET_TRANSMITTER, SUBTYPE_TRANSMITTER_RESPONSE, seq, code])
+
+
+def split_frames(buffer: bytearray) -> list[bytes]:
+    """Extrait les trames complètes du tampon; ignore les longueurs invalides."""
+    frames: list[bytes] = []
+    while buffer:
+        length = buffer[0]
+        if length < MIN_FRAME_LENGTH or length > MAX_FRAME_LENGTH:
+            del buffer[0]
+            continue
+        if len(buffer) < length + 1:
+            break
+        frames.append(bytes(buffer[: length + 1]))
+        del buffer[: length + 1]
+    return frames
+
+
+class _Client:
+    """Connexion à l'émulateur (socket TCP ou pty) et son tampon de réception."""
+
+    def __init__(self, name: str, write: Callable[[bytes], None]) -> None:
+        self.name = name
+        self.write = write
+        self.buffer = bytearray()
+
+
+class RFXtrxEmulator:
+    """RFXtrx simulé: répond aux commandes et diffuse le trafic synthétique."""
+
+    def __init__(
+        self,
+        profile: TrafficProfile | None = None,
+        ack_delay: float = 0.0,
+        nak_rate: float = 0.0,
+    ) -> None:
+        """Initialise l'émulateur (aucune écoute avant start_tcp / open_pty)."""
+        self.profile = profile or TrafficProfile()
+        self.ack_delay = ack_delay
+        self.nak_rate = nak_rate
+        self._rng = random.Random(self.profile.seed)
+        self._clients: list[_Client] = []
+        self._servers: list[asyncio.AbstractServer] = []
+        self._tasks: list[asyncio.Task] = []
+        self._pty_fds: tuple[int, int] | None = None
+        self._receiving = False
+        self._seq = 0
+        # Trames émises par les clients: (instant, trame), pour les bancs de latence
+        self.transmitted: list[tuple[float, bytes]] = []
+        self.counters = {
+            "commands": 0,
+            "transmitted": 0,
+            "acks": 0,
+            "naks": 0,
+            "emitted": 0,
+            "sensor_frames": 0,
+            "remote_frames": 0,
+            "corrupt_frames": 0,
+            "dropped_writes": 0,
+        }
+
+    @property
+    def clients(self) -> int:
+        """Nombre de connexions ouvertes."""
+        return len(self._clients)
+
+    def _next_seq(self) -> int:
+        self._seq = (self._seq + 1) % 256
+        return self._seq
+
+    def handle_frame(self, frame: bytes) -> bytes | None:
+        """Traite une trame reçue d'un client; retourne la réponse immédiate.
+
+        Les acquittements des trames émises sont retournés par respond(), qui
+        applique le délai d'acquittement configuré.
+        """
+        packet_type, seq = frame[1], frame[3]
+        if packet_type == PACKET_INTERFACE_CONTROL:
+            self.counters["commands"] += 1
+            command = frame[4] if len(frame) > 4 else CMD_RESET
+            if command == CMD_RESET:
+                # Le RFXtrx redémarre sans répondre et n'écoute plus jusqu'au start
+                self._receiving = False
+                return None
+            if command in (CMD_STATUS, CMD_SET_MODE):
+                return status_response(seq, command)
+            if command == CMD_START_RECEIVER:
+                self._receiving = True
+                return start_receiver_response(seq)
+            return status_response(seq, command)
+        self.counters["transmitted"] += 1
+        self.transmitted.append((asyncio.get_running_loop().time(), frame))
+        if self.nak_rate and self._rng.random() < self.nak_rate:
+            self.counters["naks"] += 1
+            return transmitter_response(seq, NAK)
+        self.counters["acks"] += 1
+        return transmitter_response(seq, ACK)
+
+    def _feed(self, client: _Client, data: bytes) -> None:
+        """Ajoute des octets reçus d'un client et répond aux trames complètes."""
+        client.buffer += data
+        for frame in split_frames(client.buffer):
+            response = self.handle_frame(frame)
+            if response is None:
+                continue
+            if self.ack_delay and frame[1] != PACKET_INTERFACE_CONTROL:
+                asyncio.get_running_loop().call_later(self.ack_delay, self._write, client, response)
+            else:
+                self._write(client, response)
+
+    def _write(self, client: _Client, data: bytes) -> None:
+        if client not in self._clients:
+            return
+        try:
+            client.write(data)
+        except (BlockingIOError, OSError):
+            # Personne ne lit le pty: la trame est perdue, comme en radio
+            self.counters["dropped_writes"] += 1
+
+    def emit(self, frame: bytes) -> float:
+        """Diffuse une trame « reçue par radio » à tous les clients; retourne l'instant."""
+        self.counters["emitted"] += 1
+        for client in list(self._clients):
+            self._write(client, frame)
+        return asyncio.get_running_loop().time()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Écoute en TCP; retourne le port (port=0 choisit un port libre)."""
+
+        async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            peer = writer.get_extra_info("peername")
+            client = _Client(f"tcp:{peer}", writer.write)
+            self._clients.append(client)
+            _LOGGER.info("🔌 Client connecté: %s", client.name)
+            try:
+                while data := await reader.read(1024):
+                    self._feed(client, data)
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            finally:
+                self._clients.remove(client)
+                writer.close()
+                _LOGGER.info("🔌 Client déconnecté: %s", client.name)
+
+        server = await asyncio.start_server(_handle, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    def open_pty(self) -> str:
+        """Ouvre un pseudo-terminal (POSIX); retourne le chemin côté « port série »."""
+        import tty
+
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        # Le côté esclave reste ouvert ici: sans lecteur, le maître ne renvoie pas EIO
+        self._pty_fds = (master, slave)
+        client = _Client("pty", lambda data: os.write(master, data))
+        self._clients.append(client)
+
+        def _readable() -> None:
+            try:
+                data = os.read(master, 1024)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                data = b""
+            if data:
+                self._feed(client, data)
+
+        asyncio.get_running_loop().add_reader(master, _readable)
+        return os.ttyname(slave)
+
+    def start_traffic(self) -> None:
+        """Démarre la génération du trafic synthétique du profil."""
+        profile = self.profile
+        if profile.sensor_rate:
+            self._tasks.append(asyncio.create_task(self._async_emit_at(profile.sensor_rate, self._emit_sensor)))
+        if profile.burst_rate:
+            self._tasks.append(asyncio.create_task(self._async_emit_at(profile.burst_rate, self._emit_burst)))
+        if profile.corrupt_rate:
+            self._tasks.append(asyncio.create_task(self._async_emit_at(profile.corrupt_rate, self._emit_corrupt)))
+
+    async def _async_emit_at(self, rate: float, emit: Callable[[int], None]) -> None:
+        """Appelle emit(n) à la fréquence donnée, en rattrapant le retard éventuel."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        count = 0
+        while True:
+            due = int((loop.time() - start) * rate)
+            while count < due:
+                emit(count)
+                count += 1
+            await asyncio.sleep(max(start + (count + 1) / rate - loop.time(), 0))
+
+    def _emit_sensor(self, count: int) -> None:
+        sensors = self.profile.sensors
+        self.counters["sensor_frames"] += 1
+        self.emit(sensor_frame(count % sensors, count // sensors, self._next_seq()))
+
+    def _emit_burst(self, count: int) -> None:
+        # Un appui de télécommande: la même trame répétée, comme le font les émetteurs
+        frame = remote_frame(count % self.profile.remotes, (count // self.profile.remotes) % 2 == 0, self._next_seq())
+        for _ in range(self.profile.burst_repeats):
+            self.counters["remote_frames"] += 1
+            self.emit(frame)
+
+    def _emit_corrupt(self, count: int) -> None:
+        self.counters["corrupt_frames"] += 1
+        self.emit(corrupt_frame(self._rng.choice(CORRUPT_KINDS)))
+
+    async def stop(self) -> None:
+        """Arrête le trafic, les écoutes TCP et le pty."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        if self._pty_fds is not None:
+            master, slave = self._pty_fds
+            asyncio.get_running_loop().remove_reader(master)
+            os.close(master)
+            os.close(slave)
+            self._pty_fds = None
+        self._clients.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Compteurs de l'émulateur (commandes, acquittements, trafic émis)."""
+        return {**self.counters, "clients": self.clients}
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    profile = TrafficProfile(
+        sensors=args.sensors,
+        sensor_period=args.sensor_period,
+        remotes=args.remotes,
+        burst_period=args.burst_period,
+        burst_repeats=args.burst_repeats,
+        corrupt_rate=args.corrupt_rate,
+        seed=args.seed,
+    )
+    emulator = RFXtrxEmulator(profile, ack_delay=args.ack_delay / 1000, nak_rate=args.nak_rate)
+    if args.tcp is not None:
+        port = await emulator.start_tcp(args.host, args.tcp)
+        print(f"🛰️ RFXtrx émulé en TCP: {args.host}:{port}", flush=True)
+    if args.pty:
+        print(f"🛰️ RFXtrx émulé sur le port série: {emulator.open_pty()}", flush=True)
+    emulator.start_traffic()
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(f"📊 {emulator.stats()}", flush=True)
+    finally:
+        await emulator.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Émulateur RFXtrx (TCP et pty)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp", type=int, metavar="PORT", help="écoute TCP (0: port libre)")
+    parser.add_argument("--pty", action="store_true", help="ouvre un pseudo-terminal série")
+    parser.add_argument("--sensors", type=int, default=0, help="capteurs température/humidité")
+    parser.add_argument("--sensor-period", type=float, default=30.0, help="période par capteur (s)")
+    parser.add_argument("--remotes", type=int, default=0, help="télécommandes")
+    parser.add_argument("--burst-period", type=float, default=10.0, help="période par télécommande (s)")
+    parser.add_argument("--burst-repeats", type=int, default=3, help="répétitions par appui")
+    parser.add_argument("--corrupt-rate", type=float, default=0.0, help="trames corrompues par seconde")
+    parser.add_argument("--ack-delay", type=float, default=0.0, help="délai d'acquittement (ms)")
+    parser.add_argument("--nak-rate", type=float, default=0.0, help="part des émissions refusées (0-1)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="affichage des compteurs (s)")
+    args = parser.parse_args(argv)
+    if args.tcp is None and not args.pty:
+        parser.error("indiquer --tcp PORT et/ou --pty")
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Banc de montée en charge: grands inventaires d'appareils et capteurs bavards.
+
+Génère des options d'entrée (entry.options["devices"]) couvrant tous les
+protocoles de PROTOCOLS_SWITCH, puis mesure pour chaque taille d'inventaire :
+la configuration des plateformes (switch, sensor, cover), le peuplement du
+device registry, la mémoire par entité et le coût par trame reçue, de
+_async_receive_loop jusqu'à l'état des entités. Les courbes obtenues rendent
+visibles les chemins dont le coût croît plus vite que prévu.
+
+Importe l'intégration: s'exécute dans l'environnement de développement Home
+Assistant ou sous pytest (tests/test_scale.py, option --bench pour les courbes).
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable
+from unittest.mock import MagicMock, patch
+
+from custom_components.rfxcom import cover, sensor, switch
+from custom_components.rfxcom.const import (
+    CONF_DEVICE_ID,
+    CONF_HOUSE_CODE,
+    CONF_PROTOCOL,
+    CONF_UNIT_CODE,
+    CONNECTION_TYPE_NETWORK,
+    DEVICE_TYPE_COVER,
+    DEVICE_TYPE_SENSOR,
+    DOMAIN,
+    PACKET_TYPE_LIGHTING1,
+    PACKET_TYPE_LIGHTING2,
+    PACKET_TYPE_LIGHTING3,
+    PACKET_TYPE_LIGHTING4,
+    PACKET_TYPE_LIGHTING5,
+    PACKET_TYPE_LIGHTING6,
+    PROTOCOL_TEMP_HUM,
+    PROTOCOL_TO_PACKET,
+    PROTOCOLS_SWITCH,
+    TRANSPORT_SUBSCRIBER_QUEUE,
+)
+from custom_components.rfxcom.coordinator import RFXCOMCoordinator
+from custom_components.rfxcom.transport import SharedTransport, transport_key
+
+from .rfxtrx_emulator import sensor_frame
+
+SIZES = (50, 100, 250, 500, 1000)
+CHATTY_SENSORS = 50
+FRAMES_PER_SENSOR = 20
+COVER_EVERY = 10  # un appareil sur dix configuré en volet
+
+# Chiffres hexadécimaux de l'identifiant par type de paquet (Lighting1: house/unit)
+DEVICE_ID_DIGITS = {
+    PACKET_TYPE_LIGHTING2: 8,
+    PACKET_TYPE_LIGHTING3: 4,
+    PACKET_TYPE_LIGHTING4: 6,
+    PACKET_TYPE_LIGHTING5: 6,
+    PACKET_TYPE_LIGHTING6: 4,
+}
+# Propriétés lues par Home Assistant pour écrire l'état d'une entité
+STATE_PROPERTIES = ("native_value", "is_on", "is_closed")
+
+
+def generate_devices(count: int, sensors: int = 0, cover_every: int = COVER_EVERY) -> list[dict[str, Any]]:
+    """Inventaire de count appareils répartis sur PROTOCOLS_SWITCH, plus sensors sondes.
+
+    Les sondes ont les identifiants des capteurs de l'émulateur RFXtrx
+    (tools.rfxtrx_emulator.sensor_frame), pour recevoir leur trafic.
+    """
+    devices: list[dict[str, Any]] = []
+    for index in range(count):
+        protocol = PROTOCOLS_SWITCH[index % len(PROTOCOLS_SWITCH)]
+        packet_type = PROTOCOL_TO_PACKET[protocol][0]
+        device: dict[str, Any] = {"name": f"Scale {protocol} {index}", CONF_PROTOCOL: protocol}
+        if packet_type == PACKET_TYPE_LIGHTING1:
+            device[CONF_HOUSE_CODE] = chr(ord("A") + index // 16 % 16)
+            device[CONF_UNIT_CODE] = str(index % 16 + 1)
+        else:
+            device[CONF_DEVICE_ID] = f"{index:0{DEVICE_ID_DIGITS[packet_type]}X}"
+            if packet_type in (PACKET_TYPE_LIGHTING2, PACKET_TYPE_LIGHTING3, PACKET_TYPE_LIGHTING5):
+                device[CONF_UNIT_CODE] = str(index % 16 + 1)
+        if cover_every and index % cover_every == cover_every - 1:
+            device["device_type"] = DEVICE_TYPE_COVER
+        devices.append(device)
+    for index in range(sensors):
+        devices.append(
+            {
+                "name": f"Scale Temp/Hum {index}",
+                CONF_PROTOCOL: PROTOCOL_TEMP_HUM,
+                CONF_DEVICE_ID: str(0x1000 + index),
+                "device_type": DEVICE_TYPE_SENSOR,
+            }
+        )
+    return devices
+
+
+def sensor_traffic(sensors: int, frames_per_sensor: int) -> list[bytes]:
+    """Trames des capteurs bavards, entrelacées comme en réception réelle."""
+    return [
+        sensor_frame(index, reading, seq=(reading * sensors + index) % 256)
+        for reading in range(frames_per_sensor)
+        for index in range(sensors)
+    ]
+
+
+class DeviceRegistry:
+    """Device registry en mémoire, avec le nombre d'écritures."""
+
+    def __init__(self) -> None:
+        self.devices: dict[str, SimpleNamespace] = {}
+        self.writes = 0
+
+    def async_get_device(self, identifiers: set[tuple[str, str]]) -> SimpleNamespace | None:
+        ((_, identifier),) = identifiers
+        return self.devices.get(identifier)
+
+    def async_get_or_create(self, config_entry_id: str, identifiers, name, manufacturer, model) -> SimpleNamespace:
+        ((_, identifier),) = identifiers
+        self.writes += 1
+        device = SimpleNamespace(
+            config_entries={config_entry_id}, name=name, manufacturer=manufacturer, model=model
+        )
+        self.devices[identifier] = device
+        return device
+
+
+def _state_reader(entity: Any) -> Callable[[], Any]:
+    for name in STATE_PROPERTIES:
+        if isinstance(getattr(type(entity), name, None), property):
+            return lambda entity=entity, name=name: getattr(entity, name)
+    return lambda: None
+
+
+class ScaleHarness:
+    """Une entrée configurée avec un inventaire donné, sur un hass simulé."""
+
+    def __init__(self, devices: list[dict[str, Any]], entry_id: str = "scale") -> None:
+        """Crée l'entrée et son coordinateur (réseau, sans connexion)."""
+        self.hass = MagicMock()
+        self.hass.data = {}
+        self.entry = SimpleNamespace(
+            entry_id=entry_id,
+            data={
+                "connection_type": CONNECTION_TYPE_NETWORK,
+                "host": "127.0.0.1",
+                "network_port": 10001,
+                "auto_registry": False,
+            },
+            options={"devices": devices},
+        )
+        self.coordinator = RFXCOMCoordinator(self.hass, self.entry)
+        self.hass.data[DOMAIN] = {entry_id: self.coordinator}
+        self.registry = DeviceRegistry()
+        self.entities: list[Any] = []
+
+    async def async_setup_platforms(self) -> dict[str, Any]:
+        """Configure switch, sensor et cover; retourne durées et compteurs."""
+        self.entities = []
+        counts: dict[str, int] = {}
+        timings: dict[str, float] = {}
+        writes_before = self.registry.writes
+        with patch("custom_components.rfxcom.device_identity.dr.async_get", return_value=self.registry):
+            for name, platform in (("switch", switch), ("sensor", sensor), ("cover", cover)):
+                added: list[Any] = []
+                started_at = time.perf_counter()
+                await platform.async_setup_entry(self.hass, self.entry, added.extend)
+                timings[name] = (time.perf_counter() - started_at) * 1000
+                counts[name] = len(added)
+                self.entities.extend(added)
+        return {
+            "setup_ms": round(sum(timings.values()), 3),
+            "platform_ms": {name: round(value, 3) for name, value in timings.items()},
+            "entities": counts,
+            "registry_devices": len(self.registry.devices),
+            "registry_writes": self.registry.writes - writes_before,
+        }
+
+    async def async_memory_per_entity(self) -> float:
+        """Octets alloués par entité créée (configuration complète sous tracemalloc)."""
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            await self.async_setup_platforms()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        return allocated / max(len(self.entities), 1)
+
+    def _refresh_entities(self) -> None:
+        # Comme les listeners de DataUpdateCoordinator: chaque entité relit son état
+        for read in self._readers:
+            read()
+
+    async def async_frame_cost(self, frames: list[bytes]) -> float:
+        """Coût moyen par trame (µs), de la boucle de réception à l'état des entités."""
+        coordinator = self.coordinator
+        self._readers = [_state_reader(entity) for entity in self.entities]
+        coordinator.async_update_listeners = self._refresh_entities
+        # Transport partagé sans socket: les trames sont publiées directement aux abonnés
+        transport = SharedTransport(transport_key(CONNECTION_TYPE_NETWORK, "", "127.0.0.1", 10001))
+        coordinator._transport = transport
+        task = asyncio.create_task(coordinator._async_receive_loop())
+        try:
+            while transport.subscribers == 0:
+                await asyncio.sleep(0)
+            received = coordinator.stats.frames_received
+            processed_before = sum(received.values())
+            started_at = time.perf_counter()
+            for offset in range(0, len(frames), TRANSPORT_SUBSCRIBER_QUEUE):
+                chunk = frames[offset : offset + TRANSPORT_SUBSCRIBER_QUEUE]
+                for frame in chunk:
+                    transport._publish((frame, None))
+                target = processed_before + offset + len(chunk)
+                while sum(received.values()) < target:
+                    await asyncio.sleep(0)
+            elapsed = time.perf_counter() - started_at
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            coordinator._transport = None
+        return elapsed / max(len(frames), 1) * 1e6
+
+
+async def async_measure(
+    count: int, sensors: int = CHATTY_SENSORS, frames_per_sensor: int = FRAMES_PER_SENSOR
+) -> dict[str, Any]:
+    """Mesures complètes pour un inventaire de count appareils et sensors sondes."""
+    devices = generate_devices(count, sensors)
+    harness = ScaleHarness(devices)
+    setup = await harness.async_setup_platforms()
+    # Rechargement à options inchangées: le registry ne doit plus être écrit
+    reload = await harness.async_setup_platforms()
+    frame_us = await harness.async_frame_cost(sensor_traffic(sensors, frames_per_sensor))
+    memory = await ScaleHarness(devices).async_memory_per_entity()
+    return {
+        "devices": len(devices),
+        "entities": sum(setup["entities"].values()),
+        "setup_ms": setup["setup_ms"],
+        "reload_ms": reload["setup_ms"],
+        "registry_devices": setup["registry_devices"],
+        "registry_writes": setup["registry_writes"],
+        "reload_registry_writes": reload["registry_writes"],
+        "bytes_per_entity": round(memory),
+        "frame_us": round(frame_us, 1),
+    }
+
+
+async def async_scaling_curve(
+    sizes: tuple[int, ...] = SIZES, sensors: int = CHATTY_SENSORS, frames_per_sensor: int = FRAMES_PER_SENSOR
+) -> list[dict[str, Any]]:
+    """Mesures pour chaque taille d'inventaire."""
+    return [await async_measure(count, sensors, frames_per_sensor) for count in sizes]
+
+
+def scaling_exponent(rows: list[dict[str, Any]], key: str, size_key: str = "devices") -> float:
+    """Exposant k de la croissance (coût ~ N^k) entre la plus petite et la plus grande taille.
+
+    ~0: constant, ~1: linéaire, ~2: quadratique.
+    """
+    first, last = rows[0], rows[-1]
+    if first[key] <= 0 or last[size_key] == first[size_key]:
+        return 0.0
+    return math.log(last[key] / first[key]) / math.log(last[size_key] / first[size_key])
+
+
+def format_curve(rows: list[dict[str, Any]]) -> str:
+    """Tableau texte des courbes, avec l'exposant de croissance de chaque mesure."""
+    columns = ("devices", "entities", "setup_ms", "reload_ms", "registry_writes", "bytes_per_entity", "frame_us")
+    lines = [" ".join(f"{column:>16}" for column in columns)]
+    for row in rows:
+        lines.append(" ".join(f"{row[column]:>16}" for column in columns))
+    lines.append(
+        " ".join(
+            f"{'N^' + format(scaling_exponent(rows, column), '.2f'):>16}" if column != "devices" else f"{'croissance':>16}"
+            for column in columns
+        )
+    )
+    return "\n".join(lines)